@@ -0,0 +1 @@
+"""Benchmark scripts package."""
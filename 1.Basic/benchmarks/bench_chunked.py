@@ -0,0 +1,80 @@
+"""
+Chunked Workflow Benchmark
+Transforms documents of growing length with the basic workflow (one prompt
+for the whole document) and with the chunked map-reduce workflow at several
+concurrency limits, against a stand-in LLM whose latency grows with the
+prompt length, and reports end-to-end latency.
+
+The single call grows with the document; the chunked run takes about
+(chunks / concurrency) calls of chunk size.
+
+Run from the project root:
+    python -m benchmarks.bench_chunked
+"""
+import argparse
+import contextlib
+import io
+
+from langgraph_common.harness import print_report, run_benchmark, timer
+
+import src.nodes.data_transformer as data_transformer
+from src.config import Config
+from src.llm import LLMLimiter, set_llm_limiter
+from src.nodes.chunked_transformer import split_into_chunks
+from src.testing import StreamingFakeChatModel
+from src.workflows.basic_workflow import create_langgraph_workflow
+from src.workflows.chunked_workflow import create_chunked_workflow
+
+PARAGRAPH = ("LangGraph runs each node as a step of the graph. "
+             "State flows from one node to the next. " * 4).strip()
+
+
+def _initial_state(text):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "started"
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20_000, 80_000],
+                        help="Document sizes in characters")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fixed seconds per call")
+    parser.add_argument("--per-char", type=float, default=0.00002,
+                        help="Seconds per prompt character")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    # No rate limits: the comparison is about the shape of the calls
+    set_llm_limiter(LLMLimiter(initial_concurrency=32, max_concurrency=32))
+    data_transformer.llm = StreamingFakeChatModel(
+        responses=["A creative retelling."], latency=args.latency,
+        latency_per_prompt_char=args.per_char
+    )
+
+    for size in args.sizes:
+        text = "\n\n".join([PARAGRAPH] * (size // (len(PARAGRAPH) + 2) + 1))[:size]
+        chunks = len(split_into_chunks(text, Config.CHUNK_MAX_TOKENS))
+        apps = [("single prompt", create_langgraph_workflow())] + [
+            (f"chunked, concurrency {limit}", create_chunked_workflow(max_concurrency=limit))
+            for limit in (1, 4, 8)
+        ]
+        for label, app in apps:
+            def run():
+                elapsed = timer()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    app.invoke(_initial_state(text))
+                return {"run": elapsed()}
+
+            print_report(f"{size:,} chars ({chunks} chunks of {Config.CHUNK_MAX_TOKENS} tokens), {label}",
+                         run_benchmark(run, repeats=args.repeats, warmup=0))
+
+    set_llm_limiter(None)
+
+
+if __name__ == "__main__":
+    main()
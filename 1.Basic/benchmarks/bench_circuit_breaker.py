@@ -0,0 +1,69 @@
+"""
+Circuit Breaker Benchmark
+Runs the data transformer through a simulated LLM outage (every call hangs
+for the timeout and then fails) followed by recovery, with the circuit
+breaker effectively disabled and enabled, and reports per-phase latency.
+During the outage an open circuit answers with the fallback at once; after
+open_seconds a probe call finds the LLM healthy and closes it again.
+
+Run from the project root:
+    python -m benchmarks.bench_circuit_breaker
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from langgraph_common.harness import print_report, timer
+
+import src.llm.circuit_breaker as circuit_breaker
+import src.nodes.data_transformer as data_transformer
+from src.config import Config
+from src.llm import LLMLimiter, set_llm_limiter
+from src.testing import StreamingFakeChatModel
+
+
+def _phase(llm, calls, failure_rate, latency):
+    llm.failure_rate = failure_rate
+    llm.latency = latency
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(calls):
+            elapsed = timer()
+            data_transformer.data_transformer_node({"processed_text": "PROCESSING: outage"})
+            samples.append(elapsed())
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=60, help="Calls per phase")
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--timeout", type=float, default=0.2,
+                        help="Seconds a call hangs before failing during the outage")
+    parser.add_argument("--open-seconds", type=float, default=0.5)
+    args = parser.parse_args()
+
+    set_llm_limiter(LLMLimiter())
+    Config.LLM_BREAKER_OPEN_SECONDS = args.open_seconds
+    llm = StreamingFakeChatModel(responses=["A creative retelling."])
+    data_transformer.llm = llm
+
+    for label, error_rate in (("no breaker", 2.0), ("circuit breaker", 0.5)):
+        Config.LLM_BREAKER_ERROR_RATE = error_rate
+        circuit_breaker._breakers.clear()
+        samples = {"outage": _phase(llm, args.calls, 1.0, args.timeout)}
+        # The LLM comes back while the circuit is still open
+        time.sleep(args.open_seconds)
+        samples["recovered"] = _phase(llm, args.calls, 0.0, args.latency)
+        total = sum(samples["outage"]) + sum(samples["recovered"])
+        print_report(f"{label}: {args.calls} calls per phase, {total:.2f}s total", samples)
+        snapshot = circuit_breaker.get_circuit_breaker("data_transformer").snapshot()
+        print(f"LLM calls: {snapshot['calls']}  rejected: {snapshot['rejected']}  "
+              f"opened: {snapshot['opened']}  state: {snapshot['state']}")
+
+    set_llm_limiter(None)
+
+
+if __name__ == "__main__":
+    main()
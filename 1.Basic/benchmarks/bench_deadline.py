@@ -0,0 +1,62 @@
+"""
+Deadline Benchmark
+Runs the basic workflow from many threads against a stand-in LLM with a
+slow tail, with and without a per-run deadline, and reports end-to-end
+latency and how many runs fell back to the cheap transform.
+
+Run from the project root:
+    python -m benchmarks.bench_deadline
+"""
+import argparse
+import contextlib
+import io
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from langgraph_common.harness import print_report, timer
+
+import src.nodes.data_transformer as data_transformer
+from src.llm import LLMLimiter, set_llm_limiter
+from src.testing import StreamingFakeChatModel
+from src.workflows.basic_workflow import run_workflow
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--deadline-ms", type=float, default=150)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--tail-latency", type=float, default=1.0)
+    parser.add_argument("--tail-probability", type=float, default=0.05)
+    args = parser.parse_args()
+
+    random.seed(11)
+    set_llm_limiter(LLMLimiter(initial_concurrency=args.threads, max_concurrency=args.threads))
+    data_transformer.llm = StreamingFakeChatModel(
+        responses=["A creative retelling."], latency=args.latency,
+        tail_latency=args.tail_latency, tail_probability=args.tail_probability
+    )
+
+    for label, deadline in (("no deadline", None), (f"{args.deadline_ms:g} ms deadline",
+                                                    args.deadline_ms / 1000)):
+        def run(_):
+            elapsed = timer()
+            result = run_workflow("meet the latency target", deadline_seconds=deadline)
+            return elapsed(), "✨ TRANSFORMED" in result["output_text"]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            with ThreadPoolExecutor(max_workers=args.threads) as pool:
+                results = list(pool.map(run, range(args.runs)))
+
+        print_report(f"{args.runs} runs, {args.tail_probability:.0%} of LLM calls take "
+                     f"{args.tail_latency}s, {label}",
+                     {"run_latency": [latency for latency, _ in results]})
+        fallbacks = sum(fell_back for _, fell_back in results)
+        print(f"fallback answers: {fallbacks}/{args.runs}")
+
+    set_llm_limiter(None)
+
+
+if __name__ == "__main__":
+    main()
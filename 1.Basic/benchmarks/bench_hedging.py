@@ -0,0 +1,62 @@
+"""
+Hedging Benchmark
+Calls the data transformer against a stand-in LLM with a slow tail (a few
+percent of calls take far longer than the rest) with and without hedging,
+and reports latency percentiles, hedge rate and hedge win rate.
+
+Run from the project root:
+    python -m benchmarks.bench_hedging
+"""
+import argparse
+import contextlib
+import io
+import random
+
+from langgraph_common.harness import print_report, run_benchmark, timer
+
+import src.llm.hedging as hedging
+import src.nodes.data_transformer as data_transformer
+from src.config import Config
+from src.llm import LLMLimiter, set_llm_limiter
+from src.testing import StreamingFakeChatModel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--tail-latency", type=float, default=0.4)
+    parser.add_argument("--tail-probability", type=float, default=0.03)
+    args = parser.parse_args()
+
+    random.seed(7)
+    set_llm_limiter(LLMLimiter())
+    data_transformer.llm = StreamingFakeChatModel(
+        responses=["A creative retelling."], latency=args.latency,
+        tail_latency=args.tail_latency, tail_probability=args.tail_probability
+    )
+
+    def run():
+        elapsed = timer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            data_transformer.data_transformer_node({"processed_text": "PROCESSING: tail"})
+        return {"call_latency": elapsed()}
+
+    for label, enabled in (("without hedging", False), ("with hedging", True)):
+        Config.LLM_HEDGING = enabled
+        hedging._policies.clear()
+        print_report(
+            f"{args.calls} calls, {args.tail_probability:.0%} take {args.tail_latency}s, {label}",
+            run_benchmark(run, repeats=args.calls, warmup=0)
+        )
+        policy = hedging.get_hedging_policy("data_transformer")
+        if policy is not None:
+            snapshot = policy.snapshot()
+            print(f"hedge rate: {snapshot['hedge_rate']:.1%}  hedge wins: "
+                  f"{snapshot['hedge_win_rate']:.1%}  hedge delay: {snapshot['hedge_delay_ms']} ms")
+
+    set_llm_limiter(None)
+
+
+if __name__ == "__main__":
+    main()
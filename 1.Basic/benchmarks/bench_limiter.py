@@ -0,0 +1,69 @@
+"""
+LLM Limiter Benchmark
+Sends bursts of data transformer calls from many threads at a stand-in LLM
+that answers 429 beyond a fixed concurrency, with and without the adaptive
+limiter, and reports how many calls were rejected and fell back.
+
+Run from the project root:
+    python -m benchmarks.bench_limiter
+"""
+import argparse
+import contextlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from langgraph_common.harness import print_report, timer
+
+import src.nodes.data_transformer as data_transformer
+from src.config import Config
+from src.llm import LLMLimiter, set_llm_limiter
+from src.testing import RateLimitedFakeChatModel
+
+
+def _run(limiter, args):
+    set_llm_limiter(limiter)
+    llm = RateLimitedFakeChatModel(responses=["A creative retelling."],
+                                   latency=args.latency, capacity=args.capacity)
+    data_transformer.llm = llm
+
+    def call():
+        elapsed = timer()
+        data_transformer.data_transformer_node({"processed_text": "PROCESSING: burst"})
+        return elapsed()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            latencies = list(pool.map(lambda _: call(), range(args.calls)))
+    return llm, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--capacity", type=int, default=6,
+                        help="Concurrent calls the stand-in accepts before answering 429")
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    # Keep the circuit breaker closed so every call reaches the stand-in
+    Config.LLM_BREAKER_ERROR_RATE = 2.0
+
+    # backoff_factor=1 never backs off: the same as calling the LLM directly
+    unlimited = LLMLimiter(initial_concurrency=args.threads, max_concurrency=args.threads,
+                           backoff_factor=1.0)
+    adaptive = LLMLimiter(initial_concurrency=args.threads, max_concurrency=args.threads)
+
+    for label, limiter in (("no limit", unlimited), ("AIMD limiter", adaptive)):
+        llm, latencies = _run(limiter, args)
+        print_report(f"{args.calls} calls from {args.threads} threads, {label}",
+                     {"call_latency": latencies})
+        snapshot = limiter.snapshot()
+        print(f"429s: {llm.rejected}/{args.calls}  concurrency limit: "
+              f"{snapshot['concurrency_limit']}  avg queue wait: {snapshot['avg_queue_wait_ms']} ms")
+
+    set_llm_limiter(None)
+
+
+if __name__ == "__main__":
+    main()
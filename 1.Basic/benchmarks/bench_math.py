@@ -0,0 +1,77 @@
+"""
+Math Evaluation Benchmark
+Times the calculator's expression evaluation: typical expressions with
+eval() (as the tool used to) and with the cost-bounded AST evaluator, and
+adversarial expressions, which the evaluator refuses.
+
+eval() of the adversarial expressions would run for minutes or hours (or
+until memory runs out), so only the growth of an allowed power is shown
+for it.
+
+Run from the project root:
+    python -m benchmarks.bench_math
+"""
+import argparse
+import math
+
+from langgraph_common.harness import print_report, run_benchmark, timer
+
+from src.tools.safe_math import ExpressionError, evaluate_expression
+
+TYPICAL = ["2 + 3 * 4", "sqrt(16) + 5", "sin(pi/2)", "10 / 2 - 1",
+           "max(1, 5, 3)", "round(3.14159, 2)", "1200 / 240"]
+
+ADVERSARIAL = ["9**9**9", "pow(10, 10**8)", "pow(3, 2**4000, 2**4095 + 1)",
+               "(2**4000) * (2**4000)", "-" * 900 + "1",
+               "+".join(["99"] * 300), "max(" + ",".join(["-1"] * 330) + ")"]
+
+_NAMES = {"__builtins__": {}, "sqrt": math.sqrt, "sin": math.sin, "pi": math.pi,
+          "max": max, "round": round}
+
+
+def _refused(expression):
+    try:
+        evaluate_expression(expression)
+    except ExpressionError:
+        return
+    raise AssertionError(f"{expression[:40]} was not refused")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+
+    def typical():
+        eval_elapsed = timer()
+        for expression in TYPICAL:
+            eval(expression, _NAMES, {})
+        eval_time = eval_elapsed()
+        safe_elapsed = timer()
+        for expression in TYPICAL:
+            evaluate_expression(expression)
+        return {"eval": eval_time, "ast evaluator": safe_elapsed()}
+
+    print_report(f"{len(TYPICAL)} typical expressions",
+                 run_benchmark(typical, repeats=args.runs, warmup=50))
+
+    def adversarial():
+        samples = {}
+        for i, expression in enumerate(ADVERSARIAL):
+            elapsed = timer()
+            _refused(expression)
+            samples[f"{i}: {expression[:16]}"] = elapsed()
+        return samples
+
+    print_report("adversarial expressions, refused",
+                 run_benchmark(adversarial, repeats=args.runs // 10, warmup=5))
+
+    print("\neval of an allowed-looking power grows with its exponent:")
+    for exponent in (10 ** 5, 10 ** 6, 10 ** 7):
+        elapsed = timer()
+        str(eval(f"3 ** {exponent}", _NAMES, {}) % 10)
+        print(f"  3 ** {exponent:<10} {elapsed() * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Offload Benchmark
+Runs large tool-workflow requests concurrently with small ones under
+ainvoke, with and without the process pool offload, and measures small
+request latency and event loop lag (how late a 10 ms heartbeat wakes up).
+
+Without offload the large analyses run in threads and hold the GIL, so
+small requests and the loop itself wait behind them.
+
+Run from the project root:
+    python -m benchmarks.bench_offload
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+
+from langgraph_common.harness import print_report, timer
+
+from src.config import Config
+from src.nodes.offload import get_process_pool, shutdown_process_pool
+from main import create_tool_enhanced_workflow
+
+HEARTBEAT_SECONDS = 0.01
+
+
+def _initial_state(text):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "started",
+        "tool_results": ""
+    }
+
+
+async def _heartbeat(lags, stop):
+    while not stop.is_set():
+        expected = time.perf_counter() + HEARTBEAT_SECONDS
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _timed(app, text, samples):
+    elapsed = timer()
+    await app.ainvoke(_initial_state(text))
+    samples.append(elapsed())
+
+
+async def _run_mix(app, large_text, large, small):
+    samples = {"large_request": [], "small_request": [], "loop_lag": []}
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(samples["loop_lag"], stop))
+
+    async def small_stream():
+        for _ in range(small):
+            await _timed(app, "a short request", samples["small_request"])
+            await asyncio.sleep(0.005)
+
+    await asyncio.gather(
+        *(_timed(app, large_text, samples["large_request"]) for _ in range(large)),
+        small_stream()
+    )
+    stop.set()
+    await heartbeat
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chars", type=int, default=2_000_000,
+                        help="Size of each large input text")
+    parser.add_argument("--large", type=int, default=4, help="Concurrent large requests")
+    parser.add_argument("--small", type=int, default=40, help="Sequential small requests")
+    args = parser.parse_args()
+
+    large_text = ("The quick brown fox jumps over the lazy dog. " * (args.chars // 45 + 1))[:args.chars]
+    app = create_tool_enhanced_workflow()
+
+    for label, threshold in (("in threads (offload off)", 0), ("process pool (offload on)", 100_000)):
+        Config.TOOL_OFFLOAD_MIN_CHARS = threshold
+        if threshold:
+            get_process_pool()
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Warm-up: starts pool workers and imports in them
+            asyncio.run(_run_mix(app, large_text, args.large, 1))
+            samples = asyncio.run(_run_mix(app, large_text, args.large, args.small))
+        print_report(f"{args.large} x {args.chars:,} chars {label}", samples)
+
+    shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Sampling Profiler Overhead Benchmark
+Runs the tool-enhanced workflow (no LLM) from several threads at once with
+the background sampler off and on, and reports run latency, throughput,
+and the CPU share the sampler measured for itself.
+
+Run from the project root:
+    python -m benchmarks.bench_sampler
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import threading
+import time
+
+from langgraph_common.harness import print_report, timer
+
+from main import create_tool_enhanced_workflow
+from src.profiling import SamplingProfiler
+
+
+def _initial_state(text):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "started",
+        "tool_results": ""
+    }
+
+
+def run_load(app, threads, seconds):
+    """Run the workflow from threads for seconds; returns per-run latencies."""
+    samples = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + seconds
+    text = "Sampling should cost little next to the work it watches. 12 * 7 = 84."
+
+    def worker():
+        while time.perf_counter() < stop_at:
+            elapsed = timer()
+            app.invoke(_initial_state(text))
+            with lock:
+                samples.append(elapsed())
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=0.02)
+    args = parser.parse_args()
+
+    app = create_tool_enhanced_workflow()
+    run_load(app, args.threads, 1.0)  # warm up
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label, sampler in (("sampler off", None),
+                               (f"sampler every {args.interval * 1000:g} ms",
+                                SamplingProfiler(directory, interval=args.interval,
+                                                 flush_seconds=args.seconds / 2))):
+            if sampler is not None:
+                sampler.start()
+            cpu_started = time.process_time()
+            samples = run_load(app, args.threads, args.seconds)
+            cpu_seconds = time.process_time() - cpu_started
+            if sampler is not None:
+                sampler.stop()
+
+            print_report(f"{args.threads} threads for {args.seconds:g}s, {label}", {"run": samples})
+            print(f"runs/s: {len(samples) / args.seconds:.1f}  process CPU: {cpu_seconds:.2f}s")
+            if sampler is not None:
+                print(f"samples: {sampler.stats['samples']}  sampler CPU share: "
+                      f"{sampler.stats['overhead']:.2%}  snapshots: {sampler.stats['snapshots']}")
+
+
+if __name__ == "__main__":
+    main()
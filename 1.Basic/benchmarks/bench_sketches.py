@@ -0,0 +1,74 @@
+"""
+Sketch Mode Benchmark
+Runs text_analyzer_tool exactly and in sketch mode on a text with a large
+vocabulary, and reports latency, peak Python heap (tracemalloc) and how
+far the sketched unique-word count and top words are from the exact ones.
+
+Exact mode holds a list of every word and a set of every distinct word;
+sketch mode scans the text once and keeps a 16 KiB HyperLogLog, a 64 KiB
+count-min sketch and the top-k words, whatever the size of the text.
+
+Run from the project root:
+    python -m benchmarks.bench_sketches
+"""
+import argparse
+import contextlib
+import io
+import random
+import tracemalloc
+
+from langgraph_common.harness import print_report, timer
+
+from src.tools.text_analyzer import text_analyzer_tool
+
+
+def _text(words, vocabulary, seed=7):
+    # Zipf-like frequencies: a few common words and a long tail
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    tokens = rng.choices([f"word{i}" for i in range(vocabulary)], weights, k=words)
+    return " ".join(tokens)
+
+
+def _run(text, sketch, runs):
+    samples = {"analyze": []}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(runs):
+            elapsed = timer()
+            result = text_analyzer_tool.__wrapped__(text, sketch=sketch)
+            samples["analyze"].append(elapsed())
+        # Peak heap from a separate run: tracemalloc slows allocations down
+        tracemalloc.start()
+        text_analyzer_tool.__wrapped__(text, sketch=sketch)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return samples, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=2_000_000)
+    parser.add_argument("--vocabulary", type=int, default=500_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    text = _text(args.words, args.vocabulary)
+    print(f"text: {args.words:,} words, {len(text) / 1e6:.1f} MB")
+    results = {}
+    for label, sketch in (("exact", False), ("sketch", True)):
+        samples, peak, results[label] = _run(text, sketch, args.runs)
+        print_report(f"text_analyzer_tool, {label}", samples)
+        print(f"peak heap: {peak / 1e6:.1f} MB")
+
+    exact, sketched = results["exact"], results["sketch"]
+    error = sketched["unique_word_count"] / exact["unique_word_count"] - 1
+    print(f"\nunique words: exact {exact['unique_word_count']:,}  "
+          f"sketch {sketched['unique_word_count']:,} ({error:+.2%})")
+    print(f"error bounds: {sketched['sketch_error_bounds']}")
+    print("top words (sketch estimate):")
+    for word, count in sketched["top_words"]:
+        print(f"  {word:<12} {count:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Streaming Benchmark
+Compares time-to-first-token of the streaming mode with the blocking
+invoke path, using a fake chat model that streams one character at a time.
+
+Run from the project root:
+    python -m benchmarks.bench_streaming
+"""
+import argparse
+import contextlib
+import io
+
+from langgraph_common.harness import print_report, run_benchmark, timer
+
+from src.testing import install_stand_in_llm
+from src.workflows.basic_workflow import create_langgraph_workflow, stream_workflow
+
+RESPONSE = "A creative retelling of the input, streamed one token at a time. " * 4
+
+
+def _initial_state():
+    return {
+        "input_text": "benchmark the streaming mode",
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "started"
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--token-delay", type=float, default=0.002,
+                        help="Seconds the fake model sleeps per streamed token")
+    args = parser.parse_args()
+
+    install_stand_in_llm(token_delay=args.token_delay, response=RESPONSE)
+    app = create_langgraph_workflow()
+
+    def blocking_run():
+        elapsed = timer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.invoke(_initial_state())
+        total = elapsed()
+        # Nothing is shown before invoke returns
+        return {"blocking_ttft": total, "blocking_total": total}
+
+    def streaming_run():
+        elapsed = timer()
+        first_token = None
+        with contextlib.redirect_stdout(io.StringIO()):
+            for kind, _ in stream_workflow(app, _initial_state()):
+                if kind == "token" and first_token is None:
+                    first_token = elapsed()
+        return {"streaming_ttft": first_token, "streaming_total": elapsed()}
+
+    print_report(
+        f"Blocking invoke ({len(RESPONSE)} tokens, {args.token_delay}s/token)",
+        run_benchmark(blocking_run, repeats=args.repeats)
+    )
+    print_report(
+        "Streaming (messages stream mode)",
+        run_benchmark(streaming_run, repeats=args.repeats)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Tracing Overhead Benchmark
+Runs the tool-enhanced workflow (no LLM) many times with tracing off, with
+every trace recorded and with 10% head sampling, and reports run latency
+and the spans written.
+
+Run from the project root:
+    python -m benchmarks.bench_tracing
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+
+from langgraph_common.harness import print_report, run_benchmark, timer
+
+from main import create_tool_enhanced_workflow
+from src.tracing import JsonlSpanExporter, Tracer, set_tracer
+
+
+def _initial_state(text):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "started",
+        "tool_results": ""
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    text = "Tracing should cost little next to the work it records. 12 * 7 = 84."
+    with tempfile.TemporaryDirectory() as directory:
+        for label, sample_rate in (("tracing off", None), ("all traces", 1.0),
+                                   ("10% sampled", 0.1)):
+            exporter = None
+            if sample_rate is not None:
+                exporter = JsonlSpanExporter(f"{directory}/{sample_rate}.jsonl")
+                set_tracer(Tracer(exporter, sample_rate=sample_rate))
+            app = create_tool_enhanced_workflow()
+
+            def run():
+                elapsed = timer()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    app.invoke(_initial_state(text))
+                return {"run": elapsed()}
+
+            print_report(f"{args.runs} tool-workflow runs, {label}",
+                         run_benchmark(run, repeats=args.runs, warmup=20))
+            if exporter is not None:
+                exporter.close()
+                print(f"spans written: {exporter.written}  dropped: {exporter.dropped}")
+            set_tracer(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,19 @@
+import argparse
 import os
+from typing import Optional
 
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, END
+from src.blobs import blob_runs, count_words, join_text, preview_text
 from src.models.graph_state import GraphState
 from src.nodes.input_processor import input_processor_node
 from src.nodes.data_transformer import data_transformer_node
-from src.nodes.tool_processor import tool_processor_node
+from src.nodes.deadline import deadline_in
+from src.nodes.tool_processor import tool_processor
 from src.nodes.output_generator import output_generator_node
+from src.profiling import maybe_profile, profiled
+from src.tracing import traced
+from src.workflows.basic_workflow import stream_workflow
 
 # Load environment variables
 load_dotenv()
@@ -17,7 +24,7 @@ def simple_router(state: GraphState) -> str:
     Simple router function that decides the next node based on input length.
     """
     processed_text = state.get("processed_text", "")
-    word_count = len(processed_text.split())
+    word_count = count_words(processed_text)
     
     if word_count > 10:
         print(f"🔀 Router: Long text ({word_count} words) - routing to data_transformer")
@@ -34,7 +41,7 @@ def simple_processor_node(state: GraphState) -> GraphState:
     processed_text = state.get("processed_text", "")
     
     # Simple processing for short text
-    simple_text = f"📝 SIMPLE PROCESSING: {processed_text} ✨"
+    simple_text = join_text(["📝 SIMPLE PROCESSING: ", processed_text, " ✨"])
     
     print(f"📝 Simple Processor Node: Processed short content")
     
@@ -64,7 +71,7 @@ def create_langgraph_workflow():
     workflow.add_edge("output_generator", END)
 
     # Compile the graph
-    app = workflow.compile()
+    app = traced(blob_runs(workflow.compile()))
 
     return app
 
@@ -79,7 +86,7 @@ def create_tool_enhanced_workflow():
     # Add nodes
     workflow.add_node("input_processor", input_processor_node)
     # Tool processing step
-    workflow.add_node("tool_processor", tool_processor_node)
+    workflow.add_node("tool_processor", tool_processor)
     workflow.add_node("output_generator", output_generator_node)
 
     # Define the workflow edges with tool processing
@@ -90,7 +97,7 @@ def create_tool_enhanced_workflow():
     workflow.add_edge("output_generator", END)
 
     # Compile the graph
-    app = workflow.compile()
+    app = traced(blob_runs(workflow.compile()))
 
     return app
 
@@ -127,12 +134,13 @@ def create_conditional_workflow():
     workflow.add_edge("output_generator", END)
 
     # Compile the graph
-    app = workflow.compile()
+    app = traced(blob_runs(workflow.compile()))
 
     return app
 
 
-def run_workflow(input_text: str, use_tools: bool = False, use_conditional: bool = False):
+def run_workflow(input_text: str, use_tools: bool = False, use_conditional: bool = False,
+                 stream: bool = False, deadline_seconds: Optional[float] = None):
     """
     Runs the LangGraph workflow with optional tool enhancement and conditional routing.
     
@@ -140,6 +148,9 @@ def run_workflow(input_text: str, use_tools: bool = False, use_conditional: bool
         input_text: The input text to process
         use_tools: If True, uses the tool-enhanced workflow
         use_conditional: If True, uses conditional routing workflow
+        stream: If True, prints data_transformer LLM tokens as they arrive
+        deadline_seconds: If set, the run must answer within this many
+            seconds; slow steps fall back to cheaper results
     """
     if use_conditional:
         print("🚀 Starting Conditional Routing LangGraph Workflow...")
@@ -150,6 +161,7 @@ def run_workflow(input_text: str, use_tools: bool = False, use_conditional: bool
     else:
         print("🚀 Starting Basic LangGraph Workflow...")
         app = create_langgraph_workflow()
+    app = profiled(app)
 
     # Initial state
     initial_state = {
@@ -164,8 +176,20 @@ def run_workflow(input_text: str, use_tools: bool = False, use_conditional: bool
     if use_tools:
         initial_state["tool_results"] = ""
 
+    if deadline_seconds is not None:
+        initial_state["deadline"] = deadline_in(deadline_seconds)
+
     # Run the workflow
-    result = app.invoke(initial_state)
+    if stream:
+        result = None
+        for kind, payload in stream_workflow(app, initial_state):
+            if kind == "token":
+                print(payload, end="", flush=True)
+            else:
+                print()
+                result = payload
+    else:
+        result = app.invoke(initial_state)
 
     print("=" * 60)
     if use_conditional:
@@ -174,7 +198,7 @@ def run_workflow(input_text: str, use_tools: bool = False, use_conditional: bool
         print("🎉 Tool-Enhanced Workflow completed!")
     else:
         print("🎉 Basic Workflow completed!")
-    print(result["output_text"])
+    print(preview_text(result["output_text"]))
     
     # Show tool results if available
     if use_tools and result.get("tool_results"):
@@ -198,6 +222,31 @@ def run_with_conditional(input_text: str):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LangGraph workflow comparison demo")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print LLM tokens as they are generated"
+    )
+    parser.add_argument(
+        "--deadline-ms",
+        type=float,
+        default=None,
+        help="Answer each run within this many milliseconds"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile time and memory per node and tool, print a summary at the end"
+    )
+    parser.add_argument(
+        "--profile-output",
+        default="profile.collapsed",
+        help="Collapsed-stack file written with --profile (for flamegraph tools)"
+    )
+    args = parser.parse_args()
+    deadline_seconds = args.deadline_ms / 1000 if args.deadline_ms is not None else None
+
     # Example usage - demonstrate all three workflows
     print("🔬 LangGraph Workflow Comparison")
     print("=" * 80)
@@ -208,26 +257,35 @@ if __name__ == "__main__":
         ("This is a longer message with more than ten words to test routing", "Long")  # Will route to data_transformer
     ]
     
-    for input_text, description in test_inputs:
-        print(f"\n� Testing with {description} Text: '{input_text}'")
-        print("=" * 80)
+    with maybe_profile(args.profile) as session:
+        for input_text, description in test_inputs:
+            print(f"\n� Testing with {description} Text: '{input_text}'")
+            print("=" * 80)
         
-        # Run basic workflow
-        print("\n📋 Running Basic Workflow:")
-        basic_result = run_workflow(input_text, use_tools=False)
+            # Run basic workflow
+            print("\n📋 Running Basic Workflow:")
+            basic_result = run_workflow(input_text, use_tools=False, stream=args.stream,
+                                        deadline_seconds=deadline_seconds)
         
-        print("\n" + "-" * 80)
+            print("\n" + "-" * 80)
         
-        # Run conditional workflow
-        print("\n🔀 Running Conditional Routing Workflow:")
-        conditional_result = run_workflow(input_text, use_conditional=True)
+            # Run conditional workflow
+            print("\n🔀 Running Conditional Routing Workflow:")
+            conditional_result = run_workflow(input_text, use_conditional=True, stream=args.stream,
+                                              deadline_seconds=deadline_seconds)
         
-        print("\n" + "-" * 80)
+            print("\n" + "-" * 80)
         
-        # Run tool-enhanced workflow
-        print("\n🔧 Running Tool-Enhanced Workflow:")
-        tool_result = run_workflow(input_text, use_tools=True)
+            # Run tool-enhanced workflow
+            print("\n🔧 Running Tool-Enhanced Workflow:")
+            tool_result = run_workflow(input_text, use_tools=True, stream=args.stream,
+                                       deadline_seconds=deadline_seconds)
         
-        print("\n" + "=" * 80)
+            print("\n" + "=" * 80)
     
-    print("✅ All workflow demonstrations completed!")
\ No newline at end of file
+    print("✅ All workflow demonstrations completed!")
+
+    if session is not None:
+        session.print_report()
+        lines = session.write_collapsed(args.profile_output)
+        print(f"\n🔥 {lines} collapsed stacks written to {args.profile_output}")
@@ -0,0 +1,53 @@
+"""
+Content-addressed storage for large texts in GraphState.
+"""
+
+from .runs import BlobRunHandler, blob_runs
+from .store import BlobStore, BlobWriter, MemoryBlobStore, MmapBlobStore, TextView, set_blob_owner
+from .text import (
+    contains_text,
+    count_words,
+    get_blob_store,
+    is_blob_ref,
+    is_large,
+    join_text,
+    map_chunks,
+    preview_text,
+    replace_text,
+    resolve_text,
+    set_blob_store,
+    store_if_large,
+    store_text,
+    strip_text,
+    text_chunks,
+    text_length,
+    text_view
+)
+
+__all__ = [
+    'BlobRunHandler',
+    'BlobStore',
+    'BlobWriter',
+    'MemoryBlobStore',
+    'MmapBlobStore',
+    'TextView',
+    'blob_runs',
+    'contains_text',
+    'count_words',
+    'get_blob_store',
+    'is_blob_ref',
+    'is_large',
+    'join_text',
+    'map_chunks',
+    'preview_text',
+    'replace_text',
+    'resolve_text',
+    'set_blob_owner',
+    'set_blob_store',
+    'store_if_large',
+    'store_text',
+    'strip_text',
+    'text_chunks',
+    'text_length',
+    'text_view'
+]
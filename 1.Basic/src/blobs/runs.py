@@ -0,0 +1,69 @@
+"""
+Run-Scoped Blobs
+Releases the blobs a graph run created when the run ends.
+
+BlobRunHandler follows a run through LangChain callbacks like the span
+tracer: the outermost run (the graph) becomes the owner of every blob its
+nodes create, and when it ends, successfully or not, the store releases
+them. Blobs shared with a run still in progress (the same content is stored
+once) stay until that run ends too.
+
+Handles do not outlive their run, so graphs return texts: the output
+generator resolves the state's handles before the run ends. A run that
+stops early (an error or an interrupt) leaves handles in its checkpoints
+that no longer resolve.
+"""
+import threading
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.blobs.store import set_blob_owner
+from src.blobs.text import get_blob_store
+
+
+class BlobRunHandler(BaseCallbackHandler):
+    """Makes each graph run the owner of its blobs and releases them at its end."""
+
+    # Run in the caller's context so the owner is visible to the nodes
+    run_inline = True
+
+    def __init__(self):
+        # run_id -> run_id of the outermost run it belongs to
+        self._owners: Dict[UUID, UUID] = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(self, serialized: Optional[Dict[str, Any]], inputs: Any, *,
+                       run_id: UUID, parent_run_id: Optional[UUID] = None,
+                       **kwargs: Any) -> None:
+        with self._lock:
+            owner = self._owners.get(parent_run_id, run_id) if parent_run_id else run_id
+            self._owners[run_id] = owner
+        set_blob_owner(owner)
+
+    def _end(self, run_id: UUID) -> None:
+        with self._lock:
+            owner = self._owners.pop(run_id, None)
+        if owner == run_id:
+            get_blob_store().release(owner)
+            set_blob_owner(None)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+
+_handler = BlobRunHandler()
+
+
+def blob_runs(app: Any) -> Any:
+    """
+    Return app with its runs' blobs released when each run ends.
+
+    Args:
+        app: Compiled LangGraph application (or any Runnable)
+    """
+    return app.with_config(callbacks=[_handler])
@@ -0,0 +1,430 @@
+"""
+Content-Addressed Blob Store
+Keeps large texts out of GraphState; the state holds short handles instead.
+
+A handle is the string "blob:" followed by the SHA-256 of the content, so
+storing the same text twice keeps one copy and handles survive
+checkpointing as ordinary short strings. Two kinds of blobs exist:
+
+flat    UTF-8 bytes, held in memory (MemoryBlobStore) or in one file per
+        blob that is memory-mapped for reading (MmapBlobStore).
+concat  A list of literal strings and other handles whose content is their
+        concatenation. Wrapping a large text ("header" + text + "footer")
+        then costs a few bytes instead of a copy.
+
+Blobs are read through TextView, which decodes lazily in chunks.
+
+A blob created while an owner is set (set_blob_owner, e.g. to the graph run
+creating it) belongs to that owner, and release(owner) deletes the owner's
+blobs once no other owner holds them. Blobs created without an owner stay
+until they are deleted.
+"""
+import codecs
+import contextvars
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+BLOB_PREFIX = "blob:"
+CHUNK_CHARS = 1 << 20
+
+_REF_PATTERN = re.compile(r"blob:[0-9a-f]{64}")
+
+# A concat segment: ("t", literal text) or ("b", handle)
+Segment = Tuple[str, str]
+
+
+# Owner of the blobs created in the current context
+_blob_owner: contextvars.ContextVar[Optional[Hashable]] = contextvars.ContextVar(
+    "blob_owner", default=None
+)
+
+
+def set_blob_owner(owner: Optional[Hashable]) -> None:
+    """Make blobs created from now on in this context belong to owner (None: no owner)."""
+    _blob_owner.set(owner)
+
+
+def looks_like_ref(value: object) -> bool:
+    """Return True if value has the shape of a blob handle."""
+    return isinstance(value, str) and len(value) == 69 and _REF_PATTERN.fullmatch(value) is not None
+
+
+class BlobWriter:
+    """Streams text into a new flat blob; close() returns its handle."""
+
+    def __init__(self, store: "BlobStore"):
+        self._store = store
+        self._hash = hashlib.sha256()
+        self._sink = store._open_sink()
+        self.nbytes = 0
+        self.nchars = 0
+        self._ref: Optional[str] = None
+
+    def write(self, text: str) -> None:
+        """Append text to the blob."""
+        data = text.encode("utf-8")
+        self._hash.update(data)
+        self._store._write_sink(self._sink, data)
+        self.nbytes += len(data)
+        self.nchars += len(text)
+
+    def close(self) -> str:
+        """
+        Finish the blob and return its handle (an existing one if the content
+        is known). Closing again returns the same handle.
+        """
+        if self._ref is None:
+            if self._sink is None:
+                raise ValueError("The blob was discarded")
+            ref = BLOB_PREFIX + self._hash.hexdigest()
+            self._store._commit_sink(self._sink, ref, self.nbytes, self.nchars)
+            self._ref = ref
+        return self._ref
+
+    def __enter__(self) -> "BlobWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        # A clean exit commits the blob; an error discards it unless it was
+        # already closed inside the block
+        if exc_type is None:
+            self.close()
+        elif self._ref is None and self._sink is not None:
+            self._store._abort_sink(self._sink)
+            self._sink = None
+
+
+class TextView:
+    """Lazy, read-only view of a stored text."""
+
+    def __init__(self, store: "BlobStore", ref: str):
+        self._store = store
+        self.ref = ref
+        self._length = store.length(ref)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def chunks(self, size: int = CHUNK_CHARS) -> Iterator[str]:
+        """
+        Yield the text in pieces of roughly size characters.
+
+        Args:
+            size: Approximate characters per piece
+
+        Yields:
+            Consecutive pieces whose concatenation is the full text
+        """
+        segments = self._store._segments(self.ref)
+        if segments is None:
+            data = self._store._read_flat(self.ref)
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            for start in range(0, len(data), size):
+                text = decoder.decode(data[start:start + size])
+                if text:
+                    yield text
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+            return
+        for kind, value in segments:
+            if kind == "t":
+                for start in range(0, len(value), size):
+                    yield value[start:start + size]
+            else:
+                yield from TextView(self._store, value).chunks(size)
+
+    def preview(self, limit: int) -> str:
+        """Return the first limit characters without reading the rest."""
+        pieces, remaining = [], limit
+        for chunk in self.chunks(min(limit, CHUNK_CHARS) or 1):
+            pieces.append(chunk[:remaining])
+            remaining -= len(pieces[-1])
+            if remaining <= 0:
+                break
+        return "".join(pieces)
+
+    def __str__(self) -> str:
+        if self._store._segments(self.ref) is None:
+            return str(self._store._read_flat(self.ref), "utf-8")
+        return "".join(self.chunks())
+
+    def __repr__(self) -> str:
+        return f"TextView({self.ref[:17]}…, {self._length} chars)"
+
+
+class BlobStore:
+    """Base class: handle bookkeeping, concat blobs and views."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # handle -> (nbytes, nchars) for flat blobs
+        self._flat: Dict[str, Tuple[int, int]] = {}
+        # handle -> (segments, nchars) for concat blobs
+        self._concat: Dict[str, Tuple[Tuple[Segment, ...], int]] = {}
+        # owner -> handles it holds; handle -> number of owners holding it
+        self._owned: Dict[Hashable, Set[str]] = {}
+        self._holders: Dict[str, int] = {}
+        # Handles created without an owner, never released
+        self._unowned: Set[str] = set()
+
+    # Backend hooks for flat blobs
+
+    def _open_sink(self):
+        raise NotImplementedError
+
+    def _write_sink(self, sink, data: bytes) -> None:
+        raise NotImplementedError
+
+    def _store_sink(self, sink, ref: str) -> None:
+        """Keep the sink's bytes under ref (called with the lock held)."""
+        raise NotImplementedError
+
+    def _abort_sink(self, sink) -> None:
+        raise NotImplementedError
+
+    def _read_flat(self, ref: str) -> memoryview:
+        raise NotImplementedError
+
+    def _drop_flat(self, ref: str) -> None:
+        raise NotImplementedError
+
+    def _commit_sink(self, sink, ref: str, nbytes: int, nchars: int) -> None:
+        with self._lock:
+            self._hold(ref)
+            if ref in self._flat:
+                self._abort_sink(sink)
+                return
+            self._store_sink(sink, ref)
+            self._flat[ref] = (nbytes, nchars)
+
+    def _hold(self, ref: str) -> None:
+        """Record the current owner as a holder of ref (called with the lock held)."""
+        owner = _blob_owner.get()
+        if owner is None:
+            self._unowned.add(ref)
+            return
+        refs = self._owned.setdefault(owner, set())
+        if ref not in refs:
+            refs.add(ref)
+            self._holders[ref] = self._holders.get(ref, 0) + 1
+
+    def _forget(self, ref: str) -> bool:
+        """Remove a blob and its bookkeeping (called with the lock held)."""
+        self._holders.pop(ref, None)
+        self._unowned.discard(ref)
+        if self._concat.pop(ref, None) is not None:
+            return True
+        if self._flat.pop(ref, None) is not None:
+            self._drop_flat(ref)
+            return True
+        return False
+
+    # Public API
+
+    def writer(self) -> BlobWriter:
+        """Start a streamed flat blob."""
+        return BlobWriter(self)
+
+    def put(self, text: str) -> str:
+        """Store text and return its handle."""
+        writer = self.writer()
+        for start in range(0, len(text), CHUNK_CHARS):
+            writer.write(text[start:start + CHUNK_CHARS])
+        return writer.close()
+
+    def concat(self, parts: Iterable[str]) -> str:
+        """
+        Store the concatenation of parts without copying stored blobs.
+
+        Args:
+            parts: Literal strings and handles, in order
+
+        Returns:
+            Handle of the concatenation
+        """
+        segments: List[Segment] = []
+        nchars = 0
+        for part in parts:
+            if self.contains(part):
+                segments.append(("b", part))
+                nchars += self.length(part)
+            elif part:
+                segments.append(("t", part))
+                nchars += len(part)
+        key = json.dumps(["concat", segments], ensure_ascii=False).encode("utf-8")
+        ref = BLOB_PREFIX + hashlib.sha256(key).hexdigest()
+        with self._lock:
+            self._hold(ref)
+            self._concat.setdefault(ref, (tuple(segments), nchars))
+        return ref
+
+    def contains(self, value: object) -> bool:
+        """Return True if value is a handle of a blob in this store."""
+        if not looks_like_ref(value):
+            return False
+        with self._lock:
+            return value in self._flat or value in self._concat
+
+    def length(self, ref: str) -> int:
+        """Number of characters in the blob."""
+        with self._lock:
+            if ref in self._concat:
+                return self._concat[ref][1]
+            return self._flat[ref][1]
+
+    def view(self, ref: str) -> TextView:
+        """Lazy view of the blob's text."""
+        if not self.contains(ref):
+            raise KeyError(ref)
+        return TextView(self, ref)
+
+    def _segments(self, ref: str) -> Optional[Tuple[Segment, ...]]:
+        with self._lock:
+            entry = self._concat.get(ref)
+        return entry[0] if entry is not None else None
+
+    def delete(self, ref: str) -> None:
+        """Remove a blob; concat blobs referring to it become unreadable."""
+        with self._lock:
+            self._forget(ref)
+
+    def release(self, owner: Hashable) -> int:
+        """
+        Drop owner's hold on its blobs and delete those no one else holds.
+
+        Args:
+            owner: Owner given to set_blob_owner
+
+        Returns:
+            Number of blobs deleted
+        """
+        deleted = 0
+        with self._lock:
+            for ref in self._owned.pop(owner, ()):
+                holders = self._holders.get(ref, 0) - 1
+                if holders > 0:
+                    self._holders[ref] = holders
+                elif ref in self._unowned:
+                    self._holders.pop(ref, None)
+                else:
+                    deleted += self._forget(ref)
+        return deleted
+
+    def clear(self) -> None:
+        """Remove every blob."""
+        with self._lock:
+            refs = list(self._flat)
+            self._flat.clear()
+            self._concat.clear()
+            self._owned.clear()
+            self._holders.clear()
+            self._unowned.clear()
+            for ref in refs:
+                self._drop_flat(ref)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of blobs and bytes held by flat blobs."""
+        with self._lock:
+            return {
+                "flat_blobs": len(self._flat),
+                "concat_blobs": len(self._concat),
+                "stored_bytes": sum(nbytes for nbytes, _ in self._flat.values()),
+            }
+
+
+class MemoryBlobStore(BlobStore):
+    """Flat blobs held as bytes in process memory."""
+
+    def __init__(self):
+        super().__init__()
+        self._data: Dict[str, bytearray] = {}
+
+    def _open_sink(self) -> bytearray:
+        return bytearray()
+
+    def _write_sink(self, sink: bytearray, data: bytes) -> None:
+        sink += data
+
+    def _store_sink(self, sink: bytearray, ref: str) -> None:
+        self._data[ref] = sink
+
+    def _abort_sink(self, sink: bytearray) -> None:
+        pass
+
+    def _read_flat(self, ref: str) -> memoryview:
+        with self._lock:
+            return memoryview(self._data[ref]).toreadonly()
+
+    def _drop_flat(self, ref: str) -> None:
+        self._data.pop(ref, None)
+
+
+class MmapBlobStore(BlobStore):
+    """
+    Flat blobs written to one file each and memory-mapped for reading.
+
+    The page cache holds the data, so it can be paged out under memory
+    pressure instead of counting against the process heap.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Where blob files go; a temporary directory if None
+        """
+        super().__init__()
+        self._tempdir = None
+        if directory is None:
+            self._tempdir = tempfile.TemporaryDirectory(prefix="langgraph-blobs-")
+            directory = self._tempdir.name
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._maps: Dict[str, mmap.mmap] = {}
+
+    def _path(self, ref: str) -> str:
+        return os.path.join(self.directory, ref[len(BLOB_PREFIX):])
+
+    def _open_sink(self):
+        return tempfile.NamedTemporaryFile(dir=self.directory, prefix=".partial-", delete=False)
+
+    def _write_sink(self, sink, data: bytes) -> None:
+        sink.write(data)
+
+    def _store_sink(self, sink, ref: str) -> None:
+        sink.close()
+        os.replace(sink.name, self._path(ref))
+
+    def _abort_sink(self, sink) -> None:
+        sink.close()
+        os.unlink(sink.name)
+
+    def _read_flat(self, ref: str) -> memoryview:
+        with self._lock:
+            if self._flat[ref][0] == 0:
+                return memoryview(b"")
+            if ref not in self._maps:
+                with open(self._path(ref), "rb") as f:
+                    self._maps[ref] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(self._maps[ref])
+
+    def _drop_flat(self, ref: str) -> None:
+        mapped = self._maps.pop(ref, None)
+        if mapped is not None:
+            try:
+                mapped.close()
+            except BufferError:
+                # A view still uses it; the mapping goes away with the view
+                pass
+        try:
+            os.unlink(self._path(ref))
+        except FileNotFoundError:
+            pass
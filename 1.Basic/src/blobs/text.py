@@ -0,0 +1,243 @@
+"""
+Blob-Aware Text Helpers
+Let nodes treat a state field the same whether it holds text or a handle.
+
+Small texts stay ordinary strings and every helper returns exactly what the
+plain str operation would. Texts of at least Config.BLOB_MIN_CHARS go into
+the process-wide blob store; the helpers then stream over the stored bytes
+and build results as new blobs or concatenations, so a run keeps one copy of
+a large input instead of one per node and per checkpoint.
+"""
+import threading
+from typing import Callable, Iterable, Iterator, Optional
+
+from src.config import Config
+from src.blobs.store import (
+    CHUNK_CHARS,
+    BlobStore,
+    MemoryBlobStore,
+    MmapBlobStore,
+    TextView,
+    looks_like_ref
+)
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Return the process-wide blob store, created from Config on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if Config.BLOB_STORE == "mmap":
+                _store = MmapBlobStore(Config.BLOB_STORE_DIR or None)
+            else:
+                _store = MemoryBlobStore()
+        return _store
+
+
+def set_blob_store(store: Optional[BlobStore]) -> None:
+    """Replace the process-wide blob store (None recreates it from Config)."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def is_blob_ref(value: object) -> bool:
+    """Return True if value is a handle of a stored blob."""
+    return looks_like_ref(value) and get_blob_store().contains(value)
+
+
+def is_large(value: str) -> bool:
+    """Return True if value is a handle or a text that belongs in the store."""
+    if is_blob_ref(value):
+        return True
+    return 0 < Config.BLOB_MIN_CHARS <= len(value)
+
+
+def store_text(value: str) -> str:
+    """Return a handle for value, storing it if it is not one already."""
+    if is_blob_ref(value):
+        return value
+    return get_blob_store().put(value)
+
+
+def store_if_large(value: str) -> str:
+    """Store value and return its handle if it is large, else return it as is."""
+    return store_text(value) if is_large(value) else value
+
+
+def text_view(value: str) -> Optional[TextView]:
+    """Lazy view of the text behind a handle, or None for a plain string."""
+    return get_blob_store().view(value) if is_blob_ref(value) else None
+
+
+def text_chunks(value: str, size: int = CHUNK_CHARS) -> Iterator[str]:
+    """Yield the text of value (a string or a handle) in pieces."""
+    view = text_view(value)
+    if view is not None:
+        yield from view.chunks(size)
+    else:
+        for start in range(0, len(value), size):
+            yield value[start:start + size]
+
+
+def text_length(value: str) -> int:
+    """Number of characters in the text of value."""
+    view = text_view(value)
+    return len(view) if view is not None else len(value)
+
+
+def resolve_text(value: str) -> str:
+    """Return the full text of value; this copies a stored blob into memory."""
+    view = text_view(value)
+    return str(view) if view is not None else value
+
+
+def preview_text(value: str, limit: int = 80) -> str:
+    """
+    Text for logs: plain strings unchanged, handles as a short preview.
+
+    Args:
+        value: String or handle
+        limit: Characters of a stored text to show
+
+    Returns:
+        value itself, or the start of the stored text with its size
+    """
+    view = text_view(value)
+    if view is None:
+        return value
+    return f"{view.preview(limit)}… [{len(view):,} chars in {value[:17]}…]"
+
+
+def join_text(parts: Iterable[str]) -> str:
+    """
+    Concatenate strings and handles.
+
+    Returns:
+        The joined string if every part is small, otherwise the handle of a
+        concatenation that refers to the stored parts without copying them
+    """
+    parts = list(parts)
+    if not any(is_large(part) for part in parts):
+        return "".join(parts)
+    store = get_blob_store()
+    return store.concat([store_text(part) if is_large(part) else part for part in parts])
+
+
+def map_chunks(value: str, fn: Callable[[str], str]) -> str:
+    """
+    Apply a chunk-local transformation (such as str.upper) to value.
+
+    fn must give the same result on pieces as on the whole text. For a
+    handle the result is written to a new blob one chunk at a time.
+    """
+    if not is_blob_ref(value):
+        return fn(value)
+    writer = get_blob_store().writer()
+    for chunk in text_chunks(value):
+        writer.write(fn(chunk))
+    return writer.close()
+
+
+def _stripped_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    started = False
+    pending = ""
+    for chunk in chunks:
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+        # Hold back trailing whitespace until more text follows it
+        combined = pending + chunk
+        body = combined.rstrip()
+        if body:
+            yield body
+        pending = combined[len(body):]
+
+
+def strip_text(value: str, then: Optional[Callable[[str], str]] = None) -> str:
+    """
+    str.strip() for strings and handles.
+
+    Args:
+        value: String or handle
+        then: Optional chunk-local transformation applied to the stripped
+            text in the same pass (see map_chunks)
+
+    Returns:
+        The stripped (and transformed) string, or the handle of a new blob
+    """
+    then = then or (lambda text: text)
+    if not is_blob_ref(value):
+        return then(value.strip())
+    writer = get_blob_store().writer()
+    for chunk in _stripped_chunks(text_chunks(value)):
+        writer.write(then(chunk))
+    return writer.close()
+
+
+def contains_text(value: str, needle: str) -> bool:
+    """needle in value, for strings and handles."""
+    if not is_blob_ref(value):
+        return needle in value
+    overlap = len(needle) - 1
+    tail = ""
+    for chunk in text_chunks(value):
+        window = tail + chunk
+        if needle in window:
+            return True
+        tail = window[-overlap:] if overlap else ""
+    return False
+
+
+def replace_text(value: str, old: str, new: str) -> str:
+    """
+    str.replace() for strings and handles.
+
+    A handle whose text does not contain old is returned unchanged, so the
+    result shares the stored blob instead of copying it.
+    """
+    if not is_blob_ref(value):
+        return value.replace(old, new)
+    if not old or not contains_text(value, old):
+        return value
+    writer = get_blob_store().writer()
+    carry = ""
+    for chunk in text_chunks(value):
+        buffer = carry + chunk
+        # A match starting before safe ends within buffer; later ones may
+        # continue in the next chunk
+        safe = len(buffer) - (len(old) - 1)
+        pos = 0
+        while True:
+            found = buffer.find(old, pos)
+            if found == -1 or found >= safe:
+                break
+            writer.write(buffer[pos:found])
+            writer.write(new)
+            pos = found + len(old)
+        if pos < safe:
+            writer.write(buffer[pos:safe])
+            pos = safe
+        carry = buffer[pos:]
+    writer.write(carry)
+    return writer.close()
+
+
+def count_words(value: str) -> int:
+    """len(value.split()) for strings and handles."""
+    if not is_blob_ref(value):
+        return len(value.split())
+    words = 0
+    previous_ends_in_word = False
+    for chunk in text_chunks(value):
+        words += len(chunk.split())
+        # A word split across two chunks was counted twice
+        if previous_ends_in_word and not chunk[0].isspace():
+            words -= 1
+        previous_ends_in_word = not chunk[-1].isspace()
+    return words
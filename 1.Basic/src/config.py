@@ -30,6 +30,89 @@ class Config:
     LLM_MODEL: str = "gpt-3.5-turbo"
     LLM_TEMPERATURE: float = 0.7
 
+    # Shared LLM call limits (0 disables a rate limit); the concurrency
+    # limit adapts between the min and max on provider 429s and timeouts
+    LLM_RATE_LIMIT_RPS: float = float(os.getenv("LLM_RATE_LIMIT_RPS", "10"))
+    LLM_RATE_LIMIT_TPM: float = float(os.getenv("LLM_RATE_LIMIT_TPM", "90000"))
+    LLM_INITIAL_CONCURRENCY: int = int(os.getenv("LLM_INITIAL_CONCURRENCY", "8"))
+    LLM_MIN_CONCURRENCY: int = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+
+    # Hedged LLM calls (opt-in): a call slower than this percentile of recent
+    # latencies gets a duplicate, for at most this fraction of calls
+    LLM_HEDGING: bool = os.getenv("LLM_HEDGING", "false").lower() == "true"
+    LLM_HEDGE_PERCENTILE: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+    LLM_HEDGE_MAX_FRACTION: float = float(os.getenv("LLM_HEDGE_MAX_FRACTION", "0.1"))
+
+    # Circuit breaker around the data transformer LLM: opens when the error
+    # rate or the share of slow calls in the window reaches its threshold
+    LLM_BREAKER_ERROR_RATE: float = float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = float(
+        os.getenv("LLM_BREAKER_SLOW_CALL_SECONDS", "10"))
+    LLM_BREAKER_SLOW_RATE: float = float(os.getenv("LLM_BREAKER_SLOW_RATE", "0.5"))
+    LLM_BREAKER_WINDOW: int = int(os.getenv("LLM_BREAKER_WINDOW", "20"))
+    LLM_BREAKER_MIN_CALLS: int = int(os.getenv("LLM_BREAKER_MIN_CALLS", "10"))
+    LLM_BREAKER_OPEN_SECONDS: float = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+
+    # With less than this much time left before a run's deadline, the data
+    # transformer uses its fallback without calling the LLM
+    DEADLINE_MIN_LLM_SECONDS: float = float(os.getenv("DEADLINE_MIN_LLM_SECONDS", "0.05"))
+
+    # Tool nodes move texts of at least this many characters to a process
+    # pool (0 disables offloading); 0 workers means one per CPU
+    TOOL_OFFLOAD_MIN_CHARS: int = int(os.getenv("TOOL_OFFLOAD_MIN_CHARS", "100000"))
+    TOOL_OFFLOAD_WORKERS: int = int(os.getenv("TOOL_OFFLOAD_WORKERS", "0"))
+
+    # Texts of at least this many characters are kept in the blob store and
+    # the state holds a handle (0 disables); the store is "memory" or "mmap"
+    # (files under BLOB_STORE_DIR, a temporary directory if empty)
+    BLOB_MIN_CHARS: int = int(os.getenv("BLOB_MIN_CHARS", "1000000"))
+    BLOB_STORE: str = os.getenv("BLOB_STORE", "memory")
+    BLOB_STORE_DIR: str = os.getenv("BLOB_STORE_DIR", "")
+
+    # Text analyzer sketch mode (see src/tools/sketches.py): unique and top-k
+    # words from HyperLogLog (2^precision bytes) and a count-min sketch
+    # (width x depth counters) instead of exact counts in memory
+    TEXT_ANALYZER_SKETCH: bool = os.getenv("TEXT_ANALYZER_SKETCH", "false").lower() == "true"
+    SKETCH_HLL_PRECISION: int = int(os.getenv("SKETCH_HLL_PRECISION", "14"))
+    SKETCH_CMS_WIDTH: int = int(os.getenv("SKETCH_CMS_WIDTH", "2048"))
+    SKETCH_CMS_DEPTH: int = int(os.getenv("SKETCH_CMS_DEPTH", "4"))
+    SKETCH_TOP_K: int = int(os.getenv("SKETCH_TOP_K", "10"))
+
+    # Math calculator limits (see src/tools/safe_math.py): expressions over
+    # any of them are refused before or while they are evaluated
+    MATH_MAX_EXPRESSION_CHARS: int = int(os.getenv("MATH_MAX_EXPRESSION_CHARS", "1000"))
+    MATH_MAX_AST_NODES: int = int(os.getenv("MATH_MAX_AST_NODES", "500"))
+    MATH_MAX_AST_DEPTH: int = int(os.getenv("MATH_MAX_AST_DEPTH", "100"))
+    MATH_MAX_INT_BITS: int = int(os.getenv("MATH_MAX_INT_BITS", "4096"))
+    MATH_MAX_EXPONENT: int = int(os.getenv("MATH_MAX_EXPONENT", "10000"))
+    MATH_CPU_BUDGET_MS: float = float(os.getenv("MATH_CPU_BUDGET_MS", "50"))
+
+    # Chunked workflow: token budget per chunk and chunks transformed at once
+    CHUNK_MAX_TOKENS: int = int(os.getenv("CHUNK_MAX_TOKENS", "1000"))
+    CHUNK_CONCURRENCY: int = int(os.getenv("CHUNK_CONCURRENCY", "8"))
+
+    # Local span tracing to a rotating JSONL file (see src/tracing); the
+    # sample rate is the share of runs recorded, decided when a run starts
+    TRACE_ENABLED: bool = os.getenv("TRACE_ENABLED", "false").lower() == "true"
+    TRACE_PATH: str = os.getenv("TRACE_PATH", "traces/spans.jsonl")
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+    TRACE_MAX_BYTES: int = int(os.getenv("TRACE_MAX_BYTES", "10000000"))
+    TRACE_BACKUP_COUNT: int = int(os.getenv("TRACE_BACKUP_COUNT", "5"))
+    TRACE_BATCH_SIZE: int = int(os.getenv("TRACE_BATCH_SIZE", "256"))
+    TRACE_FLUSH_SECONDS: float = float(os.getenv("TRACE_FLUSH_SECONDS", "1.0"))
+
+    # Background sampling profiler (see src/profiling/sampler.py): samples all
+    # threads every interval and writes a collapsed-stack snapshot to
+    # SAMPLER_DIR every flush interval, slowing down above the CPU overhead
+    SAMPLER_ENABLED: bool = os.getenv("SAMPLER_ENABLED", "false").lower() == "true"
+    SAMPLER_DIR: str = os.getenv("SAMPLER_DIR", "profiles")
+    SAMPLER_INTERVAL_SECONDS: float = float(os.getenv("SAMPLER_INTERVAL_SECONDS", "0.02"))
+    SAMPLER_FLUSH_SECONDS: float = float(os.getenv("SAMPLER_FLUSH_SECONDS", "60"))
+    SAMPLER_MAX_STACKS: int = int(os.getenv("SAMPLER_MAX_STACKS", "10000"))
+    SAMPLER_KEEP_FILES: int = int(os.getenv("SAMPLER_KEEP_FILES", "24"))
+    SAMPLER_MAX_OVERHEAD: float = float(os.getenv("SAMPLER_MAX_OVERHEAD", "0.02"))
+
     @classmethod
     def get_llm(cls) -> Optional[ChatOpenAI]:
         """
@@ -0,0 +1,32 @@
+"""
+Shared helpers for calling LLMs.
+"""
+
+from langgraph_common.llm.hedging import HedgingPolicy
+from langgraph_common.llm.limiter import (
+    AdaptiveConcurrency,
+    LLMLimiter,
+    TokenBucket,
+    is_overload_error,
+    is_timeout_error
+)
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from .hedging import call_with_hedging, get_hedging_policy
+from .limiter import get_llm_limiter, set_llm_limiter
+
+__all__ = [
+    'AdaptiveConcurrency',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'HedgingPolicy',
+    'LLMLimiter',
+    'TokenBucket',
+    'call_with_hedging',
+    'get_circuit_breaker',
+    'get_hedging_policy',
+    'get_llm_limiter',
+    'is_overload_error',
+    'is_timeout_error',
+    'set_llm_limiter'
+]
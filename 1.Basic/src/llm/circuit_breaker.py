@@ -0,0 +1,264 @@
+"""
+LLM Circuit Breaker
+Stops calling a degraded LLM so callers can take their fallback at once.
+
+closed     Calls go through; the outcomes of the last window calls are kept.
+           Once at least min_calls are recorded and the error rate or the
+           share of calls slower than slow_call_seconds reaches its
+           threshold, the circuit opens.
+open       Calls are rejected with CircuitOpenError without touching the
+           LLM. After open_seconds the circuit becomes half-open.
+half_open  Up to half_open_max_calls probe calls go through (the rest are
+           rejected). If they all succeed quickly the circuit closes,
+           otherwise it opens again.
+
+Every call is tagged with the state it was admitted in. Only calls admitted
+while half-open are probes, and a call finishing after the state has
+changed since it was admitted (e.g. one started while closed that ends
+after the circuit opened) is counted in the stats but decides nothing.
+
+A call made with own_timeout has a short timeout of the caller's own (e.g.
+from a run deadline). When it times out, that says nothing about the LLM,
+so the call is not recorded as a failure; it only counts as own_timeouts.
+
+Behind a limiter, run call() inside the limiter slot so that queueing for
+the limits is not taken for a slow LLM, and use check() before queueing to
+fail fast while the circuit is open.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple, TypeVar
+
+from langgraph_common.llm.limiter import is_timeout_error
+
+from src.config import Config
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the LLM while the circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker with error-rate and latency thresholds."""
+
+    def __init__(self,
+                 name: str,
+                 error_rate_threshold: float = 0.5,
+                 slow_call_seconds: float = 10.0,
+                 slow_rate_threshold: float = 0.5,
+                 window: int = 20,
+                 min_calls: int = 10,
+                 open_seconds: float = 30.0,
+                 half_open_max_calls: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the breaker closed.
+
+        Args:
+            name: Name used in errors, logs and metrics
+            error_rate_threshold: Failed share of the window that opens the circuit
+            slow_call_seconds: Calls slower than this count as slow
+            slow_rate_threshold: Slow share of the window that opens the circuit
+            window: Number of recent call outcomes kept while closed
+            min_calls: Outcomes needed before the rates are checked
+            open_seconds: Time the circuit stays open before probing
+            half_open_max_calls: Probe calls allowed while half-open
+            clock: Time source, replaceable in tests
+        """
+        self.name = name
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate_threshold = slow_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (failed, slow) per call
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._state = CLOSED
+        # Incremented on every transition; calls remember the one they were admitted in
+        self._generation = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.stats = {"calls": 0, "failures": 0, "slow_calls": 0, "own_timeouts": 0,
+                      "rejected": 0, "opened": 0, "half_opened": 0, "closed": 0}
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once open_seconds pass."""
+        with self._lock:
+            self._check_open_timeout()
+            return self._state
+
+    def _transition(self, state: str, reason: str) -> None:
+        # Caller holds the lock
+        previous, self._state = self._state, state
+        self._generation += 1
+        self.stats["opened" if state == OPEN else
+                   "half_opened" if state == HALF_OPEN else "closed"] += 1
+        if state == OPEN:
+            self._opened_at = self._clock()
+        if state in (HALF_OPEN, CLOSED):
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        if state == CLOSED:
+            self._outcomes.clear()
+        icon = {OPEN: "🔴", HALF_OPEN: "🟡", CLOSED: "🟢"}[state]
+        print(f"{icon} Circuit '{self.name}': {previous} → {state} ({reason})")
+
+    def _check_open_timeout(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN, f"{self.open_seconds:g}s elapsed, probing")
+
+    def _rates(self) -> Tuple[float, float]:
+        calls = len(self._outcomes)
+        if not calls:
+            return 0.0, 0.0
+        failed = sum(1 for f, _ in self._outcomes if f)
+        slow = sum(1 for _, s in self._outcomes if s)
+        return failed / calls, slow / calls
+
+    def _before_call(self) -> Tuple[int, bool]:
+        """Admit a call or raise CircuitOpenError; returns (generation, is_probe)."""
+        with self._lock:
+            self._check_open_timeout()
+            if self._state == OPEN:
+                self.stats["rejected"] += 1
+                retry_in = self.open_seconds - (self._clock() - self._opened_at)
+                raise CircuitOpenError(self.name, max(0.0, retry_in))
+            if self._state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self._probes_in_flight += 1
+            self.stats["calls"] += 1
+            return self._generation, self._state == HALF_OPEN
+
+    def check(self) -> None:
+        """
+        Raise CircuitOpenError if the circuit is open, without admitting a call.
+
+        Lets callers skip queueing for an LLM that would be rejected;
+        call() still decides admission (e.g. of half-open probes).
+        """
+        with self._lock:
+            self._check_open_timeout()
+            if self._state == OPEN:
+                self.stats["rejected"] += 1
+                retry_in = self.open_seconds - (self._clock() - self._opened_at)
+                raise CircuitOpenError(self.name, max(0.0, retry_in))
+
+    def _after_call(self, admitted: Tuple[int, bool], failed: bool, latency: float) -> None:
+        slow = latency > self.slow_call_seconds
+        generation, probe = admitted
+        with self._lock:
+            self.stats["failures"] += failed
+            self.stats["slow_calls"] += slow
+            if generation != self._generation:
+                # Admitted in an earlier state (e.g. closed, before the
+                # circuit opened); its outcome no longer decides anything
+                return
+            if probe:
+                self._probes_in_flight -= 1
+                if failed or slow:
+                    self._transition(OPEN, "probe failed" if failed else
+                                     f"probe took {latency:.2f}s")
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_max_calls:
+                        self._transition(CLOSED, "probes succeeded")
+                return
+
+            self._outcomes.append((failed, slow))
+            if len(self._outcomes) < self.min_calls:
+                return
+            error_rate, slow_rate = self._rates()
+            if error_rate >= self.error_rate_threshold:
+                self._transition(OPEN, f"error rate {error_rate:.0%} over {len(self._outcomes)} calls")
+            elif slow_rate >= self.slow_rate_threshold:
+                self._transition(OPEN, f"{slow_rate:.0%} of {len(self._outcomes)} calls "
+                                       f"slower than {self.slow_call_seconds:g}s")
+
+    def _discard_call(self, admitted: Tuple[int, bool]) -> None:
+        """Forget a call that timed out on the caller's own timeout."""
+        generation, probe = admitted
+        with self._lock:
+            self.stats["own_timeouts"] += 1
+            if probe and generation == self._generation:
+                # Inconclusive probe: free its place for another one
+                self._probes_in_flight -= 1
+
+    def call(self, fn: Callable[[], T], own_timeout: bool = False) -> T:
+        """
+        Run fn through the breaker.
+
+        Args:
+            fn: Zero-argument function making the LLM call
+            own_timeout: fn has a short timeout of the caller's own (e.g.
+                from a run deadline), so its timeouts are not failures
+
+        Returns:
+            fn's result
+
+        Raises:
+            CircuitOpenError: If the circuit is open (fn is not called)
+        """
+        admitted = self._before_call()
+        start = self._clock()
+        try:
+            result = fn()
+        except Exception as e:
+            if own_timeout and is_timeout_error(e):
+                self._discard_call(admitted)
+            else:
+                self._after_call(admitted, True, self._clock() - start)
+            raise
+        self._after_call(admitted, False, self._clock() - start)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State, window rates and transition counters."""
+        with self._lock:
+            self._check_open_timeout()
+            error_rate, slow_rate = self._rates()
+            return {
+                "state": self._state,
+                "window_calls": len(self._outcomes),
+                "error_rate": round(error_rate, 4),
+                "slow_rate": round(slow_rate, 4),
+                **self.stats,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Return the named breaker, configured from Config on first use."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                name,
+                error_rate_threshold=Config.LLM_BREAKER_ERROR_RATE,
+                slow_call_seconds=Config.LLM_BREAKER_SLOW_CALL_SECONDS,
+                slow_rate_threshold=Config.LLM_BREAKER_SLOW_RATE,
+                window=Config.LLM_BREAKER_WINDOW,
+                min_calls=Config.LLM_BREAKER_MIN_CALLS,
+                open_seconds=Config.LLM_BREAKER_OPEN_SECONDS
+            )
+        return _breakers[name]
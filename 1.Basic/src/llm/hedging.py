@@ -0,0 +1,41 @@
+"""
+Hedged LLM Requests
+Per-call-site hedging policies, configured from Config.
+
+HedgingPolicy itself is langgraph_common.llm.hedging, shared with the
+other projects.
+"""
+import threading
+from typing import Callable, Dict, Optional, TypeVar
+
+from langgraph_common.llm.hedging import HedgingPolicy
+
+from src.config import Config
+
+T = TypeVar("T")
+
+_policies: Dict[str, HedgingPolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def get_hedging_policy(name: str) -> Optional[HedgingPolicy]:
+    """
+    Return the hedging policy for a call site, or None if hedging is off.
+
+    Each call site (e.g. a node) keeps its own latency history.
+    """
+    if not Config.LLM_HEDGING:
+        return None
+    with _policies_lock:
+        if name not in _policies:
+            _policies[name] = HedgingPolicy(
+                percentile=Config.LLM_HEDGE_PERCENTILE,
+                max_hedge_fraction=Config.LLM_HEDGE_MAX_FRACTION
+            )
+        return _policies[name]
+
+
+def call_with_hedging(name: str, fn: Callable[[], T]) -> T:
+    """Run fn under the named call site's hedging policy, or directly if hedging is off."""
+    policy = get_hedging_policy(name)
+    return policy.call(fn) if policy is not None else fn()
@@ -1,4 +1,16 @@
-from typing import TypedDict
+from typing import Annotated, Dict, Optional, TypedDict
+
+
+def merge_chunk_results(current: Dict[int, str], update: Optional[Dict[int, str]]) -> Dict[int, str]:
+    """
+    Reducer for chunk_results: parallel chunk transformers add their own entries.
+
+    An update of None clears the results, so that a run on a checkpointed
+    thread does not reduce the chunks left by the thread's previous run.
+    """
+    if update is None:
+        return {}
+    return {**current, **update}
 
 
 class GraphState(TypedDict):
@@ -8,3 +20,7 @@ class GraphState(TypedDict):
     transformed_text: str
     output_text: str
     step: str
+    # Optional absolute deadline for the run (time.time() seconds)
+    deadline: float
+    # Chunked workflow: transformed chunk text by chunk index
+    chunk_results: Annotated[Dict[int, str], merge_chunk_results]
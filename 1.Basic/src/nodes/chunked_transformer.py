@@ -0,0 +1,166 @@
+"""
+Chunked Transformer Nodes
+Map-reduce version of the data transformer for long documents.
+
+fan_out_chunks splits processed_text at paragraph and sentence boundaries
+into chunks of at most Config.CHUNK_MAX_TOKENS tokens and sends each one to
+chunk_transformer_node, which the graph runs in parallel. Every chunk goes
+through the same LLM path as the data transformer (breaker, hedging, shared
+limiter, deadline) and adds its result to chunk_results under its index.
+chunk_reducer_node then joins the results in document order.
+chunk_input_processor_node starts each run by clearing chunk_results, which
+a checkpointer otherwise carries over from the thread's previous run.
+"""
+import re
+from typing import Dict, List, Tuple, TypedDict, Union
+
+from langgraph.types import Send
+from langgraph_common.llm.limiter import CHARS_PER_TOKEN
+
+from src.blobs import join_text, preview_text, resolve_text
+from src.config import Config
+from src.models.graph_state import GraphState
+from src.nodes.data_transformer import transform_text
+from src.nodes.deadline import remaining_seconds
+from src.nodes.input_processor import input_processor_node
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+PARAGRAPH_SEPARATOR = "\n\n"
+
+
+class ChunkState(TypedDict):
+    """Input of one chunk_transformer_node task."""
+
+    chunk_index: int
+    chunk_text: str
+    # Absolute deadline of the run, if any
+    deadline: float
+
+
+def _split_long_sentence(sentence: str, max_chars: int) -> List[str]:
+    """Split at the last whitespace before max_chars, or hard at max_chars."""
+    pieces = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(" ", 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(sentence[:cut].rstrip())
+        sentence = sentence[cut:].lstrip()
+    if sentence:
+        pieces.append(sentence)
+    return pieces
+
+
+def _units(text: str, max_chars: int) -> List[Tuple[str, bool]]:
+    """Pieces of at most max_chars, flagged True where a paragraph starts."""
+    units = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            units.append((paragraph, True))
+            continue
+        first = True
+        for sentence in _SENTENCE_END.split(paragraph):
+            for piece in _split_long_sentence(sentence, max_chars):
+                units.append((piece, first))
+                first = False
+    return units
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into chunks that fit a token budget.
+
+    Whole paragraphs are kept together when they fit, otherwise the
+    paragraph is split into sentences, and only a sentence longer than the
+    budget is split inside (at a space where possible). Consecutive pieces
+    are packed into a chunk until the next one would not fit.
+
+    Args:
+        text: Text to split
+        max_tokens: Token budget per chunk (estimated like the LLM limiter,
+            CHARS_PER_TOKEN characters per token)
+
+    Returns:
+        Chunks in document order
+    """
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+    chunks: List[str] = []
+    current = ""
+    for unit, starts_paragraph in _units(text, max_chars):
+        separator = PARAGRAPH_SEPARATOR if starts_paragraph else " "
+        if current and len(current) + len(separator) + len(unit) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}{separator}{unit}" if current else unit
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_input_processor_node(state: GraphState) -> GraphState:
+    """
+    input_processor_node for the chunked workflow.
+
+    Also clears chunk_results before the fan-out, so a document with fewer
+    chunks than the thread's previous one gets none of its stale chunks.
+    """
+    return {**input_processor_node(state), "chunk_results": None}
+
+
+def fan_out_chunks(state: GraphState) -> Union[List[Send], str]:
+    """
+    Conditional edge: send every chunk of processed_text to a chunk transformer.
+
+    Returns:
+        One Send per chunk, or "chunk_reducer" for an empty text
+    """
+    chunks = split_into_chunks(resolve_text(state.get("processed_text", "")),
+                               Config.CHUNK_MAX_TOKENS)
+    print(f"✂️ Chunk Splitter: {len(chunks)} chunks of up to {Config.CHUNK_MAX_TOKENS} tokens")
+    if not chunks:
+        return "chunk_reducer"
+
+    deadline = {"deadline": state["deadline"]} if state.get("deadline") else {}
+    return [
+        Send("chunk_transformer", {"chunk_index": index, "chunk_text": chunk, **deadline})
+        for index, chunk in enumerate(chunks)
+    ]
+
+
+def chunk_transformer_node(state: ChunkState) -> Dict[str, Dict[int, str]]:
+    """
+    Map step: transform one chunk.
+
+    Returns:
+        Update adding the transformed chunk to chunk_results
+    """
+    index = state["chunk_index"]
+    transformed = transform_text(state["chunk_text"], remaining_seconds(state))
+    print(f"🧩 Chunk Transformer: chunk {index} transformed")
+    return {"chunk_results": {index: transformed}}
+
+
+def chunk_reducer_node(state: GraphState) -> GraphState:
+    """
+    Reduce step: join the transformed chunks in document order.
+    """
+    results = state.get("chunk_results", {})
+    parts = []
+    for index in sorted(results):
+        if parts:
+            parts.append(PARAGRAPH_SEPARATOR)
+        parts.append(results[index])
+    transformed_text = join_text(parts)
+
+    print(f"🔗 Chunk Reducer: {len(results)} chunks → {preview_text(transformed_text)}")
+
+    return {
+        **state,
+        "transformed_text": transformed_text,
+        "step": "chunks_reduced"
+    }
@@ -3,11 +3,21 @@ Data Transformer Node
 Transforms the processed data using an LLM
 """
 import os
+from typing import Optional
 
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
 
+from src.blobs import join_text, preview_text, replace_text, resolve_text
+from src.llm import (
+    CircuitOpenError,
+    call_with_hedging,
+    get_circuit_breaker,
+    get_llm_limiter
+)
+from src.config import Config
 from src.models.graph_state import GraphState
+from src.nodes.deadline import race_deadline, remaining_seconds
 
 
 # Initialize the LLM (you can replace with any LLM)
@@ -23,30 +33,86 @@ else:
     llm = None  # Will use fallback logic
 
 
-def data_transformer_node(state: GraphState) -> GraphState:
+def fallback_transform(processed_text: str) -> str:
     """
-    Node 2: Data Transformer
-    Transforms the processed data using an LLM
+    Cheap transformation used when the LLM is unavailable.
+
+    A blob handle gives a handle: the replacement streams over the stored
+    text (or reuses it when nothing matches) and the decoration is a
+    concatenation rather than a copy.
+    """
+    fallback_text = replace_text(processed_text, 'PROCESSING:', 'ENHANCED:')
+    return join_text(["✨ TRANSFORMED: ", fallback_text, " ✨"])
+
+
+def transform_text(processed_text: str, remaining: Optional[float] = None) -> str:
+    """
+    Transform text with the LLM, falling back to fallback_transform.
+
+    Args:
+        processed_text: Text (or blob handle) to transform
+        remaining: Seconds left before the run's deadline, None for no deadline
+
+    Returns:
+        The LLM's answer, or the fallback transformation if the LLM is
+        unavailable, failing, or would miss the deadline
     """
-    processed_text = state.get("processed_text", "")
+    def llm_transform() -> str:
+        prompt = f"Transform this text into a creative format: {resolve_text(processed_text)}"
+        messages = [HumanMessage(content=prompt)]
+        timeout = {} if remaining is None else {"timeout": remaining}
+        # The circuit breaker fails fast while the LLM is degraded, before
+        # the call queues for the shared rate limits. Once the call has its
+        # slot, the breaker times only the provider call and a slow one is
+        # hedged when LLM_HEDGING is on. Timeouts from the run's own
+        # deadline are not held against the LLM.
+        breaker = get_circuit_breaker("data_transformer")
+        breaker.check()
+        response = get_llm_limiter().invoke(
+            llm, messages,
+            wrap=lambda call: breaker.call(
+                lambda: call_with_hedging("data_transformer", call),
+                own_timeout=remaining is not None
+            ),
+            **timeout
+        )
+        return response.content
 
     # Transform the data using LLM
-    if llm is not None:
-        try:
-            prompt = f"Transform this text into a creative format: {processed_text}"
-            response = llm.invoke([HumanMessage(content=prompt)])
-            transformed_text = response.content
-        except Exception as e:
-            print(f"⚠️ LLM invocation failed: {e}")
-            # Fallback transformation if LLM fails
-            fallback_text = processed_text.replace('PROCESSING:', 'ENHANCED:')
-            transformed_text = f"✨ TRANSFORMED: {fallback_text} ✨"
-    else:
+    if llm is not None and remaining is not None and remaining < Config.DEADLINE_MIN_LLM_SECONDS:
+        print(f"⏱️ Deadline: {remaining:.3f}s left, skipping the LLM")
+        return fallback_transform(processed_text)
+    if llm is None:
         # Fallback transformation if LLM is not available
-        fallback_text = processed_text.replace('PROCESSING:', 'ENHANCED:')
-        transformed_text = f"✨ TRANSFORMED: {fallback_text} ✨"
+        return fallback_transform(processed_text)
+    try:
+        if remaining is None:
+            return llm_transform()
+        # Race the LLM against the deadline; the fallback wins if
+        # the LLM has not answered when the time is up
+        return race_deadline(
+            llm_transform, remaining, lambda: fallback_transform(processed_text)
+        )
+    except CircuitOpenError as e:
+        print(f"⚡ {e}: using fallback")
+        return fallback_transform(processed_text)
+    except Exception as e:
+        print(f"⚠️ LLM invocation failed: {e}")
+        # Fallback transformation if LLM fails
+        return fallback_transform(processed_text)
+
+
+def data_transformer_node(state: GraphState) -> GraphState:
+    """
+    Node 2: Data Transformer
+    Transforms the processed data using an LLM
+
+    With a deadline in the state, the LLM gets the remaining time as its
+    timeout and the fallback transform is used if it does not answer in time.
+    """
+    transformed_text = transform_text(state.get("processed_text", ""), remaining_seconds(state))
 
-    print(f"🔄 Data Transformer Node: {transformed_text}")
+    print(f"🔄 Data Transformer Node: {preview_text(transformed_text)}")
 
     return {
         **state,
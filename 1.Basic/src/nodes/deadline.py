@@ -0,0 +1,74 @@
+"""
+Request Deadlines
+Lets a caller bound how long a workflow run may take.
+
+The caller puts an absolute deadline (time.time() seconds) in the state's
+"deadline" field, e.g. via run_workflow(..., deadline_seconds=0.8). Nodes
+that can take long check the time left before starting work: the data
+transformer gives the LLM the remaining time as its timeout and races it
+against the cheap fallback transform, and the tool nodes skip their
+analysis once the deadline has passed. Runs without a deadline are
+unaffected.
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional, TypeVar
+
+from src.models.graph_state import GraphState
+
+T = TypeVar("T")
+
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="deadline")
+
+
+def deadline_in(seconds: float) -> float:
+    """Return the absolute deadline seconds from now."""
+    return time.time() + seconds
+
+
+def remaining_seconds(state: GraphState) -> Optional[float]:
+    """
+    Time left before the run's deadline.
+
+    Returns:
+        Seconds left (0.0 once passed), or None if the run has no deadline
+    """
+    deadline = state.get("deadline")
+    if not deadline:
+        return None
+    return max(0.0, deadline - time.time())
+
+
+def deadline_passed(state: GraphState) -> bool:
+    """Return True if the run has a deadline and it has passed."""
+    return remaining_seconds(state) == 0.0
+
+
+def race_deadline(fn: Callable[[], T], timeout: float, fallback: Callable[[], T]) -> T:
+    """
+    Return fn()'s result if it finishes within timeout, otherwise fallback().
+
+    fn runs on a worker thread with the caller's context, so callbacks such
+    as token streaming still reach the graph. A call that loses the race is
+    not waited for; it should be given timeout itself so it ends soon after.
+
+    Args:
+        fn: The expensive call
+        timeout: Seconds fn may take
+        fallback: Cheap function whose result is used if fn is too slow
+
+    Returns:
+        fn's result or fallback's result
+
+    Raises:
+        Exception: Whatever fn raised, if it failed within timeout
+    """
+    context = contextvars.copy_context()
+    future = _executor.submit(context.run, fn)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        print(f"⏱️ Deadline: no answer within {timeout:.3f}s, using fallback")
+        return fallback()
@@ -1,7 +1,11 @@
 """
 Input Processor Node
 Processes the initial input and adds some context
+
+A large input is moved to the blob store first (see src.blobs); the state
+then carries handles and the processed text is written chunk by chunk.
 """
+from src.blobs import is_large, join_text, preview_text, store_text, strip_text
 from src.models.graph_state import GraphState
 
 
@@ -11,14 +15,17 @@ def input_processor_node(state: GraphState) -> GraphState:
     Processes the initial input and adds some context
     """
     input_text = state.get("input_text", "")
+    if is_large(input_text):
+        input_text = store_text(input_text)
 
     # Simple processing - add a prefix and clean the input
-    processed_text = f"Processing: {input_text.strip().upper()}"
+    processed_text = join_text(["Processing: ", strip_text(input_text, str.upper)])
 
-    print(f"🔍 Input Processor Node: {processed_text}")
+    print(f"🔍 Input Processor Node: {preview_text(processed_text)}")
 
     return {
         **state,
+        "input_text": input_text,
         "processed_text": processed_text,
         "step": "input_processed"
     }
@@ -0,0 +1,130 @@
+"""
+Process Pool Offload
+Runs CPU-heavy text work in worker processes so it does not hold the GIL.
+
+Texts are handed to workers through shared memory instead of being pickled
+through the pool's pipe; workers return only small results. Nodes call
+run_text_task() from sync code (the calling thread waits, other threads
+keep running) or await arun_text_task() from async code, which blocks
+neither the event loop nor an executor thread while a worker is busy.
+"""
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional
+
+from src.config import Config
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def should_offload(text: str, min_chars: Optional[int] = None) -> bool:
+    """Return True if text is large enough to be worth a process hop."""
+    threshold = Config.TOOL_OFFLOAD_MIN_CHARS if min_chars is None else min_chars
+    return threshold > 0 and len(text) >= threshold
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = Config.TOOL_OFFLOAD_WORKERS or os.cpu_count() or 1
+            # spawn: forking a process that runs threads can deadlock workers
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the worker processes; a later offload starts a new pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown_process_pool)
+
+
+class SharedText:
+    """UTF-8 text copied once into a named shared memory block."""
+
+    def __init__(self, text: str):
+        data = text.encode("utf-8")
+        self.size = len(data)
+        self._block = shared_memory.SharedMemory(create=True, size=max(1, self.size))
+        self._block.buf[:self.size] = data
+        self.name = self._block.name
+
+    def close(self) -> None:
+        """Release and remove the block."""
+        self._block.close()
+        self._block.unlink()
+
+    def __enter__(self) -> "SharedText":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _read_shared_text(name: str, size: int) -> str:
+    """Worker side: decode the text from an existing block without owning it."""
+    # Spawned workers share the parent's resource tracker, so attaching
+    # here does not make the worker responsible for unlinking the block
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return str(block.buf[:size], "utf-8")
+    finally:
+        block.close()
+
+
+def _run_on_shared_text(func: Callable[[str], Any], name: str, size: int) -> Any:
+    """Worker entry point: call func on the text stored in shared memory."""
+    return func(_read_shared_text(name, size))
+
+
+def run_offloaded(func: Callable[[str], Any], text: str) -> Any:
+    """
+    Run func(text) in the process pool and wait for the result.
+
+    Args:
+        func: Module-level function (it is pickled by reference)
+        text: Input text, passed through shared memory
+
+    Returns:
+        func's return value
+    """
+    with SharedText(text) as shared:
+        future = get_process_pool().submit(_run_on_shared_text, func, shared.name, shared.size)
+        return future.result()
+
+
+async def arun_offloaded(func: Callable[[str], Any], text: str) -> Any:
+    """Async variant of run_offloaded; awaits the worker without blocking."""
+    with SharedText(text) as shared:
+        future = get_process_pool().submit(_run_on_shared_text, func, shared.name, shared.size)
+        return await asyncio.wrap_future(future)
+
+
+def run_text_task(func: Callable[[str], Any], text: str) -> Any:
+    """Run func(text) in a worker if the text is large, otherwise inline."""
+    if should_offload(text):
+        return run_offloaded(func, text)
+    return func(text)
+
+
+async def arun_text_task(func: Callable[[str], Any], text: str) -> Any:
+    """Await func(text) in a worker if the text is large, otherwise in a thread."""
+    if should_offload(text):
+        return await arun_offloaded(func, text)
+    return await asyncio.to_thread(func, text)
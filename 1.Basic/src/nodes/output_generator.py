@@ -1,7 +1,11 @@
 """
 Output Generator Node
 Generates the final output with formatting
+
+This is the graph's output boundary: blob handles do not outlive the run
+that created them (see src.blobs.runs), so the final state carries texts.
 """
+from src.blobs import resolve_text
 from src.models.graph_state import GraphState
 
 
@@ -10,8 +14,8 @@ def output_generator_node(state: GraphState) -> GraphState:
     Node 3: Output Generator
     Generates the final output with formatting
     """
-    transformed_text = state.get("transformed_text", "")
-    input_text = state.get("input_text", "")
+    transformed_text = resolve_text(state.get("transformed_text", ""))
+    input_text = resolve_text(state.get("input_text", ""))
 
     # Generate final output
     output_text = f"""
@@ -25,8 +29,19 @@ Final Output: {transformed_text}
 
     print("📤 Output Generator Node: Final output generated")
 
+    resolved = {
+        "input_text": input_text,
+        "processed_text": resolve_text(state.get("processed_text", "")),
+        "transformed_text": transformed_text,
+    }
+    if "chunk_results" in state:
+        resolved["chunk_results"] = {
+            index: resolve_text(text) for index, text in state["chunk_results"].items()
+        }
+
     return {
         **state,
+        **resolved,
         "output_text": output_text,
         "step": "output_generated"
     }
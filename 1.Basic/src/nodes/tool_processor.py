@@ -1,21 +1,38 @@
 """
 Tool Integration Node
 Demonstrates how to use tools within LangGraph workflows.
+
+Texts above Config.TOOL_OFFLOAD_MIN_CHARS are analyzed in a worker process
+(see src.nodes.offload). tool_processor and conditional_tool wrap each node
+with an async variant that awaits the worker under ainvoke/astream. Once a
+run's deadline has passed the analysis is skipped. A blob handle in
+processed_text is read in full for the analysis, while the enhanced text
+refers to it instead of copying it.
 """
 import json
+import re
+from typing import Any, Dict
+
+from langchain_core.runnables import RunnableLambda
+
+from src.blobs import join_text, resolve_text
 from src.models.graph_state import GraphState
+from src.nodes.deadline import deadline_passed
+from src.nodes.offload import arun_text_task, run_text_task
 from src.tools.text_analyzer import text_analyzer_tool
 from src.tools.math_calculator import math_calculator_tool
 
 
-def tool_processor_node(state: GraphState) -> GraphState:
+def analyze_text(processed_text: str) -> Dict[str, Any]:
     """
-    Node that demonstrates tool usage within a LangGraph workflow.
+    CPU-bound part of tool_processor_node: text analysis and calculations.
 
-    This node analyzes the processed text and performs calculations.
-    """
-    processed_text = state.get("processed_text", "")
+    Args:
+        processed_text: Text to analyze
 
+    Returns:
+        Dictionary with the text analysis and the average characters per word
+    """
     # Use text analyzer tool
     text_analysis = text_analyzer_tool(processed_text)
 
@@ -31,6 +48,13 @@ def tool_processor_node(state: GraphState) -> GraphState:
     else:
         avg_chars_per_word = 0
 
+    return {"text_analysis": text_analysis, "average_chars_per_word": avg_chars_per_word}
+
+
+def _tool_processor_update(processed_text: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    text_analysis = analysis["text_analysis"]
+    avg_chars_per_word = analysis["average_chars_per_word"]
+
     # Create enhanced output with tool results
     tool_results = {
         "text_analysis": text_analysis,
@@ -41,9 +65,7 @@ def tool_processor_node(state: GraphState) -> GraphState:
     }
 
     # Enhanced text with tool insights
-    enhanced_text = f"""
-🔧 TOOL-ENHANCED ANALYSIS:
-{processed_text}
+    enhanced_text = join_text(["🔧 TOOL-ENHANCED ANALYSIS:\n", processed_text, f"""
 
 📊 Analysis Results:
 - Words: {text_analysis.get('word_count', 0)}
@@ -54,48 +76,130 @@ def tool_processor_node(state: GraphState) -> GraphState:
 - Longest Word: {text_analysis.get('longest_word', 'N/A')}
 
 🎯 {text_analysis.get('summary', 'Analysis complete')}
-    """.strip()
+    """.rstrip()])
 
     print(f"🔧 Tool Processor Node: Enhanced with analysis and calculations")
 
     return {
-        **state,
         "transformed_text": enhanced_text,
         "tool_results": json.dumps(tool_results, indent=2),
         "step": "tool_processed"
     }
 
 
-# Example of a conditional tool node that chooses tools based on content
-def conditional_tool_node(state: GraphState) -> GraphState:
+def _deadline_skipped_update(processed_text: str, step: str) -> Dict[str, Any]:
+    print(f"⏱️ Deadline passed: skipping tool analysis")
+    return {
+        "transformed_text": processed_text,
+        "tool_results": json.dumps({"skipped": "deadline passed"}),
+        "step": step
+    }
+
+
+def tool_processor_node(state: GraphState) -> GraphState:
     """
-    Node that conditionally uses different tools based on content.
+    Node that demonstrates tool usage within a LangGraph workflow.
+
+    This node analyzes the processed text and performs calculations.
     """
     processed_text = state.get("processed_text", "")
+    if deadline_passed(state):
+        return {**state, **_deadline_skipped_update(processed_text, "tool_processed")}
+
+    analysis = run_text_task(analyze_text, resolve_text(processed_text))
+
+    return {**state, **_tool_processor_update(processed_text, analysis)}
+
+
+async def atool_processor_node(state: GraphState) -> GraphState:
+    """Async tool_processor_node; large texts are awaited in a worker process."""
+    processed_text = state.get("processed_text", "")
+    if deadline_passed(state):
+        return {**state, **_deadline_skipped_update(processed_text, "tool_processed")}
 
-    # Check if text contains numbers - use math calculator
-    if any(char.isdigit() for char in processed_text):
-        # Extract potential math expressions (simple heuristic)
-        import re
-        math_patterns = re.findall(r'[\d+\-*/().\s]+', processed_text)
+    analysis = await arun_text_task(analyze_text, resolve_text(processed_text))
 
-        calculations = {}
-        for i, pattern in enumerate(math_patterns):
-            if len(pattern.strip()) > 1:  # Skip single digits
-                calc_result = math_calculator_tool(pattern.strip())
-                calculations[f"expression_{i}"] = calc_result
+    return {**state, **_tool_processor_update(processed_text, analysis)}
 
-        enhanced_text = f"{processed_text}\n\n🔢 Found calculations: {calculations}"
 
+def find_calculations(processed_text: str) -> Dict[str, Any]:
+    """
+    CPU-bound part of conditional_tool_node: evaluate numeric expressions.
+
+    Args:
+        processed_text: Text to scan
+
+    Returns:
+        Dictionary of expression key -> calculator result
+    """
+    # Extract potential math expressions (simple heuristic)
+    math_patterns = re.findall(r'[\d+\-*/().\s]+', processed_text)
+
+    calculations = {}
+    for i, pattern in enumerate(math_patterns):
+        if len(pattern.strip()) > 1:  # Skip single digits
+            calc_result = math_calculator_tool(pattern.strip())
+            calculations[f"expression_{i}"] = calc_result
+    return calculations
+
+
+def summarize_text(processed_text: str) -> str:
+    """CPU-bound part of conditional_tool_node for non-numeric text."""
+    return text_analyzer_tool(processed_text)["summary"]
+
+
+def _conditional_tool_update(processed_text: str, has_numbers: bool, result: Any) -> Dict[str, Any]:
+    if has_numbers:
+        enhanced_text = join_text([processed_text, f"\n\n🔢 Found calculations: {result}"])
     else:
-        # Use text analyzer for non-mathematical content
-        analysis = text_analyzer_tool(processed_text)
-        enhanced_text = f"{processed_text}\n\n📊 Analysis: {analysis['summary']}"
+        enhanced_text = join_text([processed_text, f"\n\n📊 Analysis: {result}"])
 
     print(f"🎯 Conditional Tool Node: Applied appropriate tool")
 
     return {
-        **state,
         "transformed_text": enhanced_text,
         "step": "conditional_tool_processed"
     }
+
+
+# Example of a conditional tool node that chooses tools based on content
+def conditional_tool_node(state: GraphState) -> GraphState:
+    """
+    Node that conditionally uses different tools based on content.
+    """
+    processed_text = state.get("processed_text", "")
+    if deadline_passed(state):
+        return {**state, **_deadline_skipped_update(processed_text, "conditional_tool_processed")}
+
+    # Check if text contains numbers - use math calculator, otherwise
+    # use text analyzer for non-mathematical content
+    text = resolve_text(processed_text)
+    has_numbers = any(char.isdigit() for char in text)
+    work = find_calculations if has_numbers else summarize_text
+
+    result = run_text_task(work, text)
+
+    return {**state, **_conditional_tool_update(processed_text, has_numbers, result)}
+
+
+async def aconditional_tool_node(state: GraphState) -> GraphState:
+    """Async conditional_tool_node; large texts are awaited in a worker process."""
+    processed_text = state.get("processed_text", "")
+    if deadline_passed(state):
+        return {**state, **_deadline_skipped_update(processed_text, "conditional_tool_processed")}
+
+    text = resolve_text(processed_text)
+    has_numbers = any(char.isdigit() for char in text)
+    work = find_calculations if has_numbers else summarize_text
+
+    result = await arun_text_task(work, text)
+
+    return {**state, **_conditional_tool_update(processed_text, has_numbers, result)}
+
+
+# Nodes for StateGraph.add_node: invoke() runs the sync function, while
+# ainvoke()/astream() run the async one, which awaits worker processes
+# instead of holding one of the graph's executor threads
+tool_processor = RunnableLambda(tool_processor_node, afunc=atool_processor_node, name="tool_processor")
+conditional_tool = RunnableLambda(conditional_tool_node, afunc=aconditional_tool_node,
+                                  name="conditional_tool")
@@ -0,0 +1,28 @@
+"""
+Profiling of workflow runs: per-node and per-tool profiles of single runs
+and a background sampling profiler for long-running processes.
+"""
+
+from langgraph_common.profiling.profiler import (
+    ProfileSession,
+    ProfilingCallbackHandler,
+    active_session,
+    maybe_profile,
+    profile_scope,
+    profiled
+)
+from langgraph_common.profiling.sampler import SamplingProfiler
+
+from .sampler import get_sampler, set_sampler
+
+__all__ = [
+    'ProfileSession',
+    'ProfilingCallbackHandler',
+    'SamplingProfiler',
+    'active_session',
+    'get_sampler',
+    'maybe_profile',
+    'profile_scope',
+    'profiled',
+    'set_sampler'
+]
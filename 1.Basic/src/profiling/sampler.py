@@ -0,0 +1,41 @@
+"""
+Background Sampling Profiler
+Process-wide sampler, started from Config.
+
+SamplingProfiler itself is langgraph_common.profiling.sampler, shared with
+the other projects.
+"""
+import threading
+from typing import Optional
+
+from langgraph_common.profiling.sampler import SamplingProfiler
+
+from src.config import Config
+
+_sampler: Optional[SamplingProfiler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> Optional[SamplingProfiler]:
+    """Return the running process-wide sampler, started on first use if Config.SAMPLER_ENABLED."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None and Config.SAMPLER_ENABLED:
+            _sampler = SamplingProfiler(
+                Config.SAMPLER_DIR,
+                interval=Config.SAMPLER_INTERVAL_SECONDS,
+                flush_seconds=Config.SAMPLER_FLUSH_SECONDS,
+                max_stacks=Config.SAMPLER_MAX_STACKS,
+                keep_files=Config.SAMPLER_KEEP_FILES,
+                max_overhead=Config.SAMPLER_MAX_OVERHEAD
+            ).start()
+        return _sampler
+
+
+def set_sampler(sampler: Optional[SamplingProfiler]) -> None:
+    """Replace the process-wide sampler, stopping the previous one (None recreates it from Config)."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is not None and _sampler is not sampler:
+            _sampler.stop()
+        _sampler = sampler
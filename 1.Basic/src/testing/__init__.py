@@ -0,0 +1,21 @@
+"""
+Test doubles for running the workflows without network access.
+"""
+
+from .fake_llm import (
+    FakeLLMError,
+    FakeRateLimitError,
+    FakeTimeoutError,
+    RateLimitedFakeChatModel,
+    StreamingFakeChatModel,
+    install_stand_in_llm
+)
+
+__all__ = [
+    'FakeLLMError',
+    'FakeRateLimitError',
+    'FakeTimeoutError',
+    'RateLimitedFakeChatModel',
+    'StreamingFakeChatModel',
+    'install_stand_in_llm'
+]
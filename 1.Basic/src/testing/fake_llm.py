@@ -0,0 +1,158 @@
+"""
+Streaming Fake Chat Model
+A local stand-in for the data transformer LLM used by benchmarks and load tests.
+"""
+import asyncio
+import random
+import threading
+import time
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from pydantic import PrivateAttr
+
+DEFAULT_RESPONSE = "A creative retelling of the input, streamed one token at a time."
+
+
+class FakeLLMError(Exception):
+    """Provider error raised by the fake models' simulated outages."""
+
+
+class FakeTimeoutError(TimeoutError):
+    """Raised by the fake models when a call outlasts its timeout argument."""
+
+
+class StreamingFakeChatModel(FakeListChatModel):
+    """
+    Fake chat model whose blocking path costs as much as its streaming path.
+
+    FakeListChatModel only sleeps once when invoked without streaming, so the
+    blocking call is routed through the token stream to keep both fair.
+    latency adds a fixed delay before the first token, like a network call;
+    with probability tail_probability the delay is tail_latency instead.
+    latency_per_prompt_char adds time in proportion to the prompt length,
+    like a model whose answer grows with its input.
+    With probability failure_rate the call fails with FakeLLMError after
+    the delay, like a provider outage. A timeout keyword argument is
+    honoured like a client timeout: a longer delay raises FakeTimeoutError.
+    """
+
+    latency: float = 0.0
+    tail_latency: float = 0.0
+    tail_probability: float = 0.0
+    failure_rate: float = 0.0
+    latency_per_prompt_char: float = 0.0
+
+    def _first_token_delay(self, messages) -> float:
+        delay = self.latency
+        if self.tail_probability and random.random() < self.tail_probability:
+            delay = self.tail_latency
+        if self.latency_per_prompt_char:
+            chars = sum(len(str(message.content)) for message in messages)
+            delay += chars * self.latency_per_prompt_char
+        return delay
+
+    def _wait_first_token(self, messages, timeout) -> float:
+        """Return the delay to sleep, raising FakeTimeoutError past timeout."""
+        delay = self._first_token_delay(messages)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise FakeTimeoutError(f"Request timed out after {timeout:.3f}s")
+        return delay
+
+    def _maybe_fail(self) -> None:
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise FakeLLMError("503 Service Unavailable")
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        return "".join(
+            chunk.message.content
+            for chunk in self._stream(messages, stop=stop, **kwargs)
+        )
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        delay = self._wait_first_token(messages, kwargs.pop("timeout", None))
+        if delay:
+            time.sleep(delay)
+        self._maybe_fail()
+        yield from super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        timeout = kwargs.pop("timeout", None)
+        delay = self._first_token_delay(messages)
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            raise FakeTimeoutError(f"Request timed out after {timeout:.3f}s")
+        if delay:
+            await asyncio.sleep(delay)
+        self._maybe_fail()
+        async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            yield chunk
+
+
+class FakeRateLimitError(Exception):
+    """429 raised by RateLimitedFakeChatModel, shaped like openai.RateLimitError."""
+
+    status_code = 429
+
+
+class RateLimitedFakeChatModel(StreamingFakeChatModel):
+    """
+    StreamingFakeChatModel that rejects calls beyond a provider-side limit.
+
+    Like a provider enforcing a concurrency quota, a call made while
+    capacity calls are already running fails at once with a
+    FakeRateLimitError (HTTP 429).
+    """
+
+    capacity: int = 4
+    served: int = 0
+    rejected: int = 0
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _in_flight: int = PrivateAttr(default=0)
+
+    def _enter(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise FakeRateLimitError("429 Too Many Requests")
+            self._in_flight += 1
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.served += 1
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        self._enter()
+        try:
+            yield from super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+        finally:
+            self._exit()
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        self._enter()
+        try:
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+        finally:
+            self._exit()
+
+
+def install_stand_in_llm(latency: float = 0.0, token_delay: float = 0.0,
+                         response: str = DEFAULT_RESPONSE) -> StreamingFakeChatModel:
+    """
+    Replace the data transformer LLM with a StreamingFakeChatModel.
+
+    Args:
+        latency: Seconds before the first token
+        token_delay: Seconds per streamed character
+        response: Text every call returns
+
+    Returns:
+        The installed model
+    """
+    import src.nodes.data_transformer as data_transformer
+
+    llm = StreamingFakeChatModel(responses=[response], latency=latency, sleep=token_delay or None)
+    data_transformer.llm = llm
+    return llm
@@ -1,12 +1,18 @@
 """
 Math Calculator Tool
 A simple tool that performs basic mathematical operations.
+
+Expressions are evaluated by src.tools.safe_math, not eval(), so inputs
+such as "9**9**9" are refused quickly instead of running for minutes.
 """
-import math
 import re
 from typing import Union, Dict, Any
 
+from src.tools.safe_math import ExpressionError, evaluate_expression
+from src.tracing import trace_tool
+
 
+@trace_tool
 def math_calculator_tool(expression: str) -> Dict[str, Any]:
     """
     Evaluates mathematical expressions safely.
@@ -20,6 +26,7 @@ def math_calculator_tool(expression: str) -> Dict[str, Any]:
     if not expression or not isinstance(expression, str):
         return {
             "error": "Invalid input: expression must be a non-empty string",
+            "error_type": "invalid_input",
             "result": None,
             "original_expression": expression
         }
@@ -27,38 +34,18 @@ def math_calculator_tool(expression: str) -> Dict[str, Any]:
     # Clean the expression
     cleaned_expression = expression.strip()
 
-    # Define allowed operations and functions
-    allowed_names = {
-        "__builtins__": {},
-        "abs": abs,
-        "round": round,
-        "min": min,
-        "max": max,
-        "sum": sum,
-        "pow": pow,
-        "sqrt": math.sqrt,
-        "sin": math.sin,
-        "cos": math.cos,
-        "tan": math.tan,
-        "pi": math.pi,
-        "e": math.e,
-        "log": math.log,
-        "log10": math.log10,
-        "ceil": math.ceil,
-        "floor": math.floor,
-    }
-
     try:
         # Validate expression contains only allowed characters
         if not re.match(r'^[0-9+\-*/().\s,a-zA-Z_]+$', cleaned_expression):
             return {
                 "error": "Invalid characters in expression",
+                "error_type": "invalid_characters",
                 "result": None,
                 "original_expression": expression
             }
 
-        # Evaluate the expression
-        result = eval(cleaned_expression, allowed_names, {})
+        # Evaluate the expression within the cost limits
+        result = evaluate_expression(cleaned_expression)
 
         # Format result
         if isinstance(result, float):
@@ -79,21 +66,32 @@ def math_calculator_tool(expression: str) -> Dict[str, Any]:
 
         return calculation_result
 
+    except ExpressionError as e:
+        # Over a limit or not allowed: refused before it could cost much
+        return {
+            "error": f"Expression refused: {str(e)}",
+            "error_type": e.code,
+            "result": None,
+            "original_expression": expression
+        }
     except ZeroDivisionError:
         return {
             "error": "Division by zero",
+            "error_type": "division_by_zero",
             "result": None,
             "original_expression": expression
         }
-    except (ValueError, TypeError) as e:
+    except (ValueError, TypeError, OverflowError) as e:
         return {
             "error": f"Math error: {str(e)}",
+            "error_type": "math_error",
             "result": None,
             "original_expression": expression
         }
     except Exception as e:
         return {
             "error": f"Invalid expression: {str(e)}",
+            "error_type": "invalid_expression",
             "result": None,
             "original_expression": expression
         }
@@ -107,6 +105,7 @@ if __name__ == "__main__":
         "sin(pi/2)",
         "10 / 2 - 1",
         "2 ** 3",  # Power operation
+        "9 ** 9 ** 9",  # Refused: exponent too large
         "max(1, 5, 3)",
         "round(3.14159, 2)"
     ]
@@ -0,0 +1,243 @@
+"""
+Safe Math Evaluation
+Evaluates arithmetic expressions by walking their AST, with limits that keep
+the cost of any input small and predictable.
+
+eval() runs whatever arithmetic its input asks for: "9**9**9" or
+"pow(10, 10**8)" computes integers of billions of bits, and nothing stops
+it once started. Here an expression is first checked against
+MATH_MAX_EXPRESSION_CHARS, then parsed, and its AST against
+MATH_MAX_AST_NODES and MATH_MAX_AST_DEPTH, before anything is evaluated.
+Only numbers, + - * / // % **, unary + and -, tuples (for sum), the
+constants pi and e and a fixed set of functions are allowed.
+
+Integer operations are checked before they run: a product or power whose
+result would exceed MATH_MAX_INT_BITS bits, or an integer power with an
+exponent above MATH_MAX_EXPONENT (also for pow with a modulus), is
+refused. round() clamps its ndigits to the digits its argument can have.
+Float operations take constant time (and raise OverflowError). Every node
+checks the thread's CPU time against MATH_CPU_BUDGET_MS as a last resort.
+
+Refused expressions raise ExpressionError, whose code names the limit.
+"""
+import ast
+import math
+import operator
+import time
+from typing import Any, Callable, Dict, Optional, Union
+
+from src.config import Config
+
+Number = Union[int, float]
+
+CONSTANTS: Dict[str, float] = {"pi": math.pi, "e": math.e}
+
+# Largest |ndigits| passed on to round() for floats, which lie between
+# 10**-324 and 10**309; larger values give the same results
+MAX_ROUND_DIGITS = 330
+
+_BINARY_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+_UNARY_OPERATORS: Dict[type, Callable[[Any], Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that are not allowed or exceed a limit."""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class _Evaluator:
+    """Evaluates one parsed expression within the limits."""
+
+    def __init__(self, max_int_bits: int, max_exponent: int, cpu_budget_ms: float):
+        self.max_int_bits = max_int_bits
+        self.max_exponent = max_exponent
+        self.cpu_budget = cpu_budget_ms / 1000
+        self.started = time.thread_time()
+        self.functions: Dict[str, Callable[..., Any]] = {
+            "abs": abs,
+            "round": self._round,
+            "min": min,
+            "max": max,
+            "sum": self._sum,
+            "pow": self._pow,
+            "sqrt": math.sqrt,
+            "sin": math.sin,
+            "cos": math.cos,
+            "tan": math.tan,
+            "log": math.log,
+            "log10": math.log10,
+            "ceil": math.ceil,
+            "floor": math.floor,
+        }
+
+    # Limits
+
+    def _check_bits(self, bits: int) -> None:
+        if bits > self.max_int_bits:
+            raise ExpressionError(
+                "integer_too_large",
+                f"Integer result would exceed {self.max_int_bits} bits")
+
+    def _checked(self, value: Any) -> Any:
+        if isinstance(value, int):
+            self._check_bits(value.bit_length())
+        return value
+
+    def _number(self, value: Any) -> Number:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ExpressionError("unsupported", f"Expected a number, got {type(value).__name__}")
+        return value
+
+    # Operations whose cost grows with their operands
+
+    def _multiply(self, left: Number, right: Number) -> Number:
+        if isinstance(left, int) and isinstance(right, int):
+            self._check_bits(left.bit_length() + right.bit_length())
+        return left * right
+
+    def _power(self, base: Number, exponent: Number) -> Number:
+        if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+            if exponent > self.max_exponent:
+                raise ExpressionError(
+                    "exponent_too_large",
+                    f"Exponent {exponent} exceeds {self.max_exponent}")
+            if abs(base) > 1:
+                self._check_bits(math.floor(exponent * math.log2(abs(base))) + 1)
+        return base ** exponent
+
+    def _pow(self, base: Number, exponent: Number, modulus: Optional[int] = None) -> Number:
+        if modulus is None:
+            return self._power(self._number(base), self._number(exponent))
+        # Modular powers stay below the modulus, but take a multiplication
+        # per exponent bit, so the exponent is limited as for **
+        if isinstance(exponent, int) and exponent > self.max_exponent:
+            raise ExpressionError(
+                "exponent_too_large",
+                f"Exponent {exponent} exceeds {self.max_exponent}")
+        return pow(base, exponent, modulus)
+
+    def _round(self, value: Number, ndigits: Optional[int] = None) -> Number:
+        if ndigits is None:
+            return round(self._number(value))
+        # round() takes time proportional to |ndigits|, so ndigits is clamped
+        # to the digits the value can have, past which the result is the same
+        value, ndigits = self._number(value), self._number(ndigits)
+        limit = MAX_ROUND_DIGITS
+        if isinstance(value, int):
+            limit = max(limit, math.ceil(value.bit_length() * math.log10(2)) + 1)
+        return round(value, max(-limit, min(limit, ndigits)))
+
+    def _sum(self, values: Any, start: Number = 0) -> Number:
+        total = start
+        for value in values:
+            total = self._checked(total + self._number(value))
+        return total
+
+    # Evaluation
+
+    def evaluate(self, node: ast.AST) -> Any:
+        if time.thread_time() - self.started > self.cpu_budget:
+            raise ExpressionError(
+                "cpu_budget_exceeded",
+                f"Evaluation exceeded {self.cpu_budget * 1000:g} ms of CPU time")
+
+        if isinstance(node, ast.Expression):
+            return self.evaluate(node.body)
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ExpressionError("unsupported", f"Unsupported constant: {node.value!r}")
+            return self._checked(node.value)
+        if isinstance(node, ast.Name):
+            if node.id not in CONSTANTS:
+                raise ExpressionError("unknown_name", f"Unknown name: {node.id}")
+            return CONSTANTS[node.id]
+        if isinstance(node, ast.Tuple):
+            return tuple(self.evaluate(element) for element in node.elts)
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+            return _UNARY_OPERATORS[type(node.op)](self._number(self.evaluate(node.operand)))
+        if isinstance(node, ast.BinOp):
+            left = self._number(self.evaluate(node.left))
+            right = self._number(self.evaluate(node.right))
+            if isinstance(node.op, ast.Pow):
+                return self._checked(self._power(left, right))
+            if isinstance(node.op, ast.Mult):
+                return self._checked(self._multiply(left, right))
+            if type(node.op) in _BINARY_OPERATORS:
+                return self._checked(_BINARY_OPERATORS[type(node.op)](left, right))
+        if isinstance(node, ast.Call):
+            name = node.func.id if isinstance(node.func, ast.Name) else None
+            if name not in self.functions or node.keywords:
+                raise ExpressionError("unsupported", f"Unsupported call: {ast.unparse(node.func)}")
+            args = [self.evaluate(arg) for arg in node.args]
+            return self._checked(self.functions[name](*args))
+        raise ExpressionError("unsupported", f"Unsupported syntax: {type(node).__name__}")
+
+
+def _check_shape(tree: ast.AST, max_nodes: int, max_depth: int) -> None:
+    """Count the nodes of tree and measure its depth without recursion."""
+    nodes = 0
+    stack = [(tree, 1)]
+    while stack:
+        node, depth = stack.pop()
+        nodes += 1
+        if nodes > max_nodes:
+            raise ExpressionError("too_many_nodes", f"Expression has more than {max_nodes} nodes")
+        if depth > max_depth:
+            raise ExpressionError("too_deep", f"Expression is nested more than {max_depth} levels")
+        stack.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
+
+
+def evaluate_expression(expression: str,
+                        max_chars: Optional[int] = None,
+                        max_nodes: Optional[int] = None,
+                        max_depth: Optional[int] = None,
+                        max_int_bits: Optional[int] = None,
+                        max_exponent: Optional[int] = None,
+                        cpu_budget_ms: Optional[float] = None) -> Any:
+    """
+    Evaluate an arithmetic expression within cost limits.
+
+    Args:
+        expression: Expression such as "2 + 3 * 4" or "sqrt(16)"
+        max_chars: Longest expression accepted
+        max_nodes: Most AST nodes accepted
+        max_depth: Deepest AST nesting accepted
+        max_int_bits: Largest integer result, in bits
+        max_exponent: Largest exponent of an integer power
+        cpu_budget_ms: CPU time evaluation may use
+
+    Limits left as None use Config.MATH_*.
+
+    Returns:
+        The value of the expression
+
+    Raises:
+        ExpressionError: If the expression is not allowed or exceeds a limit
+        SyntaxError: If the expression does not parse
+        ArithmeticError, ValueError, TypeError: As raised by the arithmetic
+    """
+    max_chars = Config.MATH_MAX_EXPRESSION_CHARS if max_chars is None else max_chars
+    if len(expression) > max_chars:
+        raise ExpressionError("too_long", f"Expression is longer than {max_chars} characters")
+    tree = ast.parse(expression, mode="eval")
+    _check_shape(tree,
+                 Config.MATH_MAX_AST_NODES if max_nodes is None else max_nodes,
+                 Config.MATH_MAX_AST_DEPTH if max_depth is None else max_depth)
+    evaluator = _Evaluator(
+        Config.MATH_MAX_INT_BITS if max_int_bits is None else max_int_bits,
+        Config.MATH_MAX_EXPONENT if max_exponent is None else max_exponent,
+        Config.MATH_CPU_BUDGET_MS if cpu_budget_ms is None else cpu_budget_ms)
+    return evaluator.evaluate(tree)
@@ -0,0 +1,305 @@
+"""
+Word Sketches
+Fixed-memory summaries of the words in a text, for texts too large to keep
+a set or counter of every distinct word.
+
+HyperLogLog estimates the number of distinct words in 2^precision bytes.
+Its relative standard error is 1.04 / sqrt(2^precision): 0.81% at the
+default precision 14 (16 KiB). About 95% of estimates fall within twice
+that.
+
+A count-min sketch (width x depth 64-bit counters) estimates each word's
+count. Estimates are never below the true count. They exceed it by at
+most (e / width) * total_words, with probability at least 1 - e^-depth:
+0.13% of the words and 98% at the default 2048 x 4 (64 KiB). A heap of
+the top_k words with the highest estimates gives the most frequent words.
+
+Words are hashed with BLAKE2b, so sketches built in different processes
+agree, and sketches of the same settings merge. Merged HyperLogLog and
+count-min sketches equal the sketch of the whole text. The merged top-k
+is chosen among the candidates of both sides, so a word frequent overall
+but in neither side's top_k can be missed.
+"""
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from src.config import Config
+
+_MASK_64 = (1 << 64) - 1
+_WORD = re.compile(r"\S+")
+_STRIP = '.,!?;:"()[]{}'
+# Distinct words counted in a dict before the sketches are updated
+_BATCH_WORDS = 65536
+# Characters of text split into words at a time
+_CHUNK_CHARS = 1 << 20
+
+
+def normalize_word(word: str) -> str:
+    """Case-fold a word and strip surrounding punctuation, as the analyzer counts it."""
+    return word.lower().strip(_STRIP)
+
+
+def _hash(word: str) -> int:
+    return int.from_bytes(blake2b(word.encode("utf-8"), digest_size=16).digest(), "little")
+
+
+class HyperLogLog:
+    """Distinct-count estimate in 2^precision one-byte registers."""
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add_hash(self, value: int) -> None:
+        """Add an item by its 64-bit hash."""
+        bits = 64 - self.precision
+        index = value >> bits
+        rest = value & ((1 << bits) - 1)
+        rank = bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, item: str) -> None:
+        """Add an item."""
+        self.add_hash(_hash(item) & _MASK_64)
+
+    def estimate(self) -> float:
+        """Estimated number of distinct items added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        harmonic = sum(2.0 ** -r for r in self.registers)
+        estimate = alpha * m * m / harmonic
+        empty = self.registers.count(0)
+        if estimate <= 2.5 * m and empty:
+            # Small cardinalities: linear counting over the empty registers
+            estimate = m * math.log(m / empty)
+        return estimate
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of estimate()."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Add other's items to this sketch; returns self."""
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLog precisions differ")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+
+class CountMinSketch:
+    """Count estimates in depth rows of width 64-bit counters."""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be positive")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def _columns(self, value: int) -> List[int]:
+        # Row i uses h1 + i * h2 (Kirsch-Mitzenmacher), from the hash's top 64 bits
+        h1 = (value >> 64) & 0xFFFFFFFF
+        h2 = (value >> 96) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add_hash(self, value: int, count: int = 1) -> int:
+        """Add count occurrences of an item by its 128-bit hash; returns its new estimate."""
+        column, step = (value >> 64) & 0xFFFFFFFF, (value >> 96) | 1
+        estimate = _MASK_64
+        for row in self.rows:
+            index = column % self.width
+            row[index] += count
+            estimate = min(estimate, row[index])
+            column += step
+        self.total += count
+        return estimate
+
+    def estimate_hash(self, value: int) -> int:
+        """Estimated count of an item by its 128-bit hash."""
+        return min(row[column] for row, column in zip(self.rows, self._columns(value)))
+
+    def add(self, item: str, count: int = 1) -> None:
+        """Add count occurrences of an item."""
+        self.add_hash(_hash(item), count)
+
+    def estimate(self, item: str) -> int:
+        """Estimated count of an item; never below the true count."""
+        return self.estimate_hash(_hash(item))
+
+    @property
+    def error_bound(self) -> int:
+        """Most an estimate exceeds the true count, with probability confidence."""
+        return math.ceil(math.e / self.width * self.total)
+
+    @property
+    def confidence(self) -> float:
+        """Probability that an estimate is within error_bound."""
+        return 1 - math.exp(-self.depth)
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """Add other's counts to this sketch; returns self."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Count-min sketch dimensions differ")
+        for row, other_row in zip(self.rows, other.rows):
+            for column, count in enumerate(other_row):
+                if count:
+                    row[column] += count
+        self.total += other.total
+        return self
+
+
+class WordSketch:
+    """Distinct and most frequent words of a text in fixed memory."""
+
+    def __init__(self, precision: Optional[int] = None, width: Optional[int] = None,
+                 depth: Optional[int] = None, top_k: Optional[int] = None):
+        """
+        Initialize empty sketches; settings default to Config.SKETCH_*.
+
+        Args:
+            precision: HyperLogLog precision (2^precision bytes)
+            width: Count-min sketch width
+            depth: Count-min sketch depth
+            top_k: Most frequent words kept
+
+        Raises:
+            ValueError: If a setting is out of range
+        """
+        self.distinct = HyperLogLog(
+            Config.SKETCH_HLL_PRECISION if precision is None else precision)
+        self.counts = CountMinSketch(Config.SKETCH_CMS_WIDTH if width is None else width,
+                                     Config.SKETCH_CMS_DEPTH if depth is None else depth)
+        self.top_k = Config.SKETCH_TOP_K if top_k is None else top_k
+        if self.top_k < 1:
+            raise ValueError("top_k must be positive")
+        # Candidate words with their latest estimates, and a min-heap over
+        # them that may hold stale entries
+        self._top: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def _offer(self, word: str, estimate: int) -> None:
+        if word in self._top or len(self._top) < self.top_k:
+            self._top[word] = estimate
+            heapq.heappush(self._heap, (estimate, word))
+        else:
+            while self._heap[0][0] != self._top.get(self._heap[0][1]):
+                heapq.heappop(self._heap)
+            if estimate <= self._heap[0][0]:
+                return
+            _, smallest = heapq.heapreplace(self._heap, (estimate, word))
+            del self._top[smallest]
+            self._top[word] = estimate
+        if len(self._heap) > 4 * self.top_k:
+            self._heap = [(count, word) for word, count in self._top.items()]
+            heapq.heapify(self._heap)
+
+    def add_counts(self, counts: Dict[str, int]) -> "WordSketch":
+        """Add normalized words with their counts; returns self."""
+        for word, count in counts.items():
+            value = _hash(word)
+            self.distinct.add_hash(value & _MASK_64)
+            self._offer(word, self.counts.add_hash(value, count))
+        return self
+
+    def update(self, words: Iterable[str]) -> "WordSketch":
+        """Add normalized words; returns self."""
+        batch: Counter = Counter()
+        for word in words:
+            batch[word] += 1
+            if len(batch) >= _BATCH_WORDS:
+                self.add_counts(batch)
+                batch.clear()
+        return self.add_counts(batch)
+
+    def unique_words(self) -> int:
+        """Estimated number of distinct words."""
+        return round(self.distinct.estimate())
+
+    def top_words(self) -> List[Tuple[str, int]]:
+        """Most frequent words with their estimated counts, most frequent first."""
+        return sorted(self._top.items(), key=lambda item: (-item[1], item[0]))
+
+    def error_bounds(self) -> Dict[str, float]:
+        """Error bounds of unique_words() and of the top_words() counts."""
+        return {
+            "unique_words_relative_error": round(self.distinct.relative_error, 4),
+            "top_word_count_overestimate": self.counts.error_bound,
+            "top_word_count_confidence": round(self.counts.confidence, 4),
+        }
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the sketches (not counting the top-k words)."""
+        return len(self.distinct.registers) + 8 * self.counts.width * self.counts.depth
+
+    def merge(self, other: "WordSketch") -> "WordSketch":
+        """Add the words of other (e.g. another chunk's sketch) to this one; returns self."""
+        self.distinct.merge(other.distinct)
+        self.counts.merge(other.counts)
+        candidates = set(self._top) | set(other._top)
+        self._top = {}
+        self._heap = []
+        for word in candidates:
+            self._offer(word, self.counts.estimate(word))
+        return self
+
+
+def word_lists(chunks: Iterable[str], chunk_chars: int = _CHUNK_CHARS) -> Iterable[List[str]]:
+    """
+    Lists of the words of text arriving in chunks, keeping words split
+    across chunk boundaries whole. Chunks longer than chunk_chars are read
+    in slices, so at most about chunk_chars of words are listed at a time.
+    """
+    carry = ""
+    for chunk in chunks:
+        for start in range(0, len(chunk), chunk_chars):
+            text = carry + chunk[start:start + chunk_chars]
+            cut = len(text)
+            while cut and not text[cut - 1].isspace():
+                cut -= 1
+            # The last word may continue in the next slice
+            text, carry = text[:cut], text[cut:]
+            yield _WORD.findall(text)
+    if carry:
+        yield [carry]
+
+
+def iter_words(chunks: Iterable[str]) -> Iterable[str]:
+    """Words of text arriving in chunks (see word_lists)."""
+    for words in word_lists(chunks):
+        yield from words
+
+
+def normalized_counts(counts: Dict[str, int]) -> Counter:
+    """Word counts folded into counts of the normalized words."""
+    normalized: Counter = Counter()
+    for word, count in counts.items():
+        normalized[normalize_word(word)] += count
+    return normalized
+
+
+def sketch_words(text: Union[str, Iterable[str]], **settings: int) -> WordSketch:
+    """
+    Sketch of the normalized words of a text. Module-level so that chunks
+    can be sketched in worker processes and the results merged.
+
+    Args:
+        text: Text, or the text as an iterable of chunks (e.g. text_chunks
+            of a blob handle), read once
+        **settings: WordSketch settings (precision, width, depth, top_k)
+    """
+    chunks = [text] if isinstance(text, str) else text
+    sketch = WordSketch(**settings)
+    for words in word_lists(chunks):
+        sketch.add_counts(normalized_counts(Counter(words)))
+    return sketch
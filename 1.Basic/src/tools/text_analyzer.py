@@ -1,20 +1,49 @@
 """
 Text Analyzer Tool
 A simple tool that analyzes text properties like word count, character count, etc.
+
+In sketch mode the words are scanned once without building a list or set
+of them; unique and most frequent words come from fixed-memory sketches
+(see src.tools.sketches) and are estimates with known error bounds.
 """
 import re
-from typing import Dict, Any
-
-
-def text_analyzer_tool(text: str) -> Dict[str, Any]:
+from collections import Counter
+from typing import Dict, Any, Optional
+
+from src.config import Config
+from src.tools.sketches import WordSketch, normalize_word, normalized_counts, word_lists
+from src.tracing import trace_tool
+
+
+def _sketch_word_metrics(text: str) -> Dict[str, Any]:
+    """Word metrics from one pass over text in slices, with unique and top words sketched."""
+    metrics = {"word_count": 0, "total_length": 0, "longest_word": "",
+               "sketch": WordSketch()}
+    for words in word_lists([text]):
+        counts = Counter(words)
+        metrics["word_count"] += len(words)
+        metrics["total_length"] += sum(len(word) * count for word, count in counts.items())
+        longest = max(counts, key=len, default="")
+        if len(longest) > len(metrics["longest_word"]):
+            metrics["longest_word"] = longest
+        metrics["sketch"].add_counts(normalized_counts(counts))
+    return metrics
+
+
+@trace_tool
+def text_analyzer_tool(text: str, sketch: Optional[bool] = None) -> Dict[str, Any]:
     """
     Analyzes text and returns various metrics.
 
     Args:
         text: The text to analyze
+        sketch: If True, estimate unique and most frequent words in fixed
+            memory instead of counting them exactly; None uses
+            Config.TEXT_ANALYZER_SKETCH
 
     Returns:
-        Dictionary containing analysis results
+        Dictionary containing analysis results; in sketch mode also
+        "top_words" and "sketch_error_bounds"
     """
     if not text or not isinstance(text, str):
         return {
@@ -25,8 +54,10 @@ def text_analyzer_tool(text: str) -> Dict[str, Any]:
             "paragraph_count": 0
         }
 
+    if sketch is None:
+        sketch = Config.TEXT_ANALYZER_SKETCH
+
     # Basic metrics
-    word_count = len(text.split())
     character_count = len(text)
     character_count_no_spaces = len(text.replace(' ', ''))
 
@@ -36,17 +67,25 @@ def text_analyzer_tool(text: str) -> Dict[str, Any]:
     # Paragraph count
     paragraph_count = len([p for p in text.split('\n\n') if p.strip()])
 
-    # Average word length
-    words = text.split()
-    avg_word_length = sum(len(word)
-                          for word in words) / len(words) if words else 0
+    if sketch:
+        metrics = _sketch_word_metrics(text)
+        word_count = metrics["word_count"]
+        avg_word_length = metrics["total_length"] / word_count if word_count else 0
+        longest_word = metrics["longest_word"]
+        unique_words = metrics["sketch"].unique_words()
+    else:
+        words = text.split()
+        word_count = len(words)
+
+        # Average word length
+        avg_word_length = sum(len(word)
+                              for word in words) / len(words) if words else 0
 
-    # Find longest word
-    longest_word = max(words, key=len) if words else ""
+        # Find longest word
+        longest_word = max(words, key=len) if words else ""
 
-    # Count unique words (case insensitive)
-    unique_words = len(set(word.lower().strip('.,!?;:"()[]{}')
-                       for word in words))
+        # Count unique words (case insensitive)
+        unique_words = len(set(normalize_word(word) for word in words))
 
     analysis_result = {
         "word_count": word_count,
@@ -61,6 +100,9 @@ def text_analyzer_tool(text: str) -> Dict[str, Any]:
         "reading_time_minutes": round(word_count / 200, 1),
         "summary": f"Text contains {word_count} words, {sentence_count} sentences, and takes ~{round(word_count / 200, 1)} minutes to read."
     }
+    if sketch:
+        analysis_result["top_words"] = metrics["sketch"].top_words()
+        analysis_result["sketch_error_bounds"] = metrics["sketch"].error_bounds()
 
     print(
         f"📊 Text Analysis Complete: {word_count} words, {character_count} characters")
@@ -0,0 +1,25 @@
+"""
+Local span tracing for workflow runs.
+"""
+
+from .exporter import JsonlSpanExporter
+from .tracer import (
+    Span,
+    Tracer,
+    TracingCallbackHandler,
+    get_tracer,
+    set_tracer,
+    trace_tool,
+    traced
+)
+
+__all__ = [
+    'JsonlSpanExporter',
+    'Span',
+    'Tracer',
+    'TracingCallbackHandler',
+    'get_tracer',
+    'set_tracer',
+    'trace_tool',
+    'traced'
+]
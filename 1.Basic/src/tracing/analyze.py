@@ -0,0 +1,197 @@
+"""
+Trace Analyzer
+Reports the slowest spans and the critical path of traced runs from the
+JSONL files written by the local tracer.
+
+The critical path of a span is found walking back from its end: the child
+that finished last before the span ended is on it, then the child that
+finished last before that one started, and so on, recursing into each.
+Time on the path not covered by such a child is the span's own ("self")
+time. Summed over all traces this shows which nodes actually decide the
+run time, as opposed to ones that are slow but run in parallel.
+
+Run from the project root:
+    python -m src.tracing.analyze [traces/spans.jsonl ...] [--top 10]
+"""
+import argparse
+import glob
+import json
+import os
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from src.config import Config
+
+# Tolerance for clock rounding when comparing span ends (seconds)
+_EPSILON = 0.0005
+
+
+def load_spans(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Read spans from JSONL files, including rotated copies (path.1, path.2, ...).
+
+    Lines that are not valid JSON (e.g. a partly written last line) are skipped.
+    """
+    files: List[str] = []
+    for path in paths:
+        files.extend(sorted(glob.glob(f"{glob.escape(path)}.*"), reverse=True))
+        if os.path.exists(path):
+            files.append(path)
+    spans = []
+    for file in files:
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return spans
+
+
+def _end(span: Dict[str, Any]) -> float:
+    return span["start"] + span["duration_ms"] / 1000
+
+
+def critical_path(spans: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Critical path of one trace.
+
+    Args:
+        spans: All spans of the trace
+
+    Returns:
+        (span, self_ms) pairs from the root down, where self_ms is the
+        span's time on the path not spent in a child on the path
+    """
+    ids = {span["span_id"] for span in spans}
+    children: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    roots = []
+    for span in spans:
+        if span.get("parent_id") in ids:
+            children[span["parent_id"]].append(span)
+        else:
+            roots.append(span)
+    if not roots:
+        return []
+
+    path: List[Tuple[Dict[str, Any], float]] = []
+
+    def walk(span: Dict[str, Any]) -> None:
+        cursor = _end(span)
+        chain = []
+        for child in sorted(children[span["span_id"]], key=_end, reverse=True):
+            if _end(child) <= cursor + _EPSILON:
+                chain.append(child)
+                cursor = child["start"]
+        chain.reverse()
+        self_ms = span["duration_ms"] - sum(child["duration_ms"] for child in chain)
+        path.append((span, round(max(0.0, self_ms), 3)))
+        for child in chain:
+            walk(child)
+
+    walk(max(roots, key=lambda span: span["duration_ms"]))
+    return path
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def analyze(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregate spans into per-span-name latency and critical-path statistics.
+
+    Returns:
+        Dictionary with "traces", "spans" (per kind/name latency stats),
+        "critical" (per kind/name time on critical paths) and "slowest"
+        (critical path of the slowest trace)
+    """
+    traces: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    durations: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+    for span in spans:
+        traces[span["trace_id"]].append(span)
+        durations[(span["kind"], span["name"])].append(span["duration_ms"])
+
+    total_ms = 0.0
+    on_path: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+    slowest: List[Tuple[Dict[str, Any], float]] = []
+    for trace_spans in traces.values():
+        path = critical_path(trace_spans)
+        if not path:
+            continue
+        total_ms += path[0][0]["duration_ms"]
+        if not slowest or path[0][0]["duration_ms"] > slowest[0][0]["duration_ms"]:
+            slowest = path
+        for span, self_ms in path:
+            on_path[(span["kind"], span["name"])].append(self_ms)
+
+    span_stats = {
+        key: {
+            "count": len(values),
+            "mean_ms": round(sum(values) / len(values), 3),
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "max_ms": max(values),
+        }
+        for key, values in durations.items()
+    }
+    critical_stats = {
+        key: {
+            "traces": len(values),
+            "self_ms": round(sum(values), 3),
+            "share": round(sum(values) / total_ms, 4) if total_ms else 0.0,
+        }
+        for key, values in on_path.items()
+    }
+    return {"traces": len(traces), "spans": span_stats, "critical": critical_stats,
+            "slowest": slowest}
+
+
+def print_report(report: Dict[str, Any], top: int = 10) -> None:
+    """Print the slowest spans, critical-path shares and the slowest trace."""
+    print(f"\n🔎 {report['traces']} traces")
+
+    print(f"\n🐢 Slowest spans by p95")
+    print("=" * 80)
+    print(f"{'kind':<7}{'name':<33}{'count':>7}{'mean':>10}{'p50':>10}{'p95':>10}  (ms)")
+    print("-" * 80)
+    ranked = sorted(report["spans"].items(), key=lambda item: item[1]["p95_ms"], reverse=True)
+    for (kind, name), stats in ranked[:top]:
+        print(f"{kind:<7}{name[:32]:<33}{stats['count']:>7}{stats['mean_ms']:>10.2f}"
+              f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}")
+
+    print(f"\n🧭 Critical path: own time on the path, share of all run time")
+    print("=" * 80)
+    print(f"{'kind':<7}{'name':<33}{'traces':>8}{'self ms':>14}{'share':>10}")
+    print("-" * 80)
+    ranked = sorted(report["critical"].items(), key=lambda item: item[1]["self_ms"], reverse=True)
+    for (kind, name), stats in ranked[:top]:
+        print(f"{kind:<7}{name[:32]:<33}{stats['traces']:>8}{stats['self_ms']:>14.2f}"
+              f"{stats['share']:>10.1%}")
+
+    if report["slowest"]:
+        root = report["slowest"][0][0]
+        print(f"\n⏱️ Slowest trace {root['trace_id']} ({root['duration_ms']:.2f} ms)")
+        for span, self_ms in report["slowest"]:
+            print(f"  {span['kind']:<6} {span['name']:<32} {span['duration_ms']:>10.2f} ms"
+                  f"  (self {self_ms:.2f} ms)")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Summarize local trace files")
+    parser.add_argument("paths", nargs="*", default=[Config.TRACE_PATH],
+                        help="Span JSONL files (rotated copies are included)")
+    parser.add_argument("--top", type=int, default=10, help="Rows per table")
+    args = parser.parse_args(argv)
+
+    spans = load_spans(args.paths)
+    if not spans:
+        print(f"No spans found in {', '.join(args.paths)}")
+        return
+    print_report(analyze(spans), top=args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+JSONL Span Exporter
+Writes finished spans to a rotating JSONL file from a background thread.
+
+export() only puts the span on a bounded queue, so recording a span never
+waits for the disk; when the queue is full the span is dropped and counted.
+The writer thread appends a batch once batch_size spans are waiting or
+flush_seconds have passed, and rotates the file like
+logging.handlers.RotatingFileHandler: spans.jsonl → spans.jsonl.1 → ... →
+spans.jsonl.<backup_count>.
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List
+
+_STOP = object()
+
+
+class JsonlSpanExporter:
+    """Batched, rotating JSONL writer running on its own thread."""
+
+    def __init__(self,
+                 path: str,
+                 max_bytes: int = 10_000_000,
+                 backup_count: int = 5,
+                 batch_size: int = 256,
+                 flush_seconds: float = 1.0,
+                 queue_size: int = 10_000):
+        """
+        Initialize the exporter and start its writer thread.
+
+        Args:
+            path: JSONL file to append to
+            max_bytes: Size at which the file is rotated (0 never rotates)
+            backup_count: Rotated files kept
+            batch_size: Spans written per batch at most
+            flush_seconds: Longest time a span waits before being written
+            queue_size: Spans that may wait; more are dropped
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.exported = 0
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._closed = False
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def export(self, span: Dict[str, Any]) -> None:
+        """Queue a finished span for writing; never blocks."""
+        try:
+            self._queue.put_nowait(span)
+            self.exported += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every span queued so far is written."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Write the remaining spans and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout=10)
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        due = time.monotonic() + self.flush_seconds
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, due - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP or isinstance(item, threading.Event):
+                self._write(batch)
+                batch = []
+                if item is _STOP:
+                    if self._file is not None:
+                        self._file.close()
+                    return
+                item.set()
+                continue
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self.batch_size or time.monotonic() >= due:
+                self._write(batch)
+                batch = []
+                due = time.monotonic() + self.flush_seconds
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        data = "".join(
+            json.dumps(span, separators=(",", ":"), default=str) + "\n" for span in batch
+        ).encode("utf-8")
+        try:
+            if self._file is None:
+                self._file = open(self.path, "ab")
+            if self.max_bytes and self._file.tell() and self._file.tell() + len(data) > self.max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self.written += len(batch)
+        except OSError as e:
+            # Tracing must not take the workflow down
+            self.dropped += len(batch)
+            print(f"⚠️ Span export failed: {e}")
+
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "ab")
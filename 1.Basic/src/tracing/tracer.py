@@ -0,0 +1,344 @@
+"""
+Local Span Tracer
+Records a span per graph run, node, LLM call and tool call without a
+remote tracing service.
+
+TracingCallbackHandler follows a run through LangChain callbacks: the
+outermost run (the graph) starts a trace, LangGraph nodes and chat model
+calls become child spans. Plain-function tools are wrapped with
+trace_tool, which records a span under the node that calls it.
+
+Sampling is decided once per trace at its root (head-based): an unsampled
+trace costs a dictionary entry per run and nothing is exported. Finished
+spans go to a JsonlSpanExporter; a span is a flat dict:
+
+    {"trace_id", "span_id", "parent_id", "name", "kind", "start",
+     "duration_ms", "status", "error", "attrs": {...}}
+"""
+import contextvars
+import functools
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+
+from src.blobs import text_length
+from src.config import Config
+from src.profiling import active_session, profile_scope
+from src.tracing.exporter import JsonlSpanExporter
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    """A span being recorded; exported as a dict when it ends."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "sampled",
+                 "start", "_started", "duration_ms", "attrs")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, kind: str,
+                 sampled: bool, attrs: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.sampled = sampled
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.attrs = attrs
+
+    def set(self, **attrs: Any) -> None:
+        """Add attributes to the span."""
+        self.attrs.update(attrs)
+
+    def end(self) -> float:
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        return self.duration_ms
+
+
+# Innermost open node or tool span of the current context, parent of tool spans
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def text_size(value: Any, depth: int = 2) -> int:
+    """
+    Characters of text in a value: strings (and blob handles), messages,
+    and the values of dicts and lists up to depth levels down.
+    """
+    if isinstance(value, str):
+        return text_length(value)
+    if isinstance(value, BaseMessage):
+        return len(value.content) if isinstance(value.content, str) else 0
+    if depth <= 0:
+        return 0
+    if isinstance(value, dict):
+        return sum(text_size(v, depth - 1) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(text_size(v, depth - 1) for v in value)
+    return 0
+
+
+class Tracer:
+    """Creates spans, samples traces at their root and hands spans to an exporter."""
+
+    def __init__(self, exporter: Any, sample_rate: float = 1.0):
+        """
+        Initialize the tracer.
+
+        Args:
+            exporter: Object with an export(span_dict) method
+            sample_rate: Share of traces recorded, decided at each root
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.stats = {"traces": 0, "sampled_traces": 0, "spans": 0}
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, kind: str, parent: Optional[Span] = None,
+                   **attrs: Any) -> Span:
+        """
+        Start a span, or a new trace if parent is None.
+
+        Children of an unsampled span are unsampled too.
+        """
+        if parent is None:
+            sampled = self.sample_rate >= 1 or random.random() < self.sample_rate
+            with self._lock:
+                self.stats["traces"] += 1
+                self.stats["sampled_traces"] += sampled
+            return Span(uuid.uuid4().hex, None, name, kind, sampled, attrs)
+        return Span(parent.trace_id, parent.span_id, name, kind, parent.sampled, attrs)
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None, **attrs: Any) -> None:
+        """Finish a span and export it if its trace is sampled."""
+        if span.duration_ms is not None:
+            return
+        span.end()
+        if not span.sampled:
+            return
+        span.attrs.update(attrs)
+        with self._lock:
+            self.stats["spans"] += 1
+        self.exporter.export({
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "name": span.name,
+            "kind": span.kind,
+            "start": round(span.start, 6),
+            "duration_ms": span.duration_ms,
+            "status": "error" if error is not None else "ok",
+            "error": f"{type(error).__name__}: {error}" if error is not None else None,
+            "attrs": span.attrs,
+        })
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attrs: Any) -> Iterator[Optional[Span]]:
+        """
+        Record a span under the current node or tool span.
+
+        Outside a traced run (no open span in the context) nothing is
+        recorded and None is yielded.
+        """
+        parent = _current_span.get()
+        if parent is None or parent.duration_ms is not None or not parent.sampled:
+            yield None
+            return
+        span = self.start_span(name, kind, parent, **attrs)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, error=e)
+            raise
+        finally:
+            _current_span.reset(token)
+        self.end_span(span)
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """Turns LangChain/LangGraph callback events into spans."""
+
+    # Run in the caller's context so node spans are visible to trace_tool
+    run_inline = True
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+        # run_id -> (span, recorded); unrecorded runs (internal chains) map
+        # to the nearest recorded ancestor so their children find a parent
+        self._runs: Dict[UUID, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _parent(self, parent_run_id: Optional[UUID]) -> Optional[Span]:
+        if parent_run_id is None:
+            return None
+        with self._lock:
+            entry = self._runs.get(parent_run_id)
+        return entry[0] if entry is not None else None
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], name: str, kind: str,
+               **attrs: Any) -> Span:
+        span = self.tracer.start_span(name, kind, self._parent(parent_run_id), **attrs)
+        with self._lock:
+            self._runs[run_id] = (span, True)
+        return span
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None, **attrs: Any) -> None:
+        with self._lock:
+            entry = self._runs.pop(run_id, None)
+        if entry is not None and entry[1]:
+            self.tracer.end_span(entry[0], error=error, **attrs)
+
+    # Graph and nodes
+
+    def on_chain_start(self, serialized: Optional[Dict[str, Any]], inputs: Any, *,
+                       run_id: UUID, parent_run_id: Optional[UUID] = None,
+                       metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "chain")
+        node = (metadata or {}).get("langgraph_node")
+        parent = self._parent(parent_run_id)
+        if parent_run_id is None or parent is None:
+            self._start(run_id, None, name, "graph", input_chars=text_size(inputs))
+        elif node is not None and name == node and not (parent.kind == "node" and parent.name == name):
+            # The node's own run; a Runnable node named like the node
+            # (e.g. a RunnableLambda) is part of the same span
+            span = self._start(run_id, parent_run_id, name, "node", input_chars=text_size(inputs))
+            _current_span.set(span)
+        else:
+            with self._lock:
+                self._runs[run_id] = (parent, False)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            entry = self._runs.get(run_id)
+        if entry is not None and entry[1]:
+            self._end(run_id, output_chars=text_size(outputs))
+            _current_span.set(None)
+        else:
+            self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            entry = self._runs.get(run_id)
+        if entry is not None and entry[1]:
+            _current_span.set(None)
+        self._end(run_id, error=error)
+
+    # LLM calls
+
+    def on_chat_model_start(self, serialized: Optional[Dict[str, Any]], messages: Any, *,
+                            run_id: UUID, parent_run_id: Optional[UUID] = None,
+                            **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "llm")
+        self._start(run_id, parent_run_id, name, "llm", input_chars=text_size(messages, depth=3))
+
+    def on_llm_start(self, serialized: Optional[Dict[str, Any]], prompts: Any, *,
+                     run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "llm")
+        self._start(run_id, parent_run_id, name, "llm", input_chars=text_size(prompts))
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        attrs: Dict[str, Any] = {"output_chars": 0}
+        for generations in response.generations:
+            for generation in generations:
+                attrs["output_chars"] += len(generation.text)
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    attrs["input_tokens"] = usage.get("input_tokens")
+                    attrs["output_tokens"] = usage.get("output_tokens")
+        self._end(run_id, **attrs)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=error)
+
+    # LangChain tools
+
+    def on_tool_start(self, serialized: Optional[Dict[str, Any]], input_str: str, *,
+                      run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "tool")
+        self._start(run_id, parent_run_id, name, "tool", input_chars=len(input_str))
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, output_chars=text_size(output if isinstance(output, (str, dict, list))
+                                                 else str(output)))
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=error)
+
+
+_tracer: Optional[Tracer] = None
+_handler: Optional[TracingCallbackHandler] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the process-wide tracer, or None unless Config.TRACE_ENABLED."""
+    global _tracer, _handler
+    with _tracer_lock:
+        if _tracer is None and Config.TRACE_ENABLED:
+            exporter = JsonlSpanExporter(
+                Config.TRACE_PATH,
+                max_bytes=Config.TRACE_MAX_BYTES,
+                backup_count=Config.TRACE_BACKUP_COUNT,
+                batch_size=Config.TRACE_BATCH_SIZE,
+                flush_seconds=Config.TRACE_FLUSH_SECONDS
+            )
+            _tracer = Tracer(exporter, sample_rate=Config.TRACE_SAMPLE_RATE)
+            _handler = TracingCallbackHandler(_tracer)
+        return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Replace the process-wide tracer (None recreates it from Config)."""
+    global _tracer, _handler
+    with _tracer_lock:
+        _tracer = tracer
+        _handler = TracingCallbackHandler(tracer) if tracer is not None else None
+
+
+def traced(app: Any) -> Any:
+    """
+    Return app with the tracing callback attached, or app itself when
+    tracing is off.
+
+    Args:
+        app: Compiled LangGraph application (or any Runnable)
+    """
+    if get_tracer() is None:
+        return app
+    return app.with_config(callbacks=[_handler])
+
+
+def trace_tool(fn: F) -> F:
+    """
+    Decorator recording a "tool" span for each call inside a traced run,
+    and a "tool" scope while a profiling session is active.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if active_session() is not None:
+            with profile_scope("tool", fn.__name__):
+                return _traced_call(fn, args, kwargs)
+        return _traced_call(fn, args, kwargs)
+    return wrapper  # type: ignore[return-value]
+
+
+def _traced_call(fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+    tracer = _tracer
+    if tracer is None or _current_span.get() is None:
+        return fn(*args, **kwargs)
+    with tracer.span(fn.__name__, "tool", input_chars=text_size(list(args))) as span:
+        result = fn(*args, **kwargs)
+        if span is not None:
+            span.set(output_chars=text_size(result))
+        return result
@@ -1,10 +1,18 @@
 """Workflows package."""
 
-from src.workflows.basic_workflow import create_langgraph_workflow, run_workflow
+from src.workflows.basic_workflow import (
+    create_langgraph_workflow,
+    run_workflow,
+    stream_workflow,
+)
 from src.workflows.advanced_workflow import create_advanced_workflow
+from src.workflows.chunked_workflow import create_chunked_workflow, run_chunked_workflow
 
 __all__ = [
     "create_langgraph_workflow",
     "run_workflow",
+    "stream_workflow",
     "create_advanced_workflow",
+    "create_chunked_workflow",
+    "run_chunked_workflow",
 ]
@@ -3,8 +3,10 @@ Advanced LangGraph workflow with conditional routing.
 """
 
 from langgraph.graph import StateGraph, END
+from langgraph_common.routing import route_for
 
 from src.models import GraphState
+from src.tracing import traced
 
 
 def conditional_router_node(state: GraphState) -> str:
@@ -17,15 +19,22 @@ def conditional_router_node(state: GraphState) -> str:
     Returns:
         Name of the next node to execute
     """
-    input_text = state.get("input_text", "")
+    # Route based on input content ("urgent", "simple" or neither)
+    return f"{route_for(state.get('input_text', ''))}_processor"
 
-    # Route based on input content
-    if "urgent" in input_text.lower():
-        return "priority_processor"
-    elif "simple" in input_text.lower():
-        return "simple_processor"
-    else:
-        return "standard_processor"
+
+def router_node(state: GraphState) -> GraphState:
+    """
+    Entry node; the routing decision is made by conditional_router_node
+    on its outgoing edges, so the state passes through unchanged.
+
+    Args:
+        state: Current graph state
+
+    Returns:
+        Empty update
+    """
+    return {}
 
 
 def priority_processor_node(state: GraphState) -> GraphState:
@@ -98,7 +107,7 @@ def create_advanced_workflow():
     workflow = StateGraph(GraphState)
 
     # Add nodes
-    workflow.add_node("router", conditional_router_node)
+    workflow.add_node("router", router_node)
     workflow.add_node("priority_processor", priority_processor_node)
     workflow.add_node("simple_processor", simple_processor_node)
     workflow.add_node("standard_processor", standard_processor_node)
@@ -122,4 +131,4 @@ def create_advanced_workflow():
     workflow.add_edge("simple_processor", END)
     workflow.add_edge("standard_processor", END)
 
-    return workflow.compile()
+    return traced(workflow.compile())
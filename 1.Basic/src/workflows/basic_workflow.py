@@ -2,20 +2,28 @@
 Basic LangGraph workflow with 3 sequential nodes.
 """
 
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
 from langgraph.graph import StateGraph, END
 
+from src.blobs import blob_runs, preview_text
 from src.models import GraphState
 from src.nodes import (
     input_processor_node,
     data_transformer_node,
     output_generator_node
 )
+from src.nodes.deadline import deadline_in
+from src.tracing import traced
 
 
-def create_langgraph_workflow():
+def create_langgraph_workflow(checkpointer: Any = None):
     """
     Creates and returns the basic LangGraph workflow.
 
+    Args:
+        checkpointer: Optional checkpoint saver to compile the graph with
+
     Returns:
         Compiled LangGraph application
     """
@@ -34,17 +42,56 @@ def create_langgraph_workflow():
     workflow.add_edge("output_generator", END)
 
     # Compile the graph
-    app = workflow.compile()
+    app = traced(blob_runs(workflow.compile(checkpointer=checkpointer)))
 
     return app
 
 
-def run_workflow(input_text: str):
+def stream_workflow(
+    app,
+    initial_state: Dict[str, Any],
+    token_nodes: Iterable[str] = ("data_transformer",)
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream a compiled workflow, yielding LLM tokens as they are generated.
+
+    Uses the graph's "messages" stream mode for tokens and the "values"
+    stream mode to keep track of the latest full state.
+
+    Args:
+        app: Compiled LangGraph application
+        initial_state: Initial graph state
+        token_nodes: Names of the nodes whose LLM tokens should be yielded
+
+    Yields:
+        ("token", text) for every LLM token emitted by a node in token_nodes,
+        followed by a single ("result", final_state) once the run completes
+    """
+    token_nodes = set(token_nodes)
+    final_state = None
+
+    for mode, chunk in app.stream(initial_state, stream_mode=["messages", "values"]):
+        if mode == "messages":
+            message, metadata = chunk
+            if metadata.get("langgraph_node") in token_nodes and message.content:
+                yield "token", message.content
+        else:
+            final_state = chunk
+
+    yield "result", final_state
+
+
+def run_workflow(input_text: str, stream: bool = False,
+                 deadline_seconds: Optional[float] = None):
     """
     Run the LangGraph workflow with given input.
 
     Args:
         input_text: Input text to process
+        stream: If True, print LLM tokens as they arrive instead of
+            waiting for the whole run to finish
+        deadline_seconds: If set, the run must answer within this many
+            seconds; the LLM transform falls back if it would miss it
 
     Returns:
         Final workflow state with results
@@ -63,12 +110,23 @@ def run_workflow(input_text: str):
         "output_text": "",
         "step": "started"
     }
+    if deadline_seconds is not None:
+        initial_state["deadline"] = deadline_in(deadline_seconds)
 
     # Run the workflow
-    result = app.invoke(initial_state)
+    if stream:
+        result = None
+        for kind, payload in stream_workflow(app, initial_state):
+            if kind == "token":
+                print(payload, end="", flush=True)
+            else:
+                print()
+                result = payload
+    else:
+        result = app.invoke(initial_state)
 
     print("=" * 50)
     print("🎉 Workflow completed!")
-    print(result["output_text"])
+    print(preview_text(result["output_text"]))
 
     return result
@@ -0,0 +1,102 @@
+"""
+Chunked map-reduce workflow for long documents.
+
+input_processor → chunk_transformer × N (parallel, via Send) → chunk_reducer
+→ output_generator
+
+The document is transformed in token-bounded chunks instead of one prompt,
+so it never exceeds the model's context window and the run takes about
+(chunks / concurrency) LLM calls of chunk size instead of one call that
+grows with the document.
+"""
+
+from typing import Any, Optional
+
+from langgraph.graph import StateGraph, END
+
+from src.blobs import blob_runs, preview_text
+from src.config import Config
+from src.models import GraphState
+from src.nodes import output_generator_node
+from src.nodes.chunked_transformer import (
+    chunk_input_processor_node,
+    chunk_reducer_node,
+    chunk_transformer_node,
+    fan_out_chunks
+)
+from src.nodes.deadline import deadline_in
+from src.tracing import traced
+
+
+def create_chunked_workflow(max_concurrency: Optional[int] = None, checkpointer: Any = None):
+    """
+    Creates the chunked map-reduce workflow.
+
+    Args:
+        max_concurrency: Chunks transformed at once (Config.CHUNK_CONCURRENCY
+            if None); LLM calls are further bounded by the shared limiter
+        checkpointer: Optional checkpoint saver to compile the graph with
+
+    Returns:
+        Compiled LangGraph application
+
+    Raises:
+        ValueError: If max_concurrency is not positive
+    """
+    if max_concurrency is None:
+        max_concurrency = Config.CHUNK_CONCURRENCY
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be positive, got {max_concurrency}")
+    workflow = StateGraph(GraphState)
+
+    workflow.add_node("input_processor", chunk_input_processor_node)
+    workflow.add_node("chunk_transformer", chunk_transformer_node)
+    workflow.add_node("chunk_reducer", chunk_reducer_node)
+    workflow.add_node("output_generator", output_generator_node)
+
+    workflow.set_entry_point("input_processor")
+    # Fan out one chunk_transformer task per chunk
+    workflow.add_conditional_edges("input_processor", fan_out_chunks,
+                                   ["chunk_transformer", "chunk_reducer"])
+    workflow.add_edge("chunk_transformer", "chunk_reducer")
+    workflow.add_edge("chunk_reducer", "output_generator")
+    workflow.add_edge("output_generator", END)
+
+    app = traced(blob_runs(workflow.compile(checkpointer=checkpointer)))
+    return app.with_config(max_concurrency=max_concurrency)
+
+
+def run_chunked_workflow(input_text: str, deadline_seconds: Optional[float] = None):
+    """
+    Run the chunked workflow with given input.
+
+    Args:
+        input_text: Input text to process
+        deadline_seconds: If set, the run must answer within this many
+            seconds; chunks whose LLM call would miss it fall back
+
+    Returns:
+        Final workflow state with results
+    """
+    print("🚀 Starting Chunked LangGraph Workflow...")
+    print("=" * 50)
+
+    app = create_chunked_workflow()
+
+    initial_state = {
+        "input_text": input_text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "started"
+    }
+    if deadline_seconds is not None:
+        initial_state["deadline"] = deadline_in(deadline_seconds)
+
+    result = app.invoke(initial_state)
+
+    print("=" * 50)
+    print("🎉 Chunked Workflow completed!")
+    print(preview_text(result["output_text"]))
+
+    return result
@@ -0,0 +1,216 @@
+"""
+Tests for the blob store and the blob-aware text helpers.
+"""
+
+import asyncio
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+import src.nodes.data_transformer as data_transformer
+from main import create_tool_enhanced_workflow, simple_router
+from src.blobs import (
+    MemoryBlobStore,
+    MmapBlobStore,
+    blob_runs,
+    count_words,
+    get_blob_store,
+    is_blob_ref,
+    join_text,
+    preview_text,
+    replace_text,
+    resolve_text,
+    set_blob_owner,
+    set_blob_store,
+    store_text,
+    strip_text,
+    text_chunks
+)
+from src.config import Config
+from src.models import GraphState
+from src.nodes import input_processor_node
+from src.workflows.basic_workflow import create_langgraph_workflow
+
+
+@pytest.fixture(params=["memory", "mmap"])
+def store(request, tmp_path, monkeypatch):
+    """Install a fresh store and a low size threshold for the test."""
+    store = MemoryBlobStore() if request.param == "memory" else MmapBlobStore(str(tmp_path))
+    set_blob_store(store)
+    monkeypatch.setattr(Config, "BLOB_MIN_CHARS", 100)
+    yield store
+    set_blob_store(None)
+
+
+def initial_state(input_text):
+    return {"input_text": input_text, "processed_text": "", "transformed_text": "",
+            "output_text": "", "step": "started"}
+
+
+class TestBlobStore:
+    """Tests for the store backends."""
+
+    def test_identical_content_is_stored_once(self, store):
+        first = store.put("x" * 1000)
+        second = store.put("x" * 1000)
+        assert first == second and first.startswith("blob:")
+        assert store.stats()["flat_blobs"] == 1
+        assert store.stats()["stored_bytes"] == 1000
+
+    def test_views_decode_multibyte_text_across_chunks(self, store):
+        text = "añ€😀" * 5000
+        view = store.view(store.put(text))
+        assert len(view) == len(text)
+        assert "".join(view.chunks(size=7)) == text
+        assert str(view) == text
+        assert view.preview(5) == text[:5]
+
+    def test_streamed_writer_matches_put(self, store):
+        writer = store.writer()
+        for _ in range(10):
+            writer.write("abc")
+        assert writer.close() == store.put("abc" * 10)
+
+    def test_writer_context_commits_on_clean_exit(self, store, tmp_path):
+        with store.writer() as writer:
+            writer.write("abc" * 10)
+        ref = writer.close()
+        assert ref == writer.close() == store.put("abc" * 10)
+        assert store.stats()["flat_blobs"] == 1
+        assert not list(tmp_path.glob(".partial-*"))
+
+    def test_writer_context_discards_on_error(self, store, tmp_path):
+        with pytest.raises(RuntimeError):
+            with store.writer() as writer:
+                writer.write("abc")
+                raise RuntimeError("boom")
+        assert store.stats()["flat_blobs"] == 0
+        assert not list(tmp_path.glob(".partial-*"))
+        with pytest.raises(ValueError):
+            writer.close()
+
+    def test_concat_refers_to_stored_parts(self, store):
+        body = store.put("b" * 500)
+        joined = store.concat(["<", body, ">"])
+        assert str(store.view(joined)) == "<" + "b" * 500 + ">"
+        assert store.stats()["stored_bytes"] == 500
+
+    def test_delete_and_clear(self, store):
+        ref = store.put("gone" * 100)
+        store.delete(ref)
+        assert not store.contains(ref)
+        store.put("also gone" * 100)
+        store.clear()
+        assert store.stats() == {"flat_blobs": 0, "concat_blobs": 0, "stored_bytes": 0}
+
+    def test_release_deletes_blobs_no_other_owner_holds(self, store):
+        kept = store.put("kept" * 100)
+        set_blob_owner("run-1")
+        shared = store.put("shared" * 100)
+        only_first = store.concat(["<", shared, ">"])
+        store.put("kept" * 100)
+        set_blob_owner("run-2")
+        store.put("shared" * 100)
+        set_blob_owner(None)
+
+        assert store.release("run-1") == 1
+        assert not store.contains(only_first)
+        assert store.contains(shared) and store.contains(kept)
+        assert store.release("run-2") == 1
+        assert not store.contains(shared)
+        # Blobs created without an owner stay
+        assert store.contains(kept) and store.stats()["flat_blobs"] == 1
+
+
+class TestTextHelpers:
+    """The helpers agree with the str operations they stand in for."""
+
+    def test_small_texts_stay_plain_strings(self, store):
+        assert join_text(["a", "b"]) == "ab"
+        assert replace_text("x PROCESSING: y", "PROCESSING:", "ENHANCED:") == "x ENHANCED: y"
+        assert preview_text("short") == "short"
+        assert get_blob_store().stats()["flat_blobs"] == 0
+
+    def test_large_texts_become_handles(self, store):
+        joined = join_text(["<", "z" * 200, ">"])
+        assert is_blob_ref(joined)
+        assert resolve_text(joined) == "<" + "z" * 200 + ">"
+        assert "202 chars" in preview_text(joined)
+
+    def test_streaming_operations(self, store):
+        text = "  one PROCESSING: two\tthree  " * 50
+        ref = store_text(text)
+        assert resolve_text(strip_text(ref, str.upper)) == text.strip().upper()
+        assert count_words(ref) == len(text.split())
+        replaced = replace_text(ref, "PROCESSING:", "ENHANCED:")
+        assert resolve_text(replaced) == text.replace("PROCESSING:", "ENHANCED:")
+        assert replace_text(ref, "absent", "x") == ref
+        assert "".join(text_chunks(ref, size=3)) == text
+
+    def test_matches_and_words_across_chunk_boundaries(self, store):
+        # Longer than one 1 MiB chunk; 11 characters do not divide it
+        text = "PROCESSING:" * 200_000
+        ref = store_text(text)
+        assert resolve_text(replace_text(ref, "PROCESSING:", "E:")) == "E:" * 200_000
+        assert count_words(ref) == 1
+
+
+class TestWorkflowsWithBlobs:
+    """Large inputs give the same results with handles in the state."""
+
+    def test_basic_workflow_output_matches(self, store, monkeypatch):
+        monkeypatch.setattr(data_transformer, "llm", None)
+        text = "  PROCESSING: large input with ümlauts  " * 20
+        app = create_langgraph_workflow()
+
+        updates = list(app.stream(initial_state(text), stream_mode="updates"))
+        assert updates[1]["data_transformer"]["transformed_text"].startswith("blob:")
+        result = app.invoke(initial_state(text))
+
+        monkeypatch.setattr(Config, "BLOB_MIN_CHARS", 0)
+        expected = create_langgraph_workflow().invoke(initial_state(text))
+        fields = ("input_text", "processed_text", "transformed_text", "output_text")
+        assert {f: result[f] for f in fields} == {f: expected[f] for f in fields}
+
+    def test_runs_release_their_blobs(self, store, monkeypatch):
+        monkeypatch.setattr(data_transformer, "llm", None)
+        text = "A large input for the blob store. " * 20
+        app = create_langgraph_workflow()
+
+        for _ in range(3):
+            result = app.invoke(initial_state(text))
+            assert store.stats() == {"flat_blobs": 0, "concat_blobs": 0, "stored_bytes": 0}
+        assert not is_blob_ref(result["output_text"]) and text.strip().upper() in result["output_text"]
+
+        asyncio.run(app.ainvoke(initial_state(text)))
+        assert store.stats()["flat_blobs"] == 0
+
+    def test_failed_runs_release_their_blobs(self, store):
+        def fail(state):
+            raise RuntimeError("node failed")
+
+        workflow = StateGraph(GraphState)
+        workflow.add_node("input_processor", input_processor_node)
+        workflow.add_node("fail", fail)
+        workflow.set_entry_point("input_processor")
+        workflow.add_edge("input_processor", "fail")
+        workflow.add_edge("fail", END)
+
+        with pytest.raises(RuntimeError):
+            blob_runs(workflow.compile()).invoke(initial_state("large input " * 20))
+        assert store.stats()["flat_blobs"] == 0
+
+    def test_router_counts_words_behind_a_handle(self, store):
+        ref = store_text("word " * 50)
+        assert simple_router({"processed_text": ref}) == "data_transformer"
+
+    def test_tool_workflow_analyzes_the_stored_text(self, store, monkeypatch):
+        monkeypatch.setattr(Config, "TOOL_OFFLOAD_MIN_CHARS", 0)
+        text = "Tool analysis input. " * 10
+
+        result = create_tool_enhanced_workflow().invoke({**initial_state(text), "tool_results": ""})
+        assert "- Words: 31" in result["transformed_text"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
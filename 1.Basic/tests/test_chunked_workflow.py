@@ -0,0 +1,148 @@
+"""
+Tests for the chunked map-reduce workflow.
+"""
+
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph_common.llm.limiter import CHARS_PER_TOKEN
+
+import src.nodes.data_transformer as data_transformer
+from src.config import Config
+from src.llm import LLMLimiter, set_llm_limiter
+from src.nodes.chunked_transformer import split_into_chunks
+from src.workflows.chunked_workflow import create_chunked_workflow
+
+PREFIX = "Transform this text into a creative format: "
+
+
+class EchoModel:
+    """LLM stand-in that answers [chunk] after a delay and records its peak concurrency."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, messages, **kwargs):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(self.delay)
+        with self._lock:
+            self.current -= 1
+        return AIMessage(content=f"[{messages[0].content[len(PREFIX):]}]")
+
+
+@pytest.fixture
+def limiter():
+    """A limiter that does not get in the way of the workflow's own bound."""
+    set_llm_limiter(LLMLimiter(requests_per_second=0, tokens_per_minute=0,
+                               initial_concurrency=32, max_concurrency=32))
+    yield
+    set_llm_limiter(None)
+
+
+def initial_state(input_text):
+    return {"input_text": input_text, "processed_text": "", "transformed_text": "",
+            "output_text": "", "step": "started"}
+
+
+def document(paragraphs=6, sentences=5):
+    return "\n\n".join(
+        " ".join(f"Paragraph {p} sentence {s} says something." for s in range(sentences))
+        for p in range(paragraphs)
+    )
+
+
+class TestSplitIntoChunks:
+    """Tests for split_into_chunks."""
+
+    def test_chunks_fit_the_budget_and_keep_every_word(self):
+        text = document()
+        chunks = split_into_chunks(text, max_tokens=40)
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 40 * CHARS_PER_TOKEN for chunk in chunks)
+        assert " ".join(chunks).split() == text.split()
+
+    def test_splits_at_sentence_ends(self):
+        for chunk in split_into_chunks(document(paragraphs=1, sentences=20), max_tokens=30):
+            assert chunk.endswith("something.")
+
+    def test_small_paragraphs_stay_whole(self):
+        text = "One.\n\nTwo.\n\nThree."
+        assert split_into_chunks(text, max_tokens=100) == [text]
+        assert split_into_chunks(text, max_tokens=2) == ["One.", "Two.", "Three."]
+
+    def test_a_sentence_over_the_budget_is_split_at_spaces(self):
+        chunks = split_into_chunks("word " * 100, max_tokens=10)
+        assert all(len(chunk) <= 40 for chunk in chunks)
+        assert " ".join(chunks).split() == ["word"] * 100
+
+    def test_empty_text(self):
+        assert split_into_chunks("  \n\n ", max_tokens=10) == []
+
+
+class TestChunkedWorkflow:
+    """Tests for the map-reduce workflow."""
+
+    def test_chunks_are_reduced_in_document_order(self, limiter, monkeypatch):
+        monkeypatch.setattr(data_transformer, "llm", EchoModel())
+        monkeypatch.setattr(Config, "CHUNK_MAX_TOKENS", 40)
+
+        result = create_chunked_workflow().invoke(initial_state(document()))
+
+        chunks = split_into_chunks("Processing: " + document().upper(), 40)
+        assert result["transformed_text"] == "\n\n".join(f"[{chunk}]" for chunk in chunks)
+        assert result["step"] == "output_generated"
+
+    def test_concurrency_is_bounded(self, limiter, monkeypatch):
+        llm = EchoModel(delay=0.05)
+        monkeypatch.setattr(data_transformer, "llm", llm)
+        # One paragraph per chunk
+        monkeypatch.setattr(Config, "CHUNK_MAX_TOKENS", 15)
+        text = document(paragraphs=8, sentences=1)
+
+        start = time.monotonic()
+        result = create_chunked_workflow(max_concurrency=4).invoke(initial_state(text))
+        elapsed = time.monotonic() - start
+
+        assert len(result["chunk_results"]) == 8
+        assert llm.peak == 4
+        # Two rounds of four calls rather than eight calls in a row
+        assert elapsed < 0.3
+
+    def test_runs_on_a_thread_do_not_share_chunks(self, limiter, monkeypatch):
+        monkeypatch.setattr(data_transformer, "llm", EchoModel())
+        # One paragraph per chunk
+        monkeypatch.setattr(Config, "CHUNK_MAX_TOKENS", 15)
+        app = create_chunked_workflow(checkpointer=MemorySaver())
+        config = {"configurable": {"thread_id": "doc"}}
+
+        first = app.invoke(initial_state(document(paragraphs=3, sentences=1)), config)
+        assert len(first["chunk_results"]) == 3
+        second = app.invoke(initial_state("Short one."), config)
+
+        assert second["chunk_results"] == {0: "[Processing: SHORT ONE.]"}
+        assert second["transformed_text"] == "[Processing: SHORT ONE.]"
+
+    def test_concurrency_must_be_positive(self):
+        with pytest.raises(ValueError):
+            create_chunked_workflow(max_concurrency=0)
+
+    def test_fallback_without_llm(self, monkeypatch):
+        monkeypatch.setattr(data_transformer, "llm", None)
+        monkeypatch.setattr(Config, "CHUNK_MAX_TOKENS", 6)
+
+        result = create_chunked_workflow().invoke(initial_state("First part.\n\nSecond part."))
+        assert result["transformed_text"] == (
+            "✨ TRANSFORMED: Processing: FIRST PART. ✨\n\n✨ TRANSFORMED: SECOND PART. ✨"
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
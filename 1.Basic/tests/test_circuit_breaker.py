@@ -0,0 +1,251 @@
+"""
+Tests for the LLM circuit breaker.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import pytest
+
+import src.llm.circuit_breaker as circuit_breaker
+import src.nodes.data_transformer as data_transformer
+from src.llm import CircuitBreaker, CircuitOpenError, LLMLimiter, set_llm_limiter
+from src.nodes.deadline import deadline_in
+from src.testing import FakeTimeoutError, StreamingFakeChatModel
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fail():
+    raise RuntimeError("LLM down")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", window=10, min_calls=4, open_seconds=30,
+                          slow_call_seconds=5, clock=clock)
+
+
+def _time_out():
+    raise FakeTimeoutError("Request timed out")
+
+
+def _trip(breaker):
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail)
+
+
+class TestCircuitBreaker:
+    """Tests for the state machine."""
+
+    def test_opens_on_error_rate(self, breaker):
+        breaker.call(lambda: "ok")
+        breaker.call(lambda: "ok")
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                breaker.call(_fail)
+        assert breaker.state == "open"
+        assert breaker.snapshot()["opened"] == 1
+
+    def test_check_rejects_only_while_open(self, breaker, clock):
+        breaker.check()
+        _trip(breaker)
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+        clock.now += 30
+        breaker.check()
+        # check() admits nothing: the probe is still available to call()
+        assert breaker.call(lambda: "ok") == "ok"
+        assert breaker.state == "closed"
+
+    def test_needs_min_calls(self, breaker):
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                breaker.call(_fail)
+        assert breaker.state == "closed"
+
+    def test_opens_on_slow_calls(self, breaker, clock):
+        def slow():
+            clock.now += 6
+            return "ok"
+
+        for _ in range(4):
+            breaker.call(slow)
+        assert breaker.state == "open"
+
+    def test_open_circuit_rejects_without_calling(self, breaker):
+        _trip(breaker)
+        calls = []
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.call(lambda: calls.append(1))
+        assert calls == []
+        assert error.value.retry_in == pytest.approx(30)
+        assert breaker.snapshot()["rejected"] == 1
+
+    def test_probe_success_closes(self, breaker, clock):
+        _trip(breaker)
+        clock.now += 30
+        assert breaker.state == "half_open"
+        assert breaker.call(lambda: "ok") == "ok"
+        snapshot = breaker.snapshot()
+        assert snapshot["state"] == "closed"
+        assert snapshot["window_calls"] == 0
+        assert snapshot["closed"] == 1
+
+    def test_probe_failure_reopens(self, breaker, clock):
+        _trip(breaker)
+        clock.now += 30
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail)
+        assert breaker.state == "open"
+        assert breaker.snapshot()["opened"] == 2
+
+    def test_half_open_limits_probes(self, breaker, clock):
+        _trip(breaker)
+        clock.now += 30
+
+        def concurrent_call():
+            with pytest.raises(CircuitOpenError):
+                breaker.call(lambda: "second probe")
+            return "first probe"
+
+        assert breaker.call(concurrent_call) == "first probe"
+        assert breaker.state == "closed"
+
+    @pytest.mark.parametrize("late_call", [lambda: "ok", _fail])
+    def test_call_admitted_before_opening_is_not_a_probe(self, breaker, clock, late_call):
+        def admitted_while_closed():
+            _trip(breaker)
+            clock.now += 30
+            assert breaker.state == "half_open"
+            return late_call()
+
+        with pytest.raises(RuntimeError) if late_call is _fail else nullcontext():
+            breaker.call(admitted_while_closed)
+        # The late call neither closed nor reopened the circuit, and the
+        # probe slot is still free for a real probe
+        assert breaker.state == "half_open"
+        assert breaker.call(lambda: "probe") == "probe"
+        assert breaker.state == "closed"
+
+    def test_own_timeouts_are_not_failures(self, breaker):
+        for _ in range(4):
+            with pytest.raises(FakeTimeoutError):
+                breaker.call(_time_out, own_timeout=True)
+        snapshot = breaker.snapshot()
+        assert snapshot["state"] == "closed"
+        assert snapshot["window_calls"] == snapshot["failures"] == 0
+        assert snapshot["own_timeouts"] == 4
+
+    def test_other_timeouts_are_failures(self, breaker):
+        for _ in range(4):
+            with pytest.raises(FakeTimeoutError):
+                breaker.call(_time_out)
+        assert breaker.state == "open"
+
+    def test_own_timeout_probe_frees_its_place(self, breaker, clock):
+        _trip(breaker)
+        clock.now += 30
+        with pytest.raises(FakeTimeoutError):
+            breaker.call(_time_out, own_timeout=True)
+        assert breaker.state == "half_open"
+        assert breaker.call(lambda: "ok") == "ok"
+        assert breaker.state == "closed"
+
+    def test_transitions_are_logged(self, breaker, clock, capsys):
+        _trip(breaker)
+        clock.now += 30
+        breaker.call(lambda: "ok")
+        output = capsys.readouterr().out
+        assert "closed → open" in output
+        assert "open → half_open" in output
+        assert "half_open → closed" in output
+
+
+class TestDataTransformerBreaker:
+    """data_transformer_node falls back at once while the circuit is open."""
+
+    def test_open_circuit_takes_the_fallback(self, monkeypatch):
+        monkeypatch.setattr(circuit_breaker, "_breakers", {})
+        llm = StreamingFakeChatModel(responses=["unused"], failure_rate=1.0)
+        monkeypatch.setattr(data_transformer, "llm", llm)
+        breaker = circuit_breaker.get_circuit_breaker("data_transformer")
+
+        for _ in range(breaker.min_calls):
+            data_transformer.data_transformer_node({"processed_text": "PROCESSING: hi"})
+        assert breaker.state == "open"
+
+        result = data_transformer.data_transformer_node({"processed_text": "PROCESSING: hi"})
+        assert result["transformed_text"] == "✨ TRANSFORMED: ENHANCED: hi ✨"
+        assert breaker.snapshot()["rejected"] == 1
+
+    def test_deadline_timeouts_do_not_open_the_circuit(self, monkeypatch):
+        monkeypatch.setattr(circuit_breaker, "_breakers", {})
+        monkeypatch.setattr(data_transformer, "llm",
+                            StreamingFakeChatModel(responses=["too late"], latency=0.3))
+        breaker = circuit_breaker.get_circuit_breaker("data_transformer")
+
+        for _ in range(breaker.min_calls):
+            data_transformer.data_transformer_node(
+                {"processed_text": "PROCESSING: hi", "deadline": deadline_in(0.1)})
+        # Calls that lost the race time out on their worker threads
+        stop = time.monotonic() + 2
+        while breaker.snapshot()["own_timeouts"] < breaker.min_calls and time.monotonic() < stop:
+            time.sleep(0.01)
+        snapshot = breaker.snapshot()
+        assert snapshot["own_timeouts"] == breaker.min_calls
+        assert snapshot["state"] == "closed" and snapshot["failures"] == 0
+
+    def test_queue_wait_is_not_slowness(self, monkeypatch):
+        monkeypatch.setattr(circuit_breaker, "_breakers", {})
+        monkeypatch.setattr(data_transformer, "llm",
+                            StreamingFakeChatModel(responses=["ok"], latency=0.05))
+        breaker = CircuitBreaker("data_transformer", min_calls=4, slow_call_seconds=0.2)
+        circuit_breaker._breakers["data_transformer"] = breaker
+        # One slot: with 8 callers most of them queue far longer than 0.2s
+        set_llm_limiter(LLMLimiter(initial_concurrency=1, max_concurrency=1))
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(data_transformer.transform_text, ["hi"] * 8))
+        finally:
+            set_llm_limiter(None)
+
+        assert results == ["ok"] * 8
+        snapshot = breaker.snapshot()
+        assert snapshot["state"] == "closed"
+        assert snapshot["slow_calls"] == 0 and snapshot["calls"] == 8
+
+    def test_open_circuit_does_not_queue(self, monkeypatch):
+        monkeypatch.setattr(circuit_breaker, "_breakers", {})
+        monkeypatch.setattr(data_transformer, "llm", StreamingFakeChatModel(responses=["unused"]))
+        breaker = CircuitBreaker("data_transformer", min_calls=4)
+        circuit_breaker._breakers["data_transformer"] = breaker
+        _trip(breaker)
+        limiter = LLMLimiter()
+        set_llm_limiter(limiter)
+        try:
+            result = data_transformer.transform_text("PROCESSING: hi")
+        finally:
+            set_llm_limiter(None)
+
+        assert result == "✨ TRANSFORMED: ENHANCED: hi ✨"
+        assert limiter.stats["calls"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+"""
+Tests for request deadline propagation.
+"""
+
+import json
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+
+import src.nodes.data_transformer as data_transformer
+from src.nodes.deadline import deadline_in, deadline_passed, race_deadline, remaining_seconds
+from src.nodes.tool_processor import tool_processor_node
+from src.testing import RateLimitedFakeChatModel, StreamingFakeChatModel
+from src.workflows.basic_workflow import run_workflow
+
+
+class RecordingModel:
+    """LLM stand-in that records the keyword arguments of each call."""
+
+    def __init__(self):
+        self.kwargs = []
+
+    def invoke(self, messages, **kwargs):
+        self.kwargs.append(kwargs)
+        return AIMessage(content="Once upon a time")
+
+
+def _transform(state):
+    return data_transformer.data_transformer_node(
+        {"processed_text": "PROCESSING: hi", **state}
+    )
+
+
+class TestDeadlineHelpers:
+    """Tests for the deadline helpers."""
+
+    def test_no_deadline(self):
+        assert remaining_seconds({}) is None
+        assert not deadline_passed({})
+
+    def test_remaining_time(self):
+        state = {"deadline": deadline_in(2)}
+        assert remaining_seconds(state) == pytest.approx(2, abs=0.1)
+        assert not deadline_passed(state)
+
+    def test_passed_deadline(self):
+        state = {"deadline": deadline_in(-1)}
+        assert remaining_seconds(state) == 0.0
+        assert deadline_passed(state)
+
+    def test_race_returns_the_fast_result(self):
+        assert race_deadline(lambda: "llm", 1, lambda: "fallback") == "llm"
+
+    def test_race_falls_back_when_slow(self):
+        start = time.monotonic()
+        result = race_deadline(lambda: time.sleep(0.5) or "llm", 0.05, lambda: "fallback")
+        assert result == "fallback"
+        assert time.monotonic() - start < 0.3
+
+    def test_race_propagates_errors(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            race_deadline(fail, 1, lambda: "fallback")
+
+
+class TestDataTransformerDeadline:
+    """data_transformer_node within a deadline."""
+
+    def test_llm_gets_the_remaining_time_as_timeout(self, monkeypatch):
+        llm = RecordingModel()
+        monkeypatch.setattr(data_transformer, "llm", llm)
+        result = _transform({"deadline": deadline_in(5)})
+
+        assert result["transformed_text"] == "Once upon a time"
+        assert 4 < llm.kwargs[0]["timeout"] <= 5
+
+    def test_no_timeout_without_deadline(self, monkeypatch):
+        llm = RecordingModel()
+        monkeypatch.setattr(data_transformer, "llm", llm)
+        _transform({})
+        assert llm.kwargs == [{}]
+
+    def test_slow_llm_loses_to_the_fallback(self, monkeypatch):
+        monkeypatch.setattr(data_transformer, "llm",
+                            StreamingFakeChatModel(responses=["too late"], latency=0.5))
+        start = time.monotonic()
+        result = _transform({"deadline": deadline_in(0.1)})
+
+        assert result["transformed_text"] == "✨ TRANSFORMED: ENHANCED: hi ✨"
+        assert time.monotonic() - start < 0.3
+
+    def test_exhausted_budget_skips_the_llm(self, monkeypatch):
+        llm = RateLimitedFakeChatModel(responses=["unused"])
+        monkeypatch.setattr(data_transformer, "llm", llm)
+        result = _transform({"deadline": deadline_in(0.01)})
+
+        assert result["transformed_text"] == "✨ TRANSFORMED: ENHANCED: hi ✨"
+        assert llm.served == 0
+
+
+class TestWorkflowDeadline:
+    """Deadlines through whole runs."""
+
+    def test_run_meets_its_deadline(self, monkeypatch):
+        monkeypatch.setattr(data_transformer, "llm",
+                            StreamingFakeChatModel(responses=["too late"], latency=1.0))
+        start = time.monotonic()
+        result = run_workflow("hello", deadline_seconds=0.2)
+
+        assert time.monotonic() - start < 0.6
+        assert "✨ TRANSFORMED" in result["output_text"]
+
+    def test_tool_analysis_is_skipped_after_the_deadline(self):
+        result = tool_processor_node({"processed_text": "Processing: HI",
+                                      "deadline": deadline_in(-1)})
+        assert result["transformed_text"] == "Processing: HI"
+        assert json.loads(result["tool_results"]) == {"skipped": "deadline passed"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
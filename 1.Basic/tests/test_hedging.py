@@ -0,0 +1,225 @@
+"""
+Tests for hedged LLM requests.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+from langchain_core.runnables.config import var_child_runnable_config
+
+import src.nodes.data_transformer as data_transformer
+import src.llm.hedging as hedging
+from src.config import Config
+from src.llm import HedgingPolicy, LLMLimiter, set_llm_limiter
+from src.testing import RateLimitedFakeChatModel, StreamingFakeChatModel
+from src.workflows import create_langgraph_workflow, stream_workflow
+
+REQUEST_ID = contextvars.ContextVar("request_id", default=None)
+
+
+def _warm_up(policy, latency=0.01, samples=20):
+    """Fill the latency window so hedging can start."""
+    for _ in range(samples):
+        policy.call(lambda: time.sleep(latency))
+
+
+class SlowFirstCall:
+    """Callable whose first call is slow and later calls are fast."""
+
+    def __init__(self, slow=0.5, fast=0.01):
+        self.slow = slow
+        self.fast = fast
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            number = self.calls
+        time.sleep(self.slow if number == 1 else self.fast)
+        return number
+
+
+class TestHedgingPolicy:
+    """Tests for HedgingPolicy."""
+
+    def test_no_hedging_before_enough_samples(self):
+        policy = HedgingPolicy(min_samples=5)
+        slow = SlowFirstCall(slow=0.05)
+        assert policy.call(slow) == 1
+        assert slow.calls == 1
+        assert policy.snapshot()["hedge_delay_ms"] is None
+
+    def test_slow_call_is_hedged_and_hedge_wins(self):
+        policy = HedgingPolicy(max_hedge_fraction=0.5)
+        _warm_up(policy)
+
+        slow = SlowFirstCall()
+        start = time.monotonic()
+        assert policy.call(slow) == 2
+        assert time.monotonic() - start < 0.3
+
+        snapshot = policy.snapshot()
+        assert snapshot["hedged"] == snapshot["hedge_wins"] == 1
+        assert snapshot["hedge_win_rate"] == 1.0
+        assert snapshot["hedge_rate"] == pytest.approx(1 / 21, abs=0.001)
+
+    def test_fast_calls_are_not_hedged(self):
+        policy = HedgingPolicy(max_hedge_fraction=0.5)
+        _warm_up(policy, latency=0.02)
+        calls = []
+        policy.call(lambda: calls.append(1))
+        assert len(calls) == 1
+        assert policy.snapshot()["hedged"] == 0
+
+    def test_hedges_are_capped(self):
+        policy = HedgingPolicy(max_hedge_fraction=0.05)
+        _warm_up(policy)
+        slow = SlowFirstCall(slow=0.1)
+        # 21 calls allow one hedge; the second slow call must wait it out
+        policy.call(slow)
+        slow.calls = 0
+        assert policy.call(slow) == 1
+        assert policy.snapshot()["hedged"] == 1
+
+    def test_failed_attempt_falls_back_to_the_other(self):
+        policy = HedgingPolicy(max_hedge_fraction=0.5)
+        _warm_up(policy)
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                time.sleep(0.1)
+                raise RuntimeError("boom")
+            time.sleep(0.2)
+            return "ok"
+
+        assert policy.call(flaky) == "ok"
+
+    def test_all_attempts_failing_raises(self):
+        policy = HedgingPolicy(max_hedge_fraction=0.5)
+        _warm_up(policy)
+
+        def failing():
+            time.sleep(0.05)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            policy.call(failing)
+
+    def test_attempts_run_in_the_callers_context(self):
+        policy = HedgingPolicy(max_hedge_fraction=0.5)
+        _warm_up(policy)
+        seen = []
+
+        def call():
+            config = var_child_runnable_config.get()
+            seen.append((REQUEST_ID.get(), config["callbacks"]))
+            time.sleep(0.3 if len(seen) == 1 else 0.01)
+
+        def scenario():
+            REQUEST_ID.set("abc")
+            var_child_runnable_config.set({"callbacks": ["handler"], "tags": ["x"]})
+            policy.call(call)
+
+        contextvars.copy_context().run(scenario)
+        # Only the first attempt keeps the callbacks, so tokens are not interleaved
+        assert seen == [("abc", ["handler"]), ("abc", None)]
+
+    def test_async_loser_is_cancelled(self):
+        policy = HedgingPolicy(max_hedge_fraction=0.5)
+        cancelled = []
+        attempts = []
+
+        async def call(latency=None):
+            attempts.append(1)
+            try:
+                await asyncio.sleep(latency if latency is not None else
+                                    (0.5 if len(attempts) == 1 else 0.01))
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+            return len(attempts)
+
+        async def scenario():
+            for _ in range(20):
+                await policy.acall(lambda: call(0.01))
+            attempts.clear()
+            return await policy.acall(call)
+
+        assert asyncio.run(scenario()) == 2
+        assert cancelled == [1]
+        assert policy.snapshot()["hedge_wins"] == 1
+
+
+class TestDataTransformerHedging:
+    """data_transformer_node hedges only when LLM_HEDGING is on."""
+
+    def test_hedging_is_opt_in(self, monkeypatch):
+        monkeypatch.setattr(Config, "LLM_HEDGING", False)
+        assert hedging.get_hedging_policy("data_transformer") is None
+
+    def test_node_uses_its_policy(self, monkeypatch):
+        monkeypatch.setattr(Config, "LLM_HEDGING", True)
+        monkeypatch.setattr(hedging, "_policies", {})
+        monkeypatch.setattr(data_transformer, "llm",
+                            StreamingFakeChatModel(responses=["Once upon a time"]))
+
+        result = data_transformer.data_transformer_node({"processed_text": "hi"})
+        assert result["transformed_text"] == "Once upon a time"
+        assert hedging.get_hedging_policy("data_transformer").snapshot()["calls"] == 1
+
+    def test_queue_wait_does_not_trigger_hedges(self, monkeypatch):
+        monkeypatch.setattr(Config, "LLM_HEDGING", True)
+        monkeypatch.setattr(hedging, "_policies", {})
+        llm = RateLimitedFakeChatModel(responses=["Once upon a time"], latency=0.01)
+        monkeypatch.setattr(data_transformer, "llm", llm)
+        limiter = LLMLimiter(initial_concurrency=1, max_concurrency=1)
+        set_llm_limiter(limiter)
+        policy = hedging.get_hedging_policy("data_transformer")
+        _warm_up(policy, latency=0.01)
+
+        def hold_slot():
+            with limiter.limit():
+                time.sleep(0.3)
+
+        holder = threading.Thread(target=hold_slot)
+        holder.start()
+        try:
+            time.sleep(0.05)
+            assert data_transformer.transform_text("hi") == "Once upon a time"
+        finally:
+            holder.join()
+            set_llm_limiter(None)
+
+        # The call queued for 0.25s, far past the hedge delay, but only the
+        # provider call is timed: no hedge, one request to the provider
+        assert policy.stats["hedged"] == 0
+        assert llm.served == 1
+        assert max(policy._latencies) < 0.2
+
+    @pytest.mark.parametrize("warm", [False, True])
+    def test_streaming_with_hedging_emits_tokens(self, monkeypatch, warm):
+        monkeypatch.setattr(Config, "LLM_HEDGING", True)
+        monkeypatch.setattr(hedging, "_policies", {})
+        monkeypatch.setattr(data_transformer, "llm",
+                            StreamingFakeChatModel(responses=["Once upon a time"]))
+        if warm:
+            # With a hedge delay known, the call runs on the policy's workers
+            _warm_up(hedging.get_hedging_policy("data_transformer"), latency=0.05)
+
+        state = {"input_text": "hello", "processed_text": "", "transformed_text": "",
+                 "output_text": "", "step": "started"}
+        events = list(stream_workflow(create_langgraph_workflow(), state))
+
+        tokens = [payload for kind, payload in events if kind == "token"]
+        assert len(tokens) > 1
+        assert "".join(tokens) == "Once upon a time"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,238 @@
+"""
+Tests for the shared LLM limiter.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.messages import AIMessage
+
+import src.nodes.data_transformer as data_transformer
+from src.llm import AdaptiveConcurrency, LLMLimiter, TokenBucket, set_llm_limiter
+from src.testing import FakeRateLimitError, RateLimitedFakeChatModel
+
+
+@pytest.fixture
+def limiter():
+    """Install a fresh process-wide limiter for the test."""
+    limiter = LLMLimiter(initial_concurrency=8, max_concurrency=16)
+    set_llm_limiter(limiter)
+    yield limiter
+    set_llm_limiter(None)
+
+
+class ConcurrencyProbe:
+    """Records the highest number of simultaneous holders."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self.current -= 1
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_reservations_beyond_burst_wait(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        assert bucket.reserve(1) == 0
+        assert bucket.reserve(1) == 0
+        assert bucket.reserve(1) == pytest.approx(0.1, abs=0.02)
+        assert bucket.reserve(1) == pytest.approx(0.2, abs=0.02)
+
+    def test_oversized_request_is_capped(self):
+        bucket = TokenBucket(rate=100, capacity=100)
+        assert bucket.reserve(10_000) == 0
+
+    def test_adjust_refunds_tokens(self):
+        bucket = TokenBucket(rate=1, capacity=100)
+        bucket.reserve(80)
+        bucket.adjust(50)
+        assert bucket.available == pytest.approx(70, abs=1)
+
+
+class TestAdaptiveConcurrency:
+    """Tests for the AIMD limit."""
+
+    def test_backoff_and_increase(self):
+        concurrency = AdaptiveConcurrency(initial=8, max_limit=16)
+        concurrency.acquire()
+        concurrency.release(time.monotonic(), "overload")
+        assert concurrency.limit == 4
+
+        for _ in range(4):
+            concurrency.acquire()
+            concurrency.release(time.monotonic(), "success")
+        assert concurrency.limit == pytest.approx(5, abs=0.1)
+
+    def test_one_backoff_per_round_of_overloads(self):
+        concurrency = AdaptiveConcurrency(initial=8)
+        started = time.monotonic()
+        for _ in range(4):
+            concurrency.acquire()
+        for _ in range(4):
+            concurrency.release(started, "overload")
+        assert concurrency.limit == 4
+
+    def test_errors_leave_the_limit_alone(self):
+        concurrency = AdaptiveConcurrency(initial=8)
+        concurrency.acquire()
+        concurrency.release(time.monotonic(), "error")
+        assert concurrency.limit == 8
+
+    def test_limit_stays_within_bounds(self):
+        concurrency = AdaptiveConcurrency(initial=2, min_limit=1, max_limit=3)
+        for _ in range(5):
+            concurrency.acquire()
+            concurrency.release(time.monotonic() + 1, "overload")
+        assert concurrency.limit == 1
+        for _ in range(50):
+            concurrency.acquire()
+            concurrency.release(time.monotonic(), "success")
+        assert concurrency.limit == 3
+
+    def test_thread_acquire_times_out(self):
+        concurrency = AdaptiveConcurrency(initial=1)
+        assert concurrency.acquire()
+        assert not concurrency.acquire(timeout=0.05)
+        assert concurrency.queued == 0
+
+
+class TestLLMLimiter:
+    """Tests for LLMLimiter across threads and asyncio."""
+
+    def test_threads_and_tasks_share_the_limit(self):
+        limiter = LLMLimiter(initial_concurrency=2, max_concurrency=2)
+        probe = ConcurrencyProbe()
+
+        def sync_call():
+            with limiter.limit():
+                with probe:
+                    time.sleep(0.02)
+
+        async def async_call():
+            async with limiter.alimit():
+                with probe:
+                    await asyncio.sleep(0.02)
+
+        async def run_tasks():
+            await asyncio.gather(*(async_call() for _ in range(6)))
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            futures = [pool.submit(sync_call) for _ in range(6)]
+            asyncio.run(run_tasks())
+            for future in futures:
+                future.result()
+
+        snapshot = limiter.snapshot()
+        assert probe.peak == 2
+        assert snapshot["calls"] == snapshot["succeeded"] == 12
+        assert snapshot["in_flight"] == 0 and snapshot["queued"] == 0
+        assert snapshot["max_queue_wait_ms"] > 0
+
+    def test_cancelled_waiter_does_not_leak_a_slot(self):
+        limiter = LLMLimiter(initial_concurrency=1, max_concurrency=1)
+
+        async def scenario():
+            async with limiter.alimit():
+                waiter = asyncio.create_task(limiter.concurrency.aacquire())
+                await asyncio.sleep(0.01)
+                waiter.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await waiter
+            async with limiter.alimit():
+                pass
+
+        asyncio.run(asyncio.wait_for(scenario(), 1))
+        assert limiter.concurrency.in_flight == 0
+
+    def test_request_rate_is_enforced(self):
+        limiter = LLMLimiter(requests_per_second=50)
+        start = time.monotonic()
+        for _ in range(60):
+            with limiter.limit():
+                pass
+        # 50 go out as the initial burst, the other 10 at 50 per second
+        assert time.monotonic() - start == pytest.approx(0.2, abs=0.1)
+
+    def test_token_usage_is_reconciled(self):
+        limiter = LLMLimiter(tokens_per_minute=6000)
+
+        class UsageModel:
+            def invoke(self, messages):
+                return AIMessage(content="ok", usage_metadata={
+                    "input_tokens": 900, "output_tokens": 100, "total_tokens": 1000
+                })
+
+        limiter.invoke(UsageModel(), "short prompt")
+        assert limiter.tokens.available == pytest.approx(5000, abs=5)
+
+    def test_deadline_timeouts_are_not_overload(self):
+        limiter = LLMLimiter(initial_concurrency=8)
+
+        class TimingOutModel:
+            def invoke(self, messages, timeout=None):
+                raise TimeoutError("timed out")
+
+        with pytest.raises(TimeoutError):
+            limiter.invoke(TimingOutModel(), "hi", timeout=0.1)
+        assert limiter.concurrency.limit == 8
+        with pytest.raises(TimeoutError):
+            limiter.invoke(TimingOutModel(), "hi")
+        assert limiter.concurrency.limit == 4
+
+    def test_backs_off_against_a_rate_limited_stand_in(self):
+        limiter = LLMLimiter(initial_concurrency=16, max_concurrency=16)
+        llm = RateLimitedFakeChatModel(responses=["ok"], latency=0.01, capacity=3)
+
+        def call():
+            for _ in range(10):
+                try:
+                    limiter.invoke(llm, "hello")
+                except FakeRateLimitError:
+                    pass
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            for future in [pool.submit(call) for _ in range(16)]:
+                future.result()
+
+        snapshot = limiter.snapshot()
+        assert snapshot["overloaded"] == llm.rejected > 0
+        assert snapshot["concurrency_limit"] < 16
+        # Without the limiter most of the 160 calls would be rejected
+        assert llm.rejected < 40
+
+
+class TestDataTransformerLimit:
+    """The data transformer goes through the shared limiter."""
+
+    def test_calls_are_limited(self, limiter, monkeypatch):
+        monkeypatch.setattr(data_transformer, "llm",
+                            RateLimitedFakeChatModel(responses=["Once upon a time"]))
+        result = data_transformer.data_transformer_node({"processed_text": "hi"})
+        assert result["transformed_text"] == "Once upon a time"
+        assert limiter.snapshot()["succeeded"] == 1
+
+    def test_429_falls_back_and_backs_off(self, limiter, monkeypatch):
+        monkeypatch.setattr(data_transformer, "llm",
+                            RateLimitedFakeChatModel(responses=["unused"], capacity=0))
+        result = data_transformer.data_transformer_node({"processed_text": "PROCESSING: hi"})
+        assert result["transformed_text"] == "✨ TRANSFORMED: ENHANCED: hi ✨"
+        assert limiter.snapshot()["overloaded"] == 1
+        assert limiter.concurrency.limit == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
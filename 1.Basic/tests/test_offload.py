@@ -0,0 +1,79 @@
+"""
+Tests for offloading tool nodes to the process pool.
+"""
+
+import asyncio
+from multiprocessing import shared_memory
+
+import pytest
+
+from src.config import Config
+from src.nodes import offload
+from src.nodes.tool_processor import (
+    aconditional_tool_node,
+    atool_processor_node,
+    conditional_tool_node,
+    tool_processor_node,
+)
+
+TEXT = "Processing: The quick brown fox jumps over the lazy dog. " * 200
+NUMBERS = "Processing: totals are 12 + 30 and (4 * 5) - 2. " * 50
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Start one worker for the module and stop it afterwards."""
+    original = Config.TOOL_OFFLOAD_WORKERS
+    Config.TOOL_OFFLOAD_WORKERS = 1
+    yield offload.get_process_pool()
+    offload.shutdown_process_pool()
+    Config.TOOL_OFFLOAD_WORKERS = original
+
+
+@pytest.fixture
+def threshold(monkeypatch):
+    """Set the offload threshold for a test."""
+    def set_threshold(chars):
+        monkeypatch.setattr(Config, "TOOL_OFFLOAD_MIN_CHARS", chars)
+    return set_threshold
+
+
+class TestOffload:
+    """Offloaded nodes must produce the same state as inline ones."""
+
+    @pytest.mark.parametrize("node", [tool_processor_node, conditional_tool_node])
+    @pytest.mark.parametrize("text", [TEXT, NUMBERS])
+    def test_sync_nodes_match_inline(self, pool, threshold, node, text):
+        threshold(0)
+        inline = node({"processed_text": text})
+        threshold(100)
+        assert node({"processed_text": text}) == inline
+
+    @pytest.mark.parametrize("node, anode", [
+        (tool_processor_node, atool_processor_node),
+        (conditional_tool_node, aconditional_tool_node),
+    ])
+    def test_async_nodes_match_sync(self, pool, threshold, node, anode):
+        threshold(100)
+        expected = node({"processed_text": NUMBERS})
+        assert asyncio.run(anode({"processed_text": NUMBERS})) == expected
+
+    def test_small_texts_stay_in_process(self, threshold, monkeypatch):
+        threshold(10_000)
+
+        def fail(*args):
+            raise AssertionError("small text was offloaded")
+
+        monkeypatch.setattr(offload, "run_offloaded", fail)
+        assert tool_processor_node({"processed_text": "short text"})["step"] == "tool_processed"
+
+    def test_shared_memory_is_released(self, pool):
+        with offload.SharedText("héllo wörld") as shared:
+            name = shared.name
+            assert offload._read_shared_text(shared.name, shared.size) == "héllo wörld"
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
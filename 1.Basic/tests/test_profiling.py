@@ -0,0 +1,100 @@
+"""
+Tests for the per-node and per-tool workflow profiler.
+"""
+
+import re
+
+import pytest
+
+import src.nodes.data_transformer as data_transformer
+from main import create_tool_enhanced_workflow
+from src.profiling import ProfileSession, active_session, profile_scope, profiled
+from src.testing import StreamingFakeChatModel
+from src.workflows.basic_workflow import create_langgraph_workflow
+
+COLLAPSED_LINE = re.compile(r"^node:\w+(;[^;]+)+ \d+$")
+
+
+def initial_state(input_text):
+    return {"input_text": input_text, "processed_text": "", "transformed_text": "",
+            "output_text": "", "step": "started"}
+
+
+class TestProfileSession:
+    """Tests for scopes and memory attribution."""
+
+    def test_peak_memory_is_attributed_to_the_scope_and_its_parents(self):
+        with ProfileSession() as session:
+            with profile_scope("node", "outer"):
+                with profile_scope("tool", "allocator"):
+                    block = bytearray(4 * 1024 * 1024)
+                    del block
+                with profile_scope("tool", "idle"):
+                    pass
+
+        assert session.scopes[("tool", "allocator")]["peak_bytes"] >= 4 * 1024 * 1024
+        assert session.scopes[("node", "outer")]["peak_bytes"] >= 4 * 1024 * 1024
+        assert session.scopes[("tool", "idle")]["peak_bytes"] < 1024 * 1024
+
+    def test_nothing_is_recorded_without_a_session(self):
+        app = create_langgraph_workflow()
+        assert active_session() is None
+        assert profiled(app) is app
+        with profile_scope("tool", "unprofiled"):
+            pass
+
+
+class TestWorkflowProfiling:
+    """Tests for profiles of whole workflow runs."""
+
+    def test_nodes_get_their_own_profiles(self, monkeypatch):
+        monkeypatch.setattr(data_transformer, "llm",
+                            StreamingFakeChatModel(responses=["Once upon a time"]))
+
+        with ProfileSession() as session:
+            profiled(create_langgraph_workflow()).invoke(initial_state("hello profiler"))
+
+        nodes = {name for kind, name in session.scopes if kind == "node"}
+        assert nodes == {"input_processor", "data_transformer", "output_generator"}
+        assert set(session.node_stats) == nodes
+        assert all(session.scopes[("node", n)]["calls"] == 1 for n in nodes)
+
+    def test_tool_calls_are_scopes(self):
+        with ProfileSession() as session:
+            profiled(create_tool_enhanced_workflow()).invoke(
+                {**initial_state("count the words"), "tool_results": ""}
+            )
+
+        assert session.scopes[("tool", "text_analyzer_tool")]["calls"] == 1
+        assert session.scopes[("tool", "math_calculator_tool")]["calls"] == 1
+        assert session.scopes[("node", "tool_processor")]["calls"] == 1
+
+    def test_collapsed_stacks_are_flamegraph_lines(self, tmp_path):
+        with ProfileSession() as session:
+            profiled(create_tool_enhanced_workflow()).invoke(
+                {**initial_state("flame graphs please"), "tool_results": ""}
+            )
+
+        path = tmp_path / "out" / "profile.collapsed"
+        assert session.write_collapsed(str(path)) > 0
+        lines = path.read_text().splitlines()
+        assert all(COLLAPSED_LINE.match(line) for line in lines)
+        assert any(line.startswith("node:tool_processor;") and "tool_processor_node" in line
+                   for line in lines)
+        assert not any("profiler.py" in line for line in lines)
+
+    def test_report_lists_nodes_and_top_functions(self, capsys):
+        with ProfileSession() as session:
+            profiled(create_tool_enhanced_workflow()).invoke(
+                {**initial_state("report"), "tool_results": ""}
+            )
+        capsys.readouterr()
+
+        session.print_report(top=3)
+        report = capsys.readouterr().out
+        assert "tool_processor" in report and "text_analyzer_tool" in report
+        assert "📌 input_processor: top 3 functions" in report
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+"""
+Tests for the cost-bounded math evaluator and the calculator tool using it.
+"""
+
+import time
+
+import pytest
+
+from src.nodes.tool_processor import find_calculations
+from src.tools import math_calculator_tool
+from src.tools.safe_math import ExpressionError, evaluate_expression
+
+ADVERSARIAL = {
+    "9**9**9": "exponent_too_large",
+    "pow(10, 10**8)": "exponent_too_large",
+    "pow(3, 2**4000, 2**4095 + 1)": "exponent_too_large",
+    "2**4096": "integer_too_large",
+    "(2**4000) * (2**4000)": "integer_too_large",
+    "-" * 500 + "1": "too_deep",
+    "+".join(["1"] * 400): "too_deep",
+    "1" * 2000: "too_long",
+}
+
+
+def refusal_code(expression, **limits):
+    with pytest.raises(ExpressionError) as info:
+        evaluate_expression(expression, **limits)
+    return info.value.code
+
+
+class TestEvaluateExpression:
+    """Tests for evaluate_expression."""
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("2 + 3 * 4", 14),
+        ("sqrt(16) + 5", 9.0),
+        ("10 / 4 - 1", 1.5),
+        ("7 // 2 + 7 % 2", 4),
+        ("-2 ** 3", -8),
+        ("2 ** -1", 0.5),
+        ("max(1, 5, 3) + min(4, 2)", 7),
+        ("round(3.14159, 2)", 3.14),
+        ("sum((1, 2, 3))", 6),
+        ("pow(2, 10, 1000)", 24),
+        ("floor(pi) + ceil(e)", 6),
+    ])
+    def test_arithmetic_matches_python(self, expression, expected):
+        assert evaluate_expression(expression) == expected
+
+    def test_results_up_to_the_limit_are_allowed(self):
+        assert evaluate_expression("2 ** 4095").bit_length() == 4096
+        assert evaluate_expression("10 ** 1000") == 10 ** 1000
+
+    @pytest.mark.parametrize("expression, code", ADVERSARIAL.items())
+    def test_expensive_expressions_are_refused_quickly(self, expression, code):
+        started = time.perf_counter()
+        assert refusal_code(expression) == code
+        assert time.perf_counter() - started < 0.05
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("round(7, -10**7)", 0),
+        ("round(7, 10**7)", 7),
+        ("round(10**1000 + 1, -10**7)", 0),
+        ("round(1e308, -10**7)", 0.0),
+        ("round(1.25, 10**7)", 1.25),
+    ])
+    def test_round_with_huge_ndigits_is_fast(self, expression, expected):
+        started = time.perf_counter()
+        assert evaluate_expression(expression) == expected
+        assert time.perf_counter() - started < 0.05
+
+    @pytest.mark.parametrize("expression, code", [
+        ("__import__('os')", "unsupported"),
+        ("(1).__class__", "unsupported"),
+        ("'a' * 3", "unsupported"),
+        ("(1,) * 10", "unsupported"),
+        ("abs(x=1)", "unsupported"),
+        ("x + 1", "unknown_name"),
+    ])
+    def test_anything_but_arithmetic_is_refused(self, expression, code):
+        assert refusal_code(expression) == code
+
+    def test_node_limit(self):
+        assert refusal_code("max(" + ", ".join(["1"] * 50) + ")", max_nodes=20) == "too_many_nodes"
+
+    def test_cpu_budget_stops_evaluation(self):
+        # Each division is allowed on its own; together they exceed the budget
+        expression = "sum((" + ", ".join(["10**1000 // 7"] * 100) + "))"
+        assert refusal_code(expression, max_chars=5000, max_nodes=1000,
+                            cpu_budget_ms=0.01) == "cpu_budget_exceeded"
+
+
+class TestMathCalculatorLimits:
+    """Tests for structured errors from math_calculator_tool."""
+
+    def test_over_budget_expression_returns_structured_error(self):
+        result = math_calculator_tool("9**9**9")
+        assert result["result"] is None
+        assert result["error_type"] == "exponent_too_large"
+        assert result["error"].startswith("Expression refused")
+
+    def test_float_overflow_is_a_math_error(self):
+        assert math_calculator_tool("10.0 ** 400")["error_type"] == "math_error"
+
+    def test_user_text_with_huge_power_is_refused(self):
+        calculations = find_calculations("What is 9**9**9 and 2 + 2?")
+        types = sorted(r.get("error_type", "ok") for r in calculations.values())
+        assert "exponent_too_large" in types
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
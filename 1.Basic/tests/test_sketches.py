@@ -0,0 +1,149 @@
+"""
+Tests for the word sketches and the text analyzer's sketch mode.
+"""
+
+import json
+import pickle
+import random
+from collections import Counter
+
+import pytest
+
+from src.config import Config
+from src.nodes import offload
+from src.tools import text_analyzer_tool
+from src.tools.sketches import (
+    CountMinSketch,
+    HyperLogLog,
+    WordSketch,
+    iter_words,
+    word_lists,
+    sketch_words,
+)
+
+
+def zipf_words(count, seed=7):
+    rng = random.Random(seed)
+    return [f"w{int(rng.paretovariate(1.1))}" for _ in range(count)]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Start one worker for the module and stop it afterwards."""
+    original = Config.TOOL_OFFLOAD_WORKERS
+    Config.TOOL_OFFLOAD_WORKERS = 1
+    yield offload.get_process_pool()
+    offload.shutdown_process_pool()
+    Config.TOOL_OFFLOAD_WORKERS = original
+
+
+class TestHyperLogLog:
+    """Tests for distinct counts."""
+
+    @pytest.mark.parametrize("distinct", [10, 1000, 50000])
+    def test_estimate_is_within_three_standard_errors(self, distinct):
+        sketch = HyperLogLog(precision=12)
+        for i in range(distinct):
+            sketch.add(f"word{i}")
+            sketch.add(f"word{i}")
+        assert abs(sketch.estimate() - distinct) <= 3 * sketch.relative_error * distinct + 1
+
+    def test_precisions_must_match_to_merge(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+
+
+class TestCountMinSketch:
+    """Tests for count estimates."""
+
+    def test_estimates_never_undercount_and_stay_within_the_bound(self):
+        words = zipf_words(20000)
+        sketch = CountMinSketch(width=256, depth=4)
+        for word in words:
+            sketch.add(word)
+        exact = Counter(words)
+        errors = [sketch.estimate(word) - count for word, count in exact.items()]
+        assert min(errors) >= 0
+        within = sum(error <= sketch.error_bound for error in errors) / len(errors)
+        assert within >= sketch.confidence
+
+    def test_dimensions_must_match_to_merge(self):
+        with pytest.raises(ValueError):
+            CountMinSketch(width=64).merge(CountMinSketch(width=128))
+
+
+class TestWordSketch:
+    """Tests for top-k words, merging and chunked input."""
+
+    def test_top_words_match_exact_counts_for_skewed_text(self):
+        words = zipf_words(50000)
+        sketch = WordSketch(top_k=5).update(words)
+        assert [w for w, _ in sketch.top_words()] == [w for w, _ in Counter(words).most_common(5)]
+
+    @pytest.mark.parametrize("setting", ["precision", "width", "depth", "top_k"])
+    def test_zero_settings_are_rejected_not_defaulted(self, setting):
+        with pytest.raises(ValueError):
+            WordSketch(**{setting: 0})
+
+    def test_memory_does_not_grow_with_the_text(self):
+        small = WordSketch().update(zipf_words(100))
+        large = WordSketch().update(f"unique{i}" for i in range(100000))
+        assert small.memory_bytes == large.memory_bytes
+        assert len(large.top_words()) == large.top_k
+
+    def test_sketches_from_worker_processes_merge_into_the_whole(self, pool):
+        words = zipf_words(30000)
+        halves = [" ".join(words[:15000]), " ".join(words[15000:])]
+        whole = sketch_words(" ".join(words))
+
+        merged = offload.run_offloaded(sketch_words, halves[0])
+        merged.merge(offload.run_offloaded(sketch_words, halves[1]))
+
+        assert merged.distinct.registers == whole.distinct.registers
+        assert merged.counts.rows == whole.counts.rows
+        assert merged.top_words()[:3] == whole.top_words()[:3]
+
+    def test_sketch_survives_pickling(self):
+        sketch = sketch_words("a b b c c c")
+        copy = pickle.loads(pickle.dumps(sketch))
+        assert copy.top_words() == sketch.top_words() == [("c", 3), ("b", 2), ("a", 1)]
+
+    def test_words_split_across_chunks_stay_whole(self):
+        chunks = ["The qu", "ick brown", " fox\njum", "ps", ""]
+        assert list(iter_words(chunks)) == ["The", "quick", "brown", "fox", "jumps"]
+        assert sketch_words(iter(chunks)).unique_words() == 5
+
+    def test_long_chunks_are_read_in_slices(self):
+        text = "alpha beta gamma delta epsilon"
+        lists = list(word_lists([text], chunk_chars=7))
+        assert len(lists) > 1
+        assert [word for words in lists for word in words] == text.split()
+
+
+class TestTextAnalyzerSketchMode:
+    """Tests for text_analyzer_tool(sketch=True)."""
+
+    TEXT = "The cat sat. The cat ran! A dog, the dog, barked.\n\nThe end."
+
+    def test_matches_exact_mode_where_exact(self):
+        exact = text_analyzer_tool(self.TEXT, sketch=False)
+        sketched = text_analyzer_tool(self.TEXT, sketch=True)
+        for key in ("word_count", "character_count", "sentence_count", "paragraph_count",
+                    "average_word_length", "longest_word", "unique_word_count"):
+            assert sketched[key] == exact[key]
+        assert "top_words" not in exact
+
+    def test_reports_top_words_and_error_bounds(self):
+        result = text_analyzer_tool(self.TEXT, sketch=True)
+        assert result["top_words"][0] == ("the", 4)
+        assert result["sketch_error_bounds"]["unique_words_relative_error"] == pytest.approx(
+            1.04 / 2 ** (Config.SKETCH_HLL_PRECISION / 2), abs=1e-4)
+        json.dumps(result)
+
+    def test_config_turns_sketch_mode_on(self, monkeypatch):
+        monkeypatch.setattr(Config, "TEXT_ANALYZER_SKETCH", True)
+        assert "top_words" in text_analyzer_tool(self.TEXT)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,66 @@
+"""
+Tests for token streaming through the basic workflow.
+"""
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import src.nodes.data_transformer as data_transformer
+from src.workflows import create_langgraph_workflow, stream_workflow
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Replace the data transformer LLM with a streaming fake model."""
+    llm = FakeListChatModel(responses=["Once upon a time"])
+    monkeypatch.setattr(data_transformer, "llm", llm)
+    return llm
+
+
+def _initial_state(text: str):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "started"
+    }
+
+
+class TestStreamWorkflow:
+    """Tests for stream_workflow."""
+
+    def test_tokens_arrive_before_result(self, fake_llm):
+        """Tokens are yielded incrementally and the final state comes last."""
+        app = create_langgraph_workflow()
+        events = list(stream_workflow(app, _initial_state("hello")))
+
+        kinds = [kind for kind, _ in events]
+        assert kinds[-1] == "result"
+        assert kinds.count("result") == 1
+        assert kinds.count("token") > 1
+
+        tokens = "".join(payload for kind, payload in events if kind == "token")
+        assert tokens == "Once upon a time"
+
+    def test_result_matches_invoke(self, fake_llm):
+        """The streamed final state is the same as a blocking invoke."""
+        app = create_langgraph_workflow()
+        _, result = list(stream_workflow(app, _initial_state("hello")))[-1]
+
+        assert result["transformed_text"] == "Once upon a time"
+        assert result["step"] == "output_generated"
+        assert "LANGGRAPH WORKFLOW RESULT" in result["output_text"]
+
+    def test_fallback_streams_no_tokens(self, monkeypatch):
+        """Without an LLM the run still completes with the fallback text."""
+        monkeypatch.setattr(data_transformer, "llm", None)
+        app = create_langgraph_workflow()
+        events = list(stream_workflow(app, _initial_state("hello")))
+
+        assert [kind for kind, _ in events] == ["result"]
+        assert "TRANSFORMED" in events[0][1]["transformed_text"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
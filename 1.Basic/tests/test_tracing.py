@@ -0,0 +1,154 @@
+"""
+Tests for the local span tracer, exporter and analyzer.
+"""
+
+import json
+
+import pytest
+
+import src.nodes.data_transformer as data_transformer
+from main import create_tool_enhanced_workflow
+from src.testing import StreamingFakeChatModel
+from src.tracing import JsonlSpanExporter, Tracer, set_tracer
+from src.tracing.analyze import analyze, critical_path, load_spans
+from src.workflows.basic_workflow import create_langgraph_workflow
+
+
+class ListExporter:
+    """Collects exported spans in memory."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def exporter():
+    """Install a tracer that records every trace into a list."""
+    exporter = ListExporter()
+    set_tracer(Tracer(exporter, sample_rate=1.0))
+    yield exporter
+    set_tracer(None)
+
+
+def initial_state(input_text):
+    return {"input_text": input_text, "processed_text": "", "transformed_text": "",
+            "output_text": "", "step": "started"}
+
+
+def span(span_id, parent_id, start, duration_ms, name=None, kind="node"):
+    return {"trace_id": "t", "span_id": span_id, "parent_id": parent_id, "name": name or span_id,
+            "kind": kind, "start": start, "duration_ms": duration_ms}
+
+
+class TestJsonlSpanExporter:
+    """Tests for batching and rotation."""
+
+    def test_spans_are_written_as_jsonl(self, tmp_path):
+        path = str(tmp_path / "spans.jsonl")
+        exporter = JsonlSpanExporter(path, batch_size=10, flush_seconds=60)
+        for i in range(25):
+            exporter.export({"span_id": i})
+        assert exporter.flush()
+        with open(path) as f:
+            assert [json.loads(line)["span_id"] for line in f] == list(range(25))
+        exporter.close()
+
+    def test_rotation_keeps_backup_count_files(self, tmp_path):
+        path = str(tmp_path / "spans.jsonl")
+        exporter = JsonlSpanExporter(path, max_bytes=200, backup_count=2, batch_size=1)
+        for i in range(60):
+            exporter.export({"span_id": i, "pad": "x" * 20})
+        exporter.close()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "spans.jsonl", "spans.jsonl.1", "spans.jsonl.2"
+        ]
+        assert all(p.stat().st_size <= 200 for p in tmp_path.iterdir())
+        ids = [span["span_id"] for span in load_spans([path])]
+        assert ids == sorted(ids) and ids[-1] == 59
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        exporter = JsonlSpanExporter(str(tmp_path / "spans.jsonl"), queue_size=1,
+                                     batch_size=1000, flush_seconds=60)
+        for i in range(1000):
+            exporter.export({"span_id": i})
+        assert exporter.dropped > 0
+        exporter.close()
+
+
+class TestTracer:
+    """Tests for sampling and spans around workflow runs."""
+
+    def test_head_sampling_decides_per_trace(self):
+        exporter = ListExporter()
+        tracer = Tracer(exporter, sample_rate=0.0)
+        root = tracer.start_span("run", "graph")
+        child = tracer.start_span("node", "node", root)
+        tracer.end_span(child)
+        tracer.end_span(root)
+        assert exporter.spans == []
+        assert tracer.stats["traces"] == 1 and tracer.stats["sampled_traces"] == 0
+
+    def test_workflow_spans_form_a_tree(self, exporter, monkeypatch):
+        monkeypatch.setattr(data_transformer, "llm",
+                            StreamingFakeChatModel(responses=["Once upon a time"]))
+
+        create_langgraph_workflow().invoke(initial_state("hello tracing"))
+
+        by_name = {s["name"]: s for s in exporter.spans}
+        graph = by_name["LangGraph"]
+        assert graph["kind"] == "graph" and graph["parent_id"] is None
+        for node in ("input_processor", "data_transformer", "output_generator"):
+            assert by_name[node]["kind"] == "node"
+            assert by_name[node]["parent_id"] == graph["span_id"]
+        llm = by_name["StreamingFakeChatModel"]
+        assert llm["kind"] == "llm"
+        assert llm["parent_id"] == by_name["data_transformer"]["span_id"]
+        assert llm["attrs"]["output_chars"] == len("Once upon a time")
+        assert len({s["trace_id"] for s in exporter.spans}) == 1
+
+    def test_tool_calls_are_spans_of_their_node(self, exporter):
+        create_tool_enhanced_workflow().invoke({**initial_state("count the words"),
+                                                "tool_results": ""})
+
+        nodes = [s for s in exporter.spans if s["name"] == "tool_processor"]
+        assert len(nodes) == 1
+        tools = [s for s in exporter.spans if s["kind"] == "tool"]
+        assert {s["name"] for s in tools} == {"text_analyzer_tool", "math_calculator_tool"}
+        assert all(s["parent_id"] == nodes[0]["span_id"] for s in tools)
+
+    def test_nothing_is_recorded_outside_a_run(self, exporter):
+        from src.tools import text_analyzer_tool
+        text_analyzer_tool("not traced")
+        assert exporter.spans == []
+
+
+class TestAnalyzer:
+    """Tests for the critical path and the report."""
+
+    def test_critical_path_follows_the_blocking_children(self):
+        spans = [
+            span("root", None, 0.0, 100),
+            span("a", "root", 0.0, 10),
+            # b and c run in parallel; c finishes last so it decides the time
+            span("b", "root", 0.01, 30),
+            span("c", "root", 0.01, 80),
+            span("c_llm", "c", 0.02, 60, kind="llm"),
+            span("d", "root", 0.09, 10),
+        ]
+        path = [(s["span_id"], self_ms) for s, self_ms in critical_path(spans)]
+        assert path == [("root", 0.0), ("a", 10), ("c", 20), ("c_llm", 60), ("d", 10)]
+
+    def test_report_aggregates_traces(self):
+        spans = [span("root", None, 0.0, 100), span("c", "root", 0.0, 100)]
+        report = analyze(spans)
+        assert report["traces"] == 1
+        assert report["spans"][("node", "c")]["p95_ms"] == 100
+        assert report["critical"][("node", "c")]["share"] == 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,14 +2,22 @@
 Streamlit Chat Application for LangGraph Router
 A user-friendly chat interface with LLM agent and tool integration.
 """
+import uuid
+
 import streamlit as st
 from dotenv import load_dotenv
 
-from main import create_workflow
+from main import chat_memory, get_chat_workflow, stream_workflow
+from src.memory.thread_memory import thread_config
+from src.models.chat_session import HISTORY_PAGE_SIZE, ChatStats, history_window
+from src.profiling import get_sampler
 
 # Load environment variables
 load_dotenv()
 
+# Background sampling profiler, if SAMPLER_ENABLED (one per process across reruns)
+get_sampler()
+
 # Page configuration
 st.set_page_config(
     page_title="LangGraph Chat Agent",
@@ -60,14 +68,27 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_resource(show_spinner=False)
+def load_workflow():
+    """
+    Load the compiled workflow once per process.
+
+    The graph, its LLM client and the conversation checkpointer are shared
+    by all sessions; each session only keeps its thread id.
+    """
+    return get_chat_workflow()
+
+
 def initialize_session_state():
     """Initialize session state variables."""
     if "messages" not in st.session_state:
         st.session_state.messages = []
-    if "workflow" not in st.session_state:
-        st.session_state.workflow = create_workflow()
-    if "conversation_history" not in st.session_state:
-        st.session_state.conversation_history = []
+    if "thread_id" not in st.session_state:
+        st.session_state.thread_id = uuid.uuid4().hex
+    if "stats" not in st.session_state:
+        st.session_state.stats = ChatStats()
+    if "history_pages" not in st.session_state:
+        st.session_state.history_pages = 1
 
 
 def display_message(role, content, tool_calls=None):
@@ -86,38 +107,69 @@ def display_message(role, content, tool_calls=None):
         # Display tool calls if present
         if tool_calls:
             for tool_call in tool_calls:
-                tool_name = tool_call.get('name', 'unknown')
-                tool_args = tool_call.get('args', {})
-                st.markdown(
-                    f'<div class="tool-call">'
-                    f'🔧 Tool Called: <b>{tool_name}</b><br>'
-                    f'Arguments: {tool_args}'
-                    f'</div>',
-                    unsafe_allow_html=True
-                )
+                display_tool_call(tool_call)
 
         st.markdown('</div>', unsafe_allow_html=True)
 
 
-def run_agent(user_input):
-    """Run the LangGraph workflow with user input."""
-    # Create initial state
-    initial_state = {
-        "input_text": user_input,
-        "processed_text": "",
-        "transformed_text": "",
-        "output_text": "",
-        "step": "",
-        "messages": st.session_state.conversation_history.copy()
-    }
-
-    # Run workflow
-    result = st.session_state.workflow.invoke(initial_state)
+def display_tool_call(tool_call):
+    """Display a single tool call."""
+    tool_name = tool_call.get('name', 'unknown')
+    tool_args = tool_call.get('args', {})
+    st.markdown(
+        f'<div class="tool-call">'
+        f'🔧 Tool Called: <b>{tool_name}</b><br>'
+        f'Arguments: {tool_args}'
+        f'</div>',
+        unsafe_allow_html=True
+    )
 
-    # Update conversation history
-    st.session_state.conversation_history = result.get("messages", [])
 
-    return result
+def run_agent(user_input, answer_placeholder=None, tools_container=None):
+    """
+    Run the LangGraph workflow with user input, streaming as it goes.
+
+    Args:
+        user_input: The user's message
+        answer_placeholder: st.empty() slot that receives the answer tokens
+        tools_container: Container where tool calls are shown as emitted
+
+    Returns:
+        Tuple of (final state, tool calls made during this turn)
+    """
+    # Earlier messages live in the thread's checkpoints; only the new input
+    # is sent, so the cost of a turn does not grow with the conversation
+    initial_state = {"input_text": user_input}
+    config = thread_config(st.session_state.thread_id)
+
+    # Stream the workflow, rendering tokens and tool events as they arrive
+    result = None
+    answer = ""
+    tool_calls = []
+
+    for kind, payload in stream_workflow(load_workflow(), initial_state, config):
+        if kind == "token":
+            answer += payload
+            if answer_placeholder is not None:
+                answer_placeholder.markdown(answer + "▌")
+        elif kind == "tool_call":
+            tool_calls.append(payload)
+            if tools_container is not None:
+                with tools_container:
+                    display_tool_call(payload)
+        elif kind == "tool_result":
+            # The agent runs again after tools, so its next answer starts fresh
+            answer = ""
+            if tools_container is not None:
+                with tools_container:
+                    st.caption(f"↳ {payload.name} returned {payload.content}")
+        else:
+            result = payload
+
+    if answer_placeholder is not None:
+        answer_placeholder.markdown(result.get("output_text", ""))
+
+    return result, tool_calls
 
 
 def main():
@@ -152,23 +204,19 @@ def main():
 
         st.divider()
 
-        # Conversation stats
-        st.header("📊 Stats")
-        st.metric("Messages", len(st.session_state.messages))
-        st.metric(
-            "Tool Calls",
-            sum(
-                1 for msg in st.session_state.conversation_history
-                if hasattr(msg, 'tool_calls') and msg.tool_calls
-            )
-        )
+        # Conversation stats are filled in at the end of the run so they
+        # include the turn streamed below without a second rerun
+        stats_placeholder = st.empty()
 
         st.divider()
 
         # Clear chat button
         if st.button("🗑️ Clear Chat", use_container_width=True):
             st.session_state.messages = []
-            st.session_state.conversation_history = []
+            chat_memory.delete_thread(st.session_state.thread_id)
+            st.session_state.thread_id = uuid.uuid4().hex
+            st.session_state.stats = ChatStats()
+            st.session_state.history_pages = 1
             st.rerun()
 
         # Show conversation history toggle
@@ -178,8 +226,17 @@ def main():
     chat_container = st.container()
 
     with chat_container:
+        # Only the latest pages of history are rendered on each rerun
+        start = history_window(
+            len(st.session_state.messages), st.session_state.history_pages
+        )
+        if start > 0:
+            if st.button(f"⬆️ Show earlier messages ({start} hidden)"):
+                st.session_state.history_pages += 1
+                st.rerun()
+
         # Display chat messages
-        for message in st.session_state.messages:
+        for message in st.session_state.messages[start:]:
             display_message(
                 message["role"],
                 message["content"],
@@ -200,62 +257,69 @@ def main():
         with chat_container:
             display_message("user", user_input)
 
-        # Show processing indicator
-        with st.spinner("🤔 Agent is thinking..."):
-            try:
-                # Run the agent
-                result = run_agent(user_input)
-
-                # Extract response and tool calls
-                messages = result.get("messages", [])
-
-                # Find tool calls in the conversation
-                tool_calls = []
-                assistant_response = result.get("output_text", "")
-
-                for msg in messages:
-                    if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                        tool_calls.extend(msg.tool_calls)
-
-                # Add assistant message to chat
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": assistant_response,
-                    "tool_calls": tool_calls if tool_calls else None
-                })
-
-                # Display assistant message
-                with chat_container:
-                    display_message(
-                        "assistant",
-                        assistant_response,
-                        tool_calls if tool_calls else None
-                    )
-
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": f"Sorry, I encountered an error: {str(e)}"
-                })
-
-        st.rerun()
+            # Assistant reply is streamed into this block as it is generated
+            with st.container():
+                st.markdown(
+                    '<div class="chat-message assistant-message">',
+                    unsafe_allow_html=True
+                )
+                st.markdown("**🤖 Assistant**")
+                tools_container = st.container()
+                answer_placeholder = st.empty()
+                answer_placeholder.markdown("🤔 Agent is thinking...")
+                st.markdown('</div>', unsafe_allow_html=True)
+
+        try:
+            # Run the agent
+            result, tool_calls = run_agent(
+                user_input, answer_placeholder, tools_container
+            )
+
+            # Add assistant message to chat
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": result.get("output_text", ""),
+                "tool_calls": tool_calls if tool_calls else None
+            })
+            st.session_state.stats.record_turn(2, tool_calls)
+
+        except Exception as e:
+            answer_placeholder.error(f"❌ Error: {str(e)}")
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": f"Sorry, I encountered an error: {str(e)}"
+            })
+            st.session_state.stats.record_turn(2)
+
+    # Conversation stats
+    with stats_placeholder.container():
+        st.header("📊 Stats")
+        st.metric("Messages", st.session_state.stats.messages)
+        st.metric("Tool Calls", st.session_state.stats.tool_calls)
 
     # Show conversation history in sidebar if enabled
-    if show_history and st.session_state.conversation_history:
-        with st.sidebar:
-            st.divider()
-            st.header("💬 Message History")
-            for i, msg in enumerate(st.session_state.conversation_history, 1):
-                msg_type = type(msg).__name__
-                with st.expander(f"{i}. {msg_type}"):
-                    st.json({
-                        "type": msg_type,
-                        "content": getattr(msg, 'content', 'N/A')[:100],
-                        "has_tool_calls": bool(
-                            getattr(msg, 'tool_calls', None)
-                        )
-                    })
+    if show_history:
+        # Only the latest page is read from the thread's checkpoints
+        history, total = chat_memory.tail_messages(
+            st.session_state.thread_id, HISTORY_PAGE_SIZE
+        )
+        start = total - len(history)
+        if history:
+            with st.sidebar:
+                st.divider()
+                st.header("💬 Message History")
+                if start > 0:
+                    st.caption(f"Showing the latest {len(history)} of {total} messages")
+                for i, msg in enumerate(history, start + 1):
+                    msg_type = type(msg).__name__
+                    with st.expander(f"{i}. {msg_type}"):
+                        st.json({
+                            "type": msg_type,
+                            "content": getattr(msg, 'content', 'N/A')[:100],
+                            "has_tool_calls": bool(
+                                getattr(msg, 'tool_calls', None)
+                            )
+                        })
 
 
 if __name__ == "__main__":
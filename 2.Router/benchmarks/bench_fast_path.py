@@ -0,0 +1,82 @@
+"""
+Fast Path Benchmark
+Runs a mixed set of requests through the agent workflow with and without
+the arithmetic fast path, against a stand-in LLM with fixed latency, and
+reports the bypass hit rate and the latency saved.
+
+Run from the project root:
+    python -m benchmarks.bench_fast_path
+"""
+import argparse
+import contextlib
+import io
+
+from langgraph_common.harness import print_report, run_benchmark, summarize, timer
+
+import main as router
+from src.llm import LLMLimiter, set_llm_limiter
+from src.nodes.fast_path import fast_path_stats
+from src.testing import FakeToolCallingChatModel
+
+REQUESTS = [
+    "What is 15 multiplied by 8?",
+    "Calculate 25 times 4",
+    "What is the product of 12 and 12?",
+    "multiply 7 by 6",
+    "What is the capital of France?",
+    "Tell me about Python",
+    "Could you multiply 3 by 9 and explain why?",
+    "What is 2 times 3 plus 1?",
+]
+
+
+def _initial_state(text: str):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "",
+        "messages": []
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.05,
+                        help="Seconds each stand-in LLM call takes")
+    args = parser.parse_args()
+
+    # No rate limits: the comparison is about the calls the fast path saves
+    set_llm_limiter(LLMLimiter())
+    llm = FakeToolCallingChatModel(latency=args.llm_latency)
+    router.get_llm_with_tools = lambda: llm
+
+    apps = {
+        "llm_only": router.create_workflow(use_fast_path=False),
+        "fast_path": router.create_workflow(use_fast_path=True),
+    }
+
+    def run_all():
+        timings = {}
+        for name, app in apps.items():
+            elapsed = timer()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for text in REQUESTS:
+                    app.invoke(_initial_state(text))
+            timings[name] = elapsed() / len(REQUESTS)
+        return timings
+
+    samples = run_benchmark(run_all, repeats=args.repeats)
+    print_report(f"Mean latency per request ({len(REQUESTS)} mixed requests)", samples)
+
+    stats = fast_path_stats.snapshot()
+    saved = summarize(samples["llm_only"])["mean_ms"] - summarize(samples["fast_path"])["mean_ms"]
+    print(f"\n⚡ Bypass hit rate: {stats['hit_rate']:.0%} of {stats['requests']} requests")
+    print(f"⚡ Average bypassed request: {stats['avg_hit_ms']} ms")
+    print(f"⚡ Latency saved per request (mean): {saved:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Message Reducer Benchmark
+Compares add_messages with add_messages_indexed on long histories: building
+a history one turn at a time, and appending or editing single messages once
+the history holds 10k messages.
+
+Run from the project root:
+    python -m benchmarks.bench_message_reducer
+"""
+import argparse
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph.message import add_messages
+from langgraph_common.harness import print_report, run_benchmark, timer
+
+from src.models.message_log import add_messages_indexed
+
+REDUCERS = {"add_messages": add_messages, "indexed": add_messages_indexed}
+
+
+def _turn(i: int):
+    return [HumanMessage(content=f"question {i}", id=f"h{i}"),
+            AIMessage(content=f"answer {i}", id=f"a{i}")]
+
+
+def _build(reducer, messages: int):
+    history = []
+    for i in range(messages // 2):
+        history = reducer(history, _turn(i))
+    return history
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--merges", type=int, default=200,
+                        help="Single-message merges timed on the full history")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    histories = {name: _build(reducer, args.messages) for name, reducer in REDUCERS.items()}
+
+    def run_all():
+        timings = {}
+        for name, reducer in REDUCERS.items():
+            elapsed = timer()
+            history = histories[name]
+            for i in range(args.merges):
+                history = reducer(history, [HumanMessage(content="new", id=f"n{i}")])
+            timings[f"{name}: append"] = elapsed() / args.merges
+
+            elapsed = timer()
+            for i in range(args.merges):
+                history = reducer(history, [AIMessage(content="edited", id=f"a{i}")])
+            timings[f"{name}: update"] = elapsed() / args.merges
+        return timings
+
+    samples = run_benchmark(run_all, repeats=args.repeats)
+    print_report(f"Single-message merge into a {args.messages}-message history", samples)
+
+    print(f"\n📈 Building a {args.messages}-message history one turn at a time")
+    print("=" * 72)
+    for name, reducer in REDUCERS.items():
+        elapsed = timer()
+        _build(reducer, args.messages)
+        print(f"{name:<24}{elapsed() * 1000:>12.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Session Memory Benchmark
+Measures the memory each additional Streamlit session costs when every
+session builds its own compiled graph, versus sharing one graph and one
+tool-bound LLM client per process.
+
+Run from the project root:
+    python -m benchmarks.bench_session_memory
+"""
+import argparse
+import gc
+import os
+import tracemalloc
+
+# The client is only constructed, never called, so a placeholder key is enough
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-placeholder")
+
+from main import create_workflow, get_llm_with_tools, get_workflow  # noqa: E402
+
+
+def _measure(new_session, sessions: int) -> float:
+    """Return the average bytes allocated per session by new_session()."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    states = [new_session() for _ in range(sessions)]
+
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del states
+    return (current - baseline) / sessions
+
+
+def per_session_graph():
+    """Previous behaviour: every session compiles its own workflow."""
+    return {
+        "messages": [],
+        "conversation_history": [],
+        "workflow": create_workflow()
+    }
+
+
+def shared_graph():
+    """Current behaviour: sessions only hold conversation data."""
+    get_workflow()
+    return {
+        "messages": [],
+        "conversation_history": []
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=50)
+    args = parser.parse_args()
+
+    # Build the shared resources up front so they count as a one-off cost
+    tracemalloc.start()
+    get_llm_with_tools()
+    get_workflow()
+    shared_cost = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    per_session = _measure(per_session_graph, args.sessions)
+    shared = _measure(shared_graph, args.sessions)
+
+    print(f"\n📈 Memory per additional session ({args.sessions} sessions)")
+    print("=" * 60)
+    print(f"{'per-session compiled graph':<36}{per_session / 1024:>12.1f} KiB")
+    print(f"{'shared graph + client':<36}{shared / 1024:>12.1f} KiB")
+    print("-" * 60)
+    print(f"{'one-off shared resources':<36}{shared_cost / 1024:>12.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
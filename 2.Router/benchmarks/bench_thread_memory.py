@@ -0,0 +1,81 @@
+"""
+Thread Memory Benchmark
+Measures the cost of a chat turn as the conversation grows when every turn
+resends the whole history, when a standard checkpointer keeps the thread,
+and when ThreadMemorySaver keeps it as an append-only log.
+
+Run from the project root:
+    python -m benchmarks.bench_thread_memory
+"""
+import argparse
+import contextlib
+import io
+import statistics
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph_common.harness import timer
+
+import main as router
+from src.llm import LLMLimiter, set_llm_limiter
+from src.memory import ThreadMemorySaver, thread_config
+from src.testing import FakeToolCallingChatModel
+
+
+def resend_history(turns: int):
+    """Previous behaviour: the caller copies the history into every run."""
+    app = router.create_workflow()
+    history = []
+    for i in range(turns):
+        elapsed = timer()
+        result = app.invoke({"input_text": f"Tell me fact number {i}",
+                             "messages": history.copy()})
+        history = result["messages"]
+        yield elapsed()
+
+
+def checkpointed(saver_cls):
+    """Current behaviour: the thread lives in the checkpointer."""
+    def run(turns: int):
+        app = router.create_workflow(checkpointer=saver_cls())
+        config = thread_config("bench")
+        for i in range(turns):
+            elapsed = timer()
+            app.invoke({"input_text": f"Tell me fact number {i}"}, config)
+            yield elapsed()
+    return run
+
+
+def _around(samples: list, turn: int, window: int = 10) -> float:
+    """Mean latency of the window turns ending at turn, in ms."""
+    return statistics.fmean(samples[max(0, turn - window):turn]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=400)
+    args = parser.parse_args()
+
+    # No rate limits: the token bucket would throttle long histories
+    set_llm_limiter(LLMLimiter())
+    llm = FakeToolCallingChatModel()
+    router.get_llm_with_tools = lambda: llm
+
+    checkpoints = [n for n in (1, 10, 50, 100, 200, 400, 800) if n <= args.turns]
+    variants = {
+        "resend history": resend_history,
+        "MemorySaver thread": checkpointed(MemorySaver),
+        "ThreadMemorySaver": checkpointed(ThreadMemorySaver),
+    }
+
+    print(f"\n📈 Mean latency of the 10 turns up to turn N (ms, stand-in LLM with no delay)")
+    print("=" * 72)
+    print(f"{'variant':<24}" + "".join(f"{'#' + str(n):>8}" for n in checkpoints))
+    print("-" * 72)
+    for name, run in variants.items():
+        with contextlib.redirect_stdout(io.StringIO()):
+            samples = list(run(args.turns))
+        print(f"{name:<24}" + "".join(f"{_around(samples, n):>8.2f}" for n in checkpoints))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Agent Loop Load Test
+Runs concurrent requests through the agent workflow against a stand-in LLM,
+where a share of the requests never stop asking for tools, and compares
+tail latency with the request budget against an effectively unlimited one.
+
+Run from the project root:
+    python -m benchmarks.load_test
+"""
+import argparse
+import contextlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph_common.harness import print_report, timer
+
+import main as router
+from src.llm import LLMLimiter, set_llm_limiter
+from src.testing import FakeToolCallingChatModel
+
+NORMAL_REQUESTS = [
+    "Could you multiply 15 by 8 for me?",
+    "What is the capital of France?",
+    "Please multiply 6 by 7",
+]
+RUNAWAY_REQUEST = "Keep multiplying until you are sure"
+
+UNLIMITED = {"max_agent_iterations": 10_000, "max_tool_calls": 10_000,
+             "time_budget_seconds": 3600}
+
+
+class RunawayChatModel(FakeToolCallingChatModel):
+    """Stand-in LLM that keeps calling tools for runaway requests."""
+
+    def respond(self, messages):
+        question = next(m.content for m in reversed(messages) if isinstance(m, HumanMessage))
+        if not question.startswith("Keep"):
+            return super().respond(messages)
+        self.calls += 1
+        return AIMessage(content="", tool_calls=[{
+            "name": "multiply_numbers",
+            "args": {"a": self.calls, "b": 2},
+            "id": f"call_{self.calls}"
+        }])
+
+
+def _initial_state(text: str, budget: dict):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "",
+        "messages": [],
+        **budget
+    }
+
+
+def run_load(app, requests, budget, concurrency, recursion_limit):
+    """Run all requests concurrently and return per-request latencies in seconds."""
+
+    def run_one(text):
+        elapsed = timer()
+        try:
+            app.invoke(_initial_state(text, budget),
+                       config={"recursion_limit": recursion_limit})
+        except Exception:  # runaway request hit the recursion limit
+            pass
+        return elapsed()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(run_one, requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--runaway-every", type=int, default=10,
+                        help="Every Nth request keeps asking for tools")
+    parser.add_argument("--llm-latency", type=float, default=0.02,
+                        help="Seconds each stand-in LLM call takes")
+    parser.add_argument("--recursion-limit", type=int, default=100,
+                        help="Graph step limit that stops unbudgeted runaway requests")
+    args = parser.parse_args()
+
+    # No rate limits: requests queue on the stand-in LLM only
+    set_llm_limiter(LLMLimiter(initial_concurrency=args.concurrency,
+                               max_concurrency=args.concurrency))
+    llm = RunawayChatModel(latency=args.llm_latency)
+    router.get_llm_with_tools = lambda: llm
+    app = router.create_workflow(use_fast_path=False)
+
+    requests = [
+        RUNAWAY_REQUEST if i % args.runaway_every == 0
+        else NORMAL_REQUESTS[i % len(NORMAL_REQUESTS)]
+        for i in range(1, args.requests + 1)
+    ]
+
+    samples = {
+        "budgeted": run_load(app, requests, {}, args.concurrency, args.recursion_limit),
+        "unlimited": run_load(app, requests, UNLIMITED, args.concurrency, args.recursion_limit),
+    }
+
+    print_report(
+        f"Request latency ({args.requests} requests, {args.concurrency} concurrent, "
+        f"1 in {args.runaway_every} runaway)",
+        samples
+    )
+
+
+if __name__ == "__main__":
+    main()
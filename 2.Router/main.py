@@ -1,35 +1,67 @@
+import argparse
 import os
+from functools import lru_cache
 
 from dotenv import load_dotenv
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk, ToolMessage
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode, tools_condition
+from src.config import Config
+from src.llm import call_with_hedging, get_llm_limiter
+from src.memory.history_manager import ConversationHistoryManager
+from src.memory.thread_memory import ThreadMemorySaver
 from src.models.graph_state import GraphState
+from src.nodes.budget import budget_exhausted, budget_exhausted_node
+from src.nodes.fast_path import make_fast_path_node, route_after_fast_path
 from src.nodes.input_node import input_node
 from src.nodes.output_node import output_node
-from src.tools.multiply import multiply_numbers
+from src.nodes.tool_answer import make_tool_answer_node, make_tool_answer_router
+from src.profiling import maybe_profile, profiled
+from src.tools.cache import ToolResultCache, memoize_pure_tools
+from src.tools.multiply import multiply_batch, multiply_numbers
 
 # Load environment variables
 load_dotenv()
 
-# Initialize LLM
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# Define tools; pure tools answer repeated calls from a shared cache
+tool_cache = ToolResultCache()
+tools = memoize_pure_tools([multiply_numbers, multiply_batch], tool_cache)
+tools_by_name = {tool.name: tool for tool in tools}
 
-# Define tools and bind to LLM
-tools = [multiply_numbers]
-llm_with_tools = llm.bind_tools(tools)
 
+@lru_cache(maxsize=None)
+def get_llm_with_tools():
+    """
+    Return the tool-bound LLM client.
+
+    Created lazily on first use and shared by every run in the process,
+    so all sessions reuse one client and its connection pool.
+    """
+    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    return llm.bind_tools(tools)
+
+# Keeps the prompt within a token budget as conversations grow
+history_manager = ConversationHistoryManager(
+    max_tokens=Config.HISTORY_MAX_TOKENS,
+    min_recent_turns=Config.HISTORY_MIN_RECENT_TURNS,
+    max_summary_tokens=Config.HISTORY_MAX_SUMMARY_TOKENS
+)
 
 
 def agent_node(state: GraphState) -> GraphState:
     """
     LLM agent that decides whether to call multiply tool or respond directly.
     """
-    messages = state.get("messages", [])
+    messages = history_manager.build_prompt(state.get("messages", []))
     
-    # Call LLM with tools
-    response = llm_with_tools.invoke(messages)
+    # Call LLM with tools, within the limits shared by all LLM calls; once
+    # the call has its slot, a slow provider call is hedged when
+    # LLM_HEDGING is on
+    llm = get_llm_with_tools()
+    response = get_llm_limiter().invoke(
+        llm, messages, wrap=lambda call: call_with_hedging("agent", call)
+    )
     
     print(f"🤖 Agent: Analyzing request...")
     
@@ -40,18 +72,21 @@ def agent_node(state: GraphState) -> GraphState:
         print(f"   → Direct response: {response.content}")
     
     return {
-        **state,
-        "messages": [response]
+        "messages": [response],
+        "agent_iterations": state.get("agent_iterations", 0) + 1,
+        "tool_calls_made": state.get("tool_calls_made", 0) + len(response.tool_calls)
     }
 
 
 def should_continue(state: GraphState) -> str:
-    """Determine if we should call tools or end."""
+    """Determine if we should call tools, end, or stop on an exhausted budget."""
     messages = state.get("messages", [])
     last_message = messages[-1] if messages else None
     
     # Use tools_condition logic
     if last_message and hasattr(last_message, 'tool_calls') and last_message.tool_calls:
+        if budget_exhausted(state):
+            return "budget_exhausted"
         return "tools"
     return "end"
 
@@ -59,19 +94,46 @@ def should_continue(state: GraphState) -> str:
 
 
 
-def create_workflow():
-    """Create the simplified LangGraph workflow."""
+def create_workflow(use_fast_path: bool = True,
+                    direct_tool_answers: bool = Config.DIRECT_TOOL_ANSWERS,
+                    checkpointer=None):
+    """
+    Create the simplified LangGraph workflow.
+
+    Args:
+        use_fast_path: If True, plain multiplication requests are answered
+            by the fast_path node without calling the LLM
+        direct_tool_answers: If True, turns whose tool calls are all
+            answer-producing and succeeded are answered from the tool
+            output instead of going back to the agent
+        checkpointer: Optional checkpointer keeping conversation threads
+            between runs; runs must then pass a thread_id
+    """
     workflow = StateGraph(GraphState)
     
     # Add nodes
     workflow.add_node("input_processor", input_node)
     workflow.add_node("agent", agent_node)
-    workflow.add_node("tools", ToolNode(tools))
+    # Tool errors become error ToolMessages so the agent can explain them
+    workflow.add_node("tools", ToolNode(tools, handle_tool_errors=True))
     workflow.add_node("output", output_node)
     
     # Define edges
     workflow.set_entry_point("input_processor")
-    workflow.add_edge("input_processor", "agent")
+    if use_fast_path:
+        # Deterministic pre-router: answer plain arithmetic or hand off to agent
+        workflow.add_node("fast_path", make_fast_path_node(tools_by_name["multiply_numbers"]))
+        workflow.add_edge("input_processor", "fast_path")
+        workflow.add_conditional_edges(
+            "fast_path",
+            route_after_fast_path,
+            {
+                "agent": "agent",
+                "output": "output"
+            }
+        )
+    else:
+        workflow.add_edge("input_processor", "agent")
     
     # Conditional routing: agent → tools or end
     workflow.add_conditional_edges(
@@ -79,15 +141,106 @@ def create_workflow():
         should_continue,
         {
             "tools": "tools",
+            "budget_exhausted": "budget_exhausted",
             "end": "output"
         }
     )
     
-    # After tools, go back to agent for final response
-    workflow.add_edge("tools", "agent")
+    # After tools, answer directly when allowed, stop if the budget ran
+    # out, else go back to agent for final response
+    tool_answer_router = make_tool_answer_router(tools) if direct_tool_answers else None
+
+    def route_after_tools(state: GraphState) -> str:
+        if tool_answer_router and tool_answer_router(state) == "tool_answer":
+            return "tool_answer"
+        if budget_exhausted(state):
+            return "budget_exhausted"
+        return "agent"
+
+    route_targets = {
+        "agent": "agent",
+        "budget_exhausted": "budget_exhausted"
+    }
+    if direct_tool_answers:
+        workflow.add_node("tool_answer", make_tool_answer_node(tools))
+        workflow.add_edge("tool_answer", "output")
+        route_targets["tool_answer"] = "tool_answer"
+
+    workflow.add_node("budget_exhausted", budget_exhausted_node)
+    workflow.add_conditional_edges("tools", route_after_tools, route_targets)
+    workflow.add_edge("budget_exhausted", "output")
     workflow.add_edge("output", END)
     
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
+
+
+@lru_cache(maxsize=None)
+def get_workflow():
+    """
+    Return the compiled workflow shared by every run in the process.
+
+    The compiled graph holds no per-conversation data, so it is safe to
+    share between sessions and threads.
+    """
+    return create_workflow()
+
+
+# Conversation threads shared by every chat session in the process
+chat_memory = ThreadMemorySaver()
+
+
+@lru_cache(maxsize=None)
+def get_chat_workflow():
+    """
+    Return the compiled workflow that remembers conversation threads.
+
+    Each run passes thread_config(thread_id) and only the new input; the
+    earlier messages of the thread are loaded from chat_memory.
+    """
+    return create_workflow(checkpointer=chat_memory)
+
+
+def stream_workflow(app, initial_state: dict, config=None):
+    """
+    Stream a run of the workflow as UI-friendly events.
+
+    Args:
+        app: Compiled workflow
+        initial_state: Input for the run
+        config: Optional run config, e.g. thread_config(thread_id)
+
+    Yields:
+        ("token", text) for each LLM token generated by the agent,
+        ("tool_call", tool_call) as soon as the agent requests a tool,
+        ("tool_result", ToolMessage) as soon as the tools node returns,
+        and finally ("result", final_state) once the run completes
+    """
+    final_state = None
+
+    for mode, chunk in app.stream(
+        initial_state, config, stream_mode=["messages", "updates", "values"]
+    ):
+        if mode == "messages":
+            message, metadata = chunk
+            if (metadata.get("langgraph_node") == "agent"
+                    and isinstance(message, AIMessageChunk) and message.content):
+                yield "token", message.content
+        elif mode == "updates":
+            for node, update in chunk.items():
+                messages = (update or {}).get("messages", [])
+                if node in ("agent", "fast_path"):
+                    for message in messages:
+                        for tool_call in getattr(message, "tool_calls", None) or []:
+                            yield "tool_call", tool_call
+                        if isinstance(message, ToolMessage):
+                            yield "tool_result", message
+                elif node == "tools":
+                    for message in messages:
+                        yield "tool_result", message
+        else:
+            final_state = chunk
+
+    yield "result", final_state
 
 
 def run_workflow(input_text: str):
@@ -96,7 +249,7 @@ def run_workflow(input_text: str):
     print("🚀 Starting LangGraph Workflow with LLM Agent")
     print("=" * 60)
     
-    app = create_workflow()
+    app = profiled(get_workflow())
     
     # Initial state
     initial_state = {
@@ -119,28 +272,44 @@ def run_workflow(input_text: str):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LangGraph LLM agent with tool routing demo")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile time and memory per node and tool, print a summary at the end"
+    )
+    parser.add_argument(
+        "--profile-output",
+        default="profile.collapsed",
+        help="Collapsed-stack file written with --profile (for flamegraph tools)"
+    )
+    args = parser.parse_args()
+
     print("\n╔══════════════════════════════════════════════════════════╗")
     print("║    LangGraph + LLM Agent with Tool Routing Demo         ║")
     print("╚══════════════════════════════════════════════════════════╝\n")
     
-    # Test 1: Multiplication request
-    print("\n📋 Test 1: Multiplication Request")
-    print("-" * 60)
-    result1 = run_workflow("What is 15 multiplied by 8?")
-    
-    # Test 2: Non-multiplication question
-    print("\n\n📋 Test 2: General Question")
-    print("-" * 60)
-    result2 = run_workflow("What is the capital of France?")
-    
-    # Test 3: Another multiplication
-    print("\n\n📋 Test 3: Another Multiplication")
-    print("-" * 60)
-    result3 = run_workflow("Calculate 25 times 4")
+    with maybe_profile(args.profile) as session:
+        # Test 1: Multiplication request
+        print("\n📋 Test 1: Multiplication Request")
+        print("-" * 60)
+        result1 = run_workflow("What is 15 multiplied by 8?")
+        
+        # Test 2: Non-multiplication question
+        print("\n\n📋 Test 2: General Question")
+        print("-" * 60)
+        result2 = run_workflow("What is the capital of France?")
+        
+        # Test 3: Another multiplication
+        print("\n\n📋 Test 3: Another Multiplication")
+        print("-" * 60)
+        result3 = run_workflow("Calculate 25 times 4")
     
     print("\n\n" + "=" * 60)
     print("✅ All tests completed successfully!")
     print("=" * 60)
 
-
-
+    if session is not None:
+        session.print_report()
+        lines = session.write_collapsed(args.profile_output)
+        print(f"\n🔥 {lines} collapsed stacks written to {args.profile_output}")
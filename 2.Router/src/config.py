@@ -30,6 +30,48 @@ class Config:
     LLM_MODEL: str = "gpt-3.5-turbo"
     LLM_TEMPERATURE: float = 0.7
 
+    # Shared LLM call limits (0 disables a rate limit); the concurrency
+    # limit adapts between the min and max on provider 429s and timeouts
+    LLM_RATE_LIMIT_RPS: float = float(os.getenv("LLM_RATE_LIMIT_RPS", "10"))
+    LLM_RATE_LIMIT_TPM: float = float(os.getenv("LLM_RATE_LIMIT_TPM", "90000"))
+    LLM_INITIAL_CONCURRENCY: int = int(os.getenv("LLM_INITIAL_CONCURRENCY", "8"))
+    LLM_MIN_CONCURRENCY: int = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+
+    # Hedged LLM calls (opt-in): a call slower than this percentile of recent
+    # latencies gets a duplicate, for at most this fraction of calls
+    LLM_HEDGING: bool = os.getenv("LLM_HEDGING", "false").lower() == "true"
+    LLM_HEDGE_PERCENTILE: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+    LLM_HEDGE_MAX_FRACTION: float = float(os.getenv("LLM_HEDGE_MAX_FRACTION", "0.1"))
+
+    # Agent Settings
+    # Answer straight from answer-producing tools instead of a second LLM call
+    DIRECT_TOOL_ANSWERS: bool = os.getenv(
+        "DIRECT_TOOL_ANSWERS", "false").lower() == "true"
+
+    # Per-request budget for the agent/tools loop
+    AGENT_MAX_ITERATIONS: int = int(os.getenv("AGENT_MAX_ITERATIONS", "5"))
+    AGENT_MAX_TOOL_CALLS: int = int(os.getenv("AGENT_MAX_TOOL_CALLS", "10"))
+    AGENT_TIME_BUDGET_SECONDS: float = float(
+        os.getenv("AGENT_TIME_BUDGET_SECONDS", "30"))
+
+    # Conversation History Settings
+    HISTORY_MAX_TOKENS: int = int(os.getenv("HISTORY_MAX_TOKENS", "2000"))
+    HISTORY_MIN_RECENT_TURNS: int = int(os.getenv("HISTORY_MIN_RECENT_TURNS", "2"))
+    HISTORY_MAX_SUMMARY_TOKENS: int = int(
+        os.getenv("HISTORY_MAX_SUMMARY_TOKENS", "400"))
+
+    # Background sampling profiler (see src/profiling/sampler.py): samples all
+    # threads every interval and writes a collapsed-stack snapshot to
+    # SAMPLER_DIR every flush interval, slowing down above the CPU overhead
+    SAMPLER_ENABLED: bool = os.getenv("SAMPLER_ENABLED", "false").lower() == "true"
+    SAMPLER_DIR: str = os.getenv("SAMPLER_DIR", "profiles")
+    SAMPLER_INTERVAL_SECONDS: float = float(os.getenv("SAMPLER_INTERVAL_SECONDS", "0.02"))
+    SAMPLER_FLUSH_SECONDS: float = float(os.getenv("SAMPLER_FLUSH_SECONDS", "60"))
+    SAMPLER_MAX_STACKS: int = int(os.getenv("SAMPLER_MAX_STACKS", "10000"))
+    SAMPLER_KEEP_FILES: int = int(os.getenv("SAMPLER_KEEP_FILES", "24"))
+    SAMPLER_MAX_OVERHEAD: float = float(os.getenv("SAMPLER_MAX_OVERHEAD", "0.02"))
+
     @classmethod
     def get_llm(cls) -> Optional[ChatOpenAI]:
         """
@@ -0,0 +1,26 @@
+"""
+Shared helpers for calling LLMs.
+"""
+
+from langgraph_common.llm.hedging import HedgingPolicy
+from langgraph_common.llm.limiter import (
+    AdaptiveConcurrency,
+    LLMLimiter,
+    TokenBucket,
+    is_overload_error
+)
+
+from .hedging import call_with_hedging, get_hedging_policy
+from .limiter import get_llm_limiter, set_llm_limiter
+
+__all__ = [
+    'AdaptiveConcurrency',
+    'HedgingPolicy',
+    'LLMLimiter',
+    'TokenBucket',
+    'call_with_hedging',
+    'get_hedging_policy',
+    'get_llm_limiter',
+    'is_overload_error',
+    'set_llm_limiter'
+]
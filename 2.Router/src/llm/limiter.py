@@ -0,0 +1,38 @@
+"""
+LLM Rate Limiter
+Process-wide limiter for LLM calls, configured from Config.
+
+The limiter itself (request and token buckets plus AIMD concurrency) is
+langgraph_common.llm.limiter, shared with the other projects.
+"""
+import threading
+from typing import Optional
+
+from langgraph_common.llm.limiter import LLMLimiter
+
+from src.config import Config
+
+_limiter: Optional[LLMLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_llm_limiter() -> LLMLimiter:
+    """Return the process-wide limiter, configured from Config on first use."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = LLMLimiter(
+                requests_per_second=Config.LLM_RATE_LIMIT_RPS,
+                tokens_per_minute=Config.LLM_RATE_LIMIT_TPM,
+                initial_concurrency=Config.LLM_INITIAL_CONCURRENCY,
+                min_concurrency=Config.LLM_MIN_CONCURRENCY,
+                max_concurrency=Config.LLM_MAX_CONCURRENCY
+            )
+        return _limiter
+
+
+def set_llm_limiter(limiter: Optional[LLMLimiter]) -> None:
+    """Replace the process-wide limiter (None rebuilds it from Config)."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
@@ -0,0 +1,13 @@
+"""
+Conversation memory helpers for the agent workflow.
+"""
+
+from .history_manager import ConversationHistoryManager, extractive_summarizer
+from .thread_memory import ThreadMemorySaver, thread_config
+
+__all__ = [
+    'ConversationHistoryManager',
+    'extractive_summarizer',
+    'ThreadMemorySaver',
+    'thread_config'
+]
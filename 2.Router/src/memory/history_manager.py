@@ -0,0 +1,202 @@
+"""
+Conversation History Manager
+Keeps the prompt sent to the agent LLM within a token budget.
+
+System messages are always kept, recent turns are kept verbatim and older
+turns are folded into a rolling summary. A turn starts with a HumanMessage
+and carries every AI and tool message that follows it, so tool calls and
+their results are always kept or folded together.
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage
+)
+from langchain_core.messages.utils import count_tokens_approximately
+
+# (previous_summary, newly_folded_messages) -> new summary
+Summarizer = Callable[[str, Sequence[BaseMessage]], str]
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def extractive_summarizer(previous_summary: str,
+                          messages: Sequence[BaseMessage],
+                          max_chars_per_message: int = 200) -> str:
+    """
+    Cheap summarizer that extends the previous summary with one line per message.
+
+    Args:
+        previous_summary: Summary of the turns folded earlier
+        messages: Messages being folded into the summary
+        max_chars_per_message: Maximum characters kept from each message
+
+    Returns:
+        The updated summary text
+    """
+    lines = [previous_summary] if previous_summary else []
+
+    for message in messages:
+        content = " ".join(str(message.content).split())
+        if isinstance(message, HumanMessage):
+            role = "User"
+        elif isinstance(message, AIMessage):
+            role = "Assistant"
+            if message.tool_calls and not content:
+                content = ", ".join(
+                    f"called {call['name']}({call['args']})"
+                    for call in message.tool_calls
+                )
+        elif isinstance(message, ToolMessage):
+            role = f"Tool {message.name or ''}".strip()
+        else:
+            continue
+
+        if content:
+            lines.append(f"{role}: {content[:max_chars_per_message]}")
+
+    return "\n".join(lines)
+
+
+def _message_key(message: BaseMessage) -> str:
+    """Stable identity of a message used for summary caching."""
+    return message.id or f"{message.type}:{message.content}"
+
+
+class ConversationHistoryManager:
+    """
+    Builds token-budgeted prompts from a full conversation history.
+
+    The rolling summary is cached per conversation (keyed by the id of its
+    first folded message) and only recomputed when the window moves. When the
+    window moves forward, only the newly folded messages are summarized.
+    """
+
+    def __init__(self,
+                 max_tokens: int = 2000,
+                 min_recent_turns: int = 2,
+                 max_summary_tokens: int = 400,
+                 summarizer: Optional[Summarizer] = None,
+                 token_counter: Callable[[Sequence[BaseMessage]], int] = count_tokens_approximately,
+                 cache_size: int = 256):
+        """
+        Args:
+            max_tokens: Token budget for the whole prompt
+            min_recent_turns: Number of latest turns that are never folded
+            max_summary_tokens: Upper bound on the size of the rolling summary
+            summarizer: Function folding messages into the summary
+            token_counter: Function estimating the tokens of a message list
+            cache_size: Number of conversations whose summary is cached
+        """
+        self.max_tokens = max_tokens
+        self.min_recent_turns = max(1, min_recent_turns)
+        self.max_summary_tokens = max_summary_tokens
+        self.summarizer = summarizer or extractive_summarizer
+        self.token_counter = token_counter
+        self.cache_size = cache_size
+
+        # conversation key -> (folded message keys, summary)
+        self._summaries: "OrderedDict[str, Tuple[Tuple[str, ...], str]]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "summary_cache_hits": 0,
+            "summary_recomputes": 0,
+            "last_prompt_tokens": 0,
+            "last_folded_messages": 0
+        }
+
+    @staticmethod
+    def split_turns(messages: Sequence[BaseMessage]) -> Tuple[List[BaseMessage], List[List[BaseMessage]]]:
+        """
+        Split messages into pinned system messages and conversation turns.
+
+        Returns:
+            Tuple of (system messages, list of turns)
+        """
+        system: List[BaseMessage] = []
+        turns: List[List[BaseMessage]] = []
+
+        for message in messages:
+            if isinstance(message, SystemMessage):
+                system.append(message)
+            elif isinstance(message, HumanMessage) or not turns:
+                turns.append([message])
+            else:
+                turns[-1].append(message)
+
+        return system, turns
+
+    def build_prompt(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """
+        Select the messages to send to the LLM.
+
+        Args:
+            messages: Full conversation history
+
+        Returns:
+            System messages, an optional summary message and the recent turns
+        """
+        system, turns = self.split_turns(messages)
+
+        budget = self.max_tokens - self.max_summary_tokens
+        if system:
+            budget -= self.token_counter(system)
+
+        # Walk backwards keeping whole turns while they fit in the budget
+        start = len(turns)
+        used = 0
+        while start > 0:
+            turn_tokens = self.token_counter(turns[start - 1])
+            kept_turns = len(turns) - start
+            if kept_turns >= self.min_recent_turns and used + turn_tokens > budget:
+                break
+            used += turn_tokens
+            start -= 1
+
+        recent = [message for turn in turns[start:] for message in turn]
+        folded = [message for turn in turns[:start] for message in turn]
+
+        prompt = list(system)
+        if folded:
+            prompt.append(SystemMessage(content=SUMMARY_PREFIX + self._summarize(folded)))
+        prompt.extend(recent)
+
+        self.stats["last_prompt_tokens"] = self.token_counter(prompt)
+        self.stats["last_folded_messages"] = len(folded)
+        return prompt
+
+    def _summarize(self, folded: List[BaseMessage]) -> str:
+        """Return the cached summary for folded, updating it incrementally."""
+        keys = tuple(_message_key(message) for message in folded)
+        conversation = keys[0]
+        cached = self._summaries.get(conversation)
+
+        if cached is not None and cached[0] == keys:
+            self.stats["summary_cache_hits"] += 1
+            self._summaries.move_to_end(conversation)
+            return cached[1]
+
+        self.stats["summary_recomputes"] += 1
+        if cached is not None and keys[:len(cached[0])] == cached[0]:
+            summary = self.summarizer(cached[1], folded[len(cached[0]):])
+        else:
+            summary = self.summarizer("", folded)
+        summary = self._clip(summary)
+
+        self._summaries[conversation] = (keys, summary)
+        self._summaries.move_to_end(conversation)
+        while len(self._summaries) > self.cache_size:
+            self._summaries.popitem(last=False)
+
+        return summary
+
+    def _clip(self, summary: str) -> str:
+        """Keep the most recent part of the summary within max_summary_tokens."""
+        while summary and self.token_counter([SystemMessage(content=SUMMARY_PREFIX + summary)]) > self.max_summary_tokens:
+            cut = summary.find("\n", len(summary) // 4)
+            summary = summary[cut + 1:] if cut != -1 else summary[len(summary) // 4 + 1:]
+        return summary
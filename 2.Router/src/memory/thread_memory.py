@@ -0,0 +1,275 @@
+"""
+Thread Memory
+Checkpointer that keeps each conversation thread's messages as an append-only log.
+
+The standard in-memory checkpointer serializes the whole message list every
+time it changes, so each turn costs O(history). ThreadMemorySaver instead
+stores only the messages appended since the thread's previous checkpoint,
+keeps the latest MessageLog of recently used threads in memory, and can
+read the tail of a conversation without loading all of it.
+
+The new messages are found with MessageLog.tail_after, and reads return
+the cached MessageLog itself, which the next run's reducer appends to, so
+neither side copies or compares the history. What remains O(history) is
+the message channel's checkpoint list (see CheckpointMessages): one
+C-level copy of the message references per checkpoint, which nothing
+serializes or walks.
+
+It implements the public BaseCheckpointSaver interface. Checkpoints and
+pending writes are kept by an inner MemorySaver without the message
+channel, whose segments ThreadMemorySaver stores itself.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.models.message_log import CheckpointMessages, MessageLog
+
+
+def thread_config(thread_id: str) -> RunnableConfig:
+    """Return the run config selecting a conversation thread."""
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def _as_log(messages: Sequence[BaseMessage]) -> MessageLog:
+    """The MessageLog behind a checkpointed message list, or a new one."""
+    if isinstance(messages, CheckpointMessages):
+        return messages.log
+    if isinstance(messages, MessageLog):
+        return messages
+    return MessageLog(messages)
+
+
+class ThreadMemorySaver(BaseCheckpointSaver):
+    """
+    In-memory checkpointer that writes the message channel as deltas.
+
+    Each stored message segment is {"base", "length", "tail"}: the value is
+    the base version's messages followed by tail. A segment with no base is
+    a full snapshot, written whenever the new log does not extend the
+    previous one (for example after a message was replaced).
+    """
+
+    def __init__(self, *, serde=None, channel: str = "messages", cached_threads: int = 128):
+        """
+        Initialize the saver.
+
+        Args:
+            serde: Serializer for checkpoints and message segments
+            channel: Name of the append-mostly message channel
+            cached_threads: Threads whose latest messages are kept in memory;
+                the least recently used are dropped first
+        """
+        super().__init__(serde=serde)
+        self.channel = channel
+        self.cached_threads = cached_threads
+        self._saver = MemorySaver(serde=self.serde)
+        # (thread_id, checkpoint_ns, version) -> serialized segment
+        self._segments: Dict[Tuple[str, str, Any], Tuple[str, bytes]] = {}
+        # (thread_id, checkpoint_ns) -> (version, messages at that version)
+        self._latest: "OrderedDict[Tuple[str, str], Tuple[Any, MessageLog]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"deltas": 0, "snapshots": 0, "messages_written": 0}
+
+    # -- writing ---------------------------------------------------------
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        values = checkpoint["channel_values"]
+        if self.channel in new_versions and self.channel in values:
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+            version = new_versions[self.channel]
+            segment = self._dump_segment(thread_id, checkpoint_ns, version,
+                                         _as_log(values[self.channel]))
+            with self._lock:
+                self._segments[(thread_id, checkpoint_ns, version)] = segment
+        # The inner saver stores the channel as empty; get_tuple fills it in
+        checkpoint = {**checkpoint, "channel_values": {
+            k: v for k, v in values.items() if k != self.channel}}
+        return self._saver.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        self._saver.put_writes(config, writes, task_id, task_path)
+
+    def get_next_version(self, current, channel):
+        return self._saver.get_next_version(current, channel)
+
+    def _dump_segment(self, thread_id: str, checkpoint_ns: str, version: Any,
+                      messages: MessageLog):
+        key = (thread_id, checkpoint_ns)
+        with self._lock:
+            latest = self._latest.get(key)
+            base, tail = None, None
+            if latest is not None:
+                tail = messages.tail_after(latest[1])
+            if tail is not None:
+                base = latest[0]
+                self.stats["deltas"] += 1
+            else:
+                tail = messages[:]
+                self.stats["snapshots"] += 1
+            self.stats["messages_written"] += len(tail)
+            self._cache(key, version, messages)
+
+        return self.serde.dumps_typed({"base": base, "length": len(messages), "tail": tail})
+
+    def _cache(self, key: Tuple[str, str], version: Any, messages: MessageLog) -> None:
+        """Remember a thread's latest messages (called with the lock held)."""
+        self._latest[key] = (version, messages)
+        self._latest.move_to_end(key)
+        while len(self._latest) > self.cached_threads:
+            self._latest.popitem(last=False)
+
+    def _cached(self, key: Tuple[str, str]) -> Optional[Tuple[Any, MessageLog]]:
+        with self._lock:
+            latest = self._latest.get(key)
+            if latest is not None:
+                self._latest.move_to_end(key)
+            return latest
+
+    # -- reading ---------------------------------------------------------
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self._with_messages(self._saver.get_tuple(config))
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None,
+             limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        for checkpoint_tuple in self._saver.list(config, filter=filter, before=before, limit=limit):
+            yield self._with_messages(checkpoint_tuple)
+
+    def _with_messages(self, checkpoint_tuple: Optional[CheckpointTuple]) -> Optional[CheckpointTuple]:
+        """Add the message channel to a checkpoint read from the inner saver."""
+        if checkpoint_tuple is None:
+            return None
+        checkpoint = checkpoint_tuple.checkpoint
+        version = checkpoint["channel_versions"].get(self.channel)
+        if version is None:
+            return checkpoint_tuple
+        configurable = checkpoint_tuple.config["configurable"]
+        messages = self._materialize(configurable["thread_id"],
+                                     configurable.get("checkpoint_ns", ""), version)
+        if messages is None:
+            return checkpoint_tuple
+        values = {**checkpoint["channel_values"], self.channel: messages}
+        return checkpoint_tuple._replace(checkpoint={**checkpoint, "channel_values": values})
+
+    def _load_segment(self, thread_id: str, checkpoint_ns: str,
+                      version: Any) -> Optional[Dict[str, Any]]:
+        segment = self._segments.get((thread_id, checkpoint_ns, version))
+        return None if segment is None else self.serde.loads_typed(segment)
+
+    def _materialize(self, thread_id: str, checkpoint_ns: str,
+                     version: Any) -> Optional[MessageLog]:
+        """
+        Return the messages at version.
+
+        The cached latest log is returned as it is (MessageLogs never
+        change); other versions are rebuilt from their segments.
+        """
+        key = (thread_id, checkpoint_ns)
+        target = version
+        latest = self._cached(key)
+        if latest is not None and latest[0] == version:
+            return latest[1]
+
+        # Walk back to a snapshot or the cached log, then replay forwards
+        tails: List[List[BaseMessage]] = []
+        messages: List[BaseMessage] = []
+        while version is not None:
+            if latest is not None and latest[0] == version:
+                messages = latest[1][:]
+                break
+            segment = self._load_segment(thread_id, checkpoint_ns, version)
+            if segment is None:
+                return None
+            tails.append(segment["tail"])
+            version = segment["base"]
+
+        for tail in reversed(tails):
+            messages.extend(tail)
+
+        log = MessageLog(messages)
+        if latest is None:
+            with self._lock:
+                if key not in self._latest:
+                    self._cache(key, target, log)
+        return log
+
+    def _latest_version(self, thread_id: str, checkpoint_ns: str) -> Any:
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}}
+        checkpoint_tuple = self._saver.get_tuple(config)
+        if checkpoint_tuple is None:
+            return None
+        return checkpoint_tuple.checkpoint["channel_versions"].get(self.channel)
+
+    def tail_messages(self, thread_id: str, limit: int,
+                      checkpoint_ns: str = "") -> Tuple[List[BaseMessage], int]:
+        """
+        Read the most recent messages of a thread.
+
+        Only the segments covering the last limit messages are loaded, so
+        the cost does not grow with the length of the conversation.
+
+        Args:
+            thread_id: Conversation thread
+            limit: Maximum number of messages to return
+            checkpoint_ns: Checkpoint namespace
+
+        Returns:
+            Tuple of (latest messages in order, total messages in the thread)
+        """
+        version = self._latest_version(thread_id, checkpoint_ns)
+        latest = self._cached((thread_id, checkpoint_ns))
+        if latest is not None and latest[0] == version:
+            messages = latest[1]
+            return messages[max(0, len(messages) - limit):], len(messages)
+
+        collected: List[BaseMessage] = []
+        total = None
+        while version is not None and len(collected) < limit:
+            segment = self._load_segment(thread_id, checkpoint_ns, version)
+            if segment is None:
+                break
+            if total is None:
+                total = segment["length"]
+            collected[:0] = segment["tail"]
+            version = segment["base"]
+        return collected[max(0, len(collected) - limit):], total or 0
+
+    # -- housekeeping ----------------------------------------------------
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._saver.delete_thread(thread_id)
+        with self._lock:
+            for key in [key for key in self._segments if key[0] == thread_id]:
+                del self._segments[key]
+            for key in [key for key in self._latest if key[0] == thread_id]:
+                del self._latest[key]
+
+    # -- async (the data is in memory, so these run the sync methods) -----
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(self, config: Optional[RunnableConfig], *,
+                    filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        for checkpoint_tuple in self.list(config, filter=filter, before=before, limit=limit):
+            yield checkpoint_tuple
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
@@ -3,5 +3,15 @@ Core models and type definitions for LangGraph workflows.
 """
 
 from .graph_state import GraphState
+from .chat_session import ChatStats, history_window
+from .message_log import CheckpointMessages, MessageLog, MessageLogChannel, add_messages_indexed
 
-__all__ = ['GraphState']
+__all__ = [
+    'GraphState',
+    'ChatStats',
+    'history_window',
+    'CheckpointMessages',
+    'MessageLog',
+    'MessageLogChannel',
+    'add_messages_indexed'
+]
@@ -0,0 +1,49 @@
+"""
+Chat Session Models
+Per-session bookkeeping for the Streamlit chat UI.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable
+
+# Number of chat messages rendered per history page
+HISTORY_PAGE_SIZE = 20
+
+
+@dataclass
+class ChatStats:
+    """
+    Conversation counters updated incrementally from each turn's new data,
+    so reading them never rescans the whole conversation.
+    """
+
+    messages: int = 0
+    tool_calls: int = 0
+
+    def record_turn(self, chat_messages: int, tool_calls: Iterable[Dict[str, Any]] = ()) -> None:
+        """
+        Add one turn to the counters.
+
+        Args:
+            chat_messages: Number of chat messages the turn added
+            tool_calls: Tool calls made during the turn
+        """
+        self.messages += chat_messages
+        self.tool_calls += sum(1 for _ in tool_calls)
+
+
+def history_window(total: int, pages: int, page_size: int = HISTORY_PAGE_SIZE) -> int:
+    """
+    Compute which part of the history to render.
+
+    Only the most recent pages are rendered, so the cost of a rerun depends
+    on the number of visible pages rather than on the session length.
+
+    Args:
+        total: Number of messages in the history
+        pages: Number of pages the user has expanded (at least 1)
+        page_size: Messages per page
+
+    Returns:
+        Index of the first rendered message; earlier messages stay hidden
+    """
+    return max(0, total - max(1, pages) * page_size)
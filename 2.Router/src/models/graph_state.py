@@ -1,8 +1,8 @@
-from typing import TypedDict, Annotated, Sequence
+from typing import TypedDict, Annotated, Optional, Sequence
 
 from langchain_core.messages import BaseMessage
 
-from langgraph.graph.message import add_messages
+from src.models.message_log import MessageLogChannel, add_messages_indexed
 
 
 class GraphState(TypedDict):
@@ -12,4 +12,19 @@ class GraphState(TypedDict):
     transformed_text: str
     output_text: str
     step: str
-    messages: Annotated[Sequence[BaseMessage], add_messages]
+    # Same merge rules as add_messages, without rescanning or copying long
+    # histories
+    messages: Annotated[Sequence[BaseMessage],
+                        MessageLogChannel(Sequence[BaseMessage], add_messages_indexed)]
+
+    # Per-request budget for the agent/tools loop (see src.nodes.budget):
+    # optional overrides from the request's input, cleared when the budget
+    # starts, then the limits in effect for the request
+    max_agent_iterations: Optional[int]
+    max_tool_calls: Optional[int]
+    time_budget_seconds: Optional[float]
+    iteration_limit: int
+    tool_call_limit: int
+    deadline: float
+    agent_iterations: int
+    tool_calls_made: int
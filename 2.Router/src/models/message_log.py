@@ -0,0 +1,243 @@
+"""
+Indexed Message Log
+Message reducer backed by an append-only store with an id index.
+
+add_messages converts every existing message and rebuilds an id lookup over
+the whole history on each merge, so a long conversation pays O(history) in
+Python code for every node that adds a message. add_messages_indexed keeps
+the messages in a shared append-only store with an id -> position index; a
+MessageLog is an immutable view of the first n messages of a store. Merging
+new messages into the newest view of a store appends them to the store and
+returns a longer view, so appends cost O(len(right)) amortized. Updates,
+removals and merges into an older view copy the messages into a new store.
+Results compare equal to add_messages for the same inputs.
+
+Views are not lists, so MessageLogChannel checkpoints them as
+CheckpointMessages, a list that checkpointers store the same way as the
+values of add_messages. Building it copies the view's message references
+(one C-level slice, no per-message work); its log attribute is the view
+itself, from which a checkpointer can take the messages added since an
+earlier checkpoint without comparing the histories (see tail_after).
+"""
+import threading
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from langchain_core.messages import (
+    BaseMessage,
+    RemoveMessage,
+    convert_to_messages,
+    message_chunk_to_message,
+)
+from langgraph.channels.binop import BinaryOperatorAggregate
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+
+class _Store:
+    """Append-only messages and their id -> position index, shared by views."""
+
+    __slots__ = ("messages", "positions", "lock")
+
+    def __init__(self, messages: List[BaseMessage], positions: Optional[Dict[str, int]] = None):
+        self.messages = messages
+        if positions is None:
+            positions = {m.id: i for i, m in enumerate(messages)}
+        self.positions = positions
+        self.lock = threading.Lock()
+
+
+class MessageLog(Sequence[BaseMessage]):
+    """
+    Immutable sequence of messages, a view of the start of a shared store.
+
+    Compares equal to lists with the same messages; slicing, + and copy()
+    return lists.
+    """
+
+    __slots__ = ("_store", "_length")
+
+    def __init__(self, messages: Iterable[BaseMessage] = ()):
+        self._store = _Store(list(messages))
+        self._length = len(self._store.messages)
+
+    @classmethod
+    def _view(cls, store: _Store, length: int) -> "MessageLog":
+        log = cls.__new__(cls)
+        log._store = store
+        log._length = length
+        return log
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._store.messages[:self._length][index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("MessageLog index out of range")
+        return self._store.messages[index]
+
+    def __iter__(self) -> Iterator[BaseMessage]:
+        messages = self._store.messages
+        for i in range(self._length):
+            yield messages[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (MessageLog, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __add__(self, other: Iterable[BaseMessage]) -> List[BaseMessage]:
+        return list(self) + list(other)
+
+    def __radd__(self, other: Iterable[BaseMessage]) -> List[BaseMessage]:
+        return list(other) + list(self)
+
+    def copy(self) -> List[BaseMessage]:
+        """Return the messages as a new list."""
+        return list(self)
+
+    def __repr__(self) -> str:
+        return f"MessageLog({list(self)!r})"
+
+    # Views never change, so copies can share the store; pickling and deep
+    # copies store the messages
+    def __copy__(self) -> "MessageLog":
+        return self
+
+    def __reduce__(self):
+        return MessageLog, (list(self),)
+
+    def tail_after(self, base: "MessageLog") -> Optional[List[BaseMessage]]:
+        """
+        Messages added since base, if this log extends it.
+
+        Views of one store are prefixes of each other, so this costs
+        O(len(tail)). Returns None if base is a view of another store (e.g.
+        one from before a message was replaced or removed) or is longer.
+        """
+        if base._store is not self._store or base._length > self._length:
+            return None
+        return self._store.messages[base._length:self._length]
+
+    def _positions(self) -> Dict[str, int]:
+        """A copy of the id -> position index of this view."""
+        store = self._store
+        with store.lock:
+            if len(store.messages) == self._length:
+                return dict(store.positions)
+        return {m.id: i for i, m in enumerate(self)}
+
+    def _position(self, message_id: str) -> Optional[int]:
+        """Position of message_id in this view, None if the view lacks it."""
+        position = self._store.positions.get(message_id)
+        return position if position is not None and position < self._length else None
+
+    def _append(self, messages: List[BaseMessage]) -> "MessageLog":
+        """Return this view extended by messages (new, distinct ids)."""
+        store = self._store
+        end = self._length + len(messages)
+        with store.lock:
+            if len(store.messages) == self._length:
+                for message in messages:
+                    store.positions[message.id] = len(store.messages)
+                    store.messages.append(message)
+                return MessageLog._view(store, end)
+            # The same update applied twice to one view (langgraph applies a
+            # node's writes to a copy of the channels for its conditional
+            # edges, then to the channels) finds them already appended
+            if len(store.messages) >= end and all(
+                    old is new for old, new in zip(store.messages[self._length:end], messages)):
+                return MessageLog._view(store, end)
+        # Not the newest view of its store: branch into a new store
+        return MessageLog(self[:] + messages)
+
+
+class CheckpointMessages(list):
+    """The messages of a MessageLog as a list, with the view in log."""
+
+    __slots__ = ("log",)
+
+    def __init__(self, log: MessageLog):
+        super().__init__(log._store.messages[:log._length])
+        self.log = log
+
+    # Copies and pickles are plain lists
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+class MessageLogChannel(BinaryOperatorAggregate):
+    """Reducer channel that checkpoints MessageLog values as CheckpointMessages."""
+
+    def checkpoint(self) -> Any:
+        value = super().checkpoint()
+        return CheckpointMessages(value) if isinstance(value, MessageLog) else value
+
+
+def _as_messages(value: Any) -> List[BaseMessage]:
+    """Coerce a reducer argument to messages with ids, like add_messages."""
+    if not isinstance(value, list):
+        value = [value]
+    messages = [message_chunk_to_message(m) for m in convert_to_messages(value)]
+    for message in messages:
+        if message.id is None:
+            message.id = str(uuid.uuid4())
+    return messages
+
+
+def add_messages_indexed(left: Any, right: Any) -> MessageLog:
+    """
+    Merge two lists of messages, updating existing messages by id.
+
+    Same contract as langgraph's add_messages: new ids are appended, known
+    ids are replaced in place, RemoveMessage deletes by id and
+    REMOVE_ALL_MESSAGES clears the history. Appends to the newest log of a
+    history cost O(len(right)) amortized; updates and removals copy it.
+
+    Args:
+        left: Existing messages
+        right: New messages or updates
+
+    Returns:
+        A MessageLog; left is not modified
+    """
+    right = _as_messages(right)
+    for idx in range(len(right) - 1, -1, -1):
+        message = right[idx]
+        if isinstance(message, RemoveMessage) and message.id == REMOVE_ALL_MESSAGES:
+            return MessageLog(right[idx + 1:])
+
+    log = left if isinstance(left, MessageLog) else MessageLog(_as_messages(left))
+
+    new_ids = {m.id for m in right}
+    if len(new_ids) == len(right) and not any(
+            isinstance(m, RemoveMessage) or log._position(m.id) is not None for m in right):
+        return log._append(right)
+
+    merged = log[:]
+    positions = log._positions()
+    ids_to_remove = set()
+    for message in right:
+        position = positions.get(message.id)
+        if position is not None:
+            if isinstance(message, RemoveMessage):
+                ids_to_remove.add(message.id)
+            else:
+                ids_to_remove.discard(message.id)
+                merged[position] = message
+        else:
+            if isinstance(message, RemoveMessage):
+                raise ValueError(
+                    f"Attempting to delete a message with an ID that doesn't exist ('{message.id}')"
+                )
+            positions[message.id] = len(merged)
+            merged.append(message)
+
+    if ids_to_remove:
+        return MessageLog(m for m in merged if m.id not in ids_to_remove)
+    return MessageLog._view(_Store(merged, positions), len(merged))
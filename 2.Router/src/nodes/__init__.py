@@ -4,8 +4,20 @@ Node implementations for LangGraph workflows.
 
 from .input_node import input_node
 from .output_node import output_node
+from .fast_path import make_fast_path_node, parse_arithmetic_request, route_after_fast_path
+from .budget import budget_exhausted, budget_exhausted_node, start_budget
+from .tool_answer import make_tool_answer_node, make_tool_answer_router, render_tool_answer
 
 __all__ = [
     'input_node',
-    'output_node'
+    'output_node',
+    'make_fast_path_node',
+    'parse_arithmetic_request',
+    'route_after_fast_path',
+    'make_tool_answer_node',
+    'make_tool_answer_router',
+    'render_tool_answer',
+    'budget_exhausted',
+    'budget_exhausted_node',
+    'start_budget'
 ]
@@ -0,0 +1,117 @@
+"""
+Request Budget
+Caps how long the agent/tools loop may run for a single request.
+
+Each request gets a budget of agent iterations, total tool calls and
+wall-clock time. input_node starts the budget, agent_node counts usage and
+the routers send the run to budget_exhausted_node once it runs out.
+
+A request may override the Config limits with max_agent_iterations,
+max_tool_calls and time_budget_seconds in its input. start_budget turns
+them into the limits in effect (iteration_limit, tool_call_limit and
+deadline) and clears them, so on a checkpointed thread an override applies
+to its own turn only.
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from src.config import Config
+from src.models.graph_state import GraphState
+
+BUDGET_EXHAUSTED_MESSAGE = "Skipped: the request ran out of its processing budget."
+
+
+def _limit(state: GraphState, key: str, default: Any) -> Any:
+    """A limit from the state, default if it is missing (0 is a limit too)."""
+    value = state.get(key)
+    return default if value is None else value
+
+
+def start_budget(state: GraphState) -> Dict[str, Any]:
+    """
+    Start the budget for a new request.
+
+    Overrides in the request's input replace the Config defaults; they are
+    cleared so that the next request on the thread starts from Config again.
+
+    Returns:
+        State update setting the limits and deadline, resetting the
+        counters and clearing the overrides
+    """
+    time_budget = _limit(state, "time_budget_seconds", Config.AGENT_TIME_BUDGET_SECONDS)
+    return {
+        "iteration_limit": _limit(state, "max_agent_iterations", Config.AGENT_MAX_ITERATIONS),
+        "tool_call_limit": _limit(state, "max_tool_calls", Config.AGENT_MAX_TOOL_CALLS),
+        "deadline": time.time() + time_budget,
+        "max_agent_iterations": None,
+        "max_tool_calls": None,
+        "time_budget_seconds": None,
+        "agent_iterations": 0,
+        "tool_calls_made": 0
+    }
+
+
+def budget_exhausted(state: GraphState) -> Optional[str]:
+    """
+    Check whether the request may keep looping.
+
+    Returns:
+        The reason the budget is exhausted, or None if work may continue
+    """
+    max_iterations = _limit(state, "iteration_limit", Config.AGENT_MAX_ITERATIONS)
+    max_tool_calls = _limit(state, "tool_call_limit", Config.AGENT_MAX_TOOL_CALLS)
+    deadline = state.get("deadline")
+
+    if state.get("agent_iterations", 0) >= max_iterations:
+        return "agent iterations"
+    if state.get("tool_calls_made", 0) > max_tool_calls:
+        return "tool calls"
+    if deadline and time.time() >= deadline:
+        return "time"
+    return None
+
+
+def budget_exhausted_node(state: GraphState) -> dict:
+    """
+    Finish the request with a best-effort answer once the budget runs out.
+
+    Pending tool calls get an error ToolMessage so the history stays valid
+    for the next LLM call, then the best answer available is returned:
+    the latest tool results of this request, or an apology.
+    """
+    messages = state.get("messages", [])
+    updates: List[Any] = []
+
+    # Answer any tool calls that will not be run
+    last_message = messages[-1] if messages else None
+    if isinstance(last_message, AIMessage) and last_message.tool_calls:
+        updates.extend(
+            ToolMessage(
+                content=BUDGET_EXHAUSTED_MESSAGE,
+                name=tool_call["name"],
+                tool_call_id=tool_call["id"],
+                status="error"
+            )
+            for tool_call in last_message.tool_calls
+        )
+
+    # Collect successful tool results produced during this request
+    results = []
+    for message in reversed(messages):
+        if message.type == "human":
+            break
+        if isinstance(message, ToolMessage) and message.status != "error":
+            results.append(f"{message.name}: {message.content}")
+
+    if results:
+        answer = ("I couldn't finish this request within its budget. "
+                  "Here is what I found so far: " + "; ".join(reversed(results)))
+    else:
+        answer = "Sorry, I couldn't finish this request within its budget."
+
+    print(f"⏱️ Budget exhausted ({budget_exhausted(state) or 'limit reached'}): best-effort answer")
+
+    updates.append(AIMessage(content=answer))
+    return {"messages": updates, "step": "budget_exhausted"}
@@ -0,0 +1,140 @@
+"""
+Arithmetic Fast Path Node
+Answers unambiguous multiplication requests without calling the LLM.
+
+Requests such as "What is 15 multiplied by 8?" or "Calculate 25 times 4"
+are matched by a small compiled grammar. The multiply tool is then run
+directly and the reply is rendered from the tool's answer template
+(see src.nodes.tool_answer).
+Anything the grammar does not fully match is left to the agent.
+"""
+import re
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import BaseTool
+
+from src.models.graph_state import GraphState
+from src.nodes.tool_answer import render_tool_answer
+
+# Operands of up to 18 digits keep the product small; longer numbers make the
+# pattern fail, so the request falls through to the agent
+_NUMBER = r"([-+]?\d{1,18})"
+_LEAD = r"(?:(?:what\s+is|what's|whats|calculate|compute|find|tell\s+me)\s+)?"
+_END = r"\s*[?.!]*\s*"
+
+# Each pattern must match the whole request, so "What is 2 times 3 plus 1?"
+# or "Is 6 times 7 the answer to everything?" fall through to the agent.
+ARITHMETIC_GRAMMAR = [
+    re.compile(
+        rf"^\s*{_LEAD}{_NUMBER}\s*(?:multiplied\s+by|times|x|\*|×)\s*{_NUMBER}{_END}$",
+        re.IGNORECASE
+    ),
+    re.compile(
+        rf"^\s*(?:please\s+)?multiply\s+{_NUMBER}\s+(?:by|and|with)\s+{_NUMBER}{_END}$",
+        re.IGNORECASE
+    ),
+    re.compile(
+        rf"^\s*{_LEAD}the\s+product\s+of\s+{_NUMBER}\s+and\s+{_NUMBER}{_END}$",
+        re.IGNORECASE
+    ),
+]
+
+
+def parse_arithmetic_request(text: str) -> Optional[Tuple[int, int]]:
+    """
+    Recognize an unambiguous multiplication request.
+
+    Args:
+        text: The user's message
+
+    Returns:
+        The two operands, or None if the text is not a plain multiplication
+    """
+    for pattern in ARITHMETIC_GRAMMAR:
+        match = pattern.match(text)
+        if match:
+            return int(match.group(1)), int(match.group(2))
+    return None
+
+
+class FastPathStats:
+    """Thread-safe counters for fast path hits and the time they took."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.hit_seconds = 0.0
+
+    def record(self, hit: bool, elapsed: float = 0.0) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.hit_seconds += elapsed
+            else:
+                self.misses += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return the hit rate and the average time of a bypassed request."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "requests": total,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "avg_hit_ms": round(self.hit_seconds / self.hits * 1000, 3) if self.hits else 0.0
+            }
+
+
+fast_path_stats = FastPathStats()
+
+
+def make_fast_path_node(multiply_tool: BaseTool,
+                        stats: FastPathStats = fast_path_stats) -> Callable[[GraphState], dict]:
+    """
+    Build the fast path node around the multiply tool.
+
+    Args:
+        multiply_tool: Tool taking "a" and "b" used to compute the answer
+        stats: Counters updated on every request
+
+    Returns:
+        Node function for the workflow
+    """
+    def fast_path_node(state: GraphState) -> dict:
+        """Answer plain multiplication requests directly, or hand off to the agent."""
+        start = time.perf_counter()
+        operands = parse_arithmetic_request(state.get("input_text", ""))
+
+        if operands is None:
+            stats.record(hit=False)
+            return {"step": "fast_path_skipped"}
+
+        a, b = operands
+        args = {"a": a, "b": b}
+        result = multiply_tool.invoke(args)
+
+        # Record the same tool call / result / answer sequence the agent
+        # would have produced, so the history looks the same either way
+        call_id = f"fast_{uuid.uuid4().hex[:12]}"
+        messages = [
+            AIMessage(content="", tool_calls=[{"name": multiply_tool.name, "args": args, "id": call_id}]),
+            ToolMessage(content=str(result), name=multiply_tool.name, tool_call_id=call_id),
+            AIMessage(content=render_tool_answer(multiply_tool, args, result))
+        ]
+
+        stats.record(hit=True, elapsed=time.perf_counter() - start)
+        print(f"⚡ Fast Path: {a} × {b} answered without the LLM")
+
+        return {"messages": messages, "step": "fast_path_answered"}
+
+    return fast_path_node
+
+
+def route_after_fast_path(state: GraphState) -> str:
+    """Send answered requests to output and everything else to the agent."""
+    return "output" if state.get("step") == "fast_path_answered" else "agent"
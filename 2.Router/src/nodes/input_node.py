@@ -1,6 +1,7 @@
 from langchain_core.messages import HumanMessage
 
 from src.models.graph_state import GraphState
+from src.nodes.budget import start_budget
 
 
 def input_node(state: GraphState) -> GraphState:
@@ -12,7 +13,11 @@ def input_node(state: GraphState) -> GraphState:
     
     print(f"📥 Input: {input_text}")
     
+    # Only the new message is returned; the reducer appends it to the
+    # thread. Per-turn fields are reset so nothing leaks from the last turn.
     return {
-        **state,
-        "messages": [human_message]
+        **start_budget(state),
+        "messages": [human_message],
+        "output_text": "",
+        "step": "input_processed"
     }
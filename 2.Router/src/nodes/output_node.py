@@ -18,7 +18,4 @@ def output_node(state: GraphState) -> GraphState:
     
     print(f"\n📤 Output: {output}")
     
-    return {
-        **state,
-        "output_text": output
-    }
\ No newline at end of file
+    return {"output_text": output}
\ No newline at end of file
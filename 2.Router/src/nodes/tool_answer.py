@@ -0,0 +1,112 @@
+"""
+Tool Answer Node
+Renders the final answer straight from tool output, skipping the second
+agent LLM call.
+
+A tool opts in with metadata={"answer_producing": True, "answer_template": ...}.
+The template is formatted with the tool call arguments plus "result".
+When every tool call in a turn is answer-producing and succeeded, the
+workflow routes from tools to this node instead of back to the agent.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.tools import BaseTool
+
+from src.models.graph_state import GraphState
+
+DEFAULT_ANSWER_TEMPLATE = "The result of {tool} is {result}."
+
+
+def render_tool_answer(tool: BaseTool, args: Dict[str, Any], result: Any) -> str:
+    """
+    Render a tool result with the tool's answer template.
+
+    Args:
+        tool: The tool that produced the result
+        args: Arguments the tool was called with
+        result: The tool output
+
+    Returns:
+        The answer sentence
+    """
+    template = (tool.metadata or {}).get("answer_template", DEFAULT_ANSWER_TEMPLATE)
+    return template.format(tool=tool.name, result=result, **args)
+
+
+def _last_tool_turn(messages: Sequence[BaseMessage]) -> Tuple[Optional[AIMessage], List[ToolMessage]]:
+    """Return the latest AI tool-call message and the tool results after it."""
+    results: List[ToolMessage] = []
+    for message in reversed(messages):
+        if isinstance(message, ToolMessage):
+            results.append(message)
+        elif isinstance(message, AIMessage) and message.tool_calls:
+            return message, list(reversed(results))
+        else:
+            break
+    return None, []
+
+
+def make_tool_answer_router(tools: Sequence[BaseTool]) -> Callable[[GraphState], str]:
+    """
+    Build the router used after the tools node.
+
+    Args:
+        tools: Tools registered with the ToolNode
+
+    Returns:
+        Router returning "tool_answer" when the turn can be answered from
+        tool output, "agent" otherwise
+    """
+    answer_tools = {
+        tool.name for tool in tools
+        if (tool.metadata or {}).get("answer_producing")
+    }
+
+    def route_after_tools(state: GraphState) -> str:
+        ai_message, results = _last_tool_turn(state.get("messages", []))
+        if ai_message is None:
+            return "agent"
+
+        results_by_id = {result.tool_call_id: result for result in results}
+        for tool_call in ai_message.tool_calls:
+            result = results_by_id.get(tool_call["id"])
+            if (tool_call["name"] not in answer_tools or result is None
+                    or result.status == "error"):
+                return "agent"
+        return "tool_answer"
+
+    return route_after_tools
+
+
+def make_tool_answer_node(tools: Sequence[BaseTool]) -> Callable[[GraphState], dict]:
+    """
+    Build the node that turns tool results into the final answer.
+
+    Args:
+        tools: Tools registered with the ToolNode
+
+    Returns:
+        Node function for the workflow
+    """
+    tools_by_name = {tool.name: tool for tool in tools}
+
+    def tool_answer_node(state: GraphState) -> dict:
+        """Answer from the latest tool results without calling the LLM."""
+        ai_message, results = _last_tool_turn(state.get("messages", []))
+        results_by_id = {result.tool_call_id: result for result in results}
+
+        answer = " ".join(
+            render_tool_answer(
+                tools_by_name[tool_call["name"]],
+                tool_call["args"],
+                results_by_id[tool_call["id"]].content
+            )
+            for tool_call in ai_message.tool_calls
+        )
+
+        print(f"🧾 Tool Answer: {answer}")
+
+        return {"messages": [AIMessage(content=answer)], "step": "tool_answered"}
+
+    return tool_answer_node
@@ -0,0 +1,10 @@
+"""
+Test doubles for running the workflows without network access.
+"""
+
+from .fake_llm import FakeToolCallingChatModel, install_stand_in_llm
+
+__all__ = [
+    'FakeToolCallingChatModel',
+    'install_stand_in_llm'
+]
@@ -0,0 +1,178 @@
+"""
+Fake Tool-Calling Chat Model
+A local stand-in for the agent LLM used by tests, benchmarks and load tests.
+
+It follows a fixed script: multiplication requests become a
+multiply_numbers tool call (multiply_batch when several pairs of numbers
+are given), tool results are restated as the answer and
+anything else gets a canned reply. Responses are streamed word by word
+with configurable latency so streaming and timing behaviour can be
+exercised without network access.
+"""
+import asyncio
+import json
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+MULTIPLY_PATTERN = re.compile(r"multipl|times|product|\*|×", re.IGNORECASE)
+NUMBER_PATTERN = re.compile(r"-?\d+")
+
+
+class FakeToolCallingChatModel(BaseChatModel):
+    """Scripted chat model that supports bind_tools and token streaming."""
+
+    latency: float = 0.0
+    """Seconds to wait before the first token."""
+    token_delay: float = 0.0
+    """Seconds to wait between streamed tokens."""
+    calls: int = 0
+    """Number of times the model has been called."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-tool-calling-chat-model"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeToolCallingChatModel":
+        """Tools are ignored; the script already knows about multiply_numbers."""
+        return self
+
+    def respond(self, messages: List[BaseMessage]) -> AIMessage:
+        """Return the scripted reply to the conversation so far."""
+        self.calls += 1
+        last = messages[-1] if messages else None
+
+        if isinstance(last, ToolMessage):
+            return AIMessage(content=f"The result is {last.content}.")
+
+        if isinstance(last, HumanMessage):
+            text = str(last.content)
+            numbers = NUMBER_PATTERN.findall(text)
+            if MULTIPLY_PATTERN.search(text) and len(numbers) >= 4:
+                pairs = [
+                    [int(numbers[i]), int(numbers[i + 1])]
+                    for i in range(0, len(numbers) - 1, 2)
+                ]
+                return AIMessage(
+                    content="",
+                    tool_calls=[{
+                        "name": "multiply_batch",
+                        "args": {"pairs": pairs},
+                        "id": f"call_{uuid.uuid4().hex[:12]}"
+                    }]
+                )
+            if MULTIPLY_PATTERN.search(text) and len(numbers) >= 2:
+                return AIMessage(
+                    content="",
+                    tool_calls=[{
+                        "name": "multiply_numbers",
+                        "args": {"a": int(numbers[0]), "b": int(numbers[1])},
+                        "id": f"call_{uuid.uuid4().hex[:12]}"
+                    }]
+                )
+            return AIMessage(content=f"This is a stand-in answer to: {text}")
+
+        return AIMessage(content="How can I help you?")
+
+    def _chunks(self, message: AIMessage) -> List[AIMessageChunk]:
+        """Split a reply into streamed chunks."""
+        chunks = [
+            AIMessageChunk(content=token, id=message.id)
+            for token in re.split(r"(\s)", str(message.content)) if token
+        ]
+        if message.tool_calls:
+            chunks.append(AIMessageChunk(
+                content="",
+                id=message.id,
+                tool_call_chunks=[
+                    {
+                        "name": call["name"],
+                        "args": json.dumps(call["args"]),
+                        "id": call["id"],
+                        "index": index
+                    }
+                    for index, call in enumerate(message.tool_calls)
+                ]
+            ))
+        return chunks
+
+    def _generate(self,
+                  messages: List[BaseMessage],
+                  stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None,
+                  **kwargs: Any) -> ChatResult:
+        message = self.respond(messages)
+        time.sleep(self.latency + self.token_delay * len(self._chunks(message)))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self,
+                         messages: List[BaseMessage],
+                         stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                         **kwargs: Any) -> ChatResult:
+        message = self.respond(messages)
+        await asyncio.sleep(self.latency + self.token_delay * len(self._chunks(message)))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self,
+                messages: List[BaseMessage],
+                stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        message = self.respond(messages)
+        time.sleep(self.latency)
+        for chunk in self._chunks(message):
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager:
+                run_manager.on_llm_new_token(str(chunk.content), chunk=generation)
+            yield generation
+
+    async def _astream(self,
+                       messages: List[BaseMessage],
+                       stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        message = self.respond(messages)
+        await asyncio.sleep(self.latency)
+        for chunk in self._chunks(message):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager:
+                await run_manager.on_llm_new_token(str(chunk.content), chunk=generation)
+            yield generation
+
+
+def install_stand_in_llm(latency: float = 0.0, token_delay: float = 0.0) -> FakeToolCallingChatModel:
+    """
+    Replace the agent's tool-bound LLM with a FakeToolCallingChatModel.
+
+    Args:
+        latency: Seconds before each response
+        token_delay: Seconds per streamed word
+
+    Returns:
+        The installed model
+    """
+    import main
+
+    llm = FakeToolCallingChatModel(latency=latency, token_delay=token_delay)
+    main.get_llm_with_tools = lambda: llm
+    return llm
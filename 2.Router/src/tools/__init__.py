@@ -2,8 +2,13 @@
 Tools for LangGraph workflows.
 """
 
-from .multiply import multiply_numbers
+from .multiply import multiply_numbers, multiply_batch
+from .cache import ToolResultCache, memoize_tool, memoize_pure_tools
 
 __all__ = [
-    'multiply_numbers'
+    'multiply_numbers',
+    'multiply_batch',
+    'ToolResultCache',
+    'memoize_tool',
+    'memoize_pure_tools'
 ]
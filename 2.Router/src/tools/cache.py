@@ -0,0 +1,123 @@
+"""
+Tool Result Cache
+Memoizes pure tools so repeated calls are answered without running them.
+
+A tool opts in by setting metadata={"pure": True}. Results are keyed by the
+tool name and its validated arguments serialized as canonical JSON, so
+argument order and equivalent values (e.g. "3" and 3 for an int field)
+map to the same entry.
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Sequence
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+
+class ToolResultCache:
+    """Thread-safe LRU cache of tool results."""
+
+    def __init__(self, max_size: int = 1024):
+        """
+        Args:
+            max_size: Maximum number of cached results
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(tool_name: str, args: Dict[str, Any]) -> str:
+        """Build the cache key for a call of tool_name with args."""
+        canonical_args = json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+        return f"{tool_name}:{canonical_args}"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached result for key, or default on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a result, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "size": len(self._entries)
+            }
+
+
+_MISSING = object()
+
+
+def memoize_tool(tool: BaseTool, cache: ToolResultCache) -> BaseTool:
+    """
+    Wrap a tool so its results are served from cache when possible.
+
+    The wrapper keeps the original name, description and argument schema,
+    so the LLM sees exactly the same tool.
+
+    Args:
+        tool: Pure tool to memoize
+        cache: Cache shared by the memoized tools
+
+    Returns:
+        A StructuredTool backed by the cache
+    """
+    def cached_call(**kwargs: Any) -> Any:
+        key = cache.make_key(tool.name, kwargs)
+        result = cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = tool.func(**kwargs) if getattr(tool, "func", None) else tool.invoke(kwargs)
+            cache.put(key, result)
+        return result
+
+    return StructuredTool.from_function(
+        func=cached_call,
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        metadata=tool.metadata
+    )
+
+
+def memoize_pure_tools(tools: Sequence[BaseTool], cache: ToolResultCache) -> List[BaseTool]:
+    """
+    Memoize every tool marked as pure, leaving the others unchanged.
+
+    Args:
+        tools: Tools to register with the agent
+        cache: Cache shared by the memoized tools
+
+    Returns:
+        List of tools in the same order
+    """
+    return [
+        memoize_tool(tool, cache) if (tool.metadata or {}).get("pure") else tool
+        for tool in tools
+    ]
@@ -1,8 +1,12 @@
 """
 Multiply Tool
-A simple LangChain tool that multiplies two integers.
+A simple LangChain tool that multiplies two integers, plus a batched
+variant that multiplies many pairs in one call.
 Compatible with LangGraph's ToolNode and tools_condition.
 """
+import operator
+from typing import List
+
 from langchain_core.tools import tool
 
 
@@ -23,6 +27,40 @@ def multiply_numbers(a: int, b: int) -> int:
     return result
 
 
+@tool
+def multiply_batch(pairs: List[List[int]]) -> List[int]:
+    """
+    Multiply several pairs of numbers in a single call.
+    Use this instead of multiply_numbers when more than one product is needed.
+    
+    Args:
+        pairs: List of [a, b] pairs to multiply
+        
+    Returns:
+        The product of each pair, in the same order as the pairs
+    """
+    if any(len(pair) != 2 for pair in pairs):
+        raise ValueError("Each pair must contain exactly two numbers")
+
+    results = list(map(operator.mul, *zip(*pairs))) if pairs else []
+    print(f"🔢 Multiply Batch Tool: {len(results)} products computed")
+    return results
+
+
+# Both tools are pure (the same arguments always give the same result) and
+# answer-producing (their output can be stated directly as the answer)
+multiply_numbers.metadata = {
+    "pure": True,
+    "answer_producing": True,
+    "answer_template": "{a} multiplied by {b} is {result}."
+}
+multiply_batch.metadata = {
+    "pure": True,
+    "answer_producing": True,
+    "answer_template": "The products of {pairs} are {result}."
+}
+
+
 # Example usage
 if __name__ == "__main__":
     print("🧪 Testing Multiply Tool")
@@ -40,5 +78,8 @@ if __name__ == "__main__":
     for a, b in test_cases:
         result = multiply_numbers.invoke({"a": a, "b": b})
         print(f"  {a} × {b} = {result}")
+
+    batch = multiply_batch.invoke({"pairs": [list(case) for case in test_cases]})
+    print(f"  batch: {batch}")
     
     print("\n✅ Multiply tool testing completed!")
@@ -0,0 +1,126 @@
+"""
+Tests for the per-request budget of the agent/tools loop.
+"""
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+import main
+from src.config import Config
+from src.memory import thread_config
+from src.nodes.budget import BUDGET_EXHAUSTED_MESSAGE
+from src.testing import FakeToolCallingChatModel
+
+
+class LoopingChatModel(FakeToolCallingChatModel):
+    """Fake model that asks for another tool call every time."""
+
+    def respond(self, messages):
+        self.calls += 1
+        return AIMessage(content="", tool_calls=[{
+            "name": "multiply_numbers",
+            "args": {"a": self.calls, "b": 2},
+            "id": f"call_{self.calls}"
+        }])
+
+
+def _initial_state(text: str, **budget):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "",
+        "messages": [],
+        **budget
+    }
+
+
+@pytest.fixture
+def looping_llm(monkeypatch):
+    llm = LoopingChatModel()
+    monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+    return llm
+
+
+class TestRequestBudget:
+    """Tests for budget enforcement in the workflow."""
+
+    def test_iteration_budget_stops_loop(self, looping_llm):
+        result = main.get_workflow().invoke(
+            _initial_state("Keep multiplying", max_agent_iterations=3)
+        )
+
+        assert looping_llm.calls == 3
+        assert result["step"] == "budget_exhausted"
+        assert result["agent_iterations"] == 3
+        assert "found so far" in result["output_text"]
+
+    def test_tool_call_budget_stops_loop(self, looping_llm):
+        result = main.get_workflow().invoke(
+            _initial_state("Keep multiplying", max_agent_iterations=50, max_tool_calls=2)
+        )
+
+        assert looping_llm.calls == 3
+        assert result["tool_calls_made"] == 3
+        assert result["step"] == "budget_exhausted"
+
+    def test_zero_tool_calls_is_a_limit(self, looping_llm):
+        result = main.get_workflow().invoke(
+            _initial_state("Keep multiplying", max_agent_iterations=50, max_tool_calls=0)
+        )
+
+        assert looping_llm.calls == 1
+        assert result["step"] == "budget_exhausted"
+
+    def test_overrides_apply_to_their_own_turn(self, monkeypatch):
+        llm = FakeToolCallingChatModel()
+        monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+        app = main.create_workflow(checkpointer=MemorySaver())
+        config = thread_config("budget-overrides")
+
+        first = app.invoke({"input_text": "Could you multiply 3 by 4?", "max_tool_calls": 0},
+                           config)
+        assert first["step"] == "budget_exhausted"
+
+        # The next turn on the thread is back to the Config limits
+        second = app.invoke({"input_text": "Could you multiply 5 by 6?"}, config)
+        assert second["output_text"] == "The result is 30."
+        assert second["max_tool_calls"] is None
+        assert second["tool_call_limit"] == Config.AGENT_MAX_TOOL_CALLS
+
+    def test_time_budget_stops_loop(self, monkeypatch):
+        llm = LoopingChatModel(latency=0.05)
+        monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+
+        result = main.get_workflow().invoke(
+            _initial_state("Keep multiplying", max_agent_iterations=50,
+                           max_tool_calls=50, time_budget_seconds=0.12)
+        )
+
+        assert 2 <= llm.calls <= 4
+        assert result["step"] == "budget_exhausted"
+
+    def test_pending_tool_calls_are_closed(self, looping_llm):
+        """Every tool call in the history has a matching tool result."""
+        result = main.get_workflow().invoke(
+            _initial_state("Keep multiplying", max_agent_iterations=2)
+        )
+        messages = result["messages"]
+
+        call_ids = [c["id"] for m in messages if isinstance(m, AIMessage) for c in m.tool_calls]
+        result_ids = [m.tool_call_id for m in messages if isinstance(m, ToolMessage)]
+        assert call_ids == result_ids
+        assert messages[-2].content == BUDGET_EXHAUSTED_MESSAGE
+
+    def test_normal_requests_are_unaffected(self, monkeypatch):
+        monkeypatch.setattr(main, "get_llm_with_tools", lambda: FakeToolCallingChatModel())
+        result = main.get_workflow().invoke(_initial_state("Could you multiply 3 by 4?"))
+
+        assert result["output_text"] == "The result is 12."
+        assert result["agent_iterations"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,41 @@
+"""
+Tests for the chat session bookkeeping used by the Streamlit app.
+"""
+
+import pytest
+
+from src.models import ChatStats, history_window
+
+
+class TestChatStats:
+    """Tests for incremental chat counters."""
+
+    def test_record_turn(self):
+        """Counters only grow by what each turn adds."""
+        stats = ChatStats()
+        stats.record_turn(2, [{"name": "multiply_numbers"}])
+        stats.record_turn(2)
+
+        assert stats.messages == 4
+        assert stats.tool_calls == 1
+
+
+class TestHistoryWindow:
+    """Tests for windowed history rendering."""
+
+    def test_short_history_is_fully_visible(self):
+        assert history_window(5, pages=1, page_size=20) == 0
+
+    def test_rendered_messages_are_bounded(self):
+        """The number of rendered messages does not grow with the session."""
+        for total in (40, 400, 4000):
+            start = history_window(total, pages=1, page_size=20)
+            assert total - start == 20
+
+    def test_expanding_pages_reveals_earlier_messages(self):
+        assert history_window(100, pages=2, page_size=20) == 60
+        assert history_window(100, pages=10, page_size=20) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
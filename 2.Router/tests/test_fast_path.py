@@ -0,0 +1,96 @@
+"""
+Tests for the arithmetic fast path that bypasses the LLM.
+"""
+
+import pytest
+
+import main
+from src.nodes.fast_path import FastPathStats, make_fast_path_node, parse_arithmetic_request
+from src.testing import FakeToolCallingChatModel
+from src.tools import multiply_numbers
+
+
+def _initial_state(text: str):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "",
+        "messages": []
+    }
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = FakeToolCallingChatModel()
+    monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+    return llm
+
+
+class TestArithmeticGrammar:
+    """Tests for parse_arithmetic_request."""
+
+    @pytest.mark.parametrize("text, operands", [
+        ("What is 15 multiplied by 8?", (15, 8)),
+        ("Calculate 25 times 4", (25, 4)),
+        ("what's 3 x 4", (3, 4)),
+        ("Multiply 6 by 7.", (6, 7)),
+        ("What is the product of 2 and 9?", (2, 9)),
+        ("12 * -3", (12, -3)),
+        ("9" * 18 + " times " + "9" * 18, (10 ** 18 - 1, 10 ** 18 - 1)),
+    ])
+    def test_recognized(self, text, operands):
+        assert parse_arithmetic_request(text) == operands
+
+    @pytest.mark.parametrize("text", [
+        "What is the capital of France?",
+        "What is 2 times 3 plus 1?",
+        "Is 6 times 7 the answer to everything?",
+        "What is 1.5 times 2?",
+        "Multiply 2 by 3 and 4 by 5",
+        "What is " + "9" * 19 + " times 2?",
+        "1" * 5000 + " x " + "1" * 5000,
+    ])
+    def test_ambiguous_requests_fall_through(self, text):
+        assert parse_arithmetic_request(text) is None
+
+
+class TestFastPathWorkflow:
+    """Tests for the fast path inside the agent workflow."""
+
+    def test_arithmetic_bypasses_llm(self, fake_llm):
+        result = main.get_workflow().invoke(_initial_state("What is 15 multiplied by 8?"))
+
+        assert fake_llm.calls == 0
+        assert result["output_text"] == "15 multiplied by 8 is 120."
+        # History records the tool call and result like the agent path would
+        assert result["messages"][1].tool_calls[0]["args"] == {"a": 15, "b": 8}
+        assert result["messages"][2].content == "120"
+
+    def test_other_requests_use_llm(self, fake_llm):
+        result = main.get_workflow().invoke(_initial_state("What is the capital of France?"))
+
+        assert fake_llm.calls == 1
+        assert "stand-in answer" in result["output_text"]
+
+    def test_fast_path_can_be_disabled(self, fake_llm):
+        main.create_workflow(use_fast_path=False).invoke(
+            _initial_state("What is 15 multiplied by 8?")
+        )
+        assert fake_llm.calls == 2
+
+    def test_stats_report_hit_rate(self):
+        stats = FastPathStats()
+        node = make_fast_path_node(multiply_numbers, stats)
+
+        node(_initial_state("Calculate 25 times 4"))
+        node(_initial_state("Tell me about Python"))
+
+        snapshot = stats.snapshot()
+        assert snapshot["requests"] == 2
+        assert snapshot["hit_rate"] == 0.5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+"""
+Tests for hedged agent LLM calls.
+"""
+
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+import main
+import src.llm.hedging as hedging
+from src.config import Config
+from src.testing import FakeToolCallingChatModel
+
+
+class SlowOnceChatModel(FakeToolCallingChatModel):
+    """Fake model whose next call stalls once when slow_next is set."""
+
+    slow_next: bool = False
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.slow_next:
+            self.slow_next = False
+            time.sleep(0.5)
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+@pytest.fixture
+def hedged(monkeypatch):
+    """Turn hedging on with fresh policies."""
+    monkeypatch.setattr(Config, "LLM_HEDGING", True)
+    monkeypatch.setattr(hedging, "_policies", {})
+
+
+class TestAgentHedging:
+    """The agent's LLM calls go through the "agent" hedging policy."""
+
+    def test_agent_call_is_recorded(self, hedged, monkeypatch):
+        llm = FakeToolCallingChatModel()
+        monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+        result = main.agent_node({"messages": [HumanMessage(content="multiply 6 and 7")]})
+
+        assert result["messages"][0].tool_calls[0]["name"] == "multiply_numbers"
+        assert hedging.get_hedging_policy("agent").snapshot()["calls"] == 1
+
+    def test_slow_agent_call_is_hedged(self, hedged, monkeypatch):
+        llm = SlowOnceChatModel(latency=0.01)
+        monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+        monkeypatch.setattr(Config, "LLM_HEDGE_MAX_FRACTION", 0.5)
+        state = {"messages": [HumanMessage(content="hello")]}
+        for _ in range(20):
+            main.agent_node(state)
+
+        llm.slow_next = True
+        start = time.monotonic()
+        main.agent_node(state)
+        assert time.monotonic() - start < 0.3
+
+        snapshot = hedging.get_hedging_policy("agent").snapshot()
+        assert snapshot["hedged"] == snapshot["hedge_wins"] == 1
+
+    def test_hedged_agent_streams_tokens(self, hedged, monkeypatch):
+        llm = FakeToolCallingChatModel()
+        monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+        state = {"input_text": "What is the capital of France?", "processed_text": "",
+                 "transformed_text": "", "output_text": "", "step": "", "messages": []}
+        events = list(main.stream_workflow(main.get_workflow(), state))
+
+        tokens = [payload for kind, payload in events if kind == "token"]
+        assert len(tokens) > 1
+        assert "".join(tokens) == events[-1][1]["output_text"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,106 @@
+"""
+Tests for the token-budgeted conversation history manager.
+"""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.graph.message import add_messages
+
+from src.memory import ConversationHistoryManager
+from src.memory.history_manager import SUMMARY_PREFIX, extractive_summarizer
+
+
+def _turn(i: int):
+    """One user turn that goes through the multiply tool."""
+    call_id = f"call_{i}"
+    return [
+        HumanMessage(content=f"Turn {i}: what is {i} multiplied by {i + 1}? " * 3),
+        AIMessage(
+            content="",
+            tool_calls=[{"name": "multiply_numbers", "args": {"a": i, "b": i + 1}, "id": call_id}]
+        ),
+        ToolMessage(content=str(i * (i + 1)), name="multiply_numbers", tool_call_id=call_id),
+        AIMessage(content=f"{i} multiplied by {i + 1} is {i * (i + 1)}.")
+    ]
+
+
+def _conversation(turns: int):
+    """Build a history with ids assigned the way the graph reducer does."""
+    history = add_messages([], [SystemMessage(content="You are a helpful assistant.")])
+    for i in range(turns):
+        history = add_messages(history, _turn(i))
+    return history
+
+
+class TestConversationHistoryManager:
+    """Tests for ConversationHistoryManager."""
+
+    def test_short_history_is_unchanged(self):
+        """Histories within the budget are sent verbatim."""
+        manager = ConversationHistoryManager(max_tokens=2000)
+        history = _conversation(2)
+
+        assert manager.build_prompt(history) == history
+
+    def test_prompt_size_levels_off(self):
+        """Per-turn prompt size stops growing once the budget is reached."""
+        manager = ConversationHistoryManager(max_tokens=600, max_summary_tokens=150)
+        history = add_messages([], [SystemMessage(content="You are a helpful assistant.")])
+
+        prompt_tokens = []
+        for i in range(60):
+            history = add_messages(history, _turn(i))
+            manager.build_prompt(history)
+            prompt_tokens.append(manager.stats["last_prompt_tokens"])
+
+        assert prompt_tokens[-1] > prompt_tokens[0]
+        assert max(prompt_tokens) <= 600
+        # The second half of the session is no larger than the first half
+        assert max(prompt_tokens[30:]) <= max(prompt_tokens[:30])
+
+    def test_system_and_tool_messages_kept(self):
+        """System messages are pinned and tool results keep their tool call."""
+        manager = ConversationHistoryManager(max_tokens=500, max_summary_tokens=100)
+        history = _conversation(20)
+        prompt = manager.build_prompt(history)
+
+        assert prompt[0].content == "You are a helpful assistant."
+        assert prompt[1].content.startswith(SUMMARY_PREFIX)
+
+        seen_calls = set()
+        for message in prompt:
+            if isinstance(message, AIMessage):
+                seen_calls.update(call["id"] for call in message.tool_calls)
+            if isinstance(message, ToolMessage):
+                assert message.tool_call_id in seen_calls
+
+        # The latest turn is always kept verbatim
+        assert prompt[-4:] == history[-4:]
+
+    def test_summary_only_recomputed_when_window_moves(self):
+        """Rebuilding the same window reuses the cached summary."""
+        calls = []
+
+        def summarizer(previous, messages):
+            calls.append(len(messages))
+            return extractive_summarizer(previous, messages)
+
+        manager = ConversationHistoryManager(
+            max_tokens=500, max_summary_tokens=100, summarizer=summarizer
+        )
+        history = _conversation(20)
+
+        manager.build_prompt(history)
+        manager.build_prompt(history)
+        assert len(calls) == 1
+        assert manager.stats["summary_cache_hits"] == 1
+
+        # Moving the window only summarizes the newly folded messages
+        history = add_messages(history, _turn(20))
+        manager.build_prompt(history)
+        assert len(calls) == 2
+        assert calls[1] < calls[0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
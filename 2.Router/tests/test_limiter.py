@@ -0,0 +1,75 @@
+"""
+Tests for the shared LLM limiter around the agent node.
+"""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+import main
+from src.llm import LLMLimiter, set_llm_limiter
+from src.testing import FakeToolCallingChatModel
+
+
+class RateLimitError(Exception):
+    """Stand-in for openai.RateLimitError."""
+
+    status_code = 429
+
+
+class OverloadedModel:
+    """Tool-bound model stand-in that always answers 429."""
+
+    def invoke(self, messages):
+        raise RateLimitError("429 Too Many Requests")
+
+
+@pytest.fixture
+def limiter():
+    """Install a fresh process-wide limiter for the test."""
+    limiter = LLMLimiter(initial_concurrency=8, max_concurrency=16)
+    set_llm_limiter(limiter)
+    yield limiter
+    set_llm_limiter(None)
+
+
+class TestAgentLimit:
+    """The agent's LLM calls go through the shared limiter."""
+
+    def test_agent_call_is_limited(self, limiter, monkeypatch):
+        llm = FakeToolCallingChatModel()
+        monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+        result = main.agent_node({"messages": [HumanMessage(content="hello")]})
+
+        assert result["messages"][0].content.startswith("This is a stand-in answer")
+        snapshot = limiter.snapshot()
+        assert snapshot["calls"] == snapshot["succeeded"] == 1
+        assert snapshot["in_flight"] == 0
+
+    def test_429_backs_off_the_concurrency_limit(self, limiter, monkeypatch):
+        monkeypatch.setattr(main, "get_llm_with_tools", lambda: OverloadedModel())
+        with pytest.raises(RateLimitError):
+            main.agent_node({"messages": [HumanMessage(content="hello")]})
+
+        assert limiter.snapshot()["overloaded"] == 1
+        assert limiter.concurrency.limit == 4
+
+    def test_async_callers_share_the_limit(self):
+        limiter = LLMLimiter(initial_concurrency=2, max_concurrency=2)
+        llm = FakeToolCallingChatModel(latency=0.02)
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(*(limiter.ainvoke(llm, [HumanMessage(content="hi")])
+                                   for _ in range(6)))
+            return time.monotonic() - start
+
+        # Six 20 ms calls, two at a time
+        assert asyncio.run(run()) >= 0.06
+        assert limiter.snapshot()["succeeded"] == 6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,144 @@
+"""
+Tests for the indexed message reducer.
+"""
+
+import copy
+import pickle
+import random
+from typing import Sequence
+
+import pytest
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph.message import REMOVE_ALL_MESSAGES, add_messages
+
+from src.models import MessageLog, MessageLogChannel, add_messages_indexed
+
+
+def _dump(messages):
+    return [(type(m).__name__, m.id, m.content) for m in messages]
+
+
+def _random_update(rng, existing_ids, counter):
+    """Build a batch of appends, replacements and removals."""
+    update = []
+    for _ in range(rng.randint(1, 4)):
+        roll = rng.random()
+        if existing_ids and roll < 0.2:
+            update.append(AIMessage(content=f"edit {counter}", id=rng.choice(existing_ids)))
+        elif existing_ids and roll < 0.3:
+            target = rng.choice(existing_ids)
+            existing_ids.remove(target)
+            update.append(RemoveMessage(id=target))
+        else:
+            message_id = f"m{counter}-{len(update)}"
+            existing_ids.append(message_id)
+            update.append(HumanMessage(content=f"msg {counter}", id=message_id))
+    return update
+
+
+class TestAddMessagesIndexed:
+    """add_messages_indexed must behave exactly like add_messages."""
+
+    def test_matches_add_messages_on_random_histories(self):
+        rng = random.Random(7)
+        expected, actual = [], []
+        existing_ids = []
+        for counter in range(300):
+            update = _random_update(rng, existing_ids, counter)
+            expected = add_messages(expected, update)
+            actual = add_messages_indexed(actual, update)
+            assert _dump(actual) == _dump(expected)
+        assert isinstance(actual, MessageLog)
+        assert actual == expected
+
+    def test_left_is_not_modified(self):
+        first = add_messages_indexed([], [HumanMessage(content="a", id="1")])
+        second = add_messages_indexed(first, [AIMessage(content="b", id="2")])
+        edited = add_messages_indexed(first, [HumanMessage(content="a2", id="1")])
+
+        assert _dump(first) == [("HumanMessage", "1", "a")]
+        assert [m.id for m in second] == ["1", "2"]
+        # Branching from an older log must not see the other branch's ids
+        assert _dump(edited) == [("HumanMessage", "1", "a2")]
+        assert _dump(add_messages_indexed(first, [AIMessage(content="c", id="2")])) == [
+            ("HumanMessage", "1", "a"), ("AIMessage", "2", "c")
+        ]
+
+    def test_missing_ids_chunks_and_remove_all(self):
+        log = add_messages_indexed([], [HumanMessage(content="hi"), AIMessageChunk(content="yo", id="c")])
+        assert all(m.id for m in log)
+        assert type(log[1]) is AIMessage
+
+        cleared = add_messages_indexed(log, [
+            RemoveMessage(id=REMOVE_ALL_MESSAGES), HumanMessage(content="fresh", id="f")
+        ])
+        assert _dump(cleared) == [("HumanMessage", "f", "fresh")]
+
+    def test_appends_extend_the_shared_store(self):
+        log = add_messages_indexed([], [HumanMessage(content="a", id="1")])
+        logs = [log]
+        for i in range(2, 50):
+            logs.append(add_messages_indexed(logs[-1], [AIMessage(content="b", id=str(i))]))
+        # Every log is a view of one store; earlier views keep their length
+        assert all(view._store is log._store for view in logs)
+        assert [len(view) for view in logs] == list(range(1, 50))
+        assert logs[10][-1].id == "11" and logs[10][:2] == list(logs[-1])[:2]
+
+    def test_repeated_update_reuses_the_store(self):
+        log = add_messages_indexed([], [HumanMessage(content="a", id="1")])
+        update = [AIMessage(content="b", id="2")]
+        # Like langgraph applying a node's writes for its conditional edges
+        # and then for the channel
+        first = add_messages_indexed(log, update)
+        second = add_messages_indexed(log, update)
+        assert second._store is first._store and second == first
+        other = add_messages_indexed(log, [AIMessage(content="c", id="3")])
+        assert other._store is not log._store and _dump(other)[1] == ("AIMessage", "3", "c")
+
+    def test_tail_after(self):
+        base = add_messages_indexed([], [HumanMessage(content="a", id="1")])
+        longer = add_messages_indexed(base, [AIMessage(content="b", id="2"),
+                                             HumanMessage(content="c", id="3")])
+        assert [m.id for m in longer.tail_after(base)] == ["2", "3"]
+        assert longer.tail_after(longer) == []
+        assert base.tail_after(longer) is None
+        edited = add_messages_indexed(longer, [AIMessage(content="B", id="2")])
+        assert edited.tail_after(longer) is None
+
+    def test_logs_behave_like_lists(self):
+        log = add_messages_indexed([], [HumanMessage(content="a", id="1"),
+                                        AIMessage(content="b", id="2")])
+        as_list = list(log)
+        assert log == as_list and as_list == log and log != as_list[:1]
+        assert log + [] == as_list and [] + log == as_list
+        assert log.copy() == as_list and type(log.copy()) is list
+        assert copy.deepcopy(log) == log and pickle.loads(pickle.dumps(log)) == log
+
+    def test_channel_checkpoints_plain_lists(self):
+        channel = MessageLogChannel(Sequence[BaseMessage], add_messages_indexed)
+        channel.update([[HumanMessage(content="a", id="1")]])
+        checkpoint = channel.checkpoint()
+        assert isinstance(checkpoint, list) and _dump(checkpoint) == [("HumanMessage", "1", "a")]
+        assert checkpoint.log is channel.get()
+        serde = JsonPlusSerializer()
+        assert serde.loads_typed(serde.dumps_typed(checkpoint)) == list(checkpoint)
+        assert type(pickle.loads(pickle.dumps(checkpoint))) is list
+        restored = channel.from_checkpoint(checkpoint)
+        restored.update([[AIMessage(content="b", id="2")]])
+        assert [m.id for m in restored.get()] == ["1", "2"]
+
+    def test_removing_unknown_id_raises(self):
+        log = add_messages_indexed([], [HumanMessage(content="a", id="1")])
+        with pytest.raises(ValueError, match="doesn't exist"):
+            add_messages_indexed(log, [RemoveMessage(id="missing")])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
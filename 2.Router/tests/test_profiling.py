@@ -0,0 +1,87 @@
+"""
+Tests for the per-node and per-tool workflow profiler.
+"""
+
+import re
+
+import pytest
+
+import main
+from src.profiling import ProfileSession, active_session, profile_scope, profiled
+from src.testing import FakeToolCallingChatModel
+
+COLLAPSED_LINE = re.compile(r"^node:\w+(;[^;]+)+ \d+$")
+
+
+def _initial_state(text: str):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "",
+        "messages": []
+    }
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = FakeToolCallingChatModel()
+    monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+    return llm
+
+
+class TestProfileSession:
+    """Tests for scopes and memory attribution."""
+
+    def test_peak_memory_is_attributed_to_the_scope_and_its_parents(self):
+        with ProfileSession() as session:
+            with profile_scope("node", "outer"):
+                with profile_scope("tool", "allocator"):
+                    block = bytearray(4 * 1024 * 1024)
+                    del block
+
+        assert session.scopes[("tool", "allocator")]["peak_bytes"] >= 4 * 1024 * 1024
+        assert session.scopes[("node", "outer")]["peak_bytes"] >= 4 * 1024 * 1024
+
+    def test_nothing_is_recorded_without_a_session(self):
+        app = main.create_workflow()
+        assert active_session() is None
+        assert profiled(app) is app
+
+
+class TestWorkflowProfiling:
+    """Tests for profiles of agent workflow runs."""
+
+    def test_nodes_and_tools_are_profiled(self, fake_llm, tmp_path):
+        with ProfileSession() as session:
+            profiled(main.create_workflow(use_fast_path=False)).invoke(
+                _initial_state("What is 15 multiplied by 8?")
+            )
+
+        assert session.scopes[("node", "agent")]["calls"] == 2
+        assert session.scopes[("node", "tools")]["calls"] == 1
+        assert session.scopes[("tool", "multiply_numbers")]["calls"] == 1
+        assert {"agent", "tools"} <= set(session.node_stats)
+
+        path = tmp_path / "profile.collapsed"
+        assert session.write_collapsed(str(path)) > 0
+        lines = path.read_text().splitlines()
+        assert all(COLLAPSED_LINE.match(line) for line in lines)
+        assert any(line.startswith("node:agent;") and "agent_node" in line for line in lines)
+
+    def test_report_lists_nodes_and_tools(self, fake_llm, capsys):
+        with ProfileSession() as session:
+            profiled(main.create_workflow(use_fast_path=False)).invoke(
+                _initial_state("What is 15 multiplied by 8?")
+            )
+        capsys.readouterr()
+
+        session.print_report(top=3)
+        report = capsys.readouterr().out
+        assert "multiply_numbers" in report
+        assert "📌 agent: top 3 functions" in report
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
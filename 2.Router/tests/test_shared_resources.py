@@ -0,0 +1,30 @@
+"""
+Tests for the process-wide shared workflow and LLM client.
+"""
+
+import pytest
+
+import main
+
+
+class TestSharedResources:
+    """Tests for get_workflow and get_llm_with_tools."""
+
+    def test_workflow_is_compiled_once(self):
+        """Every caller gets the same compiled graph."""
+        assert main.get_workflow() is main.get_workflow()
+
+    def test_llm_client_is_created_lazily_once(self, monkeypatch):
+        """The tool-bound client is built on first use and then reused."""
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test-placeholder")
+        main.get_llm_with_tools.cache_clear()
+        try:
+            assert main.get_llm_with_tools.cache_info().currsize == 0
+            first = main.get_llm_with_tools()
+            assert main.get_llm_with_tools() is first
+        finally:
+            main.get_llm_with_tools.cache_clear()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
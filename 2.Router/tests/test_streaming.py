@@ -0,0 +1,62 @@
+"""
+Headless tests for streaming agent runs with a fake streaming chat model.
+"""
+
+import pytest
+
+import main
+from src.testing import FakeToolCallingChatModel
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Replace the shared tool-bound LLM with a scripted streaming model."""
+    llm = FakeToolCallingChatModel()
+    monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+    return llm
+
+
+def _initial_state(text: str):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "",
+        "messages": []
+    }
+
+
+class TestStreamWorkflow:
+    """Tests for main.stream_workflow."""
+
+    def test_tool_events_precede_answer_tokens(self, fake_llm):
+        """Tool calls and results are emitted before the final answer streams."""
+        events = list(main.stream_workflow(
+            main.get_workflow(), _initial_state("Could you multiply 15 by 8 for me?")
+        ))
+        kinds = [kind for kind, _ in events]
+
+        assert kinds.index("tool_call") < kinds.index("tool_result") < kinds.index("token")
+        assert kinds[-1] == "result"
+
+        tool_call = events[kinds.index("tool_call")][1]
+        assert tool_call["name"] == "multiply_numbers"
+        assert tool_call["args"] == {"a": 15, "b": 8}
+        assert events[kinds.index("tool_result")][1].content == "120"
+
+    def test_tokens_build_the_final_answer(self, fake_llm):
+        """Streamed tokens add up to the answer in the final state."""
+        events = list(main.stream_workflow(
+            main.get_workflow(), _initial_state("What is the capital of France?")
+        ))
+        tokens = "".join(payload for kind, payload in events if kind == "token")
+        result = events[-1][1]
+
+        assert [kind for kind, _ in events].count("token") > 1
+        assert "tool_call" not in [kind for kind, _ in events]
+        assert tokens == result["output_text"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,140 @@
+"""
+Tests for thread-scoped conversation memory.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+
+import main
+from src.memory import ThreadMemorySaver, thread_config
+from src.testing import FakeToolCallingChatModel
+
+
+@pytest.fixture
+def chat_app(monkeypatch):
+    """Workflow with a fresh checkpointer and a scripted LLM."""
+    monkeypatch.setattr(main, "get_llm_with_tools", lambda: FakeToolCallingChatModel())
+    memory = ThreadMemorySaver()
+    return main.create_workflow(checkpointer=memory), memory
+
+
+def _turn(app, thread_id, text):
+    return app.invoke({"input_text": text}, thread_config(thread_id))
+
+
+class TestThreadMemory:
+    """Tests for ThreadMemorySaver with the chat workflow."""
+
+    def test_turns_only_send_new_input(self, chat_app):
+        app, _ = chat_app
+        thread_id = uuid.uuid4().hex
+
+        _turn(app, thread_id, "What is the capital of France?")
+        result = _turn(app, thread_id, "Could you multiply 3 by 4?")
+
+        humans = [m.content for m in result["messages"] if isinstance(m, HumanMessage)]
+        assert humans == ["What is the capital of France?", "Could you multiply 3 by 4?"]
+        assert result["output_text"] == "The result is 12."
+
+    def test_threads_are_isolated(self, chat_app):
+        app, _ = chat_app
+        _turn(app, "thread-a", "What is the capital of France?")
+        result = _turn(app, "thread-b", "Tell me about Python")
+
+        assert [m.content for m in result["messages"] if isinstance(m, HumanMessage)] == [
+            "Tell me about Python"
+        ]
+
+    def test_writes_only_new_messages_per_turn(self, chat_app):
+        app, memory = chat_app
+        thread_id = uuid.uuid4().hex
+
+        written = []
+        for i in range(6):
+            before = memory.stats["messages_written"]
+            _turn(app, thread_id, f"Tell me fact number {i}")
+            written.append(memory.stats["messages_written"] - before)
+
+        # Every turn adds a question and an answer, however long the thread is
+        assert written[1:] == [2] * 5
+        assert memory.stats["snapshots"] == 1
+
+    def test_turns_extend_the_cached_log(self, chat_app):
+        app, memory = chat_app
+        config = thread_config(uuid.uuid4().hex)
+        _turn(app, config["configurable"]["thread_id"], "Hello")
+        before = memory.get_tuple(config).checkpoint["channel_values"]["messages"]
+        # Reads hand out the cached log itself rather than a copy
+        assert memory.get_tuple(config).checkpoint["channel_values"]["messages"] is before
+
+        _turn(app, config["configurable"]["thread_id"], "Thanks")
+        after = memory.get_tuple(config).checkpoint["channel_values"]["messages"]
+        assert after._store is before._store
+        assert [m.content for m in after.tail_after(before)][0] == "Thanks"
+
+    def test_history_survives_a_cold_cache(self, chat_app):
+        app, memory = chat_app
+        thread_id = uuid.uuid4().hex
+        for text in ("Hello", "Could you multiply 5 by 6?", "Thanks"):
+            _turn(app, thread_id, text)
+        expected = app.get_state(thread_config(thread_id)).values["messages"]
+
+        memory._latest.clear()
+        tail, total = memory.tail_messages(thread_id, 3)
+        assert total == len(expected)
+        assert [m.id for m in tail] == [m.id for m in expected[-3:]]
+
+        memory._latest.clear()
+        reloaded = app.get_state(thread_config(thread_id)).values["messages"]
+        assert [m.id for m in reloaded] == [m.id for m in expected]
+
+    def test_replaced_messages_fall_back_to_a_snapshot(self, chat_app):
+        app, memory = chat_app
+        thread_id = uuid.uuid4().hex
+        _turn(app, thread_id, "Hello")
+        messages = app.get_state(thread_config(thread_id)).values["messages"]
+
+        app.update_state(thread_config(thread_id), {"messages": [
+            RemoveMessage(id=messages[0].id),
+            AIMessage(content="Edited", id=messages[-1].id)
+        ]})
+        memory._latest.clear()
+
+        reloaded = app.get_state(thread_config(thread_id)).values["messages"]
+        assert [m.content for m in reloaded] == ["Edited"]
+        assert memory.stats["snapshots"] == 2
+
+    def test_only_recent_threads_stay_cached(self, chat_app):
+        _, memory = chat_app
+        memory.cached_threads = 2
+        app = main.create_workflow(checkpointer=memory)
+        for thread_id in ("a", "b", "c"):
+            _turn(app, thread_id, "Hello")
+        assert [key[0] for key in memory._latest] == ["b", "c"]
+
+        result = _turn(app, "a", "Thanks")
+        assert [m.content for m in result["messages"] if isinstance(m, HumanMessage)] == [
+            "Hello", "Thanks"
+        ]
+        assert [key[0] for key in memory._latest] == ["c", "a"]
+
+    def test_async_runs_and_state_history(self, chat_app):
+        app, _ = chat_app
+        config = thread_config(uuid.uuid4().hex)
+
+        async def turns():
+            await app.ainvoke({"input_text": "Hello"}, config)
+            return await app.ainvoke({"input_text": "Could you multiply 3 by 4?"}, config)
+
+        result = asyncio.run(turns())
+        assert result["output_text"] == "The result is 12."
+        history = list(app.get_state_history(config))
+        assert len(history[0].values["messages"]) == len(result["messages"])
+        assert all(len(s.values.get("messages", [])) <= len(result["messages"]) for s in history)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
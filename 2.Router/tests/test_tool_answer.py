@@ -0,0 +1,103 @@
+"""
+Tests for answering directly from answer-producing tool results.
+"""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+import main
+from src.nodes.tool_answer import make_tool_answer_router, render_tool_answer
+from src.testing import FakeToolCallingChatModel
+from src.tools import multiply_batch, multiply_numbers
+
+
+def _initial_state(text: str):
+    return {
+        "input_text": text,
+        "processed_text": "",
+        "transformed_text": "",
+        "output_text": "",
+        "step": "",
+        "messages": []
+    }
+
+
+def _tool_turn(name: str, args: dict, status: str = "success"):
+    return [
+        HumanMessage(content="question"),
+        AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": "call_1"}]),
+        ToolMessage(content="6", name=name, tool_call_id="call_1", status=status)
+    ]
+
+
+class BadBatchChatModel(FakeToolCallingChatModel):
+    """Fake model that sends an invalid multiply_batch call."""
+
+    def respond(self, messages):
+        self.calls += 1
+        if isinstance(messages[-1], ToolMessage):
+            return AIMessage(content="That request could not be computed.")
+        return AIMessage(content="", tool_calls=[{
+            "name": "multiply_batch", "args": {"pairs": [[1, 2, 3]]}, "id": "call_bad"
+        }])
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = FakeToolCallingChatModel()
+    monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+    return llm
+
+
+class TestToolAnswerRouting:
+    """Tests for the router used after the tools node."""
+
+    def test_answer_producing_success_is_answered_directly(self):
+        route = make_tool_answer_router([multiply_numbers])
+        state = {"messages": _tool_turn("multiply_numbers", {"a": 2, "b": 3})}
+        assert route(state) == "tool_answer"
+
+    def test_failed_tool_goes_back_to_agent(self):
+        route = make_tool_answer_router([multiply_numbers])
+        state = {"messages": _tool_turn("multiply_numbers", {"a": 2, "b": 3}, status="error")}
+        assert route(state) == "agent"
+
+    def test_other_tools_go_back_to_agent(self):
+        route = make_tool_answer_router([multiply_batch])
+        state = {"messages": _tool_turn("multiply_numbers", {"a": 2, "b": 3})}
+        assert route(state) == "agent"
+
+    def test_render_tool_answer(self):
+        assert render_tool_answer(multiply_numbers, {"a": 2, "b": 3}, 6) == "2 multiplied by 3 is 6."
+
+
+class TestDirectToolAnswers:
+    """Tests for the direct tool answer mode of the workflow."""
+
+    def test_skips_second_llm_call(self, fake_llm):
+        app = main.create_workflow(use_fast_path=False, direct_tool_answers=True)
+        result = app.invoke(_initial_state("Could you multiply 15 by 8?"))
+
+        assert fake_llm.calls == 1
+        assert result["output_text"] == "15 multiplied by 8 is 120."
+
+    def test_default_mode_restates_with_llm(self, fake_llm):
+        app = main.create_workflow(use_fast_path=False, direct_tool_answers=False)
+        result = app.invoke(_initial_state("Could you multiply 15 by 8?"))
+
+        assert fake_llm.calls == 2
+        assert result["output_text"] == "The result is 120."
+
+    def test_tool_error_falls_back_to_agent(self, monkeypatch):
+        """A failing tool call is handed back to the agent to explain."""
+        llm = BadBatchChatModel()
+        monkeypatch.setattr(main, "get_llm_with_tools", lambda: llm)
+
+        app = main.create_workflow(use_fast_path=False, direct_tool_answers=True)
+        result = app.invoke(_initial_state("Multiply these please"))
+
+        assert llm.calls == 2
+        assert result["output_text"] == "That request could not be computed."
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,81 @@
+"""
+Tests for the multiply tools and the tool result cache.
+"""
+
+import pytest
+
+from src.tools import (
+    ToolResultCache,
+    memoize_pure_tools,
+    memoize_tool,
+    multiply_batch,
+    multiply_numbers
+)
+
+
+class TestMultiplyTools:
+    """Tests for multiply_numbers and multiply_batch."""
+
+    def test_multiply_numbers(self):
+        assert multiply_numbers.invoke({"a": 15, "b": 8}) == 120
+
+    def test_multiply_batch(self):
+        """Each pair is multiplied and order is preserved."""
+        result = multiply_batch.invoke({"pairs": [[2, 3], [-4, 5], [0, 100]]})
+        assert result == [6, -20, 0]
+
+    def test_multiply_batch_empty(self):
+        assert multiply_batch.invoke({"pairs": []}) == []
+
+    def test_multiply_batch_rejects_bad_pairs(self):
+        with pytest.raises(ValueError):
+            multiply_batch.invoke({"pairs": [[1, 2, 3]]})
+
+
+class TestToolResultCache:
+    """Tests for memoizing pure tools."""
+
+    def test_repeated_calls_hit_cache(self, capsys):
+        """The tool body only runs on the first call."""
+        cache = ToolResultCache()
+        cached_multiply = memoize_tool(multiply_numbers, cache)
+
+        assert cached_multiply.invoke({"a": 6, "b": 7}) == 42
+        assert cached_multiply.invoke({"a": 6, "b": 7}) == 42
+
+        assert capsys.readouterr().out.count("Multiply Numbers Tool") == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_keys_are_canonical(self):
+        """Argument order and coercible values map to the same entry."""
+        cache = ToolResultCache()
+        cached_multiply = memoize_tool(multiply_numbers, cache)
+
+        cached_multiply.invoke({"a": 6, "b": 7})
+        cached_multiply.invoke({"b": 7, "a": "6"})
+
+        assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 1}
+
+    def test_cache_is_bounded(self):
+        cache = ToolResultCache(max_size=2)
+        cached_multiply = memoize_tool(multiply_numbers, cache)
+
+        for a in range(5):
+            cached_multiply.invoke({"a": a, "b": 2})
+
+        assert cache.stats()["size"] == 2
+
+    def test_only_pure_tools_are_memoized(self):
+        """Tools keep their name and schema; impure tools are left alone."""
+        impure = multiply_numbers.model_copy(update={"metadata": None})
+        tools = memoize_pure_tools([multiply_batch, impure], ToolResultCache())
+
+        assert tools[0] is not multiply_batch
+        assert tools[0].name == "multiply_batch"
+        assert tools[0].args_schema is multiply_batch.args_schema
+        assert tools[1] is impure
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+"""
+Priority Scheduling Benchmark
+Offers more runs than the admission controller can execute (simulated runs
+that sleep), with 10% urgent and 20% simple inputs, and reports the queue
+wait per class with one FIFO queue and with the priority scheduler.
+
+Run from the 3.Service directory:
+    python -m benchmarks.bench_priority
+"""
+import argparse
+import asyncio
+import random
+
+from langgraph_common.harness import print_report
+
+from service.admission import AdmissionController, Overloaded
+from service.config import ServiceConfig
+from service.scheduler import classify_input
+
+TEXTS = ["urgent: payment failing"] * 1 + ["a simple question"] * 2 + ["summarize this"] * 7
+
+
+async def offer_load(controller, requests, rate, run_seconds, seed=7):
+    """Start requests at rate per second; returns queue waits per class and shed count."""
+    rng = random.Random(seed)
+    waits = {}
+    shed = 0
+
+    async def request(text):
+        nonlocal shed
+        priority_class = classify_input({"input_text": text})
+        try:
+            async with controller.admit(priority_class) as waited:
+                waits.setdefault(priority_class, []).append(waited)
+                await asyncio.sleep(run_seconds)
+        except Overloaded:
+            shed += 1
+
+    tasks = []
+    for _ in range(requests):
+        tasks.append(asyncio.create_task(request(rng.choice(TEXTS))))
+        await asyncio.sleep(rng.expovariate(rate))
+    await asyncio.gather(*tasks)
+    return waits, shed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--run-ms", type=float, default=20)
+    parser.add_argument("--load", type=float, default=1.3,
+                        help="Offered load as a multiple of capacity")
+    args = parser.parse_args()
+
+    config = ServiceConfig(max_in_flight=args.max_in_flight, max_queue=10000,
+                           queue_timeout_seconds=60)
+    capacity = args.max_in_flight / (args.run_ms / 1000)
+    for label, classes in (("one FIFO queue", None),
+                           ("priority scheduler", config.scheduling_classes())):
+        controller = AdmissionController(config.max_in_flight, config.max_queue,
+                                         config.queue_timeout_seconds, classes=classes,
+                                         starvation_seconds=config.starvation_seconds)
+        waits, shed = asyncio.run(offer_load(controller, args.requests, capacity * args.load,
+                                             args.run_ms / 1000))
+        print_report(f"queue wait by class, {label} ({args.load:g}x capacity)",
+                     {name: waits[name] for name in ("priority", "simple", "standard")})
+        if classes is not None:
+            promoted = {name: c["starvation_promotions"]
+                        for name, c in controller.snapshot()["classes"].items()}
+            print(f"starvation promotions: {promoted}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Service Load Test
+Sends concurrent requests to the workflow service and reports latency
+percentiles, throughput and how many requests were shed with 429.
+
+Without --url the service runs in-process with the project's stand-in LLM:
+    python -m benchmarks.load_test --project ../1.Basic --graph basic_workflow
+Against a running service:
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --graph basic_workflow
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+from collections import Counter
+
+import httpx
+from langgraph_common.harness import print_report, timer
+
+
+async def run_load(client: httpx.AsyncClient, graph: str, endpoint: str,
+                   requests: int, concurrency: int):
+    """Send requests with at most concurrency outstanding; return latencies and statuses."""
+    latencies = []
+    statuses = Counter()
+    pending = iter(range(requests))
+
+    async def worker():
+        for i in pending:
+            elapsed = timer()
+            body = {"input": {"input_text": f"load test request {i}"}}
+            if endpoint == "stream":
+                async with client.stream("POST", f"/graphs/{graph}/stream", json=body) as response:
+                    async for _ in response.aiter_lines():
+                        pass
+            else:
+                response = await client.post(f"/graphs/{graph}/{endpoint}", json=body)
+            statuses[response.status_code] += 1
+            if response.status_code == 200:
+                latencies.append(elapsed())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses
+
+
+async def main_async(args):
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+    else:
+        from service.app import create_app
+        from service.config import ServiceConfig
+        from service.loader import load_graphs
+
+        config = ServiceConfig(
+            project_dir=args.project,
+            max_in_flight=args.max_in_flight,
+            max_queue=args.max_queue,
+            stand_in_llm=True,
+            stand_in_latency=args.llm_latency,
+        )
+        graphs = load_graphs(config.project_dir, True, config.stand_in_latency)
+        app = create_app(graphs, config)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                   base_url="http://service", timeout=60)
+
+    async with client:
+        elapsed = timer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies, statuses = await run_load(
+                client, args.graph, args.endpoint, args.requests, args.concurrency
+            )
+        total = elapsed()
+        metrics = (await client.get("/metrics")).json()
+
+    print_report(
+        f"{args.endpoint} {args.graph}: {args.requests} requests, {args.concurrency} concurrent",
+        {"latency (200s)": latencies}
+    )
+    print(f"\n📊 Status codes: {dict(statuses)}")
+    print(f"📊 Throughput: {statuses[200] / total:.1f} successful requests/s")
+    print(f"📊 Admission: {metrics['admission']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="Base URL of a running service")
+    parser.add_argument("--project", default="../1.Basic",
+                        help="Project served in-process when --url is not given")
+    parser.add_argument("--graph", default="basic_workflow")
+    parser.add_argument("--endpoint", choices=["invoke", "stream"], default="invoke")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="Above max-in-flight + max-queue the service sheds with 429")
+    parser.add_argument("--max-in-flight", type=int, default=16)
+    parser.add_argument("--max-queue", type=int, default=32)
+    parser.add_argument("--llm-latency", type=float, default=0.05,
+                        help="Seconds each stand-in LLM call takes (in-process only)")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
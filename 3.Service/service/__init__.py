@@ -0,0 +1,22 @@
+"""
+Async HTTP service for the LangGraph workflows.
+Serves the graphs declared in a project's langgraph.json over ASGI.
+"""
+
+from .admission import AdmissionController, Draining, Overloaded
+from .app import create_app
+from .config import ServiceConfig
+from .loader import load_graphs
+from .scheduler import ClassPolicy, PriorityScheduler, classify_input
+
+__all__ = [
+    "AdmissionController",
+    "ClassPolicy",
+    "Draining",
+    "Overloaded",
+    "PriorityScheduler",
+    "classify_input",
+    "create_app",
+    "ServiceConfig",
+    "load_graphs",
+]
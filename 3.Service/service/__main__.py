@@ -0,0 +1,77 @@
+"""
+Run the workflow service with uvicorn.
+
+Run from the 3.Service directory:
+    python -m service --project ../1.Basic
+    python -m service --project ../2.Router --port 8001 --stand-in-llm
+"""
+
+import argparse
+
+import uvicorn
+
+from service.app import create_app
+from service.config import ServiceConfig
+from service.loader import load_graphs
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that stops admitting requests as soon as shutdown starts."""
+
+    def __init__(self, config: uvicorn.Config, admission):
+        super().__init__(config)
+        self.admission = admission
+
+    def handle_exit(self, sig, frame):
+        # Requests on open keep-alive connections now get 503 while
+        # in-flight runs finish within timeout_graceful_shutdown
+        self.admission.draining = True
+        super().handle_exit(sig, frame)
+
+
+def main():
+    defaults = ServiceConfig.from_env()
+    parser = argparse.ArgumentParser(description="Serve a project's LangGraph workflows over HTTP")
+    parser.add_argument("--project", default=defaults.project_dir,
+                        help="Project directory containing langgraph.json")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-in-flight", type=int, default=defaults.max_in_flight)
+    parser.add_argument("--max-queue", type=int, default=defaults.max_queue)
+    parser.add_argument("--queue-timeout", type=float, default=defaults.queue_timeout_seconds)
+    parser.add_argument("--drain-timeout", type=float, default=defaults.drain_timeout_seconds)
+    parser.add_argument("--stand-in-llm", action="store_true", default=defaults.stand_in_llm,
+                        help="Use the project's local stand-in LLM instead of OpenAI")
+    parser.add_argument("--llm-latency", type=float, default=defaults.stand_in_latency,
+                        help="Seconds the stand-in LLM takes per call")
+    args = parser.parse_args()
+
+    config = ServiceConfig(
+        project_dir=args.project,
+        max_in_flight=args.max_in_flight,
+        max_queue=args.max_queue,
+        queue_timeout_seconds=args.queue_timeout,
+        max_batch_size=defaults.max_batch_size,
+        class_weights=defaults.class_weights,
+        class_limits=defaults.class_limits,
+        starvation_seconds=defaults.starvation_seconds,
+        drain_timeout_seconds=args.drain_timeout,
+        stand_in_llm=args.stand_in_llm,
+        stand_in_latency=args.llm_latency,
+        stand_in_token_delay=defaults.stand_in_token_delay,
+    )
+    graphs = load_graphs(config.project_dir, config.stand_in_llm,
+                         config.stand_in_latency, config.stand_in_token_delay)
+    app = create_app(graphs, config)
+
+    print(f"🚀 Serving {', '.join(sorted(graphs))} on http://{args.host}:{args.port}")
+    server = DrainingServer(
+        uvicorn.Config(app, host=args.host, port=args.port,
+                       timeout_graceful_shutdown=int(config.drain_timeout_seconds)),
+        app.state.admission
+    )
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Admission Control
+Bounds the number of graph runs in flight and sheds load when the queue is full.
+
+Up to max_in_flight runs execute at once and up to max_queue more wait for
+a slot. A request arriving when the queue is full, or waiting longer than
+queue_timeout, is rejected with Overloaded (HTTP 429) instead of piling up
+latency for everyone. While draining, new requests get Draining (HTTP 503).
+
+Which waiting request gets a free slot is decided by a PriorityScheduler:
+weighted fair queues per scheduling class, with per-class in-flight
+limits and starvation protection (see service/scheduler.py).
+"""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from service.scheduler import DEFAULT_CLASS, ClassPolicy, PriorityScheduler
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed because the queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Service overloaded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Draining(Exception):
+    """Raised for requests arriving while the service shuts down."""
+
+
+class AdmissionController:
+    """In-flight limit and bounded wait queue shared by all endpoints."""
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float,
+                 classes: Optional[Dict[str, ClassPolicy]] = None,
+                 default_class: str = DEFAULT_CLASS, starvation_seconds: float = 2.0):
+        """
+        Initialize the controller.
+
+        Args:
+            max_in_flight: Maximum graph runs executing at once
+            max_queue: Maximum requests waiting for a slot
+            queue_timeout: Seconds a request may wait before being shed
+            classes: Scheduling policy per class; a single FIFO class if None
+            default_class: Class of requests without a known class
+            starvation_seconds: Queue wait after which a request is served
+                ahead of its turn (0 disables)
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.draining = False
+        self.scheduler = PriorityScheduler(max_in_flight, classes, default_class,
+                                           starvation_seconds)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        # Moving average of run time, used for Retry-After hints
+        self._avg_run_seconds = 1.0
+        self.stats = {"admitted": 0, "shed": 0, "timed_out": 0, "rejected_draining": 0}
+        self._queue_wait_total = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        """Graph runs executing."""
+        return self.scheduler.in_flight
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for a slot."""
+        return self.scheduler.queued
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is expected to clear."""
+        backlog = (self.queued + 1) / max(1, self.max_in_flight)
+        return max(1, math.ceil(backlog * self._avg_run_seconds))
+
+    def check_capacity(self, runs: int = 1) -> None:
+        """
+        Reject up front if runs more requests could not even be queued.
+
+        Raises:
+            Draining: If the service is shutting down
+            Overloaded: If the queue has no room for runs more requests
+        """
+        if self.draining:
+            self.stats["rejected_draining"] += 1
+            raise Draining("Service is shutting down")
+        free_slots = self.max_in_flight - self.in_flight
+        if self.queued + runs > self.max_queue + max(0, free_slots):
+            self.stats["shed"] += 1
+            raise Overloaded(self.retry_after())
+
+    async def acquire(self, priority_class: Optional[str] = None) -> float:
+        """
+        Wait for an execution slot.
+
+        Args:
+            priority_class: Scheduling class of the request (see
+                scheduler.classify_input); None uses the default class
+
+        Returns:
+            Seconds spent waiting in the queue
+
+        Raises:
+            Draining: If the service is shutting down
+            Overloaded: If the queue is full or the wait times out
+        """
+        self.check_capacity()
+        self._idle.clear()
+        try:
+            waited = await self.scheduler.acquire(priority_class, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timed_out"] += 1
+            raise Overloaded(self.retry_after())
+        finally:
+            self._set_idle_if_done()
+
+        self.stats["admitted"] += 1
+        self._queue_wait_total += waited
+        return waited
+
+    def release(self, run_seconds: float, priority_class: Optional[str] = None) -> None:
+        """Free a slot taken by acquire() after a run of run_seconds."""
+        self._avg_run_seconds = 0.9 * self._avg_run_seconds + 0.1 * run_seconds
+        self.scheduler.release(priority_class)
+        self._set_idle_if_done()
+
+    def _set_idle_if_done(self) -> None:
+        if self.in_flight == 0 and self.queued == 0:
+            self._idle.set()
+
+    @asynccontextmanager
+    async def admit(self, priority_class: Optional[str] = None) -> AsyncIterator[float]:
+        """Hold a slot for the duration of the block; yields the queue wait."""
+        waited = await self.acquire(priority_class)
+        start = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            self.release(time.perf_counter() - start, priority_class)
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stop admitting requests and wait for in-flight runs to finish.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if every run finished in time
+        """
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current load and counters, overall and per scheduling class."""
+        admitted = self.stats["admitted"]
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "draining": self.draining,
+            "avg_queue_wait_ms": round(self._queue_wait_total / admitted * 1000, 2) if admitted else 0.0,
+            "avg_run_ms": round(self._avg_run_seconds * 1000, 2),
+            **self.stats,
+            "classes": self.scheduler.snapshot(),
+        }
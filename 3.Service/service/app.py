@@ -0,0 +1,274 @@
+"""
+Service Application
+Starlette app exposing invoke, batch and streaming (SSE) endpoints per graph.
+
+Endpoints:
+    GET  /health                      200 when serving, 503 while draining
+    GET  /metrics                     Admission, per-class queue waits, per-graph
+                                      counters, sampler stats
+    GET  /graphs                      Names of the served graphs
+    POST /graphs/{name}/invoke        {"input": {...}, "config": {...}}
+    POST /graphs/{name}/batch         {"inputs": [{...}, ...], "config": {...}}
+    POST /graphs/{name}/stream        Same body as invoke, answered as SSE
+"""
+
+import asyncio
+import json
+import time
+from collections import Counter
+from collections.abc import Sequence
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from langchain_core.messages import AIMessageChunk
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from service.admission import AdmissionController, Draining, Overloaded
+from service.config import ServiceConfig
+from service.loader import start_project_sampler
+from service.scheduler import classify_input
+
+
+class BadRequest(Exception):
+    """Raised for malformed request bodies."""
+
+
+class ReleasingStreamingResponse(StreamingResponse):
+    """StreamingResponse that calls release() when it is done, however it ends."""
+
+    def __init__(self, content: Any, release: Callable[[], None], **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.release = release
+
+    async def __call__(self, scope, receive, send) -> None:
+        # The body generator's own cleanup only runs if it was started; a
+        # client gone before the headers were sent never starts it
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.release()
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert graph state (which may hold messages) into JSON-compatible data."""
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # Message histories may be sequences other than lists (2.Router's MessageLog)
+    if isinstance(value, Sequence) and not isinstance(value, (bytes, bytearray)):
+        return [to_jsonable(v) for v in value]
+    if hasattr(value, "model_dump"):
+        return to_jsonable(value.model_dump())
+    return str(value)
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(to_jsonable(data))}\n\n"
+
+
+def _error(status: int, message: str, retry_after: Optional[int] = None) -> JSONResponse:
+    headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+    body = {"error": message}
+    if retry_after is not None:
+        body["retry_after"] = retry_after
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+def create_app(graphs: Dict[str, Any], config: Optional[ServiceConfig] = None) -> Starlette:
+    """
+    Create the ASGI application.
+
+    Args:
+        graphs: Dictionary of graph name -> compiled graph
+        config: Service configuration; read from the environment if None
+
+    Returns:
+        Starlette application; its admission controller is app.state.admission
+    """
+    config = config or ServiceConfig.from_env()
+    admission = AdmissionController(
+        max_in_flight=config.max_in_flight,
+        max_queue=config.max_queue,
+        queue_timeout=config.queue_timeout_seconds,
+        classes=config.scheduling_classes(),
+        starvation_seconds=config.starvation_seconds
+    )
+    runs = Counter()
+    failures = Counter()
+
+    async def read_body(request: Request) -> Dict[str, Any]:
+        if request.path_params["name"] not in graphs:
+            raise KeyError(request.path_params["name"])
+        try:
+            body = await request.json()
+        except ValueError:
+            raise BadRequest("Body must be JSON")
+        if not isinstance(body, dict):
+            raise BadRequest("Body must be a JSON object")
+        if not isinstance(body.get("config", {}), dict):
+            raise BadRequest("'config' must be an object")
+        return body
+
+    def guarded(handler):
+        """Map service exceptions to HTTP responses."""
+        async def endpoint(request: Request):
+            try:
+                return await handler(request)
+            except KeyError as e:
+                return _error(404, f"Unknown graph {e}")
+            except BadRequest as e:
+                return _error(400, str(e))
+            except Overloaded as e:
+                return _error(429, str(e), e.retry_after)
+            except Draining as e:
+                return _error(503, str(e), 1)
+        return endpoint
+
+    async def run_graph(name: str, graph_input: Dict[str, Any], run_config: Dict[str, Any]):
+        # Classified before the run, so urgent inputs skip the queue
+        async with admission.admit(classify_input(graph_input)):
+            runs[name] += 1
+            try:
+                return await graphs[name].ainvoke(graph_input, run_config or None)
+            except Exception:
+                failures[name] += 1
+                raise
+
+    async def invoke(request: Request):
+        body = await read_body(request)
+        name = request.path_params["name"]
+        graph_input = body.get("input")
+        if not isinstance(graph_input, dict):
+            raise BadRequest("'input' must be an object")
+        try:
+            output = await run_graph(name, graph_input, body.get("config", {}))
+        except (Overloaded, Draining):
+            raise
+        except Exception as e:
+            return _error(500, f"{type(e).__name__}: {e}")
+        return JSONResponse({"output": to_jsonable(output)})
+
+    async def batch(request: Request):
+        body = await read_body(request)
+        name = request.path_params["name"]
+        inputs = body.get("inputs")
+        if not isinstance(inputs, list) or not all(isinstance(i, dict) for i in inputs):
+            raise BadRequest("'inputs' must be a list of objects")
+        if len(inputs) > config.max_batch_size:
+            raise BadRequest(f"Batches are limited to {config.max_batch_size} inputs")
+
+        # Each item is a run of its own; the batch is shed as a whole if
+        # the queue cannot take all of them
+        admission.check_capacity(len(inputs))
+        results = await asyncio.gather(
+            *(run_graph(name, graph_input, body.get("config", {})) for graph_input in inputs),
+            return_exceptions=True
+        )
+        outputs = [
+            {"error": f"{type(r).__name__}: {r}"} if isinstance(r, BaseException)
+            else {"output": to_jsonable(r)}
+            for r in results
+        ]
+        return JSONResponse({"outputs": outputs})
+
+    async def stream(request: Request):
+        body = await read_body(request)
+        name = request.path_params["name"]
+        graph_input = body.get("input")
+        if not isinstance(graph_input, dict):
+            raise BadRequest("'input' must be an object")
+
+        # Admit before the response starts so overload is still a 429
+        priority_class = classify_input(graph_input)
+        await admission.acquire(priority_class)
+        runs[name] += 1
+        start = time.perf_counter()
+        released = False
+
+        def release() -> None:
+            # Called when the run ends and again when the response is done
+            nonlocal released
+            if not released:
+                released = True
+                admission.release(time.perf_counter() - start, priority_class)
+
+        async def events() -> AsyncIterator[str]:
+            final_state = None
+            try:
+                async for mode, chunk in graphs[name].astream(
+                    graph_input, body.get("config") or None,
+                    stream_mode=["messages", "updates", "values"]
+                ):
+                    if mode == "messages":
+                        message, metadata = chunk
+                        if isinstance(message, AIMessageChunk) and message.content:
+                            yield sse_event("token", {
+                                "node": metadata.get("langgraph_node"),
+                                "content": message.content
+                            })
+                    elif mode == "updates":
+                        yield sse_event("update", chunk)
+                    else:
+                        final_state = chunk
+                yield sse_event("result", final_state)
+            except Exception as e:
+                failures[name] += 1
+                yield sse_event("error", {"error": f"{type(e).__name__}: {e}"})
+            finally:
+                release()
+
+        try:
+            return ReleasingStreamingResponse(events(), release, media_type="text/event-stream",
+                                              headers={"Cache-Control": "no-cache"})
+        except BaseException:
+            release()
+            raise
+
+    async def health(request: Request):
+        status = "draining" if admission.draining else "ok"
+        return JSONResponse({"status": status, **admission.snapshot()},
+                            status_code=503 if admission.draining else 200)
+
+    async def metrics(request: Request):
+        sampler = request.app.state.sampler
+        return JSONResponse({
+            "admission": admission.snapshot(),
+            "runs": dict(runs),
+            "failures": dict(failures),
+            "sampler": sampler.stats if sampler is not None else None
+        })
+
+    async def list_graphs(request: Request):
+        return JSONResponse({"graphs": sorted(graphs)})
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # The project's background sampling profiler, if it enables one
+        app.state.sampler = start_project_sampler()
+        yield
+        drained = await admission.drain(config.drain_timeout_seconds)
+        if not drained:
+            print(f"⚠️ Shutdown with {admission.in_flight} run(s) still in flight")
+        if app.state.sampler is not None:
+            app.state.sampler.stop()
+
+    app = Starlette(
+        routes=[
+            Route("/health", health),
+            Route("/metrics", metrics),
+            Route("/graphs", list_graphs),
+            Route("/graphs/{name}/invoke", guarded(invoke), methods=["POST"]),
+            Route("/graphs/{name}/batch", guarded(batch), methods=["POST"]),
+            Route("/graphs/{name}/stream", guarded(stream), methods=["POST"]),
+        ],
+        lifespan=lifespan
+    )
+    app.state.admission = admission
+    app.state.graphs = graphs
+    app.state.sampler = None
+    return app
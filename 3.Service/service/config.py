@@ -0,0 +1,88 @@
+"""
+Configuration management for the workflow service.
+"""
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict
+
+from service.scheduler import ClassPolicy, parse_class_settings
+
+
+@dataclass
+class ServiceConfig:
+    """Service settings; from_env() reads the SERVICE_* environment variables."""
+
+    # Project whose langgraph.json graphs are served
+    project_dir: str = "../1.Basic"
+
+    # Backpressure
+    max_in_flight: int = 16
+    max_queue: int = 64
+    queue_timeout_seconds: float = 10.0
+    max_batch_size: int = 16
+
+    # Priority scheduling (see service/scheduler.py): "class=weight" pairs,
+    # "class=share" caps on a class's share of max_in_flight, and the queue
+    # wait after which a request is served ahead of its turn (0 disables)
+    class_weights: str = "priority=8,standard=4,simple=1"
+    class_limits: str = "standard=0.75,simple=0.25"
+    starvation_seconds: float = 2.0
+
+    # Seconds to wait for in-flight runs on shutdown
+    drain_timeout_seconds: float = 30.0
+
+    # Replace the project's LLM with its local stand-in (load tests)
+    stand_in_llm: bool = False
+    stand_in_latency: float = 0.05
+    stand_in_token_delay: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ServiceConfig":
+        """Build the configuration from environment variables."""
+        return cls(
+            project_dir=os.getenv("SERVICE_PROJECT_DIR", cls.project_dir),
+            max_in_flight=int(os.getenv("SERVICE_MAX_IN_FLIGHT", cls.max_in_flight)),
+            max_queue=int(os.getenv("SERVICE_MAX_QUEUE", cls.max_queue)),
+            queue_timeout_seconds=float(
+                os.getenv("SERVICE_QUEUE_TIMEOUT_SECONDS", cls.queue_timeout_seconds)),
+            max_batch_size=int(os.getenv("SERVICE_MAX_BATCH_SIZE", cls.max_batch_size)),
+            class_weights=os.getenv("SERVICE_CLASS_WEIGHTS", cls.class_weights),
+            class_limits=os.getenv("SERVICE_CLASS_LIMITS", cls.class_limits),
+            starvation_seconds=float(
+                os.getenv("SERVICE_STARVATION_SECONDS", cls.starvation_seconds)),
+            drain_timeout_seconds=float(
+                os.getenv("SERVICE_DRAIN_TIMEOUT_SECONDS", cls.drain_timeout_seconds)),
+            stand_in_llm=os.getenv("SERVICE_STAND_IN_LLM", "false").lower() == "true",
+            stand_in_latency=float(os.getenv("SERVICE_STAND_IN_LATENCY", cls.stand_in_latency)),
+            stand_in_token_delay=float(
+                os.getenv("SERVICE_STAND_IN_TOKEN_DELAY", cls.stand_in_token_delay)),
+        )
+
+    def scheduling_classes(self) -> Dict[str, ClassPolicy]:
+        """
+        Scheduling policy per class from class_weights and class_limits.
+
+        Raises:
+            ValueError: If the settings are malformed, a weight is not
+                positive, a limit is outside (0, 1] or limits an unweighted class
+        """
+        weights = parse_class_settings(self.class_weights)
+        limits = parse_class_settings(self.class_limits)
+        unknown = set(limits) - set(weights)
+        if unknown:
+            raise ValueError(f"Limits for classes without a weight: {', '.join(sorted(unknown))}")
+        for name, weight in weights.items():
+            if not weight > 0:
+                raise ValueError(f"Weight of class '{name}' must be positive, got {weight:g}")
+        for name, share in limits.items():
+            if not 0 < share <= 1:
+                raise ValueError(f"Limit of class '{name}' must be in (0, 1], got {share:g}")
+        return {
+            name: ClassPolicy(
+                weight=weight,
+                max_in_flight=math.ceil(limits[name] * self.max_in_flight) if name in limits else 0
+            )
+            for name, weight in weights.items()
+        }
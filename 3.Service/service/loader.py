@@ -0,0 +1,72 @@
+"""
+Graph Loader
+Imports the graphs a project declares in its langgraph.json.
+
+Each project keeps its code in its own top-level `src` package, so a
+service process serves a single project.
+"""
+
+import importlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def _module_name(path: str) -> str:
+    """Turn "./src/workflows/basic_workflow.py" into "src.workflows.basic_workflow"."""
+    return os.path.normpath(path).removesuffix(".py").replace(os.sep, ".")
+
+
+def load_graphs(project_dir: str, stand_in_llm: bool = False,
+                stand_in_latency: float = 0.0,
+                stand_in_token_delay: float = 0.0) -> Dict[str, Any]:
+    """
+    Import and compile the graphs declared in project_dir/langgraph.json.
+
+    Args:
+        project_dir: Project root containing langgraph.json
+        stand_in_llm: If True, install the project's stand-in LLM from
+            src.testing before the graphs are built
+        stand_in_latency: Seconds the stand-in waits before responding
+        stand_in_token_delay: Seconds the stand-in waits per token
+
+    Returns:
+        Dictionary of graph name -> compiled graph
+    """
+    project = Path(project_dir).resolve()
+    spec = json.loads((project / "langgraph.json").read_text())
+
+    if str(project) not in sys.path:
+        sys.path.insert(0, str(project))
+
+    if stand_in_llm:
+        testing = importlib.import_module("src.testing")
+        testing.install_stand_in_llm(latency=stand_in_latency, token_delay=stand_in_token_delay)
+
+    graphs = {}
+    for name, target in spec["graphs"].items():
+        path, attr = target.rsplit(":", 1)
+        factory = getattr(importlib.import_module(_module_name(path)), attr)
+        # Entries may point at a compiled graph or at a function building one
+        graphs[name] = factory if hasattr(factory, "ainvoke") else factory()
+    return graphs
+
+
+def start_project_sampler() -> Optional[Any]:
+    """
+    Start the background sampling profiler of the loaded project, if it has
+    one (src.profiling.get_sampler) and enables it with SAMPLER_ENABLED=true.
+
+    Returns:
+        The running sampler, or None
+    """
+    try:
+        profiling = importlib.import_module("src.profiling")
+    except ImportError:
+        return None
+    get_sampler = getattr(profiling, "get_sampler", None)
+    sampler = get_sampler() if get_sampler is not None else None
+    # Restarts a sampler stopped by an earlier shutdown in this process
+    return sampler.start() if sampler is not None else None
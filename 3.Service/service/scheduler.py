@@ -0,0 +1,248 @@
+"""
+Priority Scheduler
+Decides which queued request gets the next free execution slot.
+
+Requests are classified when they arrive (classify_input), before any
+graph work, by the route keywords advanced_workflow's router uses
+(langgraph_common.routing): "urgent" inputs are "priority", "simple" ones
+"simple", the rest "standard". Each class has a queue, a positive weight
+and an optional limit on its runs in flight.
+
+Slots are shared by weighted fair queuing. A request gets a virtual finish
+tag 1/weight after the later of its class's previous tag and the tag of the
+last request dispatched. The queued head with the smallest tag runs next,
+so under load classes get slots in proportion to their weights, and a
+class that was idle does not get to catch up. Classes at their in-flight
+limit are skipped; their slots go to the other classes.
+
+Starvation protection: a head that has waited starvation_seconds or more
+runs before any tag-ordered request, oldest first.
+
+Queue waits are recorded per class; snapshot() reports them with the
+queue depth, runs in flight and counters of every class.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from langgraph_common.routing import DEFAULT_ROUTE, route_for
+
+DEFAULT_CLASS = DEFAULT_ROUTE
+
+_RECENT_WAITS = 1024
+
+
+def classify_input(graph_input: Dict[str, Any]) -> str:
+    """
+    Scheduling class of a graph input, from its input_text only.
+
+    Args:
+        graph_input: Graph input as sent by the client
+
+    Returns:
+        "priority", "simple" or "standard"
+    """
+    text = graph_input.get("input_text")
+    return route_for(text) if isinstance(text, str) else DEFAULT_CLASS
+
+
+@dataclass
+class ClassPolicy:
+    """Scheduling settings of one class."""
+
+    # Share of slots under contention, relative to the other classes (> 0)
+    weight: float = 1.0
+    # Most runs of the class in flight at once (0: only the global limit)
+    max_in_flight: int = 0
+
+
+@dataclass
+class _Waiter:
+    finish_tag: float
+    enqueued: float
+    future: asyncio.Future
+
+
+class _ClassState:
+    """Queue and counters of one class."""
+
+    def __init__(self, policy: ClassPolicy):
+        self.policy = policy
+        self.queue: Deque[_Waiter] = deque()
+        self.in_flight = 0
+        self.last_tag = 0.0
+        self.waits: Deque[float] = deque(maxlen=_RECENT_WAITS)
+        self.stats = {"admitted": 0, "timed_out": 0, "starvation_promotions": 0}
+
+    def head(self) -> Optional[_Waiter]:
+        # Waiters that gave up are dropped when they reach the head
+        while self.queue and self.queue[0].future.done():
+            self.queue.popleft()
+        return self.queue[0] if self.queue else None
+
+    def has_room(self) -> bool:
+        return not self.policy.max_in_flight or self.in_flight < self.policy.max_in_flight
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class PriorityScheduler:
+    """Weighted-fair slot scheduling with per-class limits and starvation protection."""
+
+    def __init__(self, max_in_flight: int, classes: Optional[Dict[str, ClassPolicy]] = None,
+                 default_class: str = DEFAULT_CLASS, starvation_seconds: float = 2.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_in_flight: Runs executing at once, over all classes
+            classes: Policy per class name; one class of weight 1 if None
+            default_class: Class of requests without a known class
+            starvation_seconds: Queue wait after which a request runs first
+                (0 disables starvation protection)
+
+        Raises:
+            ValueError: If the default class has no policy, or a policy has a
+                weight that is not positive or a negative limit
+        """
+        classes = classes or {default_class: ClassPolicy()}
+        if default_class not in classes:
+            raise ValueError(f"Default class '{default_class}' has no policy")
+        for name, policy in classes.items():
+            if not policy.weight > 0:
+                raise ValueError(f"Class '{name}' needs a positive weight, got {policy.weight}")
+            if policy.max_in_flight < 0:
+                raise ValueError(f"Class '{name}' has a negative limit: {policy.max_in_flight}")
+        self.max_in_flight = max_in_flight
+        self.default_class = default_class
+        self.starvation_seconds = starvation_seconds
+        self.classes = {name: _ClassState(policy) for name, policy in classes.items()}
+        self.in_flight = 0
+        self.queued = 0
+        self._virtual_time = 0.0
+
+    def class_of(self, name: Optional[str]) -> str:
+        """The scheduled class for name, the default class if it is unknown."""
+        return name if name in self.classes else self.default_class
+
+    def _next(self) -> Optional[_ClassState]:
+        heads = [(state, state.head()) for state in self.classes.values() if state.has_room()]
+        heads = [(state, waiter) for state, waiter in heads if waiter is not None]
+        if not heads:
+            return None
+        if self.starvation_seconds:
+            now = time.perf_counter()
+            starved = [(state, waiter) for state, waiter in heads
+                       if now - waiter.enqueued >= self.starvation_seconds]
+            if starved:
+                state, waiter = min(starved, key=lambda item: item[1].enqueued)
+                if waiter.finish_tag != min(w.finish_tag for _, w in heads):
+                    state.stats["starvation_promotions"] += 1
+                return state
+        return min(heads, key=lambda item: item[1].finish_tag)[0]
+
+    def _dispatch(self) -> None:
+        while self.in_flight < self.max_in_flight:
+            state = self._next()
+            if state is None:
+                return
+            waiter = state.queue.popleft()
+            self._virtual_time = max(self._virtual_time, waiter.finish_tag)
+            state.in_flight += 1
+            self.in_flight += 1
+            self.queued -= 1
+            waiter.future.set_result(None)
+
+    async def acquire(self, name: Optional[str] = None, timeout: Optional[float] = None) -> float:
+        """
+        Wait for a slot for a request of class name.
+
+        Args:
+            name: Scheduling class (unknown names use the default class)
+            timeout: Most seconds to wait; None waits indefinitely
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            asyncio.TimeoutError: If no slot was free within timeout
+        """
+        state = self.classes[self.class_of(name)]
+        start = time.perf_counter()
+        state.last_tag = max(state.last_tag, self._virtual_time) + 1 / state.policy.weight
+        waiter = _Waiter(state.last_tag, start, asyncio.get_running_loop().create_future())
+        state.queue.append(waiter)
+        self.queued += 1
+        self._dispatch()
+        try:
+            # asyncio.wait leaves the future alone, so a slot granted just as
+            # the timeout fires is still seen
+            await asyncio.wait({waiter.future}, timeout=timeout)
+        except BaseException:
+            # Cancelled while waiting: give up the place or the granted slot
+            if waiter.future.done():
+                self.release(name)
+            else:
+                self._leave(waiter)
+            raise
+        if not waiter.future.done():
+            self._leave(waiter)
+            state.stats["timed_out"] += 1
+            raise asyncio.TimeoutError()
+        waited = time.perf_counter() - start
+        state.waits.append(waited)
+        state.stats["admitted"] += 1
+        return waited
+
+    def _leave(self, waiter: _Waiter) -> None:
+        waiter.future.cancel()
+        self.queued -= 1
+
+    def release(self, name: Optional[str] = None) -> None:
+        """Free a slot taken by acquire() for class name and hand it on."""
+        self.classes[self.class_of(name)].in_flight -= 1
+        self.in_flight -= 1
+        self._dispatch()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, runs in flight, counters and recent queue waits per class."""
+        classes = {}
+        for name, state in self.classes.items():
+            waits = sorted(state.waits)
+            classes[name] = {
+                "weight": state.policy.weight,
+                "max_in_flight": state.policy.max_in_flight,
+                "queued": sum(1 for waiter in state.queue if not waiter.future.done()),
+                "in_flight": state.in_flight,
+                **state.stats,
+                "queue_wait_ms": {
+                    "mean": round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+                    "p50": round(_percentile(waits, 50) * 1000, 2) if waits else 0.0,
+                    "p95": round(_percentile(waits, 95) * 1000, 2) if waits else 0.0,
+                    "max": round(waits[-1] * 1000, 2) if waits else 0.0,
+                },
+            }
+        return classes
+
+
+def parse_class_settings(spec: str) -> Dict[str, float]:
+    """
+    Parse "name=value,name=value" settings, as used by the SERVICE_CLASS_*
+    environment variables.
+
+    Raises:
+        ValueError: If an entry is not name=number
+    """
+    settings = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, sep, value = entry.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Expected name=value, got '{entry}'")
+        settings[name.strip()] = float(value)
+    return settings
@@ -0,0 +1,103 @@
+"""
+Tests for the admission controller.
+"""
+
+import asyncio
+
+import pytest
+
+from service.admission import AdmissionController, Draining, Overloaded
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestAdmissionController:
+    """Tests for in-flight limits, shedding and draining."""
+
+    def test_limits_in_flight_runs(self):
+        async def scenario():
+            controller = AdmissionController(max_in_flight=2, max_queue=10, queue_timeout=5)
+            peak = 0
+
+            async def job():
+                nonlocal peak
+                async with controller.admit():
+                    peak = max(peak, controller.in_flight)
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(*(job() for _ in range(8)))
+            return controller, peak
+
+        controller, peak = run(scenario())
+        assert peak == 2
+        assert controller.stats["admitted"] == 8
+        assert controller.in_flight == controller.queued == 0
+
+    def test_sheds_when_queue_is_full(self):
+        async def scenario():
+            controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5)
+            release = asyncio.Event()
+
+            async def job():
+                async with controller.admit():
+                    await release.wait()
+
+            running = [asyncio.create_task(job()) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            with pytest.raises(Overloaded) as shed:
+                await controller.acquire()
+            release.set()
+            await asyncio.gather(*running)
+            return controller, shed.value
+
+        controller, error = run(scenario())
+        assert error.retry_after >= 1
+        assert controller.stats["shed"] == 1
+        assert controller.stats["admitted"] == 2
+
+    def test_queue_timeout_sheds(self):
+        async def scenario():
+            controller = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout=0.02)
+            await controller.acquire()
+            with pytest.raises(Overloaded):
+                await controller.acquire()
+            return controller
+
+        controller = run(scenario())
+        assert controller.stats["timed_out"] == 1
+        assert controller.queued == 0
+
+    def test_drain_waits_for_in_flight_runs(self):
+        async def scenario():
+            controller = AdmissionController(max_in_flight=4, max_queue=4, queue_timeout=5)
+            finished = []
+
+            async def job():
+                async with controller.admit():
+                    await asyncio.sleep(0.05)
+                    finished.append(True)
+
+            task = asyncio.create_task(job())
+            await asyncio.sleep(0.01)
+            drained = await controller.drain(timeout=1)
+            with pytest.raises(Draining):
+                await controller.acquire()
+            await task
+            return drained, finished
+
+        drained, finished = run(scenario())
+        assert drained and finished == [True]
+
+    def test_drain_times_out(self):
+        async def scenario():
+            controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5)
+            await controller.acquire()
+            return await controller.drain(timeout=0.01)
+
+        assert run(scenario()) is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
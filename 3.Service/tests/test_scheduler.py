@@ -0,0 +1,204 @@
+"""
+Tests for the priority scheduler and its use by the admission controller.
+"""
+
+import asyncio
+
+import pytest
+
+from service.admission import AdmissionController
+from service.config import ServiceConfig
+from service.scheduler import ClassPolicy, PriorityScheduler, classify_input
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def grant_order(scheduler, requests, hold=None):
+    """Queue requests behind a held slot, then release slots one at a time; returns grant order."""
+    await scheduler.acquire(hold)
+    order = []
+
+    async def request(name):
+        await scheduler.acquire(name)
+        order.append(name)
+
+    tasks = [asyncio.create_task(request(name)) for name in requests]
+    await asyncio.sleep(0)
+    scheduler.release(hold)
+    for granted in range(1, len(requests) + 1):
+        while len(order) < granted:
+            await asyncio.sleep(0)
+        scheduler.release(order[-1])
+    await asyncio.gather(*tasks)
+    return order
+
+
+class TestClassifyInput:
+    """Tests for admission-time classification."""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("URGENT: server down", "priority"),
+        ("a simple question", "simple"),
+        ("urgent but simple", "priority"),
+        ("summarize this", "standard"),
+    ])
+    def test_matches_advanced_workflow_routes(self, text, expected):
+        assert classify_input({"input_text": text}) == expected
+
+    def test_inputs_without_text_are_standard(self):
+        assert classify_input({}) == classify_input({"input_text": 3}) == "standard"
+
+
+class TestPriorityScheduler:
+    """Tests for weighted fair queuing, limits and starvation protection."""
+
+    def test_single_class_is_fifo(self):
+        async def scenario():
+            scheduler = PriorityScheduler(max_in_flight=1)
+            order = []
+
+            async def request(i):
+                await scheduler.acquire()
+                order.append(i)
+                await asyncio.sleep(0)
+                scheduler.release()
+
+            await asyncio.gather(*(request(i) for i in range(10)))
+            return order
+
+        assert run(scenario()) == list(range(10))
+
+    def test_slots_are_shared_by_weight(self):
+        scheduler = PriorityScheduler(max_in_flight=1, classes={
+            "priority": ClassPolicy(weight=3), "standard": ClassPolicy(weight=1)})
+        order = run(grant_order(scheduler, ["standard"] * 8 + ["priority"] * 8))
+        assert order[:8].count("priority") == 6
+        assert order[8:].count("standard") == 6
+
+    def test_class_limit_leaves_slots_to_others(self):
+        async def scenario():
+            scheduler = PriorityScheduler(max_in_flight=3, classes={
+                "standard": ClassPolicy(max_in_flight=1), "priority": ClassPolicy()})
+            for _ in range(2):
+                asyncio.create_task(scheduler.acquire("standard"))
+            await asyncio.sleep(0)
+            await asyncio.wait_for(scheduler.acquire("priority"), 1)
+            await asyncio.wait_for(scheduler.acquire("priority"), 1)
+            snapshot = scheduler.snapshot()
+            scheduler.release("standard")
+            await asyncio.sleep(0.01)
+            return snapshot, scheduler.snapshot()
+
+        before, after = run(scenario())
+        assert before["standard"]["in_flight"] == 1 and before["standard"]["queued"] == 1
+        assert before["priority"]["in_flight"] == 2
+        assert after["standard"]["in_flight"] == 1 and after["standard"]["admitted"] == 2
+
+    def test_starved_request_is_served_first(self):
+        async def scenario():
+            scheduler = PriorityScheduler(max_in_flight=1, starvation_seconds=0.05, classes={
+                "standard": ClassPolicy(weight=100), "simple": ClassPolicy(weight=1)})
+            await scheduler.acquire()
+            simple = asyncio.create_task(scheduler.acquire("simple"))
+            for _ in range(20):
+                asyncio.create_task(scheduler.acquire("standard"))
+            await asyncio.sleep(0.06)
+            scheduler.release()
+            await simple
+            return scheduler.snapshot()
+
+        snapshot = run(scenario())
+        simple = snapshot["simple"]
+        assert simple["admitted"] == 1 and snapshot["standard"]["in_flight"] == 0
+        assert simple["starvation_promotions"] == 1
+        assert simple["queue_wait_ms"]["max"] >= 50
+
+    def test_timeout_leaves_the_queue(self):
+        async def scenario():
+            scheduler = PriorityScheduler(max_in_flight=1)
+            await scheduler.acquire()
+            with pytest.raises(asyncio.TimeoutError):
+                await scheduler.acquire(timeout=0.01)
+            scheduler.release()
+            waited = await scheduler.acquire(timeout=0.01)
+            return scheduler, waited
+
+        scheduler, waited = run(scenario())
+        assert waited < 0.01
+        assert scheduler.queued == 0 and scheduler.in_flight == 1
+        assert scheduler.snapshot()["standard"]["timed_out"] == 1
+
+    def test_cancelled_request_gives_back_its_slot(self):
+        async def scenario():
+            scheduler = PriorityScheduler(max_in_flight=1)
+            await scheduler.acquire()
+            waiting = asyncio.create_task(scheduler.acquire())
+            await asyncio.sleep(0)
+            # The slot is handed over, but the request is cancelled before it runs
+            scheduler.release()
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+            return scheduler
+
+        scheduler = run(scenario())
+        assert scheduler.in_flight == scheduler.queued == 0
+
+
+class TestAdmissionScheduling:
+    """Tests for priority classes in the admission controller and service config."""
+
+    def test_urgent_runs_skip_ahead_of_queued_runs(self):
+        async def scenario():
+            controller = AdmissionController(
+                max_in_flight=1, max_queue=20, queue_timeout=5,
+                classes=ServiceConfig(max_in_flight=1).scheduling_classes())
+            order = []
+
+            async def job(priority_class):
+                async with controller.admit(priority_class):
+                    order.append(priority_class)
+                    await asyncio.sleep(0.001)
+
+            tasks = [asyncio.create_task(job("standard")) for _ in range(6)]
+            await asyncio.sleep(0)
+            tasks.append(asyncio.create_task(job("priority")))
+            await asyncio.gather(*tasks)
+            return order, controller.snapshot()
+
+        order, snapshot = run(scenario())
+        assert order.index("priority") <= 2
+        assert snapshot["classes"]["priority"]["admitted"] == 1
+        assert snapshot["in_flight"] == snapshot["queued"] == 0
+
+    def test_class_settings_from_config(self):
+        classes = ServiceConfig(max_in_flight=16).scheduling_classes()
+        assert classes["priority"] == ClassPolicy(weight=8, max_in_flight=0)
+        assert classes["standard"].max_in_flight == 12
+        assert classes["simple"].max_in_flight == 4
+
+    def test_limit_without_weight_is_rejected(self):
+        with pytest.raises(ValueError):
+            ServiceConfig(class_weights="a=1", class_limits="b=0.5").scheduling_classes()
+
+    @pytest.mark.parametrize("weights, limits", [
+        ("standard=0", ""),
+        ("standard=-2", ""),
+        ("standard=nan", ""),
+        ("standard=1", "standard=0"),
+        ("standard=1", "standard=1.5"),
+        ("standard=1", "standard=-0.5"),
+    ])
+    def test_bad_weights_and_limits_are_rejected(self, weights, limits):
+        with pytest.raises(ValueError):
+            ServiceConfig(class_weights=weights, class_limits=limits).scheduling_classes()
+
+    def test_scheduler_rejects_weight_zero(self):
+        with pytest.raises(ValueError):
+            PriorityScheduler(max_in_flight=1, classes={"standard": ClassPolicy(weight=0)})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,187 @@
+"""
+Tests for the HTTP endpoints, served against 1.Basic with its stand-in LLM.
+"""
+
+import asyncio
+import json
+from collections import UserList
+from pathlib import Path
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+from starlette.testclient import TestClient
+
+from service.app import create_app, to_jsonable
+from service.config import ServiceConfig
+from service.loader import load_graphs
+
+BASIC_PROJECT = Path(__file__).resolve().parents[2] / "1.Basic"
+
+
+@pytest.fixture(scope="module")
+def graphs():
+    return load_graphs(str(BASIC_PROJECT), stand_in_llm=True, stand_in_latency=0.0)
+
+
+@pytest.fixture
+def client(graphs):
+    with TestClient(create_app(graphs, ServiceConfig(max_in_flight=4, max_queue=4))) as client:
+        yield client
+
+
+def _parse_sse(text: str):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestEndpoints:
+    """Tests for invoke, batch and stream."""
+
+    def test_lists_graphs_from_langgraph_json(self, client):
+        assert client.get("/graphs").json() == {"graphs": ["advanced_workflow", "basic_workflow"]}
+
+    def test_invoke(self, client):
+        response = client.post("/graphs/basic_workflow/invoke",
+                               json={"input": {"input_text": "hello service"}})
+        output = response.json()["output"]
+
+        assert response.status_code == 200
+        assert output["step"] == "output_generated"
+        assert "stand-in" not in output["transformed_text"]
+        assert output["transformed_text"].startswith("A creative retelling")
+
+    def test_batch(self, client):
+        response = client.post("/graphs/advanced_workflow/batch", json={"inputs": [
+            {"input_text": "urgent fix"}, {"input_text": "simple thing"}
+        ]})
+        steps = [item["output"]["step"] for item in response.json()["outputs"]]
+        assert steps == ["priority_processed", "simple_processed"]
+
+    def test_runs_are_scheduled_by_input_class(self, client):
+        client.post("/graphs/advanced_workflow/batch", json={"inputs": [
+            {"input_text": "urgent fix"}, {"input_text": "simple thing"}, {"input_text": "other"}
+        ]})
+        classes = client.get("/metrics").json()["admission"]["classes"]
+        assert {name: c["admitted"] for name, c in classes.items()} == {
+            "priority": 1, "standard": 1, "simple": 1}
+        assert set(classes["priority"]["queue_wait_ms"]) == {"mean", "p50", "p95", "max"}
+
+    def test_batch_size_is_limited(self, client):
+        response = client.post("/graphs/advanced_workflow/batch",
+                               json={"inputs": [{"input_text": "x"}] * 17})
+        assert response.status_code == 400
+
+    def test_stream_sends_tokens_updates_and_result(self, client):
+        response = client.post("/graphs/basic_workflow/stream",
+                               json={"input": {"input_text": "stream me"}})
+        events = _parse_sse(response.text)
+        kinds = [kind for kind, _ in events]
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "token" in kinds and "update" in kinds
+        assert kinds[-1] == "result"
+        tokens = "".join(data["content"] for kind, data in events if kind == "token")
+        assert tokens == events[-1][1]["transformed_text"]
+        assert client.get("/metrics").json()["admission"]["in_flight"] == 0
+
+    def test_stream_slot_is_released_if_the_body_never_starts(self, graphs):
+        app = create_app(graphs, ServiceConfig(max_in_flight=1))
+        body = json.dumps({"input": {"input_text": "x"}}).encode()
+        scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                 "method": "POST", "scheme": "http", "path": "/graphs/basic_workflow/stream",
+                 "raw_path": b"/graphs/basic_workflow/stream", "root_path": "",
+                 "query_string": b"", "headers": [(b"content-type", b"application/json")],
+                 "server": ("service", 80), "client": ("client", 1234)}
+
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.sleep(0.01)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            # The client is gone before the response starts
+            raise OSError("connection reset")
+
+        async def scenario():
+            with pytest.raises(OSError):
+                await app(scope, receive, send)
+            return app.state.admission.snapshot()
+
+        snapshot = asyncio.run(scenario())
+        assert snapshot["in_flight"] == 0
+
+    def test_errors(self, client):
+        assert client.post("/graphs/missing/invoke", json={"input": {}}).status_code == 404
+        assert client.post("/graphs/basic_workflow/invoke", json={"input": "text"}).status_code == 400
+        assert client.post("/graphs/basic_workflow/invoke", content=b"not json").status_code == 400
+
+    def test_state_sequences_are_sent_as_lists(self):
+        # e.g. 2.Router's MessageLog, a sequence view rather than a list
+        state = {"messages": UserList([AIMessage(content="hi")]), "raw": b"x"}
+        output = to_jsonable(state)
+        assert output["messages"][0]["content"] == "hi"
+        assert output["raw"] == "b'x'"
+
+
+class TestBackpressure:
+    """Tests for shedding and draining over HTTP."""
+
+    def test_sheds_with_429_when_queue_is_full(self, graphs):
+        app = create_app(graphs, ServiceConfig(max_in_flight=1, max_queue=0))
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://service") as client:
+                await app.state.admission.acquire()
+                response = await client.post("/graphs/basic_workflow/invoke",
+                                             json={"input": {"input_text": "x"}})
+                app.state.admission.release(0.1)
+                return response
+
+        response = asyncio.run(scenario())
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_draining_rejects_new_requests(self, graphs):
+        app = create_app(graphs, ServiceConfig())
+        app.state.admission.draining = True
+        with TestClient(app) as client:
+            assert client.get("/health").status_code == 503
+            response = client.post("/graphs/basic_workflow/invoke",
+                                   json={"input": {"input_text": "x"}})
+            assert response.status_code == 503
+
+
+class TestSampler:
+    """Tests for the project's background sampling profiler."""
+
+    def test_sampler_runs_with_the_service_when_enabled(self, graphs, monkeypatch, tmp_path):
+        from src.config import Config
+        from src.profiling import set_sampler
+
+        monkeypatch.setattr(Config, "SAMPLER_ENABLED", True)
+        monkeypatch.setattr(Config, "SAMPLER_DIR", str(tmp_path))
+        set_sampler(None)
+        try:
+            app = create_app(graphs, ServiceConfig())
+            with TestClient(app) as client:
+                client.post("/graphs/basic_workflow/invoke", json={"input": {"input_text": "x"}})
+                assert client.get("/metrics").json()["sampler"]["samples"] >= 0
+                sampler = app.state.sampler
+            assert sampler is not None and not sampler.running
+        finally:
+            set_sampler(None)
+
+    def test_no_sampler_by_default(self, client):
+        assert client.get("/metrics").json()["sampler"] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,6 @@
+"""
+LangGraph Common
+Code shared by the LangGraph sample projects.
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,89 @@
+"""
+Benchmark Harness
+Small timing helpers shared by the benchmark scripts of all projects.
+"""
+import statistics
+import time
+from typing import Callable, Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Return the pct-th percentile of samples using nearest-rank.
+
+    Args:
+        samples: Measured values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value, or 0.0 if there are no samples
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples (in seconds) as milliseconds.
+
+    Args:
+        samples: Measured durations in seconds
+
+    Returns:
+        Dictionary with mean, p50, p95, p99 and max in milliseconds
+    """
+    return {
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2) if samples else 0.0,
+    }
+
+
+def run_benchmark(fn: Callable[[], Dict[str, float]], repeats: int = 10,
+                  warmup: int = 1) -> Dict[str, List[float]]:
+    """
+    Run fn repeatedly and collect the timings it reports.
+
+    fn must return a dictionary of metric name -> duration in seconds.
+
+    Args:
+        fn: Function executing one benchmark iteration
+        repeats: Number of measured iterations
+        warmup: Number of unmeasured iterations run first
+
+    Returns:
+        Dictionary of metric name -> list of samples
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples: Dict[str, List[float]] = {}
+    for _ in range(repeats):
+        for name, value in fn().items():
+            samples.setdefault(name, []).append(value)
+    return samples
+
+
+def print_report(title: str, samples: Dict[str, List[float]]) -> None:
+    """Print a summary table for every metric in samples."""
+    print(f"\n📈 {title}")
+    print("=" * 72)
+    print(f"{'metric':<24}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    print("-" * 72)
+    for name, values in samples.items():
+        stats = summarize(values)
+        print(
+            f"{name:<24}{stats['mean_ms']:>9}{stats['p50_ms']:>9}"
+            f"{stats['p95_ms']:>9}{stats['p99_ms']:>9}{stats['max_ms']:>9}"
+        )
+
+
+def timer() -> Callable[[], float]:
+    """Start a timer and return a function giving the elapsed seconds."""
+    start = time.perf_counter()
+    return lambda: time.perf_counter() - start
@@ -0,0 +1,3 @@
+"""
+LLM call helpers shared by the projects.
+"""
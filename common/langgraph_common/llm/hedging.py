@@ -0,0 +1,205 @@
+"""
+Hedged LLM Requests
+Sends a duplicate of a slow LLM call and keeps whichever answer comes first.
+
+A call that has not returned after the configured percentile of recent
+latencies gets a second, identical attempt; the first to succeed wins and
+the other is cancelled. Hedges are capped at max_hedge_fraction of all
+calls, so a latency spike across the board cannot double the traffic.
+
+Sync callers run attempts on a worker thread pool. Python threads cannot be
+interrupted, so a losing sync attempt that has already started finishes in
+the background and its result is dropped; async callers (acall) cancel the
+losing task. Each attempt runs in a copy of the caller's context, so
+context variables such as LangChain's run config and tracing spans reach
+it. The hedge has the run config's callbacks removed: only the first
+attempt streams tokens, so a hedged call's tokens are not interleaved.
+
+Hedge the provider call only, inside its limiter slot (LLMLimiter.invoke's
+wrap): time spent queueing for the limits then neither triggers hedges nor
+enters the latency history, and a hedge shares its primary's slot and rate
+reservation instead of queueing for a second one.
+Each project keeps one policy per call site, configured from its Config
+(src.llm.hedging.get_hedging_policy).
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from langchain_core.runnables.config import var_child_runnable_config
+
+T = TypeVar("T")
+
+
+def _percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _drop_callbacks() -> None:
+    """Remove the callbacks from the current context's LangChain run config."""
+    config = var_child_runnable_config.get()
+    if config and config.get("callbacks") is not None:
+        var_child_runnable_config.set({**config, "callbacks": None})
+
+
+class HedgingPolicy:
+    """Latency-triggered hedging with a cap on the hedge rate."""
+
+    def __init__(self,
+                 percentile: float = 95.0,
+                 max_hedge_fraction: float = 0.1,
+                 window: int = 200,
+                 min_samples: int = 20,
+                 max_workers: int = 32):
+        """
+        Initialize the policy.
+
+        Args:
+            percentile: Recent-latency percentile after which a hedge is sent
+            max_hedge_fraction: Maximum share of calls that may be hedged
+            window: Number of recent latencies kept
+            min_samples: Latencies needed before hedging starts
+            max_workers: Threads available to sync attempts
+        """
+        self.percentile = percentile
+        self.max_hedge_fraction = max_hedge_fraction
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="llm-hedge")
+        self.stats = {"calls": 0, "hedged": 0, "hedge_wins": 0}
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None until enough latencies are known."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            return _percentile(self._latencies, self.percentile)
+
+    def _start_call(self) -> Optional[float]:
+        with self._lock:
+            self.stats["calls"] += 1
+        return self.hedge_delay()
+
+    def _take_hedge(self) -> bool:
+        """Count a hedge if the budget allows one more."""
+        with self._lock:
+            if self.stats["hedged"] + 1 > self.max_hedge_fraction * self.stats["calls"]:
+                return False
+            self.stats["hedged"] += 1
+            return True
+
+    def _finish(self, latency: float, hedge_won: bool) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            if hedge_won:
+                self.stats["hedge_wins"] += 1
+
+    def _timed(self, fn: Callable[[], T]) -> Callable[[], Any]:
+        def attempt():
+            start = time.monotonic()
+            return fn(), time.monotonic() - start
+        return attempt
+
+    def _submit(self, fn: Callable[[], T], hedge: bool = False) -> Future:
+        # Each attempt needs its own copy: a context cannot be entered by two
+        # threads at once
+        context = contextvars.copy_context()
+        if hedge:
+            context.run(_drop_callbacks)
+        return self._executor.submit(context.run, self._timed(fn))
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """
+        Run fn, hedging it with a second call if it is slow.
+
+        Args:
+            fn: Zero-argument function making the LLM call
+
+        Returns:
+            The first successful result
+
+        Raises:
+            Exception: The error of the last attempt if every attempt failed
+        """
+        delay = self._start_call()
+        if delay is None:
+            result, latency = self._timed(fn)()
+            self._finish(latency, hedge_won=False)
+            return result
+        primary = self._submit(fn)
+        if wait([primary], timeout=delay).done or not self._take_hedge():
+            result, latency = primary.result()
+            self._finish(latency, hedge_won=False)
+            return result
+
+        hedge = self._submit(fn, hedge=True)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                result, latency = future.result()
+                self._finish(latency, hedge_won=future is hedge)
+                return result
+        raise error
+
+    async def acall(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async variant of call(); the losing attempt's task is cancelled."""
+        async def attempt(hedge=False):
+            # Tasks run in a copy of the caller's context
+            if hedge:
+                _drop_callbacks()
+            start = time.monotonic()
+            return await fn(), time.monotonic() - start
+
+        delay = self._start_call()
+        primary = asyncio.ensure_future(attempt())
+        if delay is not None:
+            await asyncio.wait([primary], timeout=delay)
+        if delay is None or primary.done() or not self._take_hedge():
+            result, latency = await primary
+            self._finish(latency, hedge_won=False)
+            return result
+
+        hedge = asyncio.ensure_future(attempt(hedge=True))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    result, latency = task.result()
+                    self._finish(latency, hedge_won=task is hedge)
+                    return result
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Hedge rate, hedge win rate and the current hedge delay."""
+        delay = self.hedge_delay()
+        with self._lock:
+            calls, hedged, wins = self.stats["calls"], self.stats["hedged"], self.stats["hedge_wins"]
+        return {
+            **self.stats,
+            "hedge_rate": round(hedged / calls, 4) if calls else 0.0,
+            "hedge_win_rate": round(wins / hedged, 4) if hedged else 0.0,
+            "hedge_delay_ms": round(delay * 1000, 2) if delay is not None else None,
+        }
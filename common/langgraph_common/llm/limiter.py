@@ -0,0 +1,430 @@
+"""
+LLM Rate Limiter
+Shared limiter for LLM calls: request and token buckets plus AIMD concurrency.
+
+Every call first reserves one request from the requests-per-second bucket
+and its estimated tokens from the tokens-per-minute bucket, sleeping until
+both reservations are covered, then waits for a concurrency slot. The
+concurrency limit follows AIMD: it is multiplied by backoff_factor when a
+call fails with a 429 or a timeout and grows by about one slot per limit's
+worth of successful calls, so it settles just below what the provider
+accepts.
+
+The limiter is thread-safe and can be used from sync code (limit(),
+invoke()) and asyncio code (alimit(), ainvoke()) at the same time; async
+waiters never block the event loop. invoke() takes a wrap function that
+runs around the provider call inside the slot, for policies such as
+hedging that must time the provider and not the queue. Each project builds
+its process-wide limiter from its Config (src.llm.limiter.get_llm_limiter).
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, Optional
+
+# Rough prompt size estimate used when reserving tokens-per-minute
+CHARS_PER_TOKEN = 4
+
+
+def is_timeout_error(error: BaseException) -> bool:
+    """Return True for timeouts: TimeoutError and client errors named *Timeout*."""
+    return isinstance(error, TimeoutError) or "Timeout" in type(error).__name__
+
+
+def is_overload_error(error: BaseException, count_timeouts: bool = True) -> bool:
+    """
+    Return True for errors that mean the provider is overloaded.
+
+    Matches HTTP 429 responses (openai.RateLimitError and anything else with
+    status_code 429) and, if count_timeouts is set, timeouts.
+    """
+    if getattr(error, "status_code", None) == 429:
+        return True
+    return count_timeouts and is_timeout_error(error)
+
+
+def estimate_tokens(messages: Any, max_output_tokens: int = 0) -> int:
+    """
+    Estimate the tokens a call will use from its prompt size.
+
+    Args:
+        messages: Prompt string or list of messages
+        max_output_tokens: Tokens to reserve for the response
+
+    Returns:
+        Estimated prompt tokens plus max_output_tokens
+    """
+    if isinstance(messages, str):
+        chars = len(messages)
+    else:
+        chars = sum(len(str(getattr(m, "content", m))) for m in messages)
+    return chars // CHARS_PER_TOKEN + 1 + max_output_tokens
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens the bucket holds (the burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount tokens now, going into debt if needed.
+
+        Args:
+            amount: Tokens to take; capped at the capacity so that one large
+                request cannot wait forever
+
+        Returns:
+            Seconds the caller must wait before the reservation is covered
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= min(amount, self.capacity)
+            return max(0.0, -self._tokens / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """Return (positive) or take (negative) tokens after the fact."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    @property
+    def available(self) -> float:
+        """Tokens currently in the bucket (negative while in debt)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class _AsyncWaiter:
+    """Concurrency waiter parked in an event loop."""
+
+    __slots__ = ("loop", "future")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+
+    def wake(self) -> None:
+        self.loop.call_soon_threadsafe(self._set)
+
+    def _set(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class _ThreadWaiter:
+    """Concurrency waiter blocked in a thread."""
+
+    __slots__ = ("event",)
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def wake(self) -> None:
+        self.event.set()
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limit with a FIFO queue shared by threads and event loops.
+
+    A freed slot is handed directly to the oldest waiter, so sync and async
+    callers are served in arrival order.
+    """
+
+    def __init__(self, initial: int, min_limit: int = 1, max_limit: int = 64,
+                 backoff_factor: float = 0.5):
+        """
+        Initialize the limit.
+
+        Args:
+            initial: Starting concurrency limit
+            min_limit: Lowest limit backoff can reach
+            max_limit: Highest limit the additive increase can reach
+            backoff_factor: Multiplier applied to the limit on overload
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_factor = backoff_factor
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.in_flight = 0
+        self._waiters: Deque[Any] = deque()
+        self._lock = threading.Lock()
+        self._last_backoff = 0.0
+
+    @property
+    def queued(self) -> int:
+        """Number of callers waiting for a slot."""
+        return len(self._waiters)
+
+    def _has_room(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def _grant_waiters(self) -> None:
+        # Caller holds the lock; the slot is taken on the waiter's behalf
+        while self._waiters and self._has_room():
+            self.in_flight += 1
+            self._waiters.popleft().wake()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block the calling thread until a slot is free.
+
+        Args:
+            timeout: Maximum seconds to wait; None waits forever
+
+        Returns:
+            True if a slot was taken, False on timeout
+        """
+        with self._lock:
+            if not self._waiters and self._has_room():
+                self.in_flight += 1
+                return True
+            waiter = _ThreadWaiter()
+            self._waiters.append(waiter)
+
+        if waiter.event.wait(timeout):
+            return True
+        with self._lock:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                return False
+        # Granted between the timeout and taking the lock
+        return True
+
+    async def aacquire(self) -> None:
+        """Wait for a slot without blocking the event loop."""
+        with self._lock:
+            if not self._waiters and self._has_room():
+                self.in_flight += 1
+                return
+            waiter = _AsyncWaiter(asyncio.get_running_loop())
+            self._waiters.append(waiter)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    # The slot was already handed over; pass it on
+                    self.in_flight -= 1
+                    self._grant_waiters()
+            raise
+
+    def release(self, started: float, outcome: str) -> None:
+        """
+        Free a slot and adapt the limit.
+
+        Args:
+            started: time.monotonic() when the call started
+            outcome: "success", "overload" or "error" (no adjustment)
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if outcome == "success":
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            elif outcome == "overload" and started >= self._last_backoff:
+                # Calls already in flight at the last backoff saw the old
+                # limit; only back off once per round of overloads
+                self.limit = max(self.min_limit, self.limit * self.backoff_factor)
+                self._last_backoff = time.monotonic()
+            self._grant_waiters()
+
+
+class LLMLimiter:
+    """Request rate, token rate and adaptive concurrency limits for LLM calls."""
+
+    def __init__(self,
+                 requests_per_second: float = 0,
+                 tokens_per_minute: float = 0,
+                 initial_concurrency: int = 8,
+                 min_concurrency: int = 1,
+                 max_concurrency: int = 64,
+                 backoff_factor: float = 0.5):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_second: Request rate limit (0 for unlimited)
+            tokens_per_minute: Token rate limit (0 for unlimited)
+            initial_concurrency: Starting concurrency limit
+            min_concurrency: Lowest concurrency limit
+            max_concurrency: Highest concurrency limit
+            backoff_factor: Multiplier applied to the concurrency limit on overload
+        """
+        # Bursts of up to one second of requests and one minute of tokens
+        self.requests = (
+            TokenBucket(requests_per_second, max(1.0, requests_per_second))
+            if requests_per_second > 0 else None
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+            if tokens_per_minute > 0 else None
+        )
+        self.concurrency = AdaptiveConcurrency(
+            initial_concurrency, min_concurrency, max_concurrency, backoff_factor
+        )
+        self._stats_lock = threading.Lock()
+        self.stats = {"calls": 0, "succeeded": 0, "overloaded": 0, "failed": 0}
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve one request and tokens; return the seconds to wait."""
+        wait = 0.0
+        if self.requests is not None:
+            wait = self.requests.reserve(1)
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def _record_wait(self, waited: float) -> None:
+        with self._stats_lock:
+            self.stats["calls"] += 1
+            self._queue_wait_total += waited
+            self._queue_wait_max = max(self._queue_wait_max, waited)
+
+    def _finish(self, started: float, error: Optional[BaseException],
+                own_timeout: bool) -> None:
+        if error is None:
+            outcome, counter = "success", "succeeded"
+        elif is_overload_error(error, count_timeouts=not own_timeout):
+            outcome, counter = "overload", "overloaded"
+        else:
+            outcome, counter = "error", "failed"
+        self.concurrency.release(started, outcome)
+        with self._stats_lock:
+            self.stats[counter] += 1
+
+    @contextmanager
+    def limit(self, tokens: int = 0, own_timeout: bool = False) -> Iterator[float]:
+        """
+        Hold a rate reservation and a concurrency slot for the block.
+
+        Args:
+            tokens: Estimated tokens the call will use
+            own_timeout: The call has its own short timeout (e.g. from a
+                request deadline), so its timeouts are not taken as overload
+
+        Yields:
+            Seconds spent waiting for the limits
+        """
+        start = time.monotonic()
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+        self.concurrency.acquire()
+        started = time.monotonic()
+        self._record_wait(started - start)
+        error = None
+        try:
+            yield started - start
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._finish(started, error, own_timeout)
+
+    @asynccontextmanager
+    async def alimit(self, tokens: int = 0, own_timeout: bool = False) -> AsyncIterator[float]:
+        """Async variant of limit(); waits without blocking the event loop."""
+        start = time.monotonic()
+        wait = self._reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+        await self.concurrency.aacquire()
+        started = time.monotonic()
+        self._record_wait(started - start)
+        error = None
+        try:
+            yield started - start
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._finish(started, error, own_timeout)
+
+    def _reconcile(self, estimated: int, response: Any) -> None:
+        """Correct the token bucket with the usage the provider reported."""
+        usage = getattr(response, "usage_metadata", None)
+        if self.tokens is not None and usage and usage.get("total_tokens"):
+            self.tokens.adjust(estimated - usage["total_tokens"])
+
+    def invoke(self, llm: Any, messages: Any, max_output_tokens: int = 0,
+               wrap: Optional[Callable[[Callable[[], Any]], Any]] = None, **kwargs: Any) -> Any:
+        """
+        Call llm.invoke(messages) within the limits.
+
+        Args:
+            llm: Chat model or runnable
+            messages: Prompt passed to invoke
+            max_output_tokens: Tokens to reserve for the response
+            wrap: Called inside the concurrency slot with the zero-argument
+                provider call and returns its response (e.g. hedging or a
+                circuit breaker), so it only sees the provider's latency and
+                not the time spent queueing for the limits
+            **kwargs: Passed to llm.invoke; a timeout argument sets own_timeout
+
+        Returns:
+            The model response
+        """
+        estimated = estimate_tokens(messages, max_output_tokens)
+
+        def call():
+            return llm.invoke(messages, **kwargs)
+
+        with self.limit(estimated, own_timeout="timeout" in kwargs):
+            response = call() if wrap is None else wrap(call)
+        self._reconcile(estimated, response)
+        return response
+
+    async def ainvoke(self, llm: Any, messages: Any, max_output_tokens: int = 0,
+                      wrap: Optional[Callable[[Callable[[], Awaitable[Any]]], Awaitable[Any]]] = None,
+                      **kwargs: Any) -> Any:
+        """Async variant of invoke() using llm.ainvoke; wrap returns an awaitable."""
+        estimated = estimate_tokens(messages, max_output_tokens)
+
+        def call():
+            return llm.ainvoke(messages, **kwargs)
+
+        async with self.alimit(estimated, own_timeout="timeout" in kwargs):
+            response = await (call() if wrap is None else wrap(call))
+        self._reconcile(estimated, response)
+        return response
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limits, load and queue wait times."""
+        calls = self.stats["calls"]
+        return {
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "queued": self.concurrency.queued,
+            "requests_per_second": self.requests.rate if self.requests else None,
+            "tokens_per_minute": round(self.tokens.rate * 60) if self.tokens else None,
+            "tokens_available": round(self.tokens.available) if self.tokens else None,
+            "avg_queue_wait_ms": round(self._queue_wait_total / calls * 1000, 2) if calls else 0.0,
+            "max_queue_wait_ms": round(self._queue_wait_max * 1000, 2),
+            **self.stats,
+        }
@@ -0,0 +1,3 @@
+"""
+Profilers shared by the projects.
+"""
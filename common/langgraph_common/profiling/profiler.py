@@ -0,0 +1,351 @@
+"""
+Workflow Profiler
+Attributes CPU time and peak memory of a run to its nodes and tools.
+
+Within a ProfileSession, every LangGraph node runs under its own cProfile
+profiler and every node or tool call is a scope whose wall time and peak
+traced allocation (tracemalloc, above the memory in use when the scope
+started) are recorded. Nodes are seen through LangChain callbacks
+(attach them with profiled(app)); LangChain tools too, and plain-function
+tools by calling profile_scope("tool", name) around them.
+
+At the end the session prints a table per scope and the top functions of
+each node, and writes the node profiles as collapsed stacks
+("node:name;frame;frame microseconds" lines) for flamegraph.pl,
+speedscope or inferno. cProfile only records caller/callee pairs, so
+stacks deeper than one call are rebuilt by splitting a function's time
+among its callers in proportion to their share of it; the widths are
+exact per function, the deeper stacks an estimate.
+"""
+import cProfile
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# pstats function key: (file, line, function name)
+FuncKey = Tuple[str, int, str]
+
+_MAX_STACK_DEPTH = 64
+_MIN_STACK_MICROSECONDS = 1
+
+
+class _Scope:
+    """An open node or tool call."""
+
+    __slots__ = ("kind", "name", "thread", "started", "cpu_started", "memory_started",
+                 "peak", "profiler")
+
+    def __init__(self, kind: str, name: str, memory: int):
+        self.kind = kind
+        self.name = name
+        self.thread = threading.get_ident()
+        self.started = time.perf_counter()
+        self.cpu_started = time.thread_time()
+        self.memory_started = memory
+        self.peak = memory
+        self.profiler: Optional[cProfile.Profile] = None
+
+
+def _label(func: FuncKey) -> str:
+    file, line, name = func
+    if file == "~":
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(file)}:{line})"
+    return label.replace(";", ",")
+
+
+class ProfileSession:
+    """Collects per-node and per-tool profiles until stopped."""
+
+    def __init__(self):
+        self.scopes: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "peak_bytes": 0}
+        )
+        self.node_stats: Dict[str, pstats.Stats] = {}
+        self.wall_ms = 0.0
+        self._open: List[_Scope] = []
+        self._lock = threading.Lock()
+        self._started = 0.0
+        self._owns_tracemalloc = False
+
+    # Session lifetime
+
+    def start(self) -> "ProfileSession":
+        """Start tracemalloc (if needed) and make this the active session."""
+        global _session
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._started = time.perf_counter()
+        _session = self
+        return self
+
+    def stop(self) -> None:
+        """Stop collecting."""
+        global _session
+        self.wall_ms += (time.perf_counter() - self._started) * 1000
+        if _session is self:
+            _session = None
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def __enter__(self) -> "ProfileSession":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # Scopes
+
+    def _fold_peak(self) -> None:
+        # tracemalloc keeps one peak for the process; record it in every
+        # open scope before it is reset (caller holds the lock)
+        peak = tracemalloc.get_traced_memory()[1]
+        for scope in self._open:
+            scope.peak = max(scope.peak, peak)
+        tracemalloc.reset_peak()
+
+    def open_scope(self, kind: str, name: str) -> _Scope:
+        """Start timing a node or tool call; nodes also start a cProfile profiler."""
+        with self._lock:
+            self._fold_peak()
+            scope = _Scope(kind, name, tracemalloc.get_traced_memory()[0])
+            # One cProfile profiler per thread: nested nodes (subgraphs)
+            # stay in the outer node's profile
+            profiling = any(s.profiler is not None and s.thread == scope.thread
+                            for s in self._open)
+            self._open.append(scope)
+        if kind == "node" and not profiling:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                scope.profiler = profiler
+            except ValueError:
+                # Another profiler is active (Python 3.12+ allows only one)
+                pass
+        return scope
+
+    def close_scope(self, scope: _Scope) -> None:
+        """Stop timing a scope and add its numbers to the session."""
+        if scope.profiler is not None:
+            scope.profiler.disable()
+        wall_ms = (time.perf_counter() - scope.started) * 1000
+        cpu_ms = (time.thread_time() - scope.cpu_started) * 1000
+        with self._lock:
+            self._fold_peak()
+            if scope in self._open:
+                self._open.remove(scope)
+            stats = self.scopes[(scope.kind, scope.name)]
+            stats["calls"] += 1
+            stats["wall_ms"] += wall_ms
+            stats["cpu_ms"] += cpu_ms
+            stats["peak_bytes"] = max(stats["peak_bytes"], scope.peak - scope.memory_started)
+            if scope.profiler is not None:
+                try:
+                    profile = pstats.Stats(scope.profiler)
+                except TypeError:
+                    # Nothing was recorded
+                    return
+                if scope.name in self.node_stats:
+                    self.node_stats[scope.name].add(profile)
+                else:
+                    self.node_stats[scope.name] = profile
+
+    # Output
+
+    def collapsed_stacks(self) -> List[str]:
+        """
+        Node profiles as collapsed stacks.
+
+        Returns:
+            "node:<name>;frame;...;frame <microseconds>" lines
+        """
+        lines: Dict[str, int] = defaultdict(int)
+        for node, stats in self.node_stats.items():
+            raw = stats.stats  # type: ignore[attr-defined]
+            callees: Dict[FuncKey, List[Tuple[FuncKey, float]]] = defaultdict(list)
+            for func, (_, _, _, _, callers) in raw.items():
+                for caller, caller_stats in callers.items():
+                    callees[caller].append((func, caller_stats[3]))
+
+            # Self time per function not placed on a stack yet
+            budget = {func: int(entry[2] * 1_000_000) for func, entry in raw.items()}
+
+            def walk(func: FuncKey, stack: Tuple[str, ...], share: float) -> None:
+                self_us = min(budget[func], int(raw[func][2] * share * 1_000_000))
+                if self_us >= _MIN_STACK_MICROSECONDS:
+                    budget[func] -= self_us
+                    lines[";".join(stack)] += self_us
+                if len(stack) >= _MAX_STACK_DEPTH:
+                    return
+                for callee, cumulative_from_func in callees[func]:
+                    label = _label(callee)
+                    total = raw[callee][3]
+                    if not total or callee[0] == __file__ or label in stack:
+                        # The profiler's own bookkeeping, or a call cycle
+                        continue
+                    child_share = share * min(1.0, cumulative_from_func / total)
+                    if raw[callee][3] * child_share * 1_000_000 >= _MIN_STACK_MICROSECONDS:
+                        walk(callee, stack + (label,), child_share)
+
+            # Stacks start at functions without a recorded caller. Frames
+            # already running when the profiler started are not recorded,
+            # which can leave call cycles (Context.run -> invoke -> ...
+            # -> Context.run) with no such function: the costliest function
+            # not reached yet becomes a root until every one is reached.
+            reached = set()
+            roots = [func for func, entry in raw.items() if not entry[4]]
+            while True:
+                for root in roots:
+                    if root[0] != __file__:
+                        walk(root, (f"node:{node}", _label(root)), 1.0)
+                pending = list(roots)
+                while pending:
+                    func = pending.pop()
+                    if func not in reached:
+                        reached.add(func)
+                        pending.extend(callee for callee, _ in callees[func])
+                unreached = [func for func in raw if func not in reached]
+                if not unreached:
+                    break
+                roots = [max(unreached, key=lambda func: raw[func][3])]
+
+            # Time lost to pruned cycles goes right under the node
+            for func, remaining in budget.items():
+                if remaining >= _MIN_STACK_MICROSECONDS and func[0] != __file__:
+                    lines[f"node:{node};{_label(func)}"] += remaining
+        return [f"{stack} {count}" for stack, count in lines.items()]
+
+    def write_collapsed(self, path: str) -> int:
+        """Write collapsed stacks to path; returns the number of lines."""
+        lines = self.collapsed_stacks()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + ("\n" if lines else ""))
+        return len(lines)
+
+    def print_report(self, top: int = 10) -> None:
+        """Print time and peak memory per scope and the top functions per node."""
+        print(f"\n🔬 Profile ({self.wall_ms:.1f} ms profiled)")
+        print("=" * 78)
+        print(f"{'kind':<6}{'name':<32}{'calls':>7}{'wall ms':>11}{'cpu ms':>11}{'peak KiB':>11}")
+        print("-" * 78)
+        ranked = sorted(self.scopes.items(), key=lambda item: item[1]["wall_ms"], reverse=True)
+        for (kind, name), stats in ranked:
+            print(f"{kind:<6}{name[:31]:<32}{stats['calls']:>7}{stats['wall_ms']:>11.2f}"
+                  f"{stats['cpu_ms']:>11.2f}{stats['peak_bytes'] / 1024:>11.1f}")
+
+        for node, stats in sorted(self.node_stats.items()):
+            raw = stats.stats  # type: ignore[attr-defined]
+            print(f"\n📌 {node}: top {top} functions by cumulative time")
+            print(f"{'cum ms':>10}{'self ms':>10}{'calls':>8}  function")
+            ranked_funcs = sorted(raw.items(), key=lambda item: item[1][3], reverse=True)
+            for func, (_, calls, self_time, cumulative, _) in ranked_funcs[:top]:
+                print(f"{cumulative * 1000:>10.2f}{self_time * 1000:>10.2f}{calls:>8}  {_label(func)}")
+
+
+_session: Optional[ProfileSession] = None
+
+
+def active_session() -> Optional[ProfileSession]:
+    """The running ProfileSession, if any."""
+    return _session
+
+
+@contextmanager
+def profile_scope(kind: str, name: str) -> Iterator[None]:
+    """Record the enclosed code as a scope of the active session, if any."""
+    session = _session
+    if session is None:
+        yield
+        return
+    scope = session.open_scope(kind, name)
+    try:
+        yield
+    finally:
+        session.close_scope(scope)
+
+
+class ProfilingCallbackHandler(BaseCallbackHandler):
+    """Opens session scopes for LangGraph nodes and LangChain tools."""
+
+    # Run in the node's own thread so its profiler records the node
+    run_inline = True
+
+    def __init__(self, session: ProfileSession):
+        self.session = session
+        self._scopes: Dict[UUID, _Scope] = {}
+        self._nodes: Dict[UUID, str] = {}
+        self._lock = threading.Lock()
+
+    def _open(self, run_id: UUID, kind: str, name: str) -> None:
+        scope = self.session.open_scope(kind, name)
+        with self._lock:
+            self._scopes[run_id] = scope
+
+    def _close(self, run_id: UUID) -> None:
+        with self._lock:
+            scope = self._scopes.pop(run_id, None)
+            self._nodes.pop(run_id, None)
+        if scope is not None:
+            self.session.close_scope(scope)
+
+    def on_chain_start(self, serialized: Optional[Dict[str, Any]], inputs: Any, *,
+                       run_id: UUID, parent_run_id: Optional[UUID] = None,
+                       metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name")
+        node = (metadata or {}).get("langgraph_node")
+        if node is None or name != node:
+            return
+        with self._lock:
+            # A Runnable node named like its node is part of the same call
+            nested = self._nodes.get(parent_run_id) == node
+            self._nodes[run_id] = node
+        if not nested:
+            self._open(run_id, "node", node)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id)
+
+    def on_tool_start(self, serialized: Optional[Dict[str, Any]], input_str: str, *,
+                      run_id: UUID, **kwargs: Any) -> None:
+        self._open(run_id, "tool", kwargs.get("name") or (serialized or {}).get("name", "tool"))
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id)
+
+
+def profiled(app: Any) -> Any:
+    """
+    Return app with the profiling callback attached while a session is
+    active, or app itself otherwise.
+
+    Args:
+        app: Compiled LangGraph application (or any Runnable)
+    """
+    session = _session
+    if session is None:
+        return app
+    return app.with_config(callbacks=[ProfilingCallbackHandler(session)])
+
+
+def maybe_profile(enabled: bool):
+    """A started ProfileSession if enabled, else a no-op context manager."""
+    return ProfileSession() if enabled else nullcontext()
@@ -0,0 +1,226 @@
+"""
+Background Sampling Profiler
+Samples the stacks of all threads at a low rate for as long as a process
+runs, and writes collapsed-stack snapshots to disk.
+
+A daemon thread reads sys._current_frames() every interval. Samples taken
+inside a LangGraph node are tagged with it: the innermost frame of
+LangGraph's RunnableCallable.invoke/ainvoke (which runs node functions)
+holds the run config, whose metadata names the node. This also works for
+async nodes, which LangGraph runs in asyncio tasks of their own, away
+from the Pregel loop frames. Other samples are tagged with the thread
+name. Threads waiting in a queue, lock or selector are skipped unless
+include_idle.
+
+The sampler only runs when it gets the GIL, which a busy thread gives up
+every sys.getswitchinterval() (5 ms); code that releases the GIL often,
+such as an event loop polling for I/O, is sampled more at those points.
+
+Counts are aggregated per stack in memory, at most max_stacks distinct
+stacks per window; further new stacks are counted as "[other]" under
+their tag. Every flush_seconds the window is written to
+directory/samples-<time>.collapsed ("tag;frame;...;frame count" lines,
+for flamegraph.pl, speedscope or inferno) and cleared; only the newest
+keep_files snapshots are kept.
+
+The sampler measures its own CPU time. When it exceeds max_overhead of
+the elapsed time, the interval is doubled (up to 16 times the configured
+one); it is halved again once overhead is well below the limit.
+
+Each project starts its process-wide sampler from its Config
+(src.profiling.get_sampler).
+"""
+import atexit
+import glob
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+try:
+    from langgraph._internal._runnable import RunnableCallable
+    _NODE_CODES = {RunnableCallable.invoke.__code__, RunnableCallable.ainvoke.__code__}
+except (ImportError, AttributeError):  # pragma: no cover - other langgraph layouts
+    _NODE_CODES = set()
+
+# Innermost Python frames of threads blocked waiting for work
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+_MAX_SLOWDOWN = 16
+
+
+class SamplingProfiler:
+    """Low-rate stack sampler with bounded aggregation and periodic snapshots."""
+
+    def __init__(self, directory: str, interval: float = 0.02, flush_seconds: float = 60.0,
+                 max_stacks: int = 10000, max_depth: int = 64, keep_files: int = 24,
+                 max_overhead: float = 0.02, include_idle: bool = False):
+        """
+        Initialize the sampler.
+
+        Args:
+            directory: Directory the snapshots are written to
+            interval: Seconds between samples
+            flush_seconds: Seconds between snapshots
+            max_stacks: Distinct stacks kept per snapshot window
+            max_depth: Frames kept per stack (innermost ones)
+            keep_files: Snapshots kept on disk (0 keeps all)
+            max_overhead: Share of elapsed time the sampler may use as CPU
+            include_idle: If True, also sample threads waiting for work
+        """
+        self.directory = directory
+        self.interval = interval
+        self.flush_seconds = flush_seconds
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.keep_files = keep_files
+        self.max_overhead = max_overhead
+        self.include_idle = include_idle
+        self.current_interval = interval
+        self.stats = {"samples": 0, "stacks": 0, "overflow": 0, "snapshots": 0,
+                      "overhead": 0.0}
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._labels: Dict[Any, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is sampling."""
+        return self._thread is not None and self._thread.is_alive()
+
+    # Sampling
+
+    def _label(self, code: Any) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = os.path.basename(code.co_filename)
+            label = f"{code.co_name} ({name}:{code.co_firstlineno})".replace(";", ",")
+            self._labels[code] = label
+        return label
+
+    def _stack(self, frame: Any, thread_name: str) -> Optional[str]:
+        leaf = frame.f_code
+        if not self.include_idle and (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES:
+            return None
+        frames = []
+        node = None
+        while frame is not None:
+            code = frame.f_code
+            if node is None and code in _NODE_CODES:
+                config = frame.f_locals.get("config") or {}
+                node = config.get("metadata", {}).get("langgraph_node")
+            if len(frames) < self.max_depth:
+                frames.append(self._label(code))
+            frame = frame.f_back
+        frames.append(f"node:{node}" if node is not None else f"thread:{thread_name}")
+        frames.reverse()
+        return ";".join(frames)
+
+    def sample(self) -> int:
+        """Take one sample of every thread but the sampler's; returns the stacks counted."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        counted = 0
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = self._stack(frame, names.get(ident, str(ident)))
+            if stack is None:
+                continue
+            with self._lock:
+                if stack not in self._counts and len(self._counts) >= self.max_stacks:
+                    self.stats["overflow"] += 1
+                    stack = f"{stack.split(';', 1)[0]};[other]"
+                self._counts[stack] += 1
+            counted += 1
+        self.stats["samples"] += 1
+        return counted
+
+    # Snapshots
+
+    def snapshot(self, reset: bool = False) -> Dict[str, int]:
+        """Counts per stack of the current window, optionally starting a new one."""
+        with self._lock:
+            counts = dict(self._counts)
+            if reset:
+                self._counts.clear()
+        return counts
+
+    def flush(self) -> Optional[str]:
+        """Write the current window to a snapshot file; returns its path, if any."""
+        counts = self.snapshot(reset=True)
+        if not counts:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.directory, f"samples-{stamp}.collapsed")
+        if os.path.exists(path):
+            path = os.path.join(self.directory, f"samples-{stamp}-{self.stats['snapshots']}.collapsed")
+        with tempfile.NamedTemporaryFile("w", dir=self.directory, delete=False,
+                                         encoding="utf-8", suffix=".tmp") as f:
+            for stack, count in sorted(counts.items()):
+                f.write(f"{stack} {count}\n")
+        os.replace(f.name, path)
+        self.stats["snapshots"] += 1
+        self.stats["stacks"] = len(counts)
+        if self.keep_files:
+            files = sorted(glob.glob(os.path.join(self.directory, "samples-*.collapsed")),
+                           key=os.path.getmtime)
+            for old in files[:-self.keep_files]:
+                os.remove(old)
+        return path
+
+    # Background thread
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        window_started, window_cpu = started, cpu_started
+        next_flush = started + self.flush_seconds
+        while not self._stop.wait(self.current_interval):
+            self.sample()
+            now = time.perf_counter()
+            # Adapt the rate to the CPU the sampler used over the last second
+            if now - window_started >= 1.0:
+                cpu = time.thread_time()
+                overhead = (cpu - window_cpu) / (now - window_started)
+                self.stats["overhead"] = round(overhead, 4)
+                if overhead > self.max_overhead:
+                    self.current_interval = min(self.current_interval * 2,
+                                                self.interval * _MAX_SLOWDOWN)
+                elif overhead < self.max_overhead / 4 and self.current_interval > self.interval:
+                    self.current_interval = max(self.current_interval / 2, self.interval)
+                window_started, window_cpu = now, cpu
+            if now >= next_flush:
+                self.flush()
+                next_flush = now + self.flush_seconds
+        self.flush()
+
+    def start(self) -> "SamplingProfiler":
+        """Start sampling in a daemon thread."""
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler",
+                                            daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop sampling and write the last snapshot."""
+        self._stop.set()
+        atexit.unregister(self.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
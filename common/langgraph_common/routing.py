@@ -0,0 +1,32 @@
+"""
+Input Routes
+Keywords that pick the route of an input text.
+
+1.Basic's advanced workflow sends an input to the processor of its route,
+and the service schedules it in the priority class of the same name, so
+both read the keywords from here.
+"""
+
+# Checked in order; the first keyword found in the input (ignoring case) wins
+ROUTE_KEYWORDS = (
+    ("urgent", "priority"),
+    ("simple", "simple"),
+)
+DEFAULT_ROUTE = "standard"
+
+
+def route_for(text: str) -> str:
+    """
+    Route of an input text.
+
+    Args:
+        text: Input text
+
+    Returns:
+        "priority", "simple" or "standard"
+    """
+    lowered = text.lower()
+    for keyword, route in ROUTE_KEYWORDS:
+        if keyword in lowered:
+            return route
+    return DEFAULT_ROUTE
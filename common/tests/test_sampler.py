@@ -0,0 +1,167 @@
+"""
+Tests for the background sampling profiler.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from typing import TypedDict
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+from langgraph_common.profiling.sampler import SamplingProfiler
+
+COLLAPSED_LINE = re.compile(r"^(node|thread):[^;]+(;[^;]+)+ \d+$")
+
+
+class WaitState(TypedDict):
+    value: str
+
+
+def _waiting_graph(release: threading.Event, entered: threading.Event):
+    def slow_node(state: WaitState):
+        entered.set()
+        while not release.is_set():
+            time.sleep(0.001)
+        return {"value": "done"}
+
+    workflow = StateGraph(WaitState)
+    workflow.add_node("slow_node", slow_node)
+    workflow.set_entry_point("slow_node")
+    workflow.add_edge("slow_node", END)
+    return workflow.compile()
+
+
+@pytest.fixture
+def busy_thread():
+    """A thread spinning in a plain function until released."""
+    release = threading.Event()
+
+    def spin():
+        while not release.is_set():
+            time.sleep(0.001)
+
+    thread = threading.Thread(target=spin, name="spinner")
+    thread.start()
+    yield thread
+    release.set()
+    thread.join()
+
+
+class TestSampling:
+    """Tests for stacks and their tags."""
+
+    def test_samples_inside_a_node_are_tagged_with_it(self, tmp_path):
+        release, entered = threading.Event(), threading.Event()
+        app = _waiting_graph(release, entered)
+        runner = threading.Thread(target=app.invoke, args=({"value": ""},))
+        runner.start()
+        entered.wait(5)
+
+        sampler = SamplingProfiler(str(tmp_path))
+        sampler.sample()
+        release.set()
+        runner.join()
+
+        stacks = sampler.snapshot()
+        node_stacks = [s for s in stacks if s.startswith("node:slow_node;")]
+        assert node_stacks and node_stacks[0].rsplit(";", 1)[1].startswith("slow_node (test_sampler.py:")
+
+    def test_async_nodes_are_tagged_too(self, tmp_path):
+        entered, release = threading.Event(), threading.Event()
+
+        async def async_node(state: WaitState):
+            entered.set()
+            while not release.is_set():
+                time.sleep(0.001)
+            return {"value": "done"}
+
+        workflow = StateGraph(WaitState)
+        workflow.add_node("async_node", async_node)
+        workflow.set_entry_point("async_node")
+        workflow.add_edge("async_node", END)
+        app = workflow.compile()
+        runner = threading.Thread(target=asyncio.run, args=(app.ainvoke({"value": ""}),))
+        runner.start()
+        entered.wait(5)
+
+        sampler = SamplingProfiler(str(tmp_path))
+        sampler.sample()
+        release.set()
+        runner.join()
+
+        assert any(s.startswith("node:async_node;") for s in sampler.snapshot())
+
+    def test_other_threads_are_tagged_with_their_name(self, tmp_path, busy_thread):
+        sampler = SamplingProfiler(str(tmp_path))
+        sampler.sample()
+        assert any(s.startswith("thread:spinner;") and ";spin (test_sampler.py:" in s
+                   for s in sampler.snapshot())
+
+    def test_idle_threads_are_skipped_unless_asked_for(self, tmp_path):
+        stop = threading.Event()
+        waiter = threading.Thread(target=stop.wait, name="waiter")
+        waiter.start()
+        try:
+            quiet = SamplingProfiler(str(tmp_path))
+            quiet.sample()
+            everything = SamplingProfiler(str(tmp_path), include_idle=True)
+            everything.sample()
+        finally:
+            stop.set()
+            waiter.join()
+
+        assert not any(s.startswith("thread:waiter;") for s in quiet.snapshot())
+        assert any(s.startswith("thread:waiter;") for s in everything.snapshot())
+
+    def test_distinct_stacks_are_bounded(self, tmp_path, busy_thread):
+        stop = threading.Event()
+        waiter = threading.Thread(target=stop.wait, name="waiter")
+        waiter.start()
+        sampler = SamplingProfiler(str(tmp_path), max_stacks=1, include_idle=True)
+        for _ in range(3):
+            sampler.sample()
+        stop.set()
+        waiter.join()
+
+        stacks = sampler.snapshot()
+        assert len([s for s in stacks if not s.endswith(";[other]")]) == 1
+        assert sampler.stats["overflow"] > 0
+
+
+class TestSnapshots:
+    """Tests for snapshot files and the background thread."""
+
+    def test_flush_writes_collapsed_stacks_and_starts_a_new_window(self, tmp_path, busy_thread):
+        sampler = SamplingProfiler(str(tmp_path))
+        sampler.sample()
+        path = sampler.flush()
+
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert lines and all(COLLAPSED_LINE.match(line) for line in lines)
+        assert sampler.snapshot() == {}
+        assert sampler.flush() is None
+
+    def test_only_the_newest_snapshots_are_kept(self, tmp_path, busy_thread):
+        sampler = SamplingProfiler(str(tmp_path), keep_files=2)
+        for _ in range(4):
+            sampler.sample()
+            sampler.flush()
+        assert len(list(tmp_path.glob("samples-*.collapsed"))) == 2
+
+    def test_background_thread_samples_until_stopped(self, tmp_path, busy_thread):
+        sampler = SamplingProfiler(str(tmp_path), interval=0.005, flush_seconds=60).start()
+        time.sleep(0.2)
+        sampler.stop()
+
+        assert sampler.stats["samples"] > 5
+        snapshots = list(tmp_path.glob("samples-*.collapsed"))
+        assert len(snapshots) == 1
+        assert "thread:spinner;" in snapshots[0].read_text()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])